@@ -28,6 +28,8 @@ from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
 
+from backend.ai.provider_registry import ProviderHandle, get_provider_registry
+
 logger = logging.getLogger(__name__)
 
 
@@ -506,45 +508,68 @@ class AIAuthority:
         """
         Create a text generation provider using current runtime decision.
         This is the ONLY way to get a text provider.
+        
+        Instances are shared per provider/model/key (see provider_registry.py).
         """
+        return self.resolve_text_provider(model_override).provider
+    
+    def resolve_text_provider(self, model_override: Optional[str] = None) -> ProviderHandle:
+        """Handle to the registered provider for the current runtime decision."""
         from backend.ai.bridge import safe_execute_async
         decision = safe_execute_async(self.resolve_runtime())
         
         provider_name = decision.active_provider
         model = model_override or decision.active_model
         
+        credential = self._ollama_base_url if provider_name == "ollama" else self.get_api_key(provider_name)
+        return get_provider_registry().get(
+            provider_name,
+            model,
+            credential,
+            lambda: self._build_text_provider(provider_name, model)
+        )
+    
+    def _build_text_provider(self, provider_name: str, model: Optional[str]):
+        """Construct a new provider instance (called once per registry entry)."""
         # Import here to avoid circular imports
         from backend.ai.providers.openai_provider import OpenAIProvider
         from backend.ai.providers.anthropic_provider import AnthropicProvider
         from backend.ai.providers.gemini_provider import GeminiProvider
         from backend.ai.providers.ollama_provider import OllamaProvider
         
+        from backend.ai.resilience import make_resilient
+        from backend.ai.response_cache import make_cached
+        
         if provider_name == "openai":
-            return OpenAIProvider(
+            provider = OpenAIProvider(
                 api_key=self._openai_key,
                 model=model,
                 timeout=180
             )
         elif provider_name == "gemini":
-            return GeminiProvider(
+            provider = GeminiProvider(
                 api_key=self._gemini_key,
                 model=model,
                 timeout=180
             )
         elif provider_name == "anthropic":
-            return AnthropicProvider(
+            provider = AnthropicProvider(
                 api_key=self._anthropic_key,
                 model=model,
                 timeout=180
             )
         elif provider_name == "ollama":
-            return OllamaProvider(
+            provider = OllamaProvider(
                 base_url=self._ollama_base_url,
                 model=model,
                 timeout=180
             )
         else:
             raise ValueError(f"Unknown provider: {provider_name}")
+        
+        # Transient errors are retried with backoff (and optionally hedged);
+        # identical calls are served from the response cache without a retry
+        return make_cached(make_resilient(provider))
     
     def create_image_provider(self):
         """
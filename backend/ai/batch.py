@@ -0,0 +1,416 @@
+"""
+AI BATCH MODE - Provider batch jobs behind the AIProvider interface
+
+Bulk re-generation (python -m backend.batch_regenerate) runs many pipelines at
+once against a BatchingProvider instead of the synchronous chat path:
+
+    pipelines (threads) -- generate() --> pending requests
+                                            | quiet for collect_window_seconds
+                                            | (or max_batch_size reached)
+                                            v
+                              BatchBackend.submit -> poll -> results
+                              (one thread per batch job: new batches are
+                               submitted while earlier ones are polled)
+                                            |
+    pipelines continue <-- futures resolved with each request's text
+
+Each pipeline still parses and validates every response itself (spine,
+ValidationGate), exactly as with a synchronous provider. Requests that
+depend on earlier answers (e.g. the dashboard) simply form the next batch.
+
+Backends:
+    OpenAIBatchBackend     /v1/batches (JSONL upload, 24h window)
+    AnthropicBatchBackend  Message Batches API
+    LocalBatchBackend      in-process stand-in for tests and dry runs
+"""
+
+import asyncio
+import concurrent.futures
+import json
+import logging
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from backend.ai.provider_interface import AIProvider
+
+logger = logging.getLogger(__name__)
+
+STATUS_IN_PROGRESS = "in_progress"
+STATUS_COMPLETED = "completed"
+STATUS_FAILED = "failed"
+
+
+@dataclass
+class BatchRequest:
+    """One generate() call, as submitted in a batch."""
+    custom_id: str
+    prompt: str
+    model: Optional[str] = None
+    system: str = ""
+    temperature: float = 0.7
+    max_tokens: int = 4096
+    json_mode: bool = False
+
+
+@dataclass
+class BatchResult:
+    custom_id: str
+    text: Optional[str] = None
+    error: Optional[str] = None
+
+
+class BatchBackend(ABC):
+    """Submits a list of requests as one provider batch job."""
+
+    name: str = "batch"
+
+    @abstractmethod
+    async def submit(self, requests: List[BatchRequest]) -> str:
+        """Create the batch job. Returns its id."""
+
+    @abstractmethod
+    async def status(self, batch_id: str) -> str:
+        """STATUS_IN_PROGRESS, STATUS_COMPLETED or STATUS_FAILED."""
+
+    @abstractmethod
+    async def results(self, batch_id: str) -> Dict[str, BatchResult]:
+        """Results keyed by custom_id (only valid once completed)."""
+
+
+# =============================================================================
+# BACKENDS
+# =============================================================================
+
+class OpenAIBatchBackend(BatchBackend):
+    """OpenAI Batch API; request bodies are built by OpenAIProvider._build_params."""
+
+    name = "openai"
+    _FAILED = {"failed", "expired", "cancelled", "cancelling"}
+
+    def __init__(self, provider: Any, completion_window: str = "24h"):
+        self.provider = provider
+        self.completion_window = completion_window
+
+    async def submit(self, requests: List[BatchRequest]) -> str:
+        lines = []
+        for r in requests:
+            body = self.provider._build_params(
+                r.prompt, r.model, r.system, r.temperature, r.max_tokens, r.json_mode, None
+            )
+            lines.append(json.dumps({
+                "custom_id": r.custom_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": body,
+            }))
+        upload = await self.provider.client.files.create(
+            file=("batch.jsonl", "\n".join(lines).encode("utf-8"), "application/jsonl"),
+            purpose="batch",
+        )
+        batch = await self.provider.client.batches.create(
+            input_file_id=upload.id,
+            endpoint="/v1/chat/completions",
+            completion_window=self.completion_window,
+        )
+        return batch.id
+
+    async def status(self, batch_id: str) -> str:
+        batch = await self.provider.client.batches.retrieve(batch_id)
+        if batch.status == "completed":
+            return STATUS_COMPLETED
+        if batch.status in self._FAILED:
+            return STATUS_FAILED
+        return STATUS_IN_PROGRESS
+
+    async def results(self, batch_id: str) -> Dict[str, BatchResult]:
+        batch = await self.provider.client.batches.retrieve(batch_id)
+        out: Dict[str, BatchResult] = {}
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            content = await self.provider.client.files.content(file_id)
+            for line in content.text.splitlines():
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                response = entry.get("response") or {}
+                if entry.get("error") or response.get("status_code") != 200:
+                    error = entry.get("error") or response.get("body", {}).get("error")
+                    out[entry["custom_id"]] = BatchResult(entry["custom_id"], error=str(error))
+                    continue
+                choices = response.get("body", {}).get("choices") or [{}]
+                text = (choices[0].get("message") or {}).get("content") or ""
+                out[entry["custom_id"]] = BatchResult(entry["custom_id"], text=text)
+        return out
+
+
+class AnthropicBatchBackend(BatchBackend):
+    """Anthropic Message Batches; params are built by AnthropicProvider._build_params."""
+
+    name = "anthropic"
+
+    def __init__(self, provider: Any):
+        self.provider = provider
+
+    async def submit(self, requests: List[BatchRequest]) -> str:
+        entries = []
+        for r in requests:
+            params = self.provider._build_params(
+                r.prompt, r.model, r.system, r.temperature, r.max_tokens, r.json_mode, None
+            )
+            entries.append({
+                "custom_id": r.custom_id,
+                "params": {k: v for k, v in params.items() if v is not None},
+            })
+        batch = await self.provider.client.messages.batches.create(requests=entries)
+        return batch.id
+
+    async def status(self, batch_id: str) -> str:
+        batch = await self.provider.client.messages.batches.retrieve(batch_id)
+        return STATUS_COMPLETED if batch.processing_status == "ended" else STATUS_IN_PROGRESS
+
+    async def results(self, batch_id: str) -> Dict[str, BatchResult]:
+        out: Dict[str, BatchResult] = {}
+        async for entry in await self.provider.client.messages.batches.results(batch_id):
+            result = entry.result
+            if result.type == "succeeded":
+                text = "".join(b.text for b in result.message.content if hasattr(b, "text"))
+                out[entry.custom_id] = BatchResult(entry.custom_id, text=text)
+            else:
+                error = getattr(result, "error", None) or result.type
+                out[entry.custom_id] = BatchResult(entry.custom_id, error=str(error))
+        return out
+
+
+class LocalBatchBackend(BatchBackend):
+    """
+    In-process stand-in for a provider batch endpoint (tests, dry runs).
+
+    Answers every request through `responder` - an AIProvider or a callable
+    taking a BatchRequest - when the batch is submitted.
+    """
+
+    name = "local"
+
+    def __init__(self, responder: Union[AIProvider, Callable[[BatchRequest], str]]):
+        self.responder = responder
+        self.submitted: List[List[BatchRequest]] = []
+        self._results: Dict[str, Dict[str, BatchResult]] = {}
+
+    async def _answer(self, request: BatchRequest) -> BatchResult:
+        try:
+            if isinstance(self.responder, AIProvider):
+                text = await self.responder.generate(
+                    request.prompt,
+                    model=request.model,
+                    system=request.system,
+                    temperature=request.temperature,
+                    max_tokens=request.max_tokens,
+                    json_mode=request.json_mode,
+                )
+            else:
+                text = self.responder(request)
+            return BatchResult(request.custom_id, text=text)
+        except Exception as e:
+            return BatchResult(request.custom_id, error=str(e))
+
+    async def submit(self, requests: List[BatchRequest]) -> str:
+        batch_id = f"local-{uuid.uuid4().hex[:12]}"
+        self.submitted.append(list(requests))
+        answers = await asyncio.gather(*(self._answer(r) for r in requests))
+        self._results[batch_id] = {a.custom_id: a for a in answers}
+        return batch_id
+
+    async def status(self, batch_id: str) -> str:
+        return STATUS_COMPLETED if batch_id in self._results else STATUS_FAILED
+
+    async def results(self, batch_id: str) -> Dict[str, BatchResult]:
+        return self._results.pop(batch_id, {})
+
+
+# =============================================================================
+# BATCHING PROVIDER
+# =============================================================================
+
+class BatchingProvider(AIProvider):
+    """
+    AIProvider whose generate() calls are collected and sent as batch jobs.
+
+    Callers block (await) until their batch has completed, so this is only
+    meant for offline bulk work. Multimodal calls (images) are not batched and
+    go to `fallback` when one is given.
+    """
+
+    def __init__(
+        self,
+        backend: BatchBackend,
+        default_model: Optional[str] = None,
+        fallback: Optional[AIProvider] = None,
+        collect_window_seconds: float = 5.0,
+        max_batch_size: int = 1000,
+        poll_interval_seconds: float = 30.0
+    ):
+        self.backend = backend
+        self.default_model = default_model
+        self.fallback = fallback
+        self.collect_window_seconds = collect_window_seconds
+        self.max_batch_size = max(1, max_batch_size)
+        self.poll_interval_seconds = poll_interval_seconds
+        self._cond = threading.Condition()
+        self._pending: List[Tuple[BatchRequest, concurrent.futures.Future]] = []
+        self._last_arrival = 0.0
+        self._dispatcher: Optional[threading.Thread] = None
+        self._stopped = False
+        self._stats_lock = threading.Lock()
+        self.stats: Dict[str, int] = {"batches": 0, "requests": 0, "failed_requests": 0}
+
+    @property
+    def name(self) -> str:
+        # Same name as the synchronous provider: cached responses are shared
+        return self.backend.name
+
+    async def generate(
+        self,
+        prompt: str,
+        *,
+        model: Optional[str] = None,
+        system: str = "",
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+        json_mode: bool = False,
+        images: Optional[List[str]] = None
+    ) -> str:
+        if images:
+            if self.fallback is None:
+                raise RuntimeError("BatchingProvider: multimodal requests cannot be batched")
+            return await self.fallback.generate(
+                prompt, model=model, system=system, temperature=temperature,
+                max_tokens=max_tokens, json_mode=json_mode, images=images
+            )
+        request = BatchRequest(
+            custom_id=uuid.uuid4().hex,
+            prompt=prompt,
+            model=model or self.default_model,
+            system=system,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            json_mode=json_mode,
+        )
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        with self._cond:
+            if self._stopped:
+                raise RuntimeError("BatchingProvider: closed")
+            self._pending.append((request, future))
+            self._last_arrival = time.monotonic()
+            self._ensure_dispatcher()
+            self._cond.notify_all()
+        # Thread-safe future: callers may live on any event loop
+        return await asyncio.wrap_future(future)
+
+    async def check_health(self) -> bool:
+        return not self._stopped
+
+    def list_models(self) -> List[str]:
+        return [self.default_model] if self.default_model else []
+
+    async def close(self):
+        self.stop()
+
+    def stop(self) -> None:
+        """Fail requests that were never submitted and stop the dispatcher."""
+        with self._cond:
+            self._stopped = True
+            pending, self._pending = self._pending, []
+            self._cond.notify_all()
+        for _, future in pending:
+            if not future.done():
+                future.set_exception(RuntimeError("BatchingProvider: stopped before submission"))
+
+    # =========================================================================
+    # DISPATCH
+    # =========================================================================
+
+    def _ensure_dispatcher(self) -> None:
+        """Caller holds self._cond."""
+        if self._dispatcher is None or not self._dispatcher.is_alive():
+            self._dispatcher = threading.Thread(target=self._dispatch_loop, name="BatchDispatcher", daemon=True)
+            self._dispatcher.start()
+
+    def _next_batch(self) -> List[Tuple[BatchRequest, concurrent.futures.Future]]:
+        """Block until requests went quiet for collect_window_seconds (or the batch is full)."""
+        with self._cond:
+            while not self._pending and not self._stopped:
+                self._cond.wait(1.0)
+            while not self._stopped and len(self._pending) < self.max_batch_size:
+                quiet = time.monotonic() - self._last_arrival
+                if quiet >= self.collect_window_seconds:
+                    break
+                self._cond.wait(self.collect_window_seconds - quiet)
+            batch = self._pending[:self.max_batch_size]
+            del self._pending[:self.max_batch_size]
+            return batch
+
+    def _dispatch_loop(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                if self._stopped:
+                    return
+                continue
+            # Polling a job can take hours: never hold up the next batch for it
+            threading.Thread(target=self._run_batch, args=(batch,), name="BatchJob", daemon=True).start()
+
+    def _run_batch(self, batch: List[Tuple[BatchRequest, concurrent.futures.Future]]) -> None:
+        from backend.ai.bridge import safe_execute_async
+
+        requests = [r for r, _ in batch]
+        try:
+            batch_id = safe_execute_async(self.backend.submit(requests))
+            logger.info(f"BatchingProvider: Submitted {len(requests)} requests as {self.backend.name} batch {batch_id}")
+            while True:
+                state = safe_execute_async(self.backend.status(batch_id))
+                if state != STATUS_IN_PROGRESS:
+                    break
+                time.sleep(self.poll_interval_seconds)
+            if state != STATUS_COMPLETED:
+                raise RuntimeError(f"batch {batch_id} ended with status {state}")
+            results = safe_execute_async(self.backend.results(batch_id))
+        except Exception as e:
+            logger.error(f"BatchingProvider: Batch of {len(requests)} requests failed: {e}")
+            with self._stats_lock:
+                self.stats["failed_requests"] += len(batch)
+            for _, future in batch:
+                future.set_exception(RuntimeError(f"{self.backend.name} batch failed: {e}"))
+            return
+
+        with self._stats_lock:
+            self.stats["batches"] += 1
+            self.stats["requests"] += len(batch)
+        for request, future in batch:
+            result = results.get(request.custom_id)
+            if result is not None and result.error is None:
+                future.set_result(result.text or "")
+                continue
+            with self._stats_lock:
+                self.stats["failed_requests"] += 1
+            reason = result.error if result is not None else "missing from batch output"
+            future.set_exception(RuntimeError(f"{self.backend.name} batch request failed: {reason}"))
+
+
+def make_batch_backend(provider_name: str, model: Optional[str] = None, responder: Optional[AIProvider] = None) -> BatchBackend:
+    """Backend for 'openai', 'anthropic' or 'local' (answers through `responder`)."""
+    if provider_name == "local":
+        if responder is None:
+            raise ValueError("Local batch backend needs a responder provider")
+        return LocalBatchBackend(responder)
+    if provider_name not in ("openai", "anthropic"):
+        raise ValueError(f"Batch mode is not available for provider '{provider_name}'")
+    from backend.ai.provider_factory import ProviderFactory
+    provider = ProviderFactory.create_provider(provider_name, model=model)
+    if provider_name == "openai":
+        return OpenAIBatchBackend(provider)
+    return AnthropicBatchBackend(provider)
@@ -1,32 +1,152 @@
 import asyncio
+import atexit
 import concurrent.futures
+import contextvars
 import logging
+import threading
+from typing import Any, Coroutine, Optional
 
 logger = logging.getLogger(__name__)
 
+
+class AsyncRuntime:
+    """
+    Long-lived background event loop for all sync -> async AI calls.
+
+    Every coroutine submitted from sync code (NarrativeGenerator, FourPlaneBackbone,
+    IntelligenceEngine, dynamic extraction, AIAuthority) runs on this ONE loop.
+    Shared clients (httpx.AsyncClient in OllamaProvider, AsyncOpenAI, AsyncAnthropic)
+    are therefore bound to a loop that stays alive, so keep-alive connections are
+    actually reused instead of being orphaned by asyncio.run() teardown.
+    """
+
+    def __init__(self, name: str = "AsyncBridge"):
+        self._name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The runtime loop (started lazily)."""
+        self._ensure_started()
+        return self._loop
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def in_runtime_thread(self) -> bool:
+        """True if the caller is executing on the runtime loop thread."""
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def _ensure_started(self) -> None:
+        if self.is_running():
+            return
+        with self._lock:
+            if self.is_running():
+                return
+            loop = asyncio.new_event_loop()
+            started = threading.Event()
+
+            def _run():
+                asyncio.set_event_loop(loop)
+                loop.call_soon(started.set)
+                loop.run_forever()
+
+            thread = threading.Thread(target=_run, name=self._name, daemon=True)
+            thread.start()
+            started.wait()
+            self._loop = loop
+            self._thread = thread
+            logger.info(f"AsyncRuntime: Background event loop started ({self._name})")
+
+    def submit(self, coro: Coroutine[Any, Any, Any]) -> concurrent.futures.Future:
+        """Schedule a coroutine on the runtime loop and return a thread-safe Future."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Coroutine[Any, Any, Any], timeout: Optional[float] = None) -> Any:
+        """Run a coroutine on the runtime loop and block until it completes."""
+        if self.in_runtime_thread():
+            raise RuntimeError("AsyncRuntime.run() cannot block on its own event loop thread")
+        future = self.submit(coro)
+        try:
+            return future.result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Cancel pending tasks, stop the loop and join the thread."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop, self._thread = None, None
+        if loop is None or thread is None or not thread.is_alive():
+            return
+
+        async def _cancel_pending():
+            tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        try:
+            asyncio.run_coroutine_threadsafe(_cancel_pending(), loop).result(timeout=timeout)
+        except Exception as e:
+            logger.warning(f"AsyncRuntime: Error cancelling pending tasks: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=timeout)
+        if not thread.is_alive():
+            loop.close()
+        logger.info(f"AsyncRuntime: Background event loop stopped ({self._name})")
+
+
+# =============================================================================
+# MODULE-LEVEL HELPER
+# =============================================================================
+
+_runtime_instance: Optional[AsyncRuntime] = None
+_runtime_lock = threading.Lock()
+
+
+def get_async_runtime() -> AsyncRuntime:
+    """Get the global AsyncRuntime instance."""
+    global _runtime_instance
+    if _runtime_instance is None:
+        with _runtime_lock:
+            if _runtime_instance is None:
+                _runtime_instance = AsyncRuntime()
+    return _runtime_instance
+
+
+def shutdown_async_runtime() -> None:
+    """Stop the global AsyncRuntime (app shutdown / tests)."""
+    global _runtime_instance
+    with _runtime_lock:
+        runtime, _runtime_instance = _runtime_instance, None
+    if runtime is not None:
+        runtime.shutdown()
+
+
+atexit.register(shutdown_async_runtime)
+
+
 def safe_execute_async(coro):
     """
     Hardened bridge to run async code from sync contexts.
     Mitigates 'RuntimeError: asyncio.run() cannot be called from a running event loop'.
-    
+
     Logic:
-    1. If no loop is running in the current thread: use asyncio.run().
-    2. If a loop is running in the current thread: offload to a dedicated 
-       background thread to avoid loop conflicts and deadlocks.
+    1. Default: submit to the shared AsyncRuntime loop and block for the result.
+       This works from plain threads and from threads with their own running loop.
+    2. Re-entrant call from the runtime loop thread itself (e.g. sync code invoked
+       inside a coroutine running on the runtime): blocking would deadlock, so we
+       offload to a temporary thread with its own loop (legacy behaviour).
     """
-    try:
-        # Detect existing loop in current thread
-        loop = asyncio.get_running_loop()
-        
-        if loop.is_running():
-            # Risk 1: Loop is already active. 
-            # We offload to a temporary thread to run a new loop there.
-            # This is the safest way to block a sync function called from async 
-            # without requiring nest_asyncio.
-            with concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="AsyncBridge") as pool:
-                return pool.submit(asyncio.run, coro).result()
-    except RuntimeError:
-        # No loop in this thread, safe to use standard asyncio.run
-        pass
-    
-    return asyncio.run(coro)
+    runtime = get_async_runtime()
+
+    if runtime.in_runtime_thread():
+        logger.debug("safe_execute_async: Re-entrant call on runtime loop, using temporary loop")
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="AsyncBridge") as pool:
+            return pool.submit(contextvars.copy_context().run, asyncio.run, coro).result()
+
+    return runtime.run(coro)
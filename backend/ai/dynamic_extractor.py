@@ -1,11 +1,19 @@
+import asyncio
 import json
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import re
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+
+def _require_json_array(response: str) -> None:
+    """Cache validator: only store responses that contain a JSON object array."""
+    if not re.search(r'\[\s*\{.*\}\s*\]', response, re.DOTALL):
+        raise ValueError("no JSON array in response")
+
+
 class DynamicExtractor:
     """
     Implements the 'Dynamic Interpretation Pipeline' for schema-agnostic
@@ -15,34 +23,78 @@ class DynamicExtractor:
     with confidence scores and provenance.
     """
 
-    def __init__(self, provider):
+    # Long listings are split into overlapping segments that are extracted in
+    # parallel and merged by key, so no part of the listing is dropped
+    CHUNK_CHARS = 4000
+    CHUNK_OVERLAP = 400
+    MAX_PARALLEL_CHUNKS = 4
+
+    def __init__(
+        self,
+        provider,
+        chunk_chars: Optional[int] = None,
+        chunk_overlap: Optional[int] = None,
+        max_parallel_chunks: Optional[int] = None
+    ):
         """
         Initialize with an AIProvider instance (e.g. OpenAIProvider, OllamaProvider).
         """
         self.provider = provider
+        self.chunk_chars = chunk_chars or self.CHUNK_CHARS
+        self.chunk_overlap = min(chunk_overlap if chunk_overlap is not None else self.CHUNK_OVERLAP,
+                                 self.chunk_chars // 2)
+        self.max_parallel_chunks = max(1, max_parallel_chunks or self.MAX_PARALLEL_CHUNKS)
 
     async def extract_attributes(self, text: str) -> List[Dict[str, Any]]:
         """
         Performs the full segmentation -> extraction -> classification pipeline.
         
+        The text is split into overlapping segments which are extracted
+        concurrently (at most max_parallel_chunks provider calls at a time);
+        the per-segment attributes are merged by key.
+        
         Returns a list of attribute dictionaries matching the database schema.
         """
         if not text or len(text.strip()) < 10:
             return []
 
-        # 1. Pipeline Stage: Request extraction from LLM
-        system_prompt, user_prompt = self._build_extraction_prompts(text)
+        # 1. Pipeline Stage: Segmentation
+        chunks = self._split_text(text)
+        semaphore = asyncio.Semaphore(self.max_parallel_chunks)
+
+        async def _extract(index: int, chunk: str) -> List[Dict[str, Any]]:
+            async with semaphore:
+                part = (index + 1, len(chunks)) if len(chunks) > 1 else None
+                return await self._extract_chunk(chunk, part)
+
+        results = await asyncio.gather(*(_extract(i, c) for i, c in enumerate(chunks)))
+
+        # 4. Pipeline Stage: Merge segments
+        attributes = self._merge_attributes(results)
+        logger.info(
+            f"Successfully extracted {len(attributes)} dynamic attributes from {len(chunks)} segment(s)."
+        )
+        return attributes
+
+    async def _extract_chunk(self, text: str, part: Optional[Tuple[int, int]] = None) -> List[Dict[str, Any]]:
+        """Extract the attributes of one segment; failures yield no attributes for that segment."""
+        system_prompt, user_prompt = self._build_extraction_prompts(text, part)
         
         try:
-            # We use a lower temperature for extraction to improve reliability and enable json_mode
-            response = await self.provider.generate(
-                user_prompt, 
-                system=system_prompt,
-                temperature=0.2, 
-                json_mode=True
-            )
+            # 2. Pipeline Stage: Request extraction from LLM
+            # We use a lower temperature for extraction to improve reliability and enable json_mode.
+            # The response cache (wrapping the provider) only stores JSON arrays,
+            # so re-analysing the same listing is free.
+            from backend.ai.response_cache import cache_validation
+            with cache_validation(_require_json_array):
+                response = await self.provider.generate(
+                    user_prompt, 
+                    system=system_prompt,
+                    temperature=0.2, 
+                    json_mode=True
+                )
             
-            # 2. Pipeline Stage: Parse LLM output
+            # 3. Pipeline Stage: Parse LLM output
             if not response:
                 logger.warning("DynamicExtractor: Empty response from LLM.")
                 return []
@@ -68,14 +120,13 @@ class DynamicExtractor:
 
             extracted_data = json.loads(cleaned_response)
             
-            # 3. Pipeline Stage: Validation and Post-processing
+            # Validation and Post-processing
             valid_attributes = []
             for item in extracted_data:
                 processed = self._process_item(item, text)
                 if processed:
                     valid_attributes.append(processed)
             
-            logger.info(f"Successfully extracted {len(valid_attributes)} dynamic attributes.")
             return valid_attributes
 
         except json.JSONDecodeError as e:
@@ -85,9 +136,69 @@ class DynamicExtractor:
             logger.error(f"DynamicExtractor: Extraction pipeline error: {e}")
             return []
 
-    def _build_extraction_prompts(self, text: str) -> tuple[str, str]:
+    def _split_text(self, text: str) -> List[str]:
+        """
+        Split text into segments of at most chunk_chars, overlapping by chunk_overlap.
+        
+        Segments end at a line break (or else a space) in their last quarter
+        where possible, so attributes are rarely cut in half; an attribute
+        that is cut still appears whole in the overlap of the next segment.
+        """
+        text = text.strip()
+        if len(text) <= self.chunk_chars:
+            return [text]
+
+        chunks = []
+        start = 0
+        while start < len(text):
+            end = min(start + self.chunk_chars, len(text))
+            if end < len(text):
+                window_start = end - self.chunk_chars // 4
+                cut = text.rfind("\n", window_start, end)
+                if cut == -1:
+                    cut = text.rfind(" ", window_start, end)
+                if cut > start:
+                    end = cut
+            chunks.append(text[start:end].strip())
+            if end >= len(text):
+                break
+            start = max(end - self.chunk_overlap, start + 1)
+        return [c for c in chunks if c]
+
+    @staticmethod
+    def _merge_attributes(results: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        Deduplicate attributes of all segments by (namespace, key), confidence-weighted.
+        
+        Per namespaced key, the value with the highest summed confidence over
+        all segments wins (overlapping segments that agree reinforce each
+        other); it is reported with the best single confidence and snippet
+        for that value. The same key in two namespaces (e.g. "oppervlakte"
+        as physical and legal) stays two attributes. Keys keep the order in
+        which they were first seen.
+        """
+        by_key: Dict[Tuple[str, str], Dict[str, List[Dict[str, Any]]]] = {}
+        for attributes in results:
+            for attribute in attributes:
+                value_key = re.sub(r"\s+", " ", attribute["value"]).strip().lower()
+                slot = (attribute["namespace"], attribute["key"])
+                by_key.setdefault(slot, {}).setdefault(value_key, []).append(attribute)
+
+        merged = []
+        for candidates in by_key.values():
+            support = max(candidates.values(), key=lambda items: sum(a["confidence"] for a in items))
+            merged.append(max(support, key=lambda a: a["confidence"]))
+        return merged
+
+    def _build_extraction_prompts(
+        self,
+        text: str,
+        part: Optional[Tuple[int, int]] = None
+    ) -> tuple[str, str]:
         """
         Constructs structured prompts (system and user) for the LLM.
+        
+        part=(n, total) marks the text as one segment of a longer listing.
         """
         system_prompt = """
         You are a 'Property Data Extraction Agent' specialized in the Dutch housing market (Funda).
@@ -111,7 +222,8 @@ class DynamicExtractor:
         5. Output MUST be a valid JSON array of objects.
         """
 
-        user_prompt = f"INPUT DATA:\n---\n{text[:4000]}\n---"
+        label = f"INPUT DATA (segment {part[0]} of {part[1]} of the listing)" if part else "INPUT DATA"
+        user_prompt = f"{label}:\n---\n{text[:self.chunk_chars]}\n---"
         
         return system_prompt, user_prompt
 
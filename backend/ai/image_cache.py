@@ -0,0 +1,217 @@
+"""
+AI IMAGE CACHE - Content-addressed lookup of generated infographics
+
+GeminiImageProvider generated a fresh image on every call, although an
+unchanged registry produces the same hero prompt on every re-run of a report
+(and for every repeated listing). Each generated image is stored once, as a
+permanent asset (backend/storage/asset_store.py); this cache only remembers
+which asset a request produced, keyed by a hash of what determines the image:
+
+    model, normalized prompt, visual type, registry fields used
+
+PROPERTIES:
+- Only a lookup aid: entries are small <key>.json files holding the asset id,
+  never image bytes, so the cache does not duplicate what the asset store holds
+- Size-bounded: least-recently-used entries are deleted above max_entries
+  (file mtime is the access time, so the order survives restarts)
+- Only successful generations are stored; failures are never replayed
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import uuid
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+IMAGE_CACHE_DIR = Path(__file__).parent.parent / "static" / "generated" / "cache"
+
+_KEY_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+# Image files written by the cache before it stored asset ids
+_LEGACY_EXTENSIONS = ("png", "jpg", "webp")
+
+
+def build_image_cache_key(model: str, prompt: str, visual_type: str = "", data_used: Optional[List[str]] = None) -> str:
+    """Deterministic SHA-256 key; whitespace differences in the prompt do not matter."""
+    material = json.dumps(
+        {
+            "model": model or "",
+            "prompt": " ".join((prompt or "").split()),
+            "visual_type": visual_type or "",
+            "data_used": sorted(data_used or []),
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class CachedImage:
+    key: str
+    asset_id: str
+    mime_type: str
+    size_bytes: int
+
+
+class ImageCache:
+    """Thread-safe, disk-backed LRU map of cache key -> generated image asset."""
+
+    def __init__(self, directory: Path = IMAGE_CACHE_DIR, max_entries: int = 4096, enabled: bool = True):
+        self.directory = Path(directory)
+        self.max_entries = max(1, max_entries)
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._entries: Optional["OrderedDict[str, CachedImage]"] = None
+        self._hits = 0
+        self._misses = 0
+        self._stores = 0
+        self._evictions = 0
+
+    def _entry_path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def _index(self) -> "OrderedDict[str, CachedImage]":
+        """Entries in LRU order, loaded from the directory on first use. Caller holds self._lock."""
+        if self._entries is None:
+            found = []
+            if self.directory.exists():
+                for path in self.directory.iterdir():
+                    key, _, ext = path.name.partition(".")
+                    if not _KEY_PATTERN.match(key):
+                        continue
+                    if ext in _LEGACY_EXTENSIONS:
+                        # The image itself lives in the asset store now
+                        path.unlink(missing_ok=True)
+                        continue
+                    if ext != "json":
+                        continue
+                    try:
+                        stat = path.stat()
+                        entry = CachedImage(**json.loads(path.read_text(encoding="utf-8")))
+                    except (OSError, ValueError, TypeError) as e:
+                        logger.warning(f"ImageCache: Ignoring unreadable entry {path.name}: {e}")
+                        continue
+                    found.append((stat.st_mtime, entry))
+            self._entries = OrderedDict((e.key, e) for _mtime, e in sorted(found, key=lambda f: f[0]))
+        return self._entries
+
+    def get(self, key: str) -> Optional[CachedImage]:
+        """Cached entry for key (marked as recently used), or None."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._index().get(key)
+            path = self._entry_path(key)
+            if entry is not None and not path.exists():
+                # Removed behind our back (manual cleanup)
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry
+
+    def put(self, key: str, asset_id: str, mime_type: str = "image/png", size_bytes: int = 0) -> Optional[CachedImage]:
+        """Remember the asset a request produced; evicts least-recently-used entries above max_entries."""
+        if not self.enabled:
+            return None
+        entry = CachedImage(key, asset_id, mime_type, size_bytes)
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # Atomic: readers never see a half-written entry
+            tmp_path = self.directory / f".{key}.{uuid.uuid4().hex[:8]}.tmp"
+            tmp_path.write_text(json.dumps(asdict(entry)), encoding="utf-8")
+            os.replace(tmp_path, self._entry_path(key))
+            index = self._index()
+            index[key] = entry
+            index.move_to_end(key)
+            self._stores += 1
+            self._evict_locked()
+        return entry
+
+    def discard(self, key: str) -> None:
+        """Forget an entry (e.g. its asset no longer exists)."""
+        with self._lock:
+            self._index().pop(key, None)
+            self._entry_path(key).unlink(missing_ok=True)
+
+    def _evict_locked(self) -> None:
+        index = self._index()
+        while len(index) > self.max_entries:
+            key, _entry = index.popitem(last=False)
+            self._evictions += 1
+            self._entry_path(key).unlink(missing_ok=True)
+
+    def purge(self) -> int:
+        """Delete every cache entry (assets are kept); returns the number removed."""
+        with self._lock:
+            index = self._index()
+            removed = len(index)
+            for key in index:
+                self._entry_path(key).unlink(missing_ok=True)
+            index.clear()
+        return removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Counters and size information for the status API."""
+        with self._lock:
+            index = self._index()
+            size = sum(e.size_bytes for e in index.values())
+            entries = len(index)
+        lookups = self._hits + self._misses
+        return {
+            "enabled": self.enabled,
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "asset_bytes": size,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": round(self._hits / lookups, 3) if lookups else 0.0,
+            "stores": self._stores,
+            "evictions": self._evictions,
+        }
+
+
+# =============================================================================
+# MODULE-LEVEL HELPER
+# =============================================================================
+
+_cache_instance: Optional[ImageCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_image_cache() -> ImageCache:
+    """Get the global ImageCache instance (configured from AISettings)."""
+    global _cache_instance
+    if _cache_instance is None:
+        with _cache_lock:
+            if _cache_instance is None:
+                from backend.config.settings import get_settings
+                settings = get_settings()
+                _cache_instance = ImageCache(
+                    directory=IMAGE_CACHE_DIR,
+                    max_entries=settings.ai.image_cache_max_entries,
+                    enabled=settings.ai.image_cache_enabled,
+                )
+    return _cache_instance
+
+
+def reset_image_cache() -> None:
+    """Drop the global instance so the next call re-reads settings (for testing)."""
+    global _cache_instance
+    with _cache_lock:
+        _cache_instance = None
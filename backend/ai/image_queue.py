@@ -0,0 +1,209 @@
+"""
+AI IMAGE QUEUE - Plane A2 hero infographics off the report's critical path
+
+FourPlaneBackbone used to generate each chapter's hero infographic inline,
+so a report waited for twelve sequential image calls. Chapters now submit
+their ImageGenerationRequest here and store the hero as "pending":
+
+    chapter ──submit()──> queue ──(≤ concurrency on the AsyncRuntime loop)──> provider
+                                                                        │
+    report stored ──deliver(run_id, sink)──> sink(chapter_id, result) <─┘
+
+Results that finish before the report is stored are held until deliver()
+registers the run's sink (simulate_pipeline attaches them to the stored
+chapters). A run that is re-started or fails validation calls discard().
+
+The queue is bounded: when max_pending requests are outstanding, submit()
+returns False and the chapter generates its image inline as before.
+
+Queue state is in memory only; the run index (RunArtifactStore) lists the
+stored heroes still pending, so the API sees them with an external worker.
+A listed hero whose queue is gone (the process restarted) is orphaned;
+readers treat it as failed once the run has been idle for
+ORPHANED_AFTER_SECONDS.
+"""
+
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from backend.ai.image_provider_interface import (
+    ImageGenerationRequest,
+    ImageGenerationResult,
+    ImageGenerationStatus,
+)
+
+logger = logging.getLogger(__name__)
+
+ImageSink = Callable[[int, ImageGenerationResult], None]
+
+# Longer than a full queue of hero images takes; protects images another process is generating
+ORPHANED_AFTER_SECONDS = 15 * 60
+
+
+def image_queue_concurrency() -> int:
+    """settings.ai.image_queue_concurrency (0 = generate images inline)."""
+    try:
+        from backend.config.settings import get_settings
+        return max(0, int(get_settings().ai.image_queue_concurrency))
+    except Exception:
+        return 0
+
+
+class ImageWorkQueue:
+    """Bounded queue of hero image requests, worked off concurrently on the AsyncRuntime loop."""
+
+    MAX_PENDING = 64
+
+    def __init__(
+        self,
+        concurrency: int = 3,
+        max_pending: Optional[int] = None,
+        provider_getter: Optional[Callable[[], Any]] = None
+    ):
+        self.concurrency = max(1, concurrency)
+        self.max_pending = max_pending or self.MAX_PENDING
+        self._provider_getter = provider_getter
+        self._lock = threading.Lock()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._tasks: Dict[Tuple[str, int], Tuple[int, Future]] = {}
+        self._tickets = 0
+        self._results: Dict[str, Dict[int, ImageGenerationResult]] = {}
+        self._sinks: Dict[str, ImageSink] = {}
+        self.completed = 0
+        self.rejected = 0
+
+    def _provider(self):
+        if self._provider_getter is not None:
+            return self._provider_getter()
+        from backend.ai.image_provider_factory import get_image_provider
+        return get_image_provider()
+
+    def submit(self, run_id: str, chapter_id: int, request: ImageGenerationRequest) -> bool:
+        """Queue a chapter's hero image. False if the queue is full (generate inline)."""
+        from backend.ai.bridge import get_async_runtime
+        with self._lock:
+            if len(self._tasks) >= self.max_pending:
+                self.rejected += 1
+                logger.warning(f"ImageWorkQueue: Full ({self.max_pending}), chapter {chapter_id} generates inline")
+                return False
+            key = (run_id, chapter_id)
+            previous = self._tasks.pop(key, None)
+            if previous is not None:
+                previous[1].cancel()
+            self._tickets += 1
+            ticket = self._tickets
+            self._tasks[key] = (ticket, get_async_runtime().submit(self._generate(run_id, chapter_id, request, ticket)))
+        return True
+
+    async def _generate(self, run_id: str, chapter_id: int, request: ImageGenerationRequest, ticket: int) -> None:
+        if self._semaphore is None:
+            # Created on the runtime loop that runs all queue work
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        provider = self._provider()
+        async with self._semaphore:
+            try:
+                result = await provider.generate_image(request)
+            except Exception as e:
+                logger.error(f"ImageWorkQueue: Chapter {chapter_id} of {run_id} failed: {e}")
+                result = ImageGenerationResult(
+                    status=ImageGenerationStatus.FAILED,
+                    provider_name=getattr(provider, "provider_name", None),
+                    model_name=getattr(provider, "model_name", None),
+                    prompt=request.prompt,
+                    error_message=str(e)
+                )
+        with self._lock:
+            entry = self._tasks.get((run_id, chapter_id))
+            if entry is None or entry[0] != ticket:
+                return  # discarded or re-submitted while generating
+            del self._tasks[(run_id, chapter_id)]
+            self.completed += 1
+            sink = self._sinks.get(run_id)
+            if sink is None:
+                self._results.setdefault(run_id, {})[chapter_id] = result
+        if sink is not None:
+            await asyncio.to_thread(self._deliver_one, run_id, sink, chapter_id, result)
+        self._forget_if_done(run_id)
+
+    @staticmethod
+    def _deliver_one(run_id: str, sink: ImageSink, chapter_id: int, result: ImageGenerationResult) -> None:
+        try:
+            sink(chapter_id, result)
+        except Exception as e:
+            logger.error(f"ImageWorkQueue: Attaching image of chapter {chapter_id} to {run_id} failed: {e}")
+
+    def deliver(self, run_id: str, sink: ImageSink) -> int:
+        """
+        Route the run's results to sink: finished ones now, the rest on arrival.
+
+        Call once the report is stored. Returns the number of images still pending.
+        """
+        with self._lock:
+            ready = self._results.pop(run_id, {})
+            pending = sum(1 for (r, _c) in self._tasks if r == run_id)
+            if pending:
+                self._sinks[run_id] = sink
+        for chapter_id, result in sorted(ready.items()):
+            self._deliver_one(run_id, sink, chapter_id, result)
+        return pending
+
+    def _forget_if_done(self, run_id: str) -> None:
+        with self._lock:
+            if not any(r == run_id for (r, _c) in self._tasks):
+                self._sinks.pop(run_id, None)
+
+    def discard(self, run_id: str) -> None:
+        """Cancel the run's pending images and drop held results (re-run, invalid report)."""
+        with self._lock:
+            keys = [k for k in self._tasks if k[0] == run_id]
+            for key in keys:
+                self._tasks.pop(key)[1].cancel()
+            self._results.pop(run_id, None)
+            self._sinks.pop(run_id, None)
+
+    def tracks(self, run_id: str, chapter_id: int) -> bool:
+        """Whether this queue is generating or holding the chapter's image."""
+        with self._lock:
+            return (run_id, chapter_id) in self._tasks or chapter_id in self._results.get(run_id, {})
+
+    def pending(self, run_id: Optional[str] = None) -> int:
+        with self._lock:
+            return sum(1 for (r, _c) in self._tasks if run_id is None or r == run_id)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "concurrency": self.concurrency,
+                "pending": len(self._tasks),
+                "held_results": sum(len(r) for r in self._results.values()),
+                "completed": self.completed,
+                "rejected": self.rejected,
+            }
+
+
+# =============================================================================
+# MODULE-LEVEL HELPER
+# =============================================================================
+
+_queue_instance: Optional[ImageWorkQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_image_queue() -> ImageWorkQueue:
+    """Get the global ImageWorkQueue."""
+    global _queue_instance
+    if _queue_instance is None:
+        with _queue_lock:
+            if _queue_instance is None:
+                _queue_instance = ImageWorkQueue(concurrency=image_queue_concurrency() or 1)
+    return _queue_instance
+
+
+def reset_image_queue() -> None:
+    """Drop the global instance (for testing)."""
+    global _queue_instance
+    with _queue_lock:
+        _queue_instance = None
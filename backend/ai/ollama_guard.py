@@ -4,7 +4,28 @@ OLLAMA GUARD - Process Management for Ollama
 This module provides:
 1. Detection of lingering Ollama model processes
 2. Safe cleanup/kill functionality
-3. keep_alive=0 enforcement helper
+3. Model residency: the keep_alive value for every request
+
+RESIDENCY: Reloading a multi-GB model for every chapter dominates runtime, so
+requests ask keep_alive_for() instead of hard-coding keep_alive=0:
+
+    pipeline run active / idle window   -> keep_alive = AI_OLLAMA_KEEP_ALIVE_SECONDS
+    last active run finished            -> resident models unloaded explicitly
+    window = 0                          -> keep_alive = 0 (unload after request)
+    opt-in memory check                 -> a local server that is low on memory
+                                           first unloads idle resident models; if
+                                           none could be unloaded, a model that is
+                                           not resident yet gets keep_alive = 0
+
+The memory check (AI_OLLAMA_MIN_FREE_MEMORY_MB, off by default) reads this
+host's memory, so it only applies when Ollama runs on localhost. It never
+demotes the requested model once it is resident: that model is what uses the
+memory, and unloading it would only make the next request reload it. Other
+resident models without a request in the last IDLE_UNLOAD_SECONDS are what
+gets unloaded to make room.
+
+Ollama itself unloads a model once the idle window passes, so a crashed
+backend cannot leave a model loaded indefinitely.
 
 SAFETY: Only affects processes matching Ollama patterns.
 """
@@ -13,9 +34,11 @@ import os
 import re
 import subprocess
 import logging
+import threading
 import time
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set
 from dataclasses import dataclass, field
+from urllib.parse import urlparse
 
 logger = logging.getLogger(__name__)
 
@@ -41,6 +64,42 @@ class CleanupResult:
     success: bool = True
 
 
+@dataclass
+class ResidentModel:
+    """A model this process asked Ollama to keep loaded."""
+    model: str
+    base_url: str
+    loaded_at: float = field(default_factory=time.time)
+    last_used: float = field(default_factory=time.time)
+    requests: int = 0
+
+
+def _available_memory_mb() -> Optional[float]:
+    """Available system memory in MB, or None if it cannot be determined."""
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+_LOCAL_HOSTS = {"localhost", "127.0.0.1", "::1", "0.0.0.0"}
+
+
+def _is_local_url(url: Optional[str]) -> bool:
+    """Whether url points at this host (its memory is what /proc/meminfo reports)."""
+    try:
+        return (urlparse(url or "").hostname or "") in _LOCAL_HOSTS
+    except ValueError:
+        return False
+
+
 class OllamaGuard:
     """
     Manages Ollama process lifecycle to prevent zombie processes.
@@ -54,9 +113,133 @@ class OllamaGuard:
         r"llama\.cpp",
     ]
     
-    def __init__(self, base_url: str = "http://localhost:11434"):
+    # Resident models without a request for this long may be unloaded under memory pressure
+    IDLE_UNLOAD_SECONDS = 60.0
+    
+    def __init__(
+        self,
+        base_url: str = "http://localhost:11434",
+        keep_alive_seconds: int = 0,
+        unload_after_run: bool = True,
+        min_free_memory_mb: int = 0
+    ):
         self.base_url = base_url
+        self.keep_alive_seconds = max(0, keep_alive_seconds)
+        self.unload_after_run = unload_after_run
+        self.min_free_memory_mb = min_free_memory_mb
         self._last_cleanup: Optional[CleanupResult] = None
+        self._lock = threading.Lock()
+        self._active_runs: Set[str] = set()
+        self._resident: Dict[str, ResidentModel] = {}
+    
+    # =========================================================================
+    # RESIDENCY
+    # =========================================================================
+    
+    def memory_pressure(self, base_url: Optional[str] = None) -> bool:
+        """
+        True when a local Ollama host has less than min_free_memory_mb free.
+
+        0 disables the check; a remote server (other host or container) is
+        never considered under pressure, since its memory is not visible here.
+        """
+        if self.min_free_memory_mb <= 0 or not _is_local_url(base_url or self.base_url):
+            return False
+        available = _available_memory_mb()
+        return available is not None and available < self.min_free_memory_mb
+    
+    def keep_alive_for(self, model: str, base_url: Optional[str] = None) -> int:
+        """Sync variant of keep_alive_for_async()."""
+        from backend.ai.bridge import safe_execute_async
+        return safe_execute_async(self.keep_alive_for_async(model, base_url=base_url))
+    
+    async def keep_alive_for_async(self, model: str, base_url: Optional[str] = None) -> int:
+        """
+        keep_alive (seconds) for the next request on model.
+        
+        0 unloads the model right after the request (the pre-residency behaviour).
+        Under memory pressure, idle resident models are unloaded before model
+        is made resident.
+        """
+        if self.keep_alive_seconds <= 0:
+            return 0
+        with self._lock:
+            resident = model in self._resident
+        if not resident and self.memory_pressure(base_url):
+            unloaded = await self._unload_idle_models(exclude=model)
+            if not unloaded:
+                logger.warning(f"OllamaGuard: Memory pressure - {model} is unloaded after this request")
+                return 0
+            logger.warning(f"OllamaGuard: Memory pressure - unloaded idle models {unloaded} for {model}")
+        now = time.time()
+        with self._lock:
+            entry = self._resident.get(model)
+            if entry is None:
+                entry = self._resident[model] = ResidentModel(model=model, base_url=base_url or self.base_url)
+            entry.last_used = now
+            entry.requests += 1
+        return self.keep_alive_seconds
+    
+    async def _unload_idle_models(self, exclude: str) -> List[str]:
+        """Unload resident models (other than exclude) idle for IDLE_UNLOAD_SECONDS. Returns their names."""
+        cutoff = time.time() - self.IDLE_UNLOAD_SECONDS
+        with self._lock:
+            idle = [r for r in self._resident.values() if r.model != exclude and r.last_used <= cutoff]
+        unloaded: List[str] = []
+        for entry in idle:
+            if await self.unload_model(entry.model, base_url=entry.base_url):
+                unloaded.append(entry.model)
+        return unloaded
+    
+    def begin_run(self, run_id: str) -> None:
+        """Keep resident models loaded until end_run() of the last active run."""
+        with self._lock:
+            self._active_runs.add(run_id)
+    
+    def end_run(self, run_id: str) -> List[str]:
+        """
+        Mark a run finished. When no other run is active, unload the models it
+        kept resident. Returns the unloaded model names.
+        """
+        with self._lock:
+            self._active_runs.discard(run_id)
+            if self._active_runs or not self.unload_after_run or not self._resident:
+                return []
+            resident = list(self._resident.values())
+            self._resident.clear()
+        
+        from backend.ai.bridge import safe_execute_async
+        unloaded: List[str] = []
+        for entry in resident:
+            try:
+                if safe_execute_async(self.unload_model(entry.model, base_url=entry.base_url)):
+                    unloaded.append(entry.model)
+            except Exception as e:
+                logger.warning(f"OllamaGuard: Unload of {entry.model} after run {run_id} failed: {e}")
+        return unloaded
+    
+    def get_residency(self) -> Dict[str, Any]:
+        """Resident models and active runs (no process scan)."""
+        with self._lock:
+            return {
+                "keep_alive_seconds": self.keep_alive_seconds,
+                "unload_after_run": self.unload_after_run,
+                "min_free_memory_mb": self.min_free_memory_mb,
+                "active_runs": len(self._active_runs),
+                "models": [
+                    {
+                        "model": r.model,
+                        "loaded_at": r.loaded_at,
+                        "last_used": r.last_used,
+                        "requests": r.requests,
+                    }
+                    for r in self._resident.values()
+                ],
+            }
+    
+    # =========================================================================
+    # PROCESS CONTROL
+    # =========================================================================
     
     def detect_processes(self) -> List[OllamaProcess]:
         """
@@ -120,18 +303,21 @@ class OllamaGuard:
         
         return processes
     
-    async def unload_model(self, model_name: str) -> bool:
+    async def unload_model(self, model_name: str, base_url: Optional[str] = None) -> bool:
         """
         Explicitly unload a model from Ollama server.
         Uses keep_alive=0 approach.
         """
         import httpx
         
+        with self._lock:
+            self._resident.pop(model_name, None)
+        
         try:
             async with httpx.AsyncClient(timeout=10.0) as client:
                 # Send a generate request with keep_alive=0 to unload
                 response = await client.post(
-                    f"{self.base_url}/api/generate",
+                    f"{base_url or self.base_url}/api/generate",
                     json={
                         "model": model_name,
                         "prompt": "",
@@ -281,6 +467,7 @@ class OllamaGuard:
                 "success": self._last_cleanup.success if self._last_cleanup else None,
                 "processes_killed": self._last_cleanup.processes_killed if self._last_cleanup else [],
             } if self._last_cleanup else None,
+            "residency": self.get_residency(),
         }
 
 
@@ -289,13 +476,29 @@ class OllamaGuard:
 # =============================================================================
 
 _guard_instance: Optional[OllamaGuard] = None
+_guard_lock = threading.Lock()
 
 
 def get_ollama_guard() -> OllamaGuard:
-    """Get the global OllamaGuard instance."""
+    """Get the global OllamaGuard instance (residency configured from AISettings)."""
     global _guard_instance
     if _guard_instance is None:
-        from backend.ai.ai_authority import get_ai_authority
-        base_url = get_ai_authority().get_ollama_base_url()
-        _guard_instance = OllamaGuard(base_url=base_url)
+        with _guard_lock:
+            if _guard_instance is None:
+                from backend.ai.ai_authority import get_ai_authority
+                from backend.config.settings import get_settings
+                ai = get_settings().ai
+                _guard_instance = OllamaGuard(
+                    base_url=get_ai_authority().get_ollama_base_url(),
+                    keep_alive_seconds=ai.ollama_keep_alive_seconds,
+                    unload_after_run=ai.ollama_unload_after_run,
+                    min_free_memory_mb=ai.ollama_min_free_memory_mb,
+                )
     return _guard_instance
+
+
+def reset_ollama_guard() -> None:
+    """Drop the global instance so the next call re-reads settings (for testing)."""
+    global _guard_instance
+    with _guard_lock:
+        _guard_instance = None
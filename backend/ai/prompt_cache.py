@@ -0,0 +1,96 @@
+"""
+AI PROMPT CACHE - Provider-side caching of the shared prompt prefix
+
+Every chapter call of a run starts with the same large prefix: the narrative
+system prompt plus the household preference block (NarrativeGenerator puts
+both in `system`; only the chapter context goes in `prompt`). Providers can
+reuse that prefix instead of processing it again:
+
+    anthropic  system sent as a text block with cache_control (ephemeral)
+    openai     automatic prefix caching; prompt_cache_key routes requests
+               with the same prefix to the same cache
+    ollama     the server reuses the KV cache of a resident model for an
+               identical leading system prompt (residency: ollama_guard.py)
+
+Cache hits are reported per provider in /api/ai/runtime-status.
+"""
+
+import hashlib
+import threading
+from typing import Any, Dict, Optional
+
+
+def prompt_caching_enabled() -> bool:
+    try:
+        from backend.config.settings import get_settings
+        return get_settings().ai.prompt_caching
+    except Exception:
+        return False
+
+
+def prefix_cache_key(system: str) -> str:
+    """Stable routing key for requests sharing the same system prefix."""
+    return "prefix-" + hashlib.sha256(system.encode("utf-8")).hexdigest()[:24]
+
+
+# =============================================================================
+# COUNTERS (runtime status)
+# =============================================================================
+
+_stats_lock = threading.Lock()
+_stats: Dict[str, Dict[str, int]] = {}
+
+
+def _as_int(value: Any) -> int:
+    return value if isinstance(value, int) else 0
+
+
+def record_usage(provider: str, input_tokens: Any, cached_tokens: Any, cache_write_tokens: Any = 0) -> None:
+    """Count prompt tokens of one call and how many were served from the provider cache."""
+    input_tokens, cached_tokens, cache_write_tokens = (
+        _as_int(input_tokens), _as_int(cached_tokens), _as_int(cache_write_tokens)
+    )
+    if not (input_tokens or cached_tokens or cache_write_tokens):
+        return
+    with _stats_lock:
+        entry = _stats.setdefault(provider, {
+            "requests": 0, "input_tokens": 0, "cached_tokens": 0, "cache_write_tokens": 0, "cache_hits": 0
+        })
+        entry["requests"] += 1
+        entry["input_tokens"] += input_tokens
+        entry["cached_tokens"] += cached_tokens
+        entry["cache_write_tokens"] += cache_write_tokens
+        if cached_tokens:
+            entry["cache_hits"] += 1
+
+
+def get_prompt_cache_stats() -> Dict[str, Any]:
+    with _stats_lock:
+        providers = {name: dict(entry) for name, entry in _stats.items()}
+    for entry in providers.values():
+        total = entry["input_tokens"]
+        entry["cached_ratio"] = round(entry["cached_tokens"] / total, 3) if total else 0.0
+    return {"enabled": prompt_caching_enabled(), "providers": providers}
+
+
+def reset_prompt_cache_stats() -> None:
+    """Clear the counters (for testing)."""
+    with _stats_lock:
+        _stats.clear()
+
+
+def anthropic_usage(usage: Optional[Any]) -> None:
+    """Record a Messages API usage object (input_tokens excludes cached tokens)."""
+    if usage is None:
+        return
+    cached = _as_int(getattr(usage, "cache_read_input_tokens", 0))
+    written = _as_int(getattr(usage, "cache_creation_input_tokens", 0))
+    record_usage("anthropic", _as_int(getattr(usage, "input_tokens", 0)) + cached + written, cached, written)
+
+
+def openai_usage(usage: Optional[Any]) -> None:
+    """Record a chat completion usage object (prompt_tokens includes cached tokens)."""
+    if usage is None:
+        return
+    details = getattr(usage, "prompt_tokens_details", None)
+    record_usage("openai", getattr(usage, "prompt_tokens", 0), getattr(details, "cached_tokens", 0))
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, List, Dict, Any, Optional
 
 class AIProvider(ABC):
     """
@@ -36,6 +36,34 @@ class AIProvider(ABC):
         """
         pass
 
+    async def generate_stream(
+        self,
+        prompt: str,
+        *,
+        model: Optional[str] = None,
+        system: str = "",
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+        json_mode: bool = False,
+        images: Optional[List[str]] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream the completion as text chunks (same arguments as generate).
+
+        Concatenating all chunks gives the same string generate() would return.
+        The default implementation yields the full response as one chunk, so
+        providers without native streaming still work with streaming callers.
+        """
+        yield await self.generate(
+            prompt,
+            model=model,
+            system=system,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            json_mode=json_mode,
+            images=images
+        )
+
     @abstractmethod
     async def check_health(self) -> bool:
         """
@@ -0,0 +1,175 @@
+"""
+AI PROVIDER REGISTRY - One warm provider instance per configuration
+
+AIAuthority used to construct a new provider (and SDK client) on every
+init_ai_provider() call: at each pipeline start, /api/ai/status and saved
+preferences. The registry keeps one instance per
+
+    (provider, model, credential fingerprint)
+
+so clients and their connection pools are reused across runs. A changed key
+or model simply maps to a new entry; the old one stays valid for runs that
+still hold it. Saving AI settings (reload_ai_provider() in main.py) evicts
+the superseded entries so the registry does not keep their clients alive.
+
+Runs do not read the process-wide provider while they execute: the pipeline
+resolves a ProviderHandle once (provider_scope() around the run) and the
+spine carries it in PipelineContext, so a settings change during a run
+cannot swap the provider under it.
+"""
+
+import contextvars
+import hashlib
+import logging
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def credential_fingerprint(credential: Optional[str]) -> str:
+    """Short, non-reversible identifier of an API key or base URL."""
+    if not credential:
+        return "none"
+    return hashlib.sha256(credential.encode("utf-8")).hexdigest()[:12]
+
+
+@dataclass(frozen=True)
+class ProviderHandle:
+    """Immutable reference to a registered provider instance."""
+    provider_name: str
+    model: str
+    fingerprint: str
+    provider: Any = field(compare=False, repr=False)
+
+    @property
+    def key(self) -> Tuple[str, str, str]:
+        return (self.provider_name, self.model, self.fingerprint)
+
+    @classmethod
+    def wrap(cls, provider: Any) -> "ProviderHandle":
+        """Handle for a provider that was built outside the registry (tools, tests)."""
+        return cls(
+            provider_name=str(getattr(provider, "name", type(provider).__name__)),
+            model=str(getattr(provider, "default_model", None) or ""),
+            fingerprint="external",
+            provider=provider,
+        )
+
+
+class ProviderRegistry:
+    """Thread-safe cache of provider instances keyed by provider, model and credential."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._handles: Dict[Tuple[str, str, str], ProviderHandle] = {}
+        self.hits = 0
+        self.created = 0
+
+    def get(
+        self,
+        provider_name: str,
+        model: Optional[str],
+        credential: Optional[str],
+        factory: Callable[[], Any]
+    ) -> ProviderHandle:
+        """Registered handle for this configuration; `factory` builds the provider on first use."""
+        key = (provider_name, model or "", credential_fingerprint(credential))
+        with self._lock:
+            handle = self._handles.get(key)
+            if handle is not None:
+                self.hits += 1
+                return handle
+            # Built under the lock: concurrent first calls must not create two clients
+            handle = ProviderHandle(*key, provider=factory())
+            self._handles[key] = handle
+            self.created += 1
+        logger.info(f"ProviderRegistry: Created {provider_name}/{key[1]} (key {key[2]})")
+        return handle
+
+    def evict(self, provider_name: Optional[str] = None, keep: Optional[ProviderHandle] = None) -> int:
+        """
+        Forget registered providers (all, or those of one provider), except `keep`.
+
+        Runs holding an evicted handle keep using it; only new lookups build
+        a fresh instance. Returns the number of evicted entries.
+        """
+        with self._lock:
+            keys = [
+                k for k in self._handles
+                if (provider_name is None or k[0] == provider_name)
+                and (keep is None or k != keep.key)
+            ]
+            for key in keys:
+                del self._handles[key]
+        return len(keys)
+
+    async def close_all(self) -> None:
+        """Close every registered provider's client and empty the registry (shutdown)."""
+        with self._lock:
+            handles = list(self._handles.values())
+            self._handles.clear()
+        for handle in handles:
+            try:
+                await handle.provider.close()
+            except Exception as e:
+                logger.warning(f"ProviderRegistry: Closing {handle.provider_name}/{handle.model} failed: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = [
+                {"provider": h.provider_name, "model": h.model, "key": h.fingerprint}
+                for h in self._handles.values()
+            ]
+        return {"entries": entries, "created": self.created, "hits": self.hits}
+
+
+_current_handle: contextvars.ContextVar[Optional[ProviderHandle]] = contextvars.ContextVar(
+    "ai_provider_handle", default=None
+)
+
+
+@contextmanager
+def provider_scope(handle: Optional[ProviderHandle]) -> Iterator[Optional[ProviderHandle]]:
+    """
+    Make `handle` the provider of everything called inside the block.
+
+    PipelineSpine picks it up when no handle is passed explicitly; spine
+    worker threads and the async bridge copy the context.
+    """
+    token = _current_handle.set(handle)
+    try:
+        yield handle
+    finally:
+        _current_handle.reset(token)
+
+
+def current_provider_handle() -> Optional[ProviderHandle]:
+    return _current_handle.get()
+
+
+# =============================================================================
+# MODULE-LEVEL HELPER
+# =============================================================================
+
+_registry_instance: Optional[ProviderRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_provider_registry() -> ProviderRegistry:
+    """Get the global ProviderRegistry."""
+    global _registry_instance
+    if _registry_instance is None:
+        with _registry_lock:
+            if _registry_instance is None:
+                _registry_instance = ProviderRegistry()
+    return _registry_instance
+
+
+def reset_provider_registry() -> None:
+    """Drop the global instance (for testing)."""
+    global _registry_instance
+    with _registry_lock:
+        _registry_instance = None
@@ -2,10 +2,12 @@ import os
 import logging
 import base64
 import mimetypes
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, List, Dict, Any, Optional
 from anthropic import AsyncAnthropic
 
 from ..provider_interface import AIProvider
+from ..prompt_cache import anthropic_usage, prompt_caching_enabled
+from ..rate_limiter import estimate_tokens, get_rate_limiter
 
 logger = logging.getLogger(__name__)
 
@@ -45,6 +47,62 @@ class AnthropicProvider(AIProvider):
         """
         Refactored Anthropic generation using Claude 3 Messages API.
         """
+        params = self._build_params(prompt, model, system, temperature, max_tokens, json_mode, images)
+
+        try:
+            logger.info(f"Anthropic Request: model={params['model']}")
+            async with get_rate_limiter().admit(self.name, params["model"], estimate_tokens(prompt, system)) as ticket:
+                response = await self.client.messages.create(**params)
+                
+                # Concatenate text blocks
+                full_text = "".join([block.text for block in response.content if hasattr(block, 'text')])
+                ticket.record_output(full_text)
+                anthropic_usage(getattr(response, "usage", None))
+            return full_text
+            
+        except Exception as e:
+            logger.error(f"Anthropic Generation Error: {e}")
+            raise RuntimeError(f"Anthropic failed: {str(e)}") from e
+
+    async def generate_stream(
+        self,
+        prompt: str,
+        *,
+        model: Optional[str] = None,
+        system: str = "",
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+        json_mode: bool = False,
+        images: Optional[List[str]] = None
+    ) -> AsyncIterator[str]:
+        """Stream text deltas via the Messages streaming API."""
+        params = self._build_params(prompt, model, system, temperature, max_tokens, json_mode, images)
+
+        try:
+            logger.info(f"Anthropic Stream Request: model={params['model']}")
+            async with get_rate_limiter().admit(self.name, params["model"], estimate_tokens(prompt, system)) as ticket:
+                async with self.client.messages.stream(**params) as stream:
+                    async for text in stream.text_stream:
+                        if text:
+                            ticket.record_output(text)
+                            yield text
+                    final = await stream.get_final_message()
+                    anthropic_usage(getattr(final, "usage", None))
+        except Exception as e:
+            logger.error(f"Anthropic Streaming Error: {e}")
+            raise RuntimeError(f"Anthropic failed: {str(e)}") from e
+
+    def _build_params(
+        self,
+        prompt: str,
+        model: Optional[str],
+        system: str,
+        temperature: float,
+        max_tokens: int,
+        json_mode: bool,
+        images: Optional[List[str]]
+    ) -> Dict[str, Any]:
+        """Messages API parameters shared by generate and generate_stream."""
         selected_model = model or self.default_model
         
         # Mapping simple names to full versions if needed
@@ -86,35 +144,33 @@ class AnthropicProvider(AIProvider):
         # Add text prompt
         content.append({"type": "text", "text": prompt})
 
-        try:
-            logger.info(f"Anthropic Request: model={actual_model}")
-            
-            # Note: Anthropic handles 'system' as a top-level param, not in messages
-            params = {
-                "model": actual_model,
-                "max_tokens": max_tokens,
-                "temperature": temperature,
-                "system": system if system else None,
-                "messages": [{"role": "user", "content": content}]
-            }
-
-            # Claude doesn't have a native 'json_mode' flag like OpenAI, 
-            # so we enforce it via the system prompt and instructions.
-            if json_mode:
-                if params["system"]:
-                    params["system"] += "\nReturn only valid JSON."
-                else:
-                    params["system"] = "Return only valid JSON."
-
-            response = await self.client.messages.create(**params)
-            
-            # Concatenate text blocks
-            full_text = "".join([block.text for block in response.content if hasattr(block, 'text')])
-            return full_text
-            
-        except Exception as e:
-            logger.error(f"Anthropic Generation Error: {e}")
-            raise RuntimeError(f"Anthropic failed: {str(e)}")
+        # Note: Anthropic handles 'system' as a top-level param, not in messages
+        params = {
+            "model": actual_model,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "system": system if system else None,
+            "messages": [{"role": "user", "content": content}]
+        }
+
+        # Claude doesn't have a native 'json_mode' flag like OpenAI, 
+        # so we enforce it via the system prompt and instructions.
+        if json_mode:
+            if params["system"]:
+                params["system"] += "\nReturn only valid JSON."
+            else:
+                params["system"] = "Return only valid JSON."
+
+        # Prompt caching: the system prompt is the prefix shared by every
+        # chapter of a run; later calls read it from the cache
+        if params["system"] and prompt_caching_enabled():
+            params["system"] = [{
+                "type": "text",
+                "text": params["system"],
+                "cache_control": {"type": "ephemeral"}
+            }]
+
+        return params
 
     def list_models(self) -> List[str]:
         return ["claude-3-5-sonnet-20241022", "claude-3-5-sonnet-20240620", "claude-3-opus-20240229", "claude-3-sonnet-20240229", "claude-3-haiku-20240307"]
@@ -12,9 +12,11 @@ FAIL-LOUD: All errors return explicit status, never silent failure.
 """
 
 import os
+import asyncio
 import logging
 import base64
 import uuid
+import weakref
 from pathlib import Path
 from typing import Optional, Dict, Any
 
@@ -27,6 +29,9 @@ from backend.ai.image_provider_interface import (
     ImageGenerationResult,
     ImageGenerationStatus,
 )
+from backend.ai.image_cache import CachedImage, ImageCache, build_image_cache_key, get_image_cache
+from backend.storage.asset_store import ASSET_URL_PREFIX, get_asset_store
+from backend.ai.rate_limiter import get_rate_limiter
 
 logger = logging.getLogger(__name__)
 
@@ -98,6 +103,10 @@ class GeminiImageProvider(ImageGenerationProvider):
         self._runtime_model = self.MODEL_ID_MAPPING.get(config_model, config_model)
         self.save_to_disk = save_to_disk
         self.client = None
+        # One request client per event loop (aio transports are bound to their loop)
+        self._loop_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, genai.Client]" = (
+            weakref.WeakKeyDictionary()
+        )
         
         if self.api_key:
             try:
@@ -185,30 +194,44 @@ class GeminiImageProvider(ImageGenerationProvider):
                 }
             )
         
+        # Build the generation prompt
+        full_prompt = self._build_image_prompt(request)
+        
+        # Unchanged registry → same prompt → reuse the stored image asset (no quota spent)
+        cache = get_image_cache()
+        cache_key = build_image_cache_key(
+            self._runtime_model, full_prompt, request.visual_type, request.data_used
+        )
+        cached = cache.get(cache_key) if self.save_to_disk else None
+        if cached is not None:
+            asset = self._cached_asset(cached)
+            if asset is not None:
+                logger.info(f"GeminiImageProvider: Cache hit for {request.visual_type} ({cache_key[:12]})")
+                return self._cached_result(request, asset)
+            cache.discard(cache_key)
+        
         try:
             logger.info(f"Generating image: type={request.visual_type}, data_fields={len(request.data_used)}")
             
-            # Build the generation prompt
-            full_prompt = self._build_image_prompt(request)
-            
             # Configure for image generation
             config = types.GenerateContentConfig(
                 response_modalities=["TEXT", "IMAGE"],
                 temperature=0.7,
             )
             
-            # Create a FRESH client for this request to avoid event loop/transport issues
-            # across threads (since this runs in safe_execute_async)
-            local_client = genai.Client(api_key=self.api_key)
+            # Client of the running loop: avoids event loop/transport issues across
+            # threads (safe_execute_async) without a new client per request
+            local_client = self._client_for_running_loop()
             
             logger.info(f"GeminiImageProvider: Generating with runtime model {self._runtime_model} (mapped from {self._model})")
             
-            # Generate content
-            response = await local_client.aio.models.generate_content(
-                model=self._runtime_model,
-                contents=full_prompt,
-                config=config,
-            )
+            # Generate content (queued by the rate limiter instead of hitting 429 / QUOTA_EXCEEDED)
+            async with get_rate_limiter().admit(self.provider_name, self._runtime_model):
+                response = await local_client.aio.models.generate_content(
+                    model=self._runtime_model,
+                    contents=full_prompt,
+                    config=config,
+                )
             
             # Extract image from response
             image_data = None
@@ -236,16 +259,17 @@ class GeminiImageProvider(ImageGenerationProvider):
                     }
                 )
             
-            # Save to disk if configured
+            # Save to disk if configured: a permanent asset, which the cache points to
             image_uri = None
             image_base64 = None
             
             if self.save_to_disk:
-                image_uri = await self._save_image(image_data, request, mime_type)
+                image_uri = await self._persist_image(image_data, request, mime_type)
             else:
                 image_base64 = base64.b64encode(image_data).decode('utf-8')
             
             logger.info(f"Image generated successfully: uri={image_uri}")
+            self._remember(cache, cache_key, image_uri, mime_type, len(image_data))
             
             # Capability Reporting - Success
             from backend.ai.capability_manager import get_capability_manager, CapabilityState
@@ -309,6 +333,56 @@ class GeminiImageProvider(ImageGenerationProvider):
                 }
             )
     
+    def _client_for_running_loop(self) -> "genai.Client":
+        loop = asyncio.get_running_loop()
+        client = self._loop_clients.get(loop)
+        if client is None:
+            client = genai.Client(api_key=self.api_key)
+            self._loop_clients[loop] = client
+        return client
+    
+    @staticmethod
+    def _cached_asset(cached: CachedImage) -> Optional[Dict[str, Any]]:
+        """The asset a cache entry points to, or None if it is gone."""
+        try:
+            store = get_asset_store()
+            asset = store.get(cached.asset_id)
+            if asset is not None:
+                # Not referenced by this run's report yet: keep it out of garbage collection
+                store.touch(cached.asset_id)
+            return asset
+        except Exception as e:
+            logger.warning(f"GeminiImageProvider: Reading cached asset {cached.asset_id} failed: {e}")
+            return None
+    
+    @staticmethod
+    def _remember(cache: ImageCache, cache_key: str, image_uri: Optional[str], mime_type: str, size_bytes: int) -> None:
+        """Point the cache at the stored asset. A cache failure never fails the (paid) generation."""
+        if not image_uri or not image_uri.startswith(ASSET_URL_PREFIX):
+            return  # inline or fallback static file: nothing to point to
+        try:
+            cache.put(cache_key, image_uri[len(ASSET_URL_PREFIX):], mime_type, size_bytes)
+        except Exception as e:
+            logger.warning(f"GeminiImageProvider: Storing cache entry {cache_key[:12]} failed: {e}")
+    
+    def _cached_result(self, request: ImageGenerationRequest, asset: Dict[str, Any]) -> ImageGenerationResult:
+        """GENERATED result for a cache hit: the image's existing asset."""
+        return ImageGenerationResult(
+            status=ImageGenerationStatus.GENERATED,
+            provider_name=self.provider_name,
+            model_name=self.model_name,
+            prompt=request.prompt,
+            image_uri=asset["url"],
+            generation_metadata={
+                "visual_type": request.visual_type,
+                "data_used": request.data_used,
+                "title": request.title,
+                "insight_summary": request.insight_summary,
+                "mime_type": asset["mime_type"],
+                "cache": "hit",
+            }
+        )
+    
     def _build_image_prompt(self, request: ImageGenerationRequest) -> str:
         """Build a detailed prompt for image generation."""
         prompt_parts = [
@@ -331,6 +405,14 @@ class GeminiImageProvider(ImageGenerationProvider):
         
         return "\n".join(p for p in prompt_parts if p)
     
+    async def _persist_image(self, image_data: bytes, request: ImageGenerationRequest, mime_type: str) -> str:
+        """Store the image as a content-hashed asset and return its /api/assets URL."""
+        try:
+            return get_asset_store().put(image_data, mime_type, source="gemini_image")["url"]
+        except Exception as e:
+            logger.warning(f"GeminiImageProvider: Storing image asset failed, saving to static: {e}")
+            return await self._save_image(image_data, request, mime_type)
+    
     async def _save_image(
         self,
         image_data: bytes,
@@ -1,11 +1,12 @@
 import os
 import logging
 import base64
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
 from google import genai
 from google.genai import types
 
 from ..provider_interface import AIProvider
+from ..rate_limiter import estimate_tokens, get_rate_limiter
 
 logger = logging.getLogger(__name__)
 
@@ -48,6 +49,69 @@ class GeminiProvider(AIProvider):
         """
         Unified generation using google.genai SDK.
         """
+        actual_model, contents, config = self._build_request(
+            prompt, model, system, temperature, max_tokens, json_mode, images
+        )
+
+        try:
+            logger.info(f"Gemini Request: model={actual_model}")
+            async with get_rate_limiter().admit(self.name, actual_model, estimate_tokens(prompt, system)) as ticket:
+                response = await self.client.aio.models.generate_content(
+                    model=actual_model,
+                    contents=contents,
+                    config=config
+                )
+                text = response.text or ""
+                ticket.record_output(text)
+            return text
+            
+        except Exception as e:
+            logger.error(f"Gemini Generation Error: {e}")
+            raise RuntimeError(f"Gemini failed: {str(e)}") from e
+
+    async def generate_stream(
+        self,
+        prompt: str,
+        *,
+        model: Optional[str] = None,
+        system: str = "",
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+        json_mode: bool = False,
+        images: Optional[List[str]] = None
+    ) -> AsyncIterator[str]:
+        """Stream text chunks via generate_content_stream."""
+        actual_model, contents, config = self._build_request(
+            prompt, model, system, temperature, max_tokens, json_mode, images
+        )
+
+        try:
+            logger.info(f"Gemini Stream Request: model={actual_model}")
+            async with get_rate_limiter().admit(self.name, actual_model, estimate_tokens(prompt, system)) as ticket:
+                stream = await self.client.aio.models.generate_content_stream(
+                    model=actual_model,
+                    contents=contents,
+                    config=config
+                )
+                async for chunk in stream:
+                    if chunk.text:
+                        ticket.record_output(chunk.text)
+                        yield chunk.text
+        except Exception as e:
+            logger.error(f"Gemini Streaming Error: {e}")
+            raise RuntimeError(f"Gemini failed: {str(e)}") from e
+
+    def _build_request(
+        self,
+        prompt: str,
+        model: Optional[str],
+        system: str,
+        temperature: float,
+        max_tokens: int,
+        json_mode: bool,
+        images: Optional[List[str]]
+    ) -> Tuple[str, List[Any], "types.GenerateContentConfig"]:
+        """Model id, content parts and config shared by generate and generate_stream."""
         selected_model = model or self.default_model
         
         # Map user-friendly names to actual model IDs if necessary
@@ -89,24 +153,7 @@ class GeminiProvider(AIProvider):
             response_mime_type="application/json" if json_mode else "text/plain",
         )
 
-        try:
-            logger.info(f"Gemini Request: model={actual_model}")
-            # The google-genai SDK generate_content is synchronous by default in many beta versions, 
-            # but we use it correctly as per latest docs or wrap if needed. 
-            # Assuming the user wants async-safe behavior.
-            
-            # Using the async client if available or proper awaitable
-            response = await self.client.aio.models.generate_content(
-                model=actual_model,
-                contents=contents,
-                config=config
-            )
-            
-            return response.text or ""
-            
-        except Exception as e:
-            logger.error(f"Gemini Generation Error: {e}")
-            raise RuntimeError(f"Gemini failed: {str(e)}")
+        return actual_model, contents, config
 
     def list_models(self) -> List[str]:
         return ["gemini-1.5-flash", "gemini-1.5-pro", "gemini-3-fast", "gemini-3-pro", "gemini-3-thinking"]
@@ -1,10 +1,13 @@
+import asyncio
 import httpx
 import os
 import logging
 import base64
-from typing import List, Dict, Any, Optional
+import json
+from typing import AsyncIterator, List, Dict, Any, Optional
 
 from ..provider_interface import AIProvider
+from ..rate_limiter import get_rate_limiter
 
 logger = logging.getLogger(__name__)
 
@@ -57,14 +60,85 @@ class OllamaProvider(AIProvider):
         json_mode: bool = False,
         images: Optional[List[str]] = None
     ) -> str:
+        payload = await self._build_payload(
+            prompt, model, system, temperature, max_tokens, json_mode, images, stream=False
+        )
+
+        try:
+            client = await self._get_client()
+            async with get_rate_limiter().admit(self.name, payload["model"]):
+                response = await client.post(self.generate_endpoint, json=payload)
+            response.raise_for_status()
+            return response.json().get("response", "")
+        except Exception as e:
+            logger.error(f"Ollama generation failed: {e}")
+            raise RuntimeError(f"Ollama failed: {str(e)}") from e
+
+    async def generate_stream(
+        self,
+        prompt: str,
+        *,
+        model: Optional[str] = None,
+        system: str = "",
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+        json_mode: bool = False,
+        images: Optional[List[str]] = None
+    ) -> AsyncIterator[str]:
+        """Stream /api/generate output (newline-delimited JSON, one object per chunk)."""
+        payload = await self._build_payload(
+            prompt, model, system, temperature, max_tokens, json_mode, images, stream=True
+        )
+
+        try:
+            client = await self._get_client()
+            async with get_rate_limiter().admit(self.name, payload["model"]):
+                async with client.stream("POST", self.generate_endpoint, json=payload) as response:
+                    response.raise_for_status()
+                    async for line in response.aiter_lines():
+                        if not line.strip():
+                            continue
+                        chunk = json.loads(line)
+                        if chunk.get("error"):
+                            raise RuntimeError(chunk["error"])
+                        if chunk.get("response"):
+                            yield chunk["response"]
+                        if chunk.get("done"):
+                            break
+        except Exception as e:
+            logger.error(f"Ollama streaming failed: {e}")
+            raise RuntimeError(f"Ollama failed: {str(e)}") from e
+
+    async def _keep_alive(self, model: str) -> int:
+        """keep_alive from the residency manager; unload immediately if it is unavailable."""
+        try:
+            from backend.ai.ollama_guard import get_ollama_guard
+            return await get_ollama_guard().keep_alive_for_async(model, base_url=self.base_url)
+        except Exception as e:
+            logger.warning(f"Ollama residency unavailable, unloading after request: {e}")
+            return 0
+
+    async def _build_payload(
+        self,
+        prompt: str,
+        model: Optional[str],
+        system: str,
+        temperature: float,
+        max_tokens: int,
+        json_mode: bool,
+        images: Optional[List[str]],
+        stream: bool
+    ) -> Dict[str, Any]:
+        """/api/generate request body shared by generate and generate_stream."""
         selected_model = model or self.default_model
         
         payload = {
             "model": selected_model,
             "prompt": prompt,
             "system": system,
-            "stream": False,
-            "keep_alive": 0,  # CRITICAL: Unload model after request to prevent zombie processes
+            "stream": stream,
+            # Residency: stay loaded across a run; 0 (unload now) when disabled or memory is low
+            "keep_alive": await self._keep_alive(selected_model),
             "options": {
                 "temperature": temperature,
                 "num_predict": max_tokens
@@ -75,30 +149,28 @@ class OllamaProvider(AIProvider):
             payload["format"] = "json"
 
         if images:
-            b64_images = []
             client_ref = await self._get_client()
-            for img_path in images:
+
+            async def _load(img_path: str) -> Optional[str]:
                 try:
                     if img_path.startswith(('http://', 'https://')):
                         resp = await client_ref.get(img_path)
                         resp.raise_for_status()
-                        b64_images.append(base64.b64encode(resp.content).decode('utf-8'))
-                    elif os.path.exists(img_path):
+                        return base64.b64encode(resp.content).decode('utf-8')
+                    if os.path.exists(img_path):
                         with open(img_path, "rb") as f:
-                            b64_images.append(base64.b64encode(f.read()).decode('utf-8'))
+                            return base64.b64encode(f.read()).decode('utf-8')
                 except Exception as e:
                     logger.warning(f"Ollama image process failed ({img_path}): {e}")
+                return None
+
+            # Usually local vision variants (media_ingest); remote leftovers load concurrently
+            loaded = await asyncio.gather(*(_load(img_path) for img_path in images))
+            b64_images = [img for img in loaded if img]
             if b64_images:
                 payload["images"] = b64_images
 
-        try:
-            client = await self._get_client()
-            response = await client.post(self.generate_endpoint, json=payload)
-            response.raise_for_status()
-            return response.json().get("response", "")
-        except Exception as e:
-            logger.error(f"Ollama generation failed: {e}")
-            raise RuntimeError(f"Ollama failed: {str(e)}")
+        return payload
 
     def list_models(self) -> List[str]:
         """
@@ -2,10 +2,12 @@ import os
 import logging
 import base64
 import mimetypes
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, List, Dict, Any, Optional
 from openai import AsyncOpenAI
 
 from ..provider_interface import AIProvider
+from ..prompt_cache import openai_usage, prefix_cache_key, prompt_caching_enabled
+from ..rate_limiter import estimate_tokens, get_rate_limiter
 
 logger = logging.getLogger(__name__)
 
@@ -46,6 +48,62 @@ class OpenAIProvider(AIProvider):
         """
         Refactored OpenAI generation using the latest AsyncOpenAI SDK.
         """
+        params = self._build_params(prompt, model, system, temperature, max_tokens, json_mode, images)
+
+        try:
+            logger.info(f"OpenAI Request: model={params['model']}")
+            async with get_rate_limiter().admit(self.name, params["model"], estimate_tokens(prompt, system)) as ticket:
+                completion = await self.client.chat.completions.create(**params)
+                text = completion.choices[0].message.content or ""
+                ticket.record_output(text)
+                openai_usage(getattr(completion, "usage", None))
+            return text
+        except Exception as e:
+            logger.error(f"OpenAI Generation Error: {e}")
+            raise RuntimeError(f"OpenAI failed: {str(e)}") from e
+
+    async def generate_stream(
+        self,
+        prompt: str,
+        *,
+        model: Optional[str] = None,
+        system: str = "",
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+        json_mode: bool = False,
+        images: Optional[List[str]] = None
+    ) -> AsyncIterator[str]:
+        """Stream content deltas of a chat completion (stream=True)."""
+        params = self._build_params(prompt, model, system, temperature, max_tokens, json_mode, images)
+
+        try:
+            logger.info(f"OpenAI Stream Request: model={params['model']}")
+            async with get_rate_limiter().admit(self.name, params["model"], estimate_tokens(prompt, system)) as ticket:
+                stream = await self.client.chat.completions.create(
+                    **params, stream=True, stream_options={"include_usage": True}
+                )
+                async for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        ticket.record_output(chunk.choices[0].delta.content)
+                        yield chunk.choices[0].delta.content
+                    elif not chunk.choices:
+                        # Final chunk: usage only
+                        openai_usage(getattr(chunk, "usage", None))
+        except Exception as e:
+            logger.error(f"OpenAI Streaming Error: {e}")
+            raise RuntimeError(f"OpenAI failed: {str(e)}") from e
+
+    def _build_params(
+        self,
+        prompt: str,
+        model: Optional[str],
+        system: str,
+        temperature: float,
+        max_tokens: int,
+        json_mode: bool,
+        images: Optional[List[str]]
+    ) -> Dict[str, Any]:
+        """Chat completion parameters shared by generate and generate_stream."""
         selected_model = model or self.default_model
         
         messages = []
@@ -118,13 +176,12 @@ class OpenAIProvider(AIProvider):
                 else:
                     messages.insert(0, {"role": "system", "content": "Output must be in valid JSON format."})
 
-        try:
-            logger.info(f"OpenAI Request: model={selected_model}")
-            completion = await self.client.chat.completions.create(**params)
-            return completion.choices[0].message.content or ""
-        except Exception as e:
-            logger.error(f"OpenAI Generation Error: {e}")
-            raise RuntimeError(f"OpenAI failed: {str(e)}")
+        # Prompt caching is automatic for long prefixes; the key keeps requests
+        # that share the system prompt on the same cache
+        if system and prompt_caching_enabled():
+            params["prompt_cache_key"] = prefix_cache_key(messages[0]["content"])
+
+        return params
 
     def list_models(self) -> List[str]:
         return ["gpt-4o", "gpt-4o-mini", "gpt-4-turbo", "o1-mini", "gpt-4"]
@@ -0,0 +1,297 @@
+"""
+AI RATE LIMITER - Per-provider, per-model admission control
+
+Parallel runs share one provider account. Without admission control a burst
+of chapter requests hits 429s, which surface as QUOTA_EXCEEDED and degrade
+the report. Every provider call is admitted by a Limiter keyed by
+(provider, model):
+
+    max_concurrent        requests in flight at the same time
+    requests_per_minute   token bucket, refilled continuously
+    tokens_per_minute     token bucket; the prompt estimate is charged on
+                          admission, the response when the call finishes
+
+Requests WAIT for capacity instead of failing. Only a wait longer than
+max_wait_seconds raises RateLimitTimeout.
+
+Callers run on different threads and event loops (spine workers, the async
+bridge), so state is guarded by a threading lock and waiting uses short
+asyncio sleeps instead of loop-bound asyncio primitives.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Rough chars-per-token ratio for budget estimates (no tokenizer dependency)
+CHARS_PER_TOKEN = 4
+# Upper bound for one sleep while queued, so freed slots are noticed quickly
+MAX_POLL_SECONDS = 0.25
+
+
+@dataclass(frozen=True)
+class ProviderLimits:
+    """Admission budget for one provider/model. 0 means unlimited."""
+    max_concurrent: int = 0
+    requests_per_minute: int = 0
+    tokens_per_minute: int = 0
+
+
+# Conservative defaults below the entry-tier account limits of each provider.
+# Override per provider or per "provider/model" with AI_RATE_LIMITS.
+DEFAULT_LIMITS: Dict[str, ProviderLimits] = {
+    "openai": ProviderLimits(max_concurrent=8, requests_per_minute=500, tokens_per_minute=200_000),
+    "anthropic": ProviderLimits(max_concurrent=4, requests_per_minute=50, tokens_per_minute=40_000),
+    "gemini": ProviderLimits(max_concurrent=4, requests_per_minute=60, tokens_per_minute=250_000),
+    "gemini_imagen": ProviderLimits(max_concurrent=2, requests_per_minute=10),
+    # Local server: only bound parallelism so queued requests don't hit the HTTP timeout
+    "ollama": ProviderLimits(max_concurrent=2),
+}
+
+
+class RateLimitTimeout(RuntimeError):
+    """Raised when a request could not be admitted within max_wait_seconds."""
+
+
+def estimate_tokens(*texts: Optional[str]) -> int:
+    """Approximate token count of the given texts."""
+    return sum(len(t) for t in texts if t) // CHARS_PER_TOKEN
+
+
+class _TokenBucket:
+    """Continuously refilled bucket of `per_minute` units. Caller holds the lock."""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until `amount` (capped at capacity) is available."""
+        self._refill(now)
+        needed = min(amount, self.capacity)
+        if self.level >= needed:
+            return 0.0
+        return (needed - self.level) / self.rate
+
+    def take(self, amount: float) -> None:
+        # May go negative (large responses): later requests wait for the debt
+        self.level -= amount
+
+
+class Ticket:
+    """Handle for an admitted request; report the response for token accounting."""
+
+    def __init__(self):
+        self.output_tokens = 0
+        self.waited_seconds = 0.0
+
+    def record_output(self, text: Optional[str]) -> None:
+        self.output_tokens += estimate_tokens(text)
+
+
+class Limiter:
+    """Admission state for one (provider, model)."""
+
+    def __init__(self, provider: str, model: str, limits: ProviderLimits):
+        self.provider = provider
+        self.model = model
+        self.limits = limits
+        self._lock = threading.Lock()
+        self._requests = _TokenBucket(limits.requests_per_minute) if limits.requests_per_minute > 0 else None
+        self._tokens = _TokenBucket(limits.tokens_per_minute) if limits.tokens_per_minute > 0 else None
+        self.in_flight = 0
+        self.queued = 0
+        self.admitted = 0
+        self.throttled = 0
+        self.timeouts = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds_seen = 0.0
+
+    def _try_admit(self, tokens: int) -> float:
+        """Admit now (returns 0) or return the suggested wait in seconds."""
+        now = time.monotonic()
+        with self._lock:
+            if self.limits.max_concurrent and self.in_flight >= self.limits.max_concurrent:
+                return MAX_POLL_SECONDS
+            wait = 0.0
+            if self._requests is not None:
+                wait = max(wait, self._requests.wait_time(1, now))
+            if self._tokens is not None and tokens:
+                wait = max(wait, self._tokens.wait_time(tokens, now))
+            if wait > 0:
+                return wait
+            if self._requests is not None:
+                self._requests.take(1)
+            if self._tokens is not None:
+                self._tokens.take(tokens)
+            self.in_flight += 1
+            self.admitted += 1
+            return 0.0
+
+    async def acquire(self, tokens: int, max_wait_seconds: float) -> float:
+        """Wait until admitted. Returns the seconds spent queued."""
+        start = time.monotonic()
+        wait = self._try_admit(tokens)
+        if wait == 0:
+            return 0.0
+        with self._lock:
+            self.queued += 1
+            self.throttled += 1
+        try:
+            while wait > 0:
+                waited = time.monotonic() - start
+                if waited + min(wait, MAX_POLL_SECONDS) > max_wait_seconds:
+                    with self._lock:
+                        self.timeouts += 1
+                    raise RateLimitTimeout(
+                        f"{self.provider}/{self.model}: no capacity after {waited:.1f}s "
+                        f"({self.in_flight} in flight)"
+                    )
+                await asyncio.sleep(min(wait, MAX_POLL_SECONDS))
+                wait = self._try_admit(tokens)
+        finally:
+            with self._lock:
+                self.queued -= 1
+        waited = time.monotonic() - start
+        with self._lock:
+            self.total_wait_seconds += waited
+            self.max_wait_seconds_seen = max(self.max_wait_seconds_seen, waited)
+        return waited
+
+    def release(self, output_tokens: int = 0) -> None:
+        with self._lock:
+            self.in_flight = max(0, self.in_flight - 1)
+            if self._tokens is not None and output_tokens:
+                self._tokens.take(output_tokens)
+
+    def snapshot(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            for bucket in (self._requests, self._tokens):
+                if bucket is not None:
+                    bucket._refill(now)
+            return {
+                "provider": self.provider,
+                "model": self.model,
+                "max_concurrent": self.limits.max_concurrent,
+                "requests_per_minute": self.limits.requests_per_minute,
+                "tokens_per_minute": self.limits.tokens_per_minute,
+                "in_flight": self.in_flight,
+                "queued": self.queued,
+                "admitted": self.admitted,
+                "throttled": self.throttled,
+                "timeouts": self.timeouts,
+                "requests_available": int(self._requests.level) if self._requests else None,
+                "tokens_available": int(self._tokens.level) if self._tokens else None,
+                "avg_wait_ms": int(self.total_wait_seconds * 1000 / self.throttled) if self.throttled else 0,
+                "max_wait_ms": int(self.max_wait_seconds_seen * 1000),
+            }
+
+
+class RateLimiter:
+    """Registry of Limiters, one per (provider, model)."""
+
+    def __init__(
+        self,
+        limits: Optional[Dict[str, ProviderLimits]] = None,
+        enabled: bool = True,
+        max_wait_seconds: float = 300.0
+    ):
+        self.limits = dict(DEFAULT_LIMITS if limits is None else limits)
+        self.enabled = enabled
+        self.max_wait_seconds = max_wait_seconds
+        self._lock = threading.Lock()
+        self._limiters: Dict[Tuple[str, str], Limiter] = {}
+
+    def limits_for(self, provider: str, model: str) -> ProviderLimits:
+        """Most specific budget: "provider/model", then "provider", else unlimited."""
+        return self.limits.get(f"{provider}/{model}") or self.limits.get(provider) or ProviderLimits()
+
+    def limiter(self, provider: str, model: Optional[str]) -> Limiter:
+        key = (provider, model or "")
+        with self._lock:
+            limiter = self._limiters.get(key)
+            if limiter is None:
+                limiter = self._limiters[key] = Limiter(provider, key[1], self.limits_for(*key))
+            return limiter
+
+    @asynccontextmanager
+    async def admit(self, provider: str, model: Optional[str], tokens: int = 0) -> AsyncIterator[Ticket]:
+        """
+        Hold a slot for one provider call.
+
+            async with get_rate_limiter().admit("openai", model, estimate_tokens(prompt)) as ticket:
+                text = await call()
+                ticket.record_output(text)
+        """
+        ticket = Ticket()
+        if not self.enabled:
+            yield ticket
+            return
+        limiter = self.limiter(provider, model)
+        ticket.waited_seconds = await limiter.acquire(tokens, self.max_wait_seconds)
+        if ticket.waited_seconds >= 1:
+            logger.info(f"RateLimiter: {provider}/{limiter.model} queued {ticket.waited_seconds:.1f}s")
+        try:
+            yield ticket
+        finally:
+            limiter.release(ticket.output_tokens)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Limiter state for /api/ai/runtime-status."""
+        with self._lock:
+            limiters = list(self._limiters.values())
+        return {
+            "enabled": self.enabled,
+            "max_wait_seconds": self.max_wait_seconds,
+            "limiters": [l.snapshot() for l in sorted(limiters, key=lambda l: (l.provider, l.model))],
+        }
+
+
+# =============================================================================
+# MODULE-LEVEL HELPER
+# =============================================================================
+
+_limiter_instance: Optional[RateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Get the global RateLimiter (DEFAULT_LIMITS merged with AISettings.rate_limits)."""
+    global _limiter_instance
+    if _limiter_instance is None:
+        with _limiter_lock:
+            if _limiter_instance is None:
+                from backend.config.settings import get_settings
+                ai = get_settings().ai
+                limits = dict(DEFAULT_LIMITS)
+                for key, values in (ai.rate_limits or {}).items():
+                    try:
+                        limits[key] = ProviderLimits(**values)
+                    except TypeError as e:
+                        logger.warning(f"RateLimiter: Ignoring invalid limits for {key}: {e}")
+                _limiter_instance = RateLimiter(
+                    limits=limits,
+                    enabled=ai.rate_limit_enabled,
+                    max_wait_seconds=ai.rate_limit_max_wait_seconds,
+                )
+    return _limiter_instance
+
+
+def reset_rate_limiter() -> None:
+    """Drop the global instance so the next call re-reads settings (for testing)."""
+    global _limiter_instance
+    with _limiter_lock:
+        _limiter_instance = None
@@ -0,0 +1,307 @@
+"""
+AI RESILIENCE - Retries with jittered backoff and hedged requests
+
+Providers turn every SDK/HTTP error into a RuntimeError. Without retries a
+single 503 or dropped connection fails the chapter (template fallback, or a
+PipelineViolation under strict policy). ResilientProvider wraps any
+AIProvider:
+
+    generate()         attempt -> retryable error? -> backoff (jittered) -> retry
+                       slow attempt (> hedge_after_seconds)? -> hedge: a second
+                       identical request races the first, first success wins
+    generate_stream()  retried only until the first chunk has been yielded
+
+Every retry and hedge draws from the RetryBudget of the current run (set with
+retry_budget_scope() around a pipeline run), so a provider outage cannot
+multiply the cost of a long run. Outside a scope there is no budget limit.
+
+Errors are classified from the exception chain (providers raise
+RuntimeError(...) from the SDK error): status codes 408/409/425/429/5xx,
+timeouts and connection errors retry; auth/validation errors do not.
+"""
+
+import asyncio
+import contextvars
+import logging
+import random
+import re
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional
+
+from backend.ai.provider_interface import AIProvider
+from backend.ai.rate_limiter import RateLimitTimeout
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS = {408, 409, 425, 429, 500, 502, 503, 504, 529}
+
+# SDK exception class names (matched by name: no SDK imports needed here)
+RETRYABLE_ERROR_NAMES = {
+    "APITimeoutError", "APIConnectionError", "RateLimitError", "InternalServerError",
+    "ServiceUnavailableError", "OverloadedError", "DeadlineExceeded", "ServerError",
+    "TimeoutException", "ConnectTimeout", "ReadTimeout", "ConnectError", "ReadError",
+    "RemoteProtocolError",
+}
+
+_RETRYABLE_MESSAGE = re.compile(
+    r"rate.?limit|overloaded|temporarily|try again|timed? ?out|connection (reset|error|refused|aborted)"
+    r"|unavailable|resource.?exhausted|internal server error|\b(429|500|502|503|504|529)\b",
+    re.IGNORECASE,
+)
+
+
+def _exception_chain(exc: BaseException) -> List[BaseException]:
+    chain, seen = [], set()
+    while exc is not None and id(exc) not in seen:
+        seen.add(id(exc))
+        chain.append(exc)
+        exc = exc.__cause__ or exc.__context__
+    return chain
+
+
+def _status_code(exc: BaseException) -> Optional[int]:
+    for attr in ("status_code", "status", "code"):
+        value = getattr(exc, attr, None)
+        if isinstance(value, int) and 100 <= value < 600:
+            return value
+    response = getattr(exc, "response", None)
+    value = getattr(response, "status_code", None)
+    return value if isinstance(value, int) else None
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """True if the error is transient (worth another attempt)."""
+    chain = _exception_chain(exc)
+    for err in chain:
+        if isinstance(err, RateLimitTimeout):
+            # Already queued for the maximum time - retrying only queues again
+            return False
+        status = _status_code(err)
+        if status is not None:
+            return status in RETRYABLE_STATUS
+        if isinstance(err, (asyncio.TimeoutError, TimeoutError, ConnectionError)):
+            return True
+        if type(err).__name__ in RETRYABLE_ERROR_NAMES:
+            return True
+    return any(_RETRYABLE_MESSAGE.search(str(err)) for err in chain)
+
+
+def backoff_delay(attempt: int, base_seconds: float, max_seconds: float) -> float:
+    """Exponential backoff with equal jitter: half fixed, half random."""
+    ceiling = min(max_seconds, base_seconds * (2 ** (attempt - 1)))
+    return ceiling / 2 + random.uniform(0, ceiling / 2)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_attempts: int = 3
+    base_delay_seconds: float = 1.0
+    max_delay_seconds: float = 20.0
+    hedge_after_seconds: float = 0.0  # 0 disables hedging
+
+
+# =============================================================================
+# PER-RUN RETRY BUDGET
+# =============================================================================
+
+class RetryBudget:
+    """Shared allowance of extra provider calls (retries + hedges) for one run."""
+
+    def __init__(self, run_id: str, limit: int):
+        self.run_id = run_id
+        self.limit = limit
+        self.used = 0
+        self._lock = threading.Lock()
+
+    @property
+    def remaining(self) -> int:
+        return max(0, self.limit - self.used)
+
+    def consume(self) -> bool:
+        with self._lock:
+            if self.used >= self.limit:
+                return False
+            self.used += 1
+            return True
+
+
+_current_budget: contextvars.ContextVar[Optional[RetryBudget]] = contextvars.ContextVar(
+    "ai_retry_budget", default=None
+)
+
+
+@contextmanager
+def retry_budget_scope(run_id: str, limit: Optional[int] = None) -> Iterator[RetryBudget]:
+    """
+    Make a RetryBudget current for everything called inside the block.
+
+    Spine worker threads and the async bridge copy the context, so chapters
+    generated in parallel share the run's budget.
+    """
+    if limit is None:
+        from backend.config.settings import get_settings
+        limit = get_settings().ai.retry_budget_per_run
+    budget = RetryBudget(run_id, limit)
+    token = _current_budget.set(budget)
+    try:
+        yield budget
+    finally:
+        _current_budget.reset(token)
+        if budget.used:
+            logger.info(f"RetryBudget [{run_id}]: {budget.used}/{budget.limit} extra provider calls used")
+
+
+def current_retry_budget() -> Optional[RetryBudget]:
+    return _current_budget.get()
+
+
+# =============================================================================
+# COUNTERS (runtime status)
+# =============================================================================
+
+_stats_lock = threading.Lock()
+_stats: Dict[str, int] = {"retries": 0, "hedges": 0, "hedge_wins": 0, "budget_exhausted": 0, "gave_up": 0}
+
+
+def _count(key: str) -> None:
+    with _stats_lock:
+        _stats[key] += 1
+
+
+def get_resilience_stats() -> Dict[str, int]:
+    with _stats_lock:
+        return dict(_stats)
+
+
+# =============================================================================
+# WRAPPER
+# =============================================================================
+
+class ResilientProvider(AIProvider):
+    """
+    AIProvider wrapper adding retries, backoff and hedging.
+
+    Other attributes (default_model, client, ...) are delegated to the wrapped
+    provider, which stays reachable as .inner.
+    """
+
+    def __init__(self, inner: AIProvider, policy: Optional[RetryPolicy] = None):
+        self.inner = inner
+        self.policy = policy or RetryPolicy()
+
+    def __getattr__(self, item: str) -> Any:
+        # Only called for attributes not found on the wrapper itself
+        return getattr(self.inner, item)
+
+    @property
+    def name(self) -> str:
+        return self.inner.name
+
+    async def generate(self, prompt: str, **kwargs) -> str:
+        attempt = 1
+        while True:
+            try:
+                return await self._attempt(lambda: self.inner.generate(prompt, **kwargs))
+            except Exception as e:
+                await self._before_retry(attempt, e)
+                attempt += 1
+
+    async def generate_stream(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        attempt = 1
+        while True:
+            started = False
+            try:
+                async for chunk in self.inner.generate_stream(prompt, **kwargs):
+                    started = True
+                    yield chunk
+                return
+            except Exception as e:
+                # Text already forwarded to the caller cannot be taken back
+                if started:
+                    raise
+                await self._before_retry(attempt, e)
+                attempt += 1
+
+    async def check_health(self) -> bool:
+        return await self.inner.check_health()
+
+    def list_models(self) -> List[str]:
+        return self.inner.list_models()
+
+    async def close(self):
+        await self.inner.close()
+
+    async def _before_retry(self, attempt: int, error: Exception) -> None:
+        """Sleep before the next attempt, or re-raise if no retry is allowed."""
+        if attempt >= self.policy.max_attempts or not is_retryable(error):
+            if attempt > 1:
+                _count("gave_up")
+            raise error
+        budget = current_retry_budget()
+        if budget is not None and not budget.consume():
+            _count("budget_exhausted")
+            logger.warning(f"ResilientProvider: Retry budget of run {budget.run_id} exhausted ({self.name})")
+            raise error
+        delay = backoff_delay(attempt, self.policy.base_delay_seconds, self.policy.max_delay_seconds)
+        _count("retries")
+        logger.warning(
+            f"ResilientProvider: {self.name} attempt {attempt}/{self.policy.max_attempts} failed "
+            f"({error}); retrying in {delay:.1f}s"
+        )
+        await asyncio.sleep(delay)
+
+    async def _attempt(self, call: Callable[[], Awaitable[str]]) -> str:
+        """One attempt, hedged with a second request if it is slow."""
+        hedge_after = self.policy.hedge_after_seconds
+        if hedge_after <= 0:
+            return await call()
+
+        primary = asyncio.ensure_future(call())
+        hedge: Optional[asyncio.Future] = None
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=hedge_after)
+            if done:
+                return primary.result()
+            budget = current_retry_budget()
+            if budget is not None and not budget.consume():
+                return await primary
+
+            _count("hedges")
+            logger.info(f"ResilientProvider: {self.name} slower than {hedge_after}s - sending hedged request")
+            hedge = asyncio.ensure_future(call())
+            pending = {primary, hedge}
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            _count("hedge_wins")
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            # No request outlives the attempt - also when the caller is cancelled
+            # while waiting: the loser (or both) is cancelled and awaited
+            unfinished = [t for t in (primary, hedge) if t is not None and not t.done()]
+            for task in unfinished:
+                task.cancel()
+            if unfinished:
+                await asyncio.gather(*unfinished, return_exceptions=True)
+
+def make_resilient(provider: AIProvider) -> AIProvider:
+    """Wrap a provider with the retry/hedging policy from AISettings."""
+    if isinstance(provider, ResilientProvider):
+        return provider
+    from backend.config.settings import get_settings
+    ai = get_settings().ai
+    if ai.retry_max_attempts <= 1 and ai.hedge_after_seconds <= 0:
+        return provider
+    return ResilientProvider(provider, RetryPolicy(
+        max_attempts=max(1, ai.retry_max_attempts),
+        base_delay_seconds=ai.retry_base_delay_seconds,
+        max_delay_seconds=ai.retry_max_delay_seconds,
+        hedge_after_seconds=ai.hedge_after_seconds,
+    ))
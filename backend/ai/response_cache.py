@@ -0,0 +1,447 @@
+"""
+AI RESPONSE CACHE - Content-addressed cache in front of AIProvider.generate
+
+Re-running a report (or analysing the same listing twice) sends byte-identical
+prompts to the provider. This cache stores successful responses keyed by a hash
+of everything that determines the output:
+
+    provider, model, system prompt, user prompt, temperature, json_mode,
+    other generation parameters (e.g. max_tokens)
+
+Text providers are wrapped once, where they are built (make_cached, next to
+make_resilient), so every generate()/generate_stream() call goes through it.
+
+PROPERTIES:
+- Persistent: stored in the app SQLite database (table ai_response_cache)
+- TTL: entries older than ttl_seconds are never served and are pruned
+- Size-bounded: least-recently-used entries are evicted above max_bytes
+- Validation-gated: callers wrap a call in cache_validation(); responses that
+  fail the validator are NOT stored, so a bad answer is never replayed
+- Not cached: multimodal calls (image bytes are not part of the key) and calls
+  sampled above max_temperature. Inside response_cache_bypass() (a run started
+  with fresh=true) the cache is not read, but fresh valid responses are stored
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional
+
+from backend.ai.provider_interface import AIProvider
+from backend.storage import sqlite_pool
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TEMPERATURE = 0.7  # AIProvider.generate default
+# Generation parameters with their own place in the cache key
+_KEYED_PARAMETERS = ("model", "system", "temperature", "json_mode")
+
+
+def build_cache_key(
+    provider: str,
+    model: Optional[str],
+    system: str,
+    prompt: str,
+    temperature: float,
+    json_mode: bool,
+    options: Optional[Dict[str, Any]] = None
+) -> str:
+    """
+    Deterministic SHA-256 key over every input that shapes the response.
+
+    options holds any further generation parameters passed to the provider
+    (e.g. max_tokens: a response truncated under a small budget must not be
+    replayed for a larger one).
+    """
+    material = json.dumps(
+        {
+            "provider": provider,
+            "model": model or "",
+            "system": system or "",
+            "prompt": prompt,
+            "temperature": round(float(temperature), 4),
+            "json_mode": bool(json_mode),
+            "options": options or {},
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    Thread-safe, SQLite-backed response cache.
+
+    File databases use the shared connection pool. ':memory:' databases (tests)
+    keep one private connection so the table survives between calls.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        ttl_seconds: int = 7 * 24 * 3600,
+        max_bytes: int = 64 * 1024 * 1024,
+        enabled: bool = True,
+        max_temperature: float = DEFAULT_TEMPERATURE
+    ):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.max_temperature = max_temperature
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._stores = 0
+        self._evictions = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        if db_path == ":memory:":
+            self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._init_schema()
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """Yield a connection with Row factory. Caller holds self._lock."""
+        if self._conn is not None:
+            self._conn.row_factory = sqlite3.Row
+            yield self._conn
+            return
+        conn = sqlite_pool.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def _init_schema(self) -> None:
+        with self._lock, self._connection() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS ai_response_cache (
+                    key TEXT PRIMARY KEY,
+                    provider TEXT,
+                    model TEXT,
+                    response TEXT,
+                    size_bytes INTEGER,
+                    created_at REAL,
+                    last_access REAL,
+                    hits INTEGER DEFAULT 0
+                )
+            """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_ai_response_cache_access ON ai_response_cache (last_access)"
+            )
+            conn.commit()
+
+    # =========================================================================
+    # LOOKUP / STORE
+    # =========================================================================
+
+    def get(self, key: str) -> Optional[str]:
+        """Return a fresh cached response or None."""
+        if not self.enabled:
+            return None
+        now = time.time()
+        with self._lock, self._connection() as conn:
+            row = conn.execute(
+                "SELECT response, created_at FROM ai_response_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self._misses += 1
+                return None
+            if now - row["created_at"] > self.ttl_seconds:
+                conn.execute("DELETE FROM ai_response_cache WHERE key = ?", (key,))
+                conn.commit()
+                self._misses += 1
+                return None
+            conn.execute(
+                "UPDATE ai_response_cache SET last_access = ?, hits = hits + 1 WHERE key = ?",
+                (now, key)
+            )
+            conn.commit()
+            self._hits += 1
+            return row["response"]
+
+    def put(self, key: str, response: str, provider: str = "", model: Optional[str] = None) -> None:
+        """Store a response and enforce the size bound."""
+        if not self.enabled or not response:
+            return
+        now = time.time()
+        size = len(response.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._lock, self._connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO ai_response_cache "
+                "(key, provider, model, response, size_bytes, created_at, last_access, hits) "
+                "VALUES (?,?,?,?,?,?,?,0)",
+                (key, provider, model or "", response, size, now, now)
+            )
+            self._stores += 1
+            self._evict_locked(conn)
+            conn.commit()
+
+    def invalidate(self, key: str) -> None:
+        """Remove a single entry."""
+        with self._lock, self._connection() as conn:
+            conn.execute("DELETE FROM ai_response_cache WHERE key = ?", (key,))
+            conn.commit()
+
+    # =========================================================================
+    # MAINTENANCE / INSPECTION
+    # =========================================================================
+
+    def _evict_locked(self, conn: sqlite3.Connection) -> None:
+        """Drop expired entries, then LRU entries until under max_bytes. Caller holds lock."""
+        cutoff = time.time() - self.ttl_seconds
+        cur = conn.execute("DELETE FROM ai_response_cache WHERE created_at < ?", (cutoff,))
+        self._evictions += cur.rowcount or 0
+
+        total = conn.execute(
+            "SELECT COALESCE(SUM(size_bytes), 0) FROM ai_response_cache"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for row in conn.execute(
+            "SELECT key, size_bytes FROM ai_response_cache ORDER BY last_access ASC"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM ai_response_cache WHERE key = ?", (row["key"],))
+            total -= row["size_bytes"]
+            self._evictions += 1
+
+    def prune(self) -> int:
+        """Apply TTL and size eviction now. Returns number of evicted entries."""
+        with self._lock, self._connection() as conn:
+            before = self._evictions
+            self._evict_locked(conn)
+            conn.commit()
+            return self._evictions - before
+
+    def purge(self, provider: Optional[str] = None) -> int:
+        """Delete all entries (or all entries for one provider). Returns count removed."""
+        with self._lock, self._connection() as conn:
+            if provider:
+                cur = conn.execute("DELETE FROM ai_response_cache WHERE provider = ?", (provider,))
+            else:
+                cur = conn.execute("DELETE FROM ai_response_cache")
+            conn.commit()
+            return cur.rowcount or 0
+
+    def list_entries(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Metadata of the most recently used entries (no response bodies)."""
+        with self._lock, self._connection() as conn:
+            rows = conn.execute(
+                "SELECT key, provider, model, size_bytes, created_at, last_access, hits "
+                "FROM ai_response_cache ORDER BY last_access DESC LIMIT ?",
+                (limit,)
+            ).fetchall()
+        return [dict(r) for r in rows]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Counters and size information for the status API."""
+        with self._lock, self._connection() as conn:
+            row = conn.execute(
+                "SELECT COUNT(*) AS entries, COALESCE(SUM(size_bytes), 0) AS bytes FROM ai_response_cache"
+            ).fetchone()
+            per_provider = conn.execute(
+                "SELECT provider, COUNT(*) AS entries FROM ai_response_cache GROUP BY provider"
+            ).fetchall()
+        lookups = self._hits + self._misses
+        return {
+            "enabled": self.enabled,
+            "entries": row["entries"],
+            "size_bytes": row["bytes"],
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            "max_temperature": self.max_temperature,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": round(self._hits / lookups, 3) if lookups else 0.0,
+            "stores": self._stores,
+            "evictions": self._evictions,
+            "by_provider": {r["provider"]: r["entries"] for r in per_provider},
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# =============================================================================
+# PROVIDER WRAPPER
+# =============================================================================
+
+_current_validator: contextvars.ContextVar[Optional[Callable[[str], Any]]] = contextvars.ContextVar(
+    "response_cache_validator", default=None
+)
+_bypass: contextvars.ContextVar[bool] = contextvars.ContextVar("response_cache_bypass", default=False)
+
+
+@contextmanager
+def cache_validation(validate: Callable[[str], Any]) -> Iterator[None]:
+    """Provider calls inside the scope are only cached if validate(response) does not raise."""
+    token = _current_validator.set(validate)
+    try:
+        yield
+    finally:
+        _current_validator.reset(token)
+
+
+@contextmanager
+def response_cache_bypass(enabled: bool = True) -> Iterator[None]:
+    """Provider calls inside the scope (e.g. one pipeline run) are not served from the cache."""
+    token = _bypass.set(enabled)
+    try:
+        yield
+    finally:
+        _bypass.reset(token)
+
+
+class CachingProvider(AIProvider):
+    """
+    AIProvider wrapper serving identical calls from the ResponseCache.
+
+    Uses the given cache, or the global one at call time. Other attributes
+    (default_model, client, ...) are delegated to the wrapped provider, which
+    stays reachable as .inner.
+    """
+
+    def __init__(self, inner: AIProvider, cache: Optional[ResponseCache] = None):
+        self.inner = inner
+        self._cache = cache
+
+    def __getattr__(self, item: str) -> Any:
+        # Only called for attributes not found on the wrapper itself
+        return getattr(self.inner, item)
+
+    @property
+    def name(self) -> str:
+        return self.inner.name
+
+    @property
+    def cache(self) -> ResponseCache:
+        return self._cache if self._cache is not None else get_response_cache()
+
+    def _key(self, cache: ResponseCache, prompt: str, kwargs: Dict[str, Any]) -> Optional[str]:
+        """Cache key of a call, or None if the call must not be cached."""
+        temperature = kwargs.get("temperature", DEFAULT_TEMPERATURE)
+        if not cache.enabled or kwargs.get("images") or temperature > cache.max_temperature:
+            return None
+        model = self._model(kwargs)
+        options = {k: v for k, v in kwargs.items() if k not in _KEYED_PARAMETERS}
+        return build_cache_key(
+            self.name, model, kwargs.get("system", ""), prompt, temperature, kwargs.get("json_mode", False), options
+        )
+
+    def _model(self, kwargs: Dict[str, Any]) -> str:
+        return str(kwargs.get("model") or getattr(self.inner, "default_model", None) or "")
+
+    def _lookup(self, cache: ResponseCache, key: str) -> Optional[str]:
+        if _bypass.get():
+            return None
+        cached = cache.get(key)
+        if cached is not None:
+            logger.info(f"ResponseCache: HIT {key[:12]} ({self.name})")
+        return cached
+
+    def _store(self, cache: ResponseCache, key: str, response: str, model: str) -> None:
+        if not response:
+            return
+        validate = _current_validator.get()
+        try:
+            if validate is not None:
+                validate(response)
+            cache.put(key, response, provider=self.name, model=model)
+        except Exception as e:
+            logger.info(f"ResponseCache: Not storing {key[:12]} - validation failed: {e}")
+
+    async def generate(self, prompt: str, **kwargs) -> str:
+        cache = self.cache
+        key = self._key(cache, prompt, kwargs)
+        if key is None:
+            return await self.inner.generate(prompt, **kwargs)
+        cached = self._lookup(cache, key)
+        if cached is not None:
+            return cached
+        response = await self.inner.generate(prompt, **kwargs)
+        self._store(cache, key, response, self._model(kwargs))
+        return response
+
+    async def generate_stream(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        """Streams a miss from the provider; a cache hit is delivered as a single chunk."""
+        cache = self.cache
+        key = self._key(cache, prompt, kwargs)
+        if key is None:
+            async for chunk in self.inner.generate_stream(prompt, **kwargs):
+                yield chunk
+            return
+        cached = self._lookup(cache, key)
+        if cached is not None:
+            yield cached
+            return
+        parts: List[str] = []
+        async for chunk in self.inner.generate_stream(prompt, **kwargs):
+            parts.append(chunk)
+            yield chunk
+        self._store(cache, key, "".join(parts), self._model(kwargs))
+
+    async def check_health(self) -> bool:
+        return await self.inner.check_health()
+
+    def list_models(self) -> List[str]:
+        return self.inner.list_models()
+
+    async def close(self):
+        await self.inner.close()
+
+
+def make_cached(provider: AIProvider) -> AIProvider:
+    """Wrap a provider with the global response cache (AISettings.response_cache_*)."""
+    if isinstance(provider, CachingProvider):
+        return provider
+    return CachingProvider(provider)
+
+
+# =============================================================================
+# MODULE-LEVEL HELPER
+# =============================================================================
+
+_cache_instance: Optional[ResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Get the global ResponseCache instance (configured from AISettings)."""
+    global _cache_instance
+    if _cache_instance is None:
+        with _cache_lock:
+            if _cache_instance is None:
+                from backend.config.settings import get_settings
+                settings = get_settings()
+                _cache_instance = ResponseCache(
+                    db_path=settings.database_url,
+                    ttl_seconds=settings.ai.response_cache_ttl_seconds,
+                    max_bytes=settings.ai.response_cache_max_mb * 1024 * 1024,
+                    enabled=settings.ai.response_cache_enabled,
+                    max_temperature=settings.ai.response_cache_max_temperature,
+                )
+    return _cache_instance
+
+
+def reset_response_cache() -> None:
+    """Drop the global instance so the next call re-reads settings (for testing)."""
+    global _cache_instance
+    with _cache_lock:
+        if _cache_instance is not None:
+            _cache_instance.close()
+        _cache_instance = None
@@ -12,10 +12,17 @@ NO OTHER ENDPOINT should provide this information.
 
 import logging
 from fastapi import APIRouter
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 from backend.ai.ai_authority import get_ai_authority, NoAvailableAIProviderError
+from backend.ai.image_cache import get_image_cache
+from backend.ai.image_queue import get_image_queue
 from backend.ai.ollama_guard import get_ollama_guard
+from backend.ai.prompt_cache import get_prompt_cache_stats
+from backend.ai.provider_registry import get_provider_registry
+from backend.ai.rate_limiter import get_rate_limiter
+from backend.ai.resilience import get_resilience_stats
+from backend.ai.response_cache import get_response_cache
 
 logger = logging.getLogger(__name__)
 
@@ -92,6 +99,14 @@ async def get_runtime_status() -> Dict[str, Any]:
         # Ollama-specific
         "ollama_guard": ollama_guard_status,
         
+        # Admission control: in-flight/queued requests and remaining budgets
+        "rate_limits": get_rate_limiter().get_stats(),
+        "resilience": get_resilience_stats(),
+        "prompt_cache": get_prompt_cache_stats(),
+        "provider_instances": get_provider_registry().get_stats(),
+        "image_queue": get_image_queue().get_stats(),
+        "image_cache": get_image_cache().get_stats(),
+        
         # Timestamp
         "timestamp": decision.timestamp,
     }
@@ -169,3 +184,29 @@ async def invalidate_runtime_cache() -> Dict[str, Any]:
         "active_model": decision.active_model,
         "message": "Cache invalidated, runtime re-evaluated",
     }
+
+
+@router.get("/response-cache")
+async def get_response_cache_status(limit: int = 20) -> Dict[str, Any]:
+    """
+    Get AI response cache statistics and the most recently used entries.
+    """
+    cache = get_response_cache()
+    return {
+        "stats": cache.get_stats(),
+        "entries": cache.list_entries(limit=limit),
+    }
+
+
+@router.delete("/response-cache")
+async def purge_response_cache(provider: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Purge the AI response cache (optionally only one provider's entries).
+    Useful after prompt or model changes that should force fresh answers.
+    """
+    removed = get_response_cache().purge(provider=provider)
+    return {
+        "success": True,
+        "removed": removed,
+        "provider": provider,
+    }
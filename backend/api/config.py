@@ -11,14 +11,14 @@ from pydantic import BaseModel
 from typing import Optional, Dict, Any
 
 from backend.config.settings import get_settings, reset_settings
-import sqlite3
+from backend.storage import sqlite_pool
 import json
 
 # Helper to get a DB connection using the configured database URL
 def _get_conn():
     settings = get_settings()
     db_path = settings.database_url
-    return sqlite3.connect(db_path)
+    return sqlite_pool.connect(db_path)
 
 router = APIRouter(prefix="/api/config", tags=["configuration"])
 
@@ -114,8 +114,8 @@ async def update_config_bulk(config: ConfigUpdateRequest):
     # Trigger AI re-init if AI section was updated
     if "ai" in sections_updated:
         try:
-            from backend.main import init_ai_provider
-            init_ai_provider()
+            from backend.main import reload_ai_provider
+            reload_ai_provider()
         except: pass
         
     return {"status": "updated", "sections": sections_updated}
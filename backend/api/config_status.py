@@ -401,12 +401,12 @@ async def update_config(update: ConfigUpdateRequest):
         updated_fields.append("timeout")
     
     # Persist to database
-    import sqlite3
     import json
+    from backend.storage import sqlite_pool
     
     db_path = settings.database_url
     try:
-        conn = sqlite3.connect(db_path)
+        conn = sqlite_pool.connect(db_path)
         cur = conn.cursor()
         
         # Update mode in settings if provided
@@ -440,8 +440,8 @@ async def update_config(update: ConfigUpdateRequest):
     
     # Reinitialize AI provider
     try:
-        from backend.main import init_ai_provider
-        init_ai_provider()
+        from backend.main import reload_ai_provider
+        reload_ai_provider()
     except Exception as e:
         logger.warning(f"Failed to reinitialize AI provider: {e}")
     
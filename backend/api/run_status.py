@@ -8,17 +8,24 @@ It tracks:
 - Elapsed time per step
 - Warnings and errors (especially timeouts)
 - Provider and model in use
+
+Clients can poll /live-status or subscribe to /events (Server-Sent Events),
+which pushes step, plane, warning, error and complete events as they happen.
+While hero images are still generating for a finished run, the stream stays
+open after 'complete' and pushes chapter_updated events.
 """
 
+import asyncio
 import time
 import json
 import logging
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime
 from dataclasses import dataclass, field, asdict
 from threading import Lock
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 logger = logging.getLogger(__name__)
@@ -95,12 +102,68 @@ class RunStatus:
         return result
 
 
+TERMINAL_STATUSES = ("done", "error", "validation_failed", "failed", "cancelled")
+
+
+class RunEventBroker:
+    """
+    Fan-out of run status events to async subscribers (SSE streams).
+    
+    Pipeline code publishes from worker threads; each subscriber owns an
+    asyncio.Queue on its event loop and is fed via call_soon_threadsafe.
+    """
+    
+    MAX_QUEUED_EVENTS = 500
+    
+    def __init__(self):
+        self._subscribers: Dict[str, List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+        self._lock = Lock()
+    
+    def subscribe(self, run_id: str) -> asyncio.Queue:
+        """Register a queue for run_id. Must be called from the consuming event loop."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.MAX_QUEUED_EVENTS)
+        with self._lock:
+            self._subscribers.setdefault(run_id, []).append((asyncio.get_running_loop(), queue))
+        return queue
+    
+    def unsubscribe(self, run_id: str, queue: asyncio.Queue):
+        with self._lock:
+            subs = [s for s in self._subscribers.get(run_id, []) if s[1] is not queue]
+            if subs:
+                self._subscribers[run_id] = subs
+            else:
+                self._subscribers.pop(run_id, None)
+    
+    def subscriber_count(self, run_id: str) -> int:
+        with self._lock:
+            return len(self._subscribers.get(run_id, []))
+    
+    def publish(self, run_id: str, event: str, data: Dict[str, Any]):
+        """Deliver an event to every subscriber of run_id (thread-safe, non-blocking)."""
+        with self._lock:
+            subs = list(self._subscribers.get(run_id, []))
+        for loop, queue in subs:
+            try:
+                loop.call_soon_threadsafe(self._enqueue, queue, (event, data))
+            except RuntimeError:
+                # Subscriber loop already closed
+                self.unsubscribe(run_id, queue)
+    
+    @staticmethod
+    def _enqueue(queue: asyncio.Queue, item: Tuple[str, Dict[str, Any]]):
+        if queue.full():
+            # Slow consumer: drop the oldest event rather than block the pipeline
+            queue.get_nowait()
+        queue.put_nowait(item)
+
+
 class RunStatusStore:
     """Thread-safe store for run status."""
     
     def __init__(self):
         self._store: Dict[str, RunStatus] = {}
         self._lock = Lock()
+        self.events = RunEventBroker()
     
     def create(self, run_id: str, provider: str = "unknown", model: str = "unknown", mode: str = "unknown") -> RunStatus:
         """Create a new run status entry."""
@@ -121,7 +184,9 @@ class RunStatusStore:
                 }
             )
             self._store[run_id] = status
-            return status
+            snapshot = status.to_dict()
+        self.events.publish(run_id, "snapshot", {**snapshot, "source": "realtime"})
+        return status
     
     def get(self, run_id: str) -> Optional[RunStatus]:
         """Get run status."""
@@ -157,6 +222,13 @@ class RunStatusStore:
             total_steps = len(run_status.steps)
             done_steps = sum(1 for s in run_status.steps.values() if s.status in ("done", "skipped"))
             run_status.progress_percent = int((done_steps / total_steps) * 100) if total_steps > 0 else 0
+            event = {
+                "key": step,
+                "step": asdict(step_obj),
+                "current_step": run_status.current_step,
+                "progress_percent": run_status.progress_percent,
+            }
+        self.events.publish(run_id, "step", event)
     
     def update_plane(self, run_id: str, plane: str, chapter_id: str, status: str, word_count: Optional[int] = None):
         """Update plane generation status."""
@@ -182,31 +254,87 @@ class RunStatusStore:
             
             run_status.current_plane = plane if status == "running" else run_status.current_plane
             run_status.current_chapter = chapter_id if status == "running" else run_status.current_chapter
+            event = {
+                "key": plane_key,
+                "plane": asdict(plane_obj),
+                "current_plane": run_status.current_plane,
+                "current_chapter": run_status.current_chapter,
+            }
+        self.events.publish(run_id, "plane", event)
+    
+    def publish_narrative(self, run_id: str, chapter_id: str, text: str, word_count: int):
+        """
+        Push partially generated chapter text to live listeners.
+        
+        Preview only: not kept in the status snapshot, the validated narrative
+        arrives with the report.
+        """
+        with self._lock:
+            if run_id not in self._store:
+                return
+        self.events.publish(run_id, "narrative", {
+            "chapter_id": chapter_id,
+            "text": text,
+            "word_count": word_count,
+        })
+    
+    def publish_chapter_updated(self, run_id: str, chapter_id: str, images_pending: int):
+        """
+        Tell live listeners that a stored chapter changed after the run finished
+        (a queued hero image arrived). Also sent for runs no longer tracked here.
+        """
+        self.events.publish(run_id, "chapter_updated", {
+            "chapter_id": chapter_id,
+            "images_pending": images_pending,
+        })
     
     def add_warning(self, run_id: str, warning: str):
         """Add a warning message."""
         with self._lock:
             run_status = self._store.get(run_id)
-            if run_status:
-                run_status.warnings.append(f"[{datetime.now().strftime('%H:%M:%S')}] {warning}")
+            if not run_status:
+                return
+            message = f"[{datetime.now().strftime('%H:%M:%S')}] {warning}"
+            run_status.warnings.append(message)
+        self.events.publish(run_id, "warning", {"message": message})
     
     def add_error(self, run_id: str, error: str):
         """Add an error message."""
         with self._lock:
             run_status = self._store.get(run_id)
-            if run_status:
-                run_status.errors.append(f"[{datetime.now().strftime('%H:%M:%S')}] {error}")
+            if not run_status:
+                return
+            message = f"[{datetime.now().strftime('%H:%M:%S')}] {error}"
+            run_status.errors.append(message)
+        # Not named "error": that name is reserved by the browser EventSource API
+        self.events.publish(run_id, "run_error", {"message": message})
     
     def complete(self, run_id: str, status: str = "done"):
         """Mark a run as complete."""
         with self._lock:
             run_status = self._store.get(run_id)
-            if run_status:
-                run_status.status = status
-                run_status.completed_at = time.time()
-                if run_status.started_at:
-                    run_status.total_elapsed_ms = int((run_status.completed_at - run_status.started_at) * 1000)
-                run_status.progress_percent = 100 if status == "done" else run_status.progress_percent
+            if not run_status:
+                return
+            run_status.status = status
+            run_status.completed_at = time.time()
+            if run_status.started_at:
+                run_status.total_elapsed_ms = int((run_status.completed_at - run_status.started_at) * 1000)
+            run_status.progress_percent = 100 if status == "done" else run_status.progress_percent
+            event = {
+                "status": status,
+                "progress_percent": run_status.progress_percent,
+                "total_elapsed_ms": run_status.total_elapsed_ms,
+            }
+        self.events.publish(run_id, "complete", event)
+    
+    def discard_finished(self, run_id: str) -> bool:
+        """Drop a run's entry if it holds a terminal status (run re-queued)."""
+        with self._lock:
+            run_status = self._store.get(run_id)
+            if not run_status or run_status.status not in TERMINAL_STATUSES:
+                return False
+            del self._store[run_id]
+            return True
     
     def cleanup_old(self, max_age_seconds: int = 3600):
         """Remove old run statuses."""
@@ -244,27 +372,14 @@ class RunStatusResponse(BaseModel):
     errors: List[str]
 
 
-@router.get("/{run_id}/live-status")
-async def get_live_status(run_id: str):
-    """
-    Get real-time status of a running pipeline.
-    
-    Use this endpoint for live updates during report generation.
-    Poll every 500ms-1000ms for smooth UI updates.
-    
-    Returns:
-        - Current step and progress
-        - Which plane is being generated
-        - Elapsed time per step
-        - Warnings and errors
-        - Provider/model/mode in use
-    """
+def build_live_status(run_id: str) -> Dict[str, Any]:
+    """Realtime status from the store, or a basic status from the database."""
     status = run_status_store.get(run_id)
     
     if not status:
         # Fall back to database status
-        from backend.main import get_run_row
-        row = get_run_row(run_id)
+        from backend.main import get_run_overview_row
+        row = get_run_overview_row(run_id)
         
         if not row:
             raise HTTPException(status_code=404, detail="Run not found")
@@ -296,6 +411,158 @@ async def get_live_status(run_id: str):
     }
 
 
+@router.get("/{run_id}/live-status")
+async def get_live_status(run_id: str):
+    """
+    Get real-time status of a running pipeline.
+    
+    Use this endpoint for live updates during report generation.
+    Prefer /events (SSE) over polling; if polling, use 500ms-1000ms.
+    
+    Returns:
+        - Current step and progress
+        - Which plane is being generated
+        - Elapsed time per step
+        - Warnings and errors
+        - Provider/model/mode in use
+    """
+    return build_live_status(run_id)
+
+
+SSE_HEARTBEAT_SECONDS = 15.0
+# Poll interval for runs not tracked in this process: with worker_mode="external"
+# (or after a restart) step and plane events are published elsewhere, so the
+# stream follows the database instead, at the pace of the old polling client.
+SSE_DB_POLL_SECONDS = 1.0
+
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def _pending_images(run_id: str) -> List[str]:
+    """Chapters whose hero image is still generating, from the run index (written by any process)."""
+    from backend.pipeline_runner import artifact_store
+    return artifact_store().pending_images(run_id)
+
+
+@router.get("/{run_id}/events")
+async def stream_run_events(run_id: str, request: Request):
+    """
+    Server-Sent Events stream of run status.
+    
+    Events:
+        snapshot   full live status (first message, when tracking starts, and
+                   on every change of a run followed through the database)
+        step       {key, step, current_step, progress_percent}
+        plane      {key, plane, current_plane, current_chapter}
+        warning    {message}
+        run_error  {message}
+        complete   {status, progress_percent, total_elapsed_ms, images_pending}
+                   - stream ends, unless hero images are still pending
+        chapter_updated  {chapter_id, images_pending} - a stored chapter changed
+                   (queued hero image attached); stream ends at images_pending 0
+        heartbeat  {ts} every SSE_HEARTBEAT_SECONDS while idle
+    
+    Runs not tracked in this process, and pending hero images, are polled
+    from the database every SSE_DB_POLL_SECONDS: with worker_mode="external"
+    the events above are published in the worker process.
+    """
+    # Subscribe BEFORE taking the snapshot so no event can fall in between
+    queue = run_status_store.events.subscribe(run_id)
+    try:
+        snapshot = build_live_status(run_id)
+    except HTTPException:
+        run_status_store.events.unsubscribe(run_id, queue)
+        raise
+    
+    async def event_stream():
+        # Chapters whose hero image has not been announced yet
+        waiting: set = set()
+        
+        def complete_event(status: Dict[str, Any]) -> Dict[str, Any]:
+            waiting.update(_pending_images(run_id))
+            return {**status, "images_pending": len(waiting)}
+        
+        try:
+            yield _sse("snapshot", snapshot)
+            last_snapshot = snapshot
+            last_sent = time.monotonic()
+            finished = snapshot["status"] in TERMINAL_STATUSES
+            if finished:
+                yield _sse("complete", complete_event({
+                    "status": snapshot["status"],
+                    "progress_percent": snapshot["progress_percent"],
+                }))
+                if not waiting:
+                    return
+            
+            while True:
+                polling = (not finished and run_status_store.get(run_id) is None) or bool(waiting)
+                try:
+                    event, data = await asyncio.wait_for(
+                        queue.get(),
+                        timeout=SSE_DB_POLL_SECONDS if polling else SSE_HEARTBEAT_SECONDS,
+                    )
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        return
+                    if finished:
+                        if not waiting:
+                            return
+                        # Attached images leave the run index's pending list
+                        pending = _pending_images(run_id)
+                        for chapter_id in sorted(waiting - set(pending)):
+                            waiting.discard(chapter_id)
+                            last_sent = time.monotonic()
+                            yield _sse("chapter_updated", {"chapter_id": chapter_id, "images_pending": len(waiting)})
+                        if not waiting:
+                            return
+                    elif polling:
+                        # Not tracked in memory: the DB is the source of truth
+                        try:
+                            current = build_live_status(run_id)
+                        except HTTPException:
+                            return
+                        if current != last_snapshot:
+                            last_snapshot = current
+                            last_sent = time.monotonic()
+                            yield _sse("snapshot", current)
+                        if current["status"] in TERMINAL_STATUSES:
+                            finished = True
+                            yield _sse("complete", complete_event({
+                                "status": current["status"],
+                                "progress_percent": current["progress_percent"],
+                            }))
+                            if not waiting:
+                                return
+                    if time.monotonic() - last_sent >= SSE_HEARTBEAT_SECONDS:
+                        last_sent = time.monotonic()
+                        yield _sse("heartbeat", {"ts": time.time()})
+                    continue
+                
+                if event == "complete":
+                    finished = True
+                    data = complete_event(data)
+                elif event == "chapter_updated":
+                    if data["chapter_id"] not in waiting:
+                        continue  # already announced from the database
+                    waiting.discard(data["chapter_id"])
+                    data = {**data, "images_pending": len(waiting)}
+                last_sent = time.monotonic()
+                yield _sse(event, data)
+                if event in ("complete", "chapter_updated") and finished and not waiting:
+                    return
+        finally:
+            run_status_store.events.unsubscribe(run_id, queue)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/{run_id}/step-timing")
 async def get_step_timing(run_id: str):
     """Get detailed timing breakdown for each step."""
@@ -366,6 +633,11 @@ def track_plane(run_id: str, plane: str, chapter_id: str, status: str, word_coun
     run_status_store.update_plane(run_id, plane, chapter_id, status, word_count)
 
 
+def track_narrative(run_id: str, chapter_id: str, text: str, word_count: int):
+    """Forward streamed narrative text. Call from narrative generation."""
+    run_status_store.publish_narrative(run_id, chapter_id, text, word_count)
+
+
 def track_warning(run_id: str, warning: str):
     """Add warning. Call when timeout or degradation occurs."""
     run_status_store.add_warning(run_id, warning)
@@ -376,6 +648,11 @@ def track_error(run_id: str, error: str):
     run_status_store.add_error(run_id, error)
 
 
+def reset_run_tracking(run_id: str) -> bool:
+    """Forget the finished status of a run that was queued again."""
+    return run_status_store.discard_finished(run_id)
+
+
 def complete_run_tracking(run_id: str, status: str = "done"):
     """Complete run tracking. Call at pipeline end."""
     run_status_store.complete(run_id, status)
@@ -0,0 +1,168 @@
+"""
+BATCH REGENERATION - Re-generate many reports through a provider batch API
+
+Offline bulk mode for re-generating existing runs (e.g. after a prompt or
+model change) at batch pricing instead of one synchronous call per chapter:
+
+    python -m backend.batch_regenerate --status done --backend openai
+    python -m backend.batch_regenerate --runs <id> <id> --backend anthropic
+    python -m backend.batch_regenerate --status done --backend local   # dry run
+
+All selected runs execute the normal pipeline in parallel against one
+BatchingProvider (backend/ai/batch.py): chapter prompts of all runs are
+collected into provider batch jobs and every answer is parsed, validated and
+stored by the spine exactly like a synchronous run. Each run generates all of
+its chapters at once (REGENERATE_CHAPTER_CONCURRENCY), so a run's chapter
+prompts share one batch instead of adding one batch round-trip per chapter. Results can take up to
+the provider's completion window (24h), so this is not used by the API.
+
+Runs that are queued or running on the job queue are skipped.
+"""
+
+import argparse
+import contextvars
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Every chapter of a run (1-13) in flight at once: their prompts land in the same batch
+REGENERATE_CHAPTER_CONCURRENCY = 13
+
+
+def select_runs(runner, run_ids: Optional[List[str]], status: Optional[str]) -> List[str]:
+    """Explicit run ids, or all runs with the given status, minus active pipeline jobs."""
+    if run_ids:
+        selected = list(run_ids)
+    else:
+        con = runner.db()
+        try:
+            rows = con.execute(
+                "SELECT id FROM runs WHERE status = ? ORDER BY created_at", (status or "done",)
+            ).fetchall()
+        finally:
+            con.close()
+        selected = [r[0] for r in rows]
+    active = set(runner.job_queue().active_run_ids(runner.PIPELINE_JOB_KIND))
+    skipped = [r for r in selected if r in active]
+    if skipped:
+        logger.warning(f"BatchRegenerate: Skipping {len(skipped)} runs with an active pipeline job: {skipped}")
+    return [r for r in selected if r not in active]
+
+
+def regenerate_runs(runner, run_ids: List[str], provider, concurrency: int) -> Dict[str, str]:
+    """Run the pipeline of every run against `provider`. Returns final run status per run."""
+    from backend.ai.resilience import retry_budget_scope
+    from backend.config.settings import get_settings
+
+    def _run(run_id: str) -> None:
+        with retry_budget_scope(run_id):
+            runner.simulate_pipeline(run_id)
+
+    pipeline_settings = get_settings().pipeline
+    chapter_concurrency = pipeline_settings.chapter_concurrency
+    pipeline_settings.chapter_concurrency = max(chapter_concurrency, REGENERATE_CHAPTER_CONCURRENCY)
+    runner.pin_text_provider(provider)
+    try:
+        # Chapters only reach the batch while their run is in flight: use enough
+        # workers for the batches to be worth it
+        with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="BatchRun") as pool:
+            futures = {
+                run_id: pool.submit(contextvars.copy_context().run, _run, run_id)
+                for run_id in run_ids
+            }
+            for run_id, future in futures.items():
+                try:
+                    future.result()
+                except Exception as e:
+                    logger.error(f"BatchRegenerate: Run {run_id} failed: {e}")
+                    runner.update_run(run_id, status="error")
+    finally:
+        runner.pin_text_provider(None)
+        pipeline_settings.chapter_concurrency = chapter_concurrency
+
+    results = {}
+    for run_id in run_ids:
+        row = runner.get_run_row(run_id)
+        results[run_id] = row["status"] if row else "missing"
+    return results
+
+
+def build_batching_provider(
+    backend_name: str,
+    model: Optional[str] = None,
+    collect_window_seconds: float = 5.0,
+    max_batch_size: int = 1000,
+    poll_interval_seconds: float = 30.0
+):
+    """BatchingProvider for 'openai', 'anthropic' or 'local' (answers via the current provider)."""
+    from backend.ai.ai_authority import get_ai_authority
+    from backend.ai.batch import BatchingProvider, make_batch_backend
+
+    authority = get_ai_authority()
+    fallback = authority.create_text_provider()
+    backend = make_batch_backend(backend_name, model=model, responder=fallback)
+    default_model = model or getattr(getattr(backend, "provider", None), "default_model", None)
+    return BatchingProvider(
+        backend,
+        default_model=default_model or getattr(fallback, "default_model", None),
+        fallback=fallback,
+        collect_window_seconds=collect_window_seconds,
+        max_batch_size=max_batch_size,
+        poll_interval_seconds=poll_interval_seconds,
+    )
+
+
+# =============================================================================
+# STANDALONE ENTRYPOINT
+# =============================================================================
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Re-generate reports through a provider batch API")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--runs", nargs="+", help="Run ids to re-generate")
+    target.add_argument("--status", help="Re-generate all runs with this status (e.g. done)")
+    parser.add_argument("--backend", choices=("openai", "anthropic", "local"), default="openai",
+                        help="Batch API to submit to (local: in-process dry run)")
+    parser.add_argument("--model", default=None, help="Model for the batch requests (default: provider default)")
+    parser.add_argument("--concurrency", type=int, default=16, help="Pipelines running at the same time")
+    parser.add_argument("--collect-window", type=float, default=5.0,
+                        help="Seconds without new requests before a batch is submitted")
+    parser.add_argument("--max-batch-size", type=int, default=1000)
+    parser.add_argument("--poll-interval", type=float, default=30.0, help="Seconds between batch status checks")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    # Only the pipeline runner: no FastAPI app is built for offline regeneration
+    from backend import pipeline_runner as runner
+    runner.init_db()
+
+    run_ids = select_runs(runner, args.runs, args.status)
+    if not run_ids:
+        logger.info("BatchRegenerate: No runs to re-generate")
+        return 0
+
+    provider = build_batching_provider(
+        args.backend,
+        model=args.model,
+        collect_window_seconds=args.collect_window,
+        max_batch_size=args.max_batch_size,
+        poll_interval_seconds=args.poll_interval,
+    )
+    logger.info(f"BatchRegenerate: Re-generating {len(run_ids)} runs via {args.backend} batches")
+    try:
+        results = regenerate_runs(runner, run_ids, provider, args.concurrency)
+    finally:
+        provider.stop()
+
+    for run_id, status in results.items():
+        logger.info(f"BatchRegenerate: {run_id}: {status}")
+    logger.info(f"BatchRegenerate: {provider.stats['batches']} batches, {provider.stats['requests']} requests, "
+                f"{provider.stats['failed_requests']} failed")
+    return 0 if all(s == "done" for s in results.values()) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
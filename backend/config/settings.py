@@ -9,12 +9,14 @@ See docs/CONFIGURATION.md for complete documentation.
 
 from pydantic_settings import BaseSettings, SettingsConfigDict, PydanticBaseSettingsSource
 from pydantic import Field, AliasChoices
-from typing import Optional, Dict, Any, Type, Tuple
+from typing import Optional, Dict, Any, Literal, Type, Tuple
 from pathlib import Path
 import json
 import sqlite3
 import os
 
+from backend.storage import sqlite_pool
+
 class SQLiteSettingsSource(PydanticBaseSettingsSource):
     """
     A custom settings source that loads configuration from a SQLite kv_store table.
@@ -46,7 +48,7 @@ class SQLiteSettingsSource(PydanticBaseSettingsSource):
                 return d
 
         try:
-            conn = sqlite3.connect(db_path)
+            conn = sqlite_pool.connect(db_path)
             conn.row_factory = sqlite3.Row
             cur = conn.cursor()
             
@@ -101,6 +103,35 @@ class AISettings(BaseSettings):
     temperature: float = 0.7  # Generation temperature
     max_tokens: int = 4096  # Max response tokens
 
+    # Response cache (backend/ai/response_cache.py)
+    response_cache_enabled: bool = True  # Serve identical prompts from cache
+    response_cache_ttl_seconds: int = 7 * 24 * 3600  # Entries older than this are not served
+    response_cache_max_mb: int = 64  # LRU eviction above this total size
+    response_cache_max_temperature: float = 0.7  # Calls sampled at a higher temperature are not cached
+    stream_narratives: bool = True  # Stream chapter text to the live status channel while generating
+    narrative_group_size: int = 4  # Fast mode: chapters per narrative request (1 = one request per chapter)
+    prompt_caching: bool = True  # Provider-side caching of the shared system prefix (backend/ai/prompt_cache.py)
+    image_queue_concurrency: int = 3  # Hero images generated at once in the background queue (backend/ai/image_queue.py); 0 = inline
+    image_cache_enabled: bool = True  # Reuse generated images for identical prompts (backend/ai/image_cache.py)
+    image_cache_max_entries: int = 4096  # LRU eviction of cache entries (prompt -> image asset) above this count
+
+    # Ollama model residency (backend/ai/ollama_guard.py)
+    ollama_keep_alive_seconds: int = 300  # Idle window a model stays loaded; 0 = unload after every request
+    ollama_unload_after_run: bool = True  # Unload resident models when the last active run finishes
+    ollama_min_free_memory_mb: int = 0  # Local Ollama only: below this free memory, don't keep new models loaded; 0 = no check
+
+    # Provider admission control (backend/ai/rate_limiter.py)
+    rate_limit_enabled: bool = True  # Queue provider calls against per-provider/model budgets
+    rate_limit_max_wait_seconds: float = 300.0  # Give up (RateLimitTimeout) after queueing this long
+    rate_limits: Dict[str, Dict[str, int]] = {}  # Overrides keyed "provider" or "provider/model"
+
+    # Retries and hedging (backend/ai/resilience.py)
+    retry_max_attempts: int = 3  # Attempts per call for transient errors (1 = no retries)
+    retry_base_delay_seconds: float = 1.0  # First backoff; doubles per attempt, jittered
+    retry_max_delay_seconds: float = 20.0  # Backoff ceiling
+    retry_budget_per_run: int = 20  # Extra calls (retries + hedges) one pipeline run may spend
+    hedge_after_seconds: float = 0.0  # Send a second identical request after this latency; 0 = off
+
     # API keys - use Field with validation_alias to accept both prefixed and non-prefixed
     openai_api_key: Optional[str] = Field(
         default=None,
@@ -194,10 +225,23 @@ class PipelineSettings(BaseSettings):
     - App.tsx:103 (poll_interval_ms - frontend reference only)
     """
 
-    max_workers: int = 10  # ThreadPoolExecutor max workers
-    image_max_size_mb: int = 10  # Maximum upload file size
+    max_workers: int = 10  # Parallel pipeline runs (embedded job worker slots)
+    chapter_concurrency: int = 4  # Chapters generated in parallel per run (1 = sequential; provider calls still queue on rate_limits)
+    async_spine: bool = False  # Prefetch a run's narratives and hero images concurrently on the shared event loop (the run keeps its worker thread)
+    image_max_size_mb: int = 10  # Maximum upload / downloaded photo size
+    vision_image_max_px: int = 768  # Longest side of photos sent to vision models (backend/pipeline/media_ingest.py)
+    thumbnail_max_px: int = 320  # Longest side of UI thumbnails
+    media_download_concurrency: int = 8  # Parallel photo downloads (pooled HTTP connections)
+    asset_max_mb: int = 2048  # Stored media budget; unreferenced assets are deleted above it (0 = unlimited)
     poll_interval_ms: int = 2000  # Frontend status poll interval (reference)
 
+    # Durable job queue (backend/storage/job_queue.py)
+    worker_mode: Literal["embedded", "external"] = "embedded"  # external: run `python -m backend.worker`
+    job_lease_seconds: int = 120  # Lease length; extended by worker heartbeats
+    job_max_attempts: int = 3  # Attempts before a job is marked dead
+    job_retry_base_seconds: float = 10.0  # Backoff after the first failure, doubled per attempt
+    job_poll_interval_ms: int = 1000  # Idle worker poll interval (jobs from other processes)
+
     model_config = SettingsConfigDict(env_prefix="PIPELINE_")
 
 
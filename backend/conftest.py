@@ -11,6 +11,10 @@ backend_dir = Path(__file__).parent
 if str(backend_dir) not in sys.path:
     sys.path.insert(0, str(backend_dir))
 
+# Mocked providers must not see each other's answers through the response cache;
+# cache tests construct their own ResponseCache instances.
+os.environ.setdefault("AI_RESPONSE_CACHE_ENABLED", "false")
+
 
 @pytest.fixture(scope="session", autouse=True)
 def setup_test_environment():
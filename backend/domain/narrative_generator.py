@@ -24,7 +24,7 @@ DOES NOT:
 
 import json
 import logging
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, List, Optional, Tuple
 from datetime import datetime
 from pydantic import BaseModel, Field, field_validator
 
@@ -190,6 +190,122 @@ No repetition.
 """
 
 
+# =============================================================================
+# STREAMING PREVIEW (live status only - never stored)
+# =============================================================================
+
+# Receives (partial narrative text, word count so far)
+PartialNarrativeCallback = Callable[[str, int], None]
+
+_JSON_ESCAPES = {'"': '"', '\\': '\\', '/': '/', 'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t'}
+
+
+def _text_value_start(buffer: str) -> Optional[int]:
+    """Index just past the opening quote of the "text" value, or None if not there yet."""
+    key = buffer.find('"text"')
+    if key < 0:
+        return None
+    i = buffer.find(':', key + 6)
+    if i < 0:
+        return None
+    i = buffer.find('"', i + 1)
+    if i < 0:
+        return None
+    return i + 1
+
+
+def _decode_string_from(buffer: str, i: int) -> Tuple[str, int, bool]:
+    """
+    Decode a JSON string body from index i as far as the buffer allows.
+
+    Returns (decoded text, index to resume from, whether the closing quote
+    was reached). An incomplete escape at the end stops before it.
+    """
+    out: List[str] = []
+    while i < len(buffer):
+        ch = buffer[i]
+        if ch == '"':
+            return "".join(out), i, True
+        if ch != '\\':
+            out.append(ch)
+            i += 1
+            continue
+        if i + 1 >= len(buffer):
+            break
+        esc = buffer[i + 1]
+        if esc == 'u':
+            hex_digits = buffer[i + 2:i + 6]
+            if len(hex_digits) < 4:
+                break
+            try:
+                out.append(chr(int(hex_digits, 16)))
+            except ValueError:
+                pass
+            i += 6
+            continue
+        out.append(_JSON_ESCAPES.get(esc, esc))
+        i += 2
+    return "".join(out), i, False
+
+
+def extract_partial_text(buffer: str) -> Optional[str]:
+    """
+    Decode the (possibly unterminated) "text" string of a streaming JSON response.
+
+    Returns None until the "text" value has started. Incomplete escape
+    sequences at the end of the buffer are left for the next call.
+    """
+    start = _text_value_start(buffer)
+    if start is None:
+        return None
+    return _decode_string_from(buffer, start)[0]
+
+
+class NarrativeStreamForwarder:
+    """
+    Collects streamed chunks and forwards the growing narrative text.
+
+    Each chunk is decoded once: the buffer only keeps what could not be
+    decoded yet (an unfinished escape). Forwarding is throttled to every min_chars of new
+    text; failures of the callback are logged and never break generation.
+    """
+
+    def __init__(self, on_partial: PartialNarrativeCallback, min_chars: int = 200):
+        self.on_partial = on_partial
+        self.min_chars = min_chars
+        self._buffer = ""
+        self._pos: Optional[int] = None  # resume index inside the "text" value
+        self._closed = False
+        self._text_parts: List[str] = []
+        self._text_len = 0
+        self._forwarded = 0
+
+    def feed(self, chunk: str) -> None:
+        if self._closed:
+            return
+        self._buffer += chunk
+        if self._pos is None:
+            self._pos = _text_value_start(self._buffer)
+            if self._pos is None:
+                return
+        decoded, self._pos, self._closed = _decode_string_from(self._buffer, self._pos)
+        # Keep only an unfinished escape sequence for the next chunk
+        self._buffer = self._buffer[self._pos:]
+        self._pos = 0
+        if decoded:
+            self._text_parts.append(decoded)
+            self._text_len += len(decoded)
+        if self._text_len - self._forwarded < self.min_chars:
+            return
+        text = "".join(self._text_parts)
+        self._text_parts = [text]
+        self._forwarded = self._text_len
+        try:
+            self.on_partial(text, len(text.split()))
+        except Exception as e:
+            logger.warning(f"NarrativeStreamForwarder: Forwarding partial text failed: {e}")
+
+
 # =============================================================================
 # NARRATIVE GENERATOR (SINGLE RESPONSIBILITY)
 # =============================================================================
@@ -213,19 +329,29 @@ class NarrativeGenerator:
     CHAPTER_MIN_WORDS = 300
     DASHBOARD_MIN_WORDS = 500
     
+    # Response budget per chapter in a multi-chapter request (~500 words + JSON)
+    GROUP_MAX_TOKENS_PER_CHAPTER = 1200
+    
     @classmethod
     def generate(
         cls,
         chapter_id: int,
         context: Dict[str, Any],
-        ai_provider: Optional[Any] = None
+        ai_provider: Optional[Any] = None,
+        on_partial: Optional[PartialNarrativeCallback] = None
     ) -> NarrativeOutput:
         """
         Generate narrative for a chapter.
+        
+        on_partial (optional) receives the narrative text while it streams in,
+        for live progress only. The returned narrative is still parsed and
+        word-count checked from the complete response.
         """
         logger.info(f"NarrativeGenerator: Generating narrative for Chapter {chapter_id}")
         
-        # Build the user prompt with chapter context
+        # Shared prefix (identical for every chapter of a run, cached by the
+        # provider) + the chapter-specific context
+        system_prompt = cls._build_system_prompt(context)
         user_prompt = cls._build_user_prompt(chapter_id, context)
         
         # Try AI generation if provider available
@@ -234,9 +360,10 @@ class NarrativeGenerator:
                 narrative = cls._generate_with_ai(
                     ai_provider, 
                     user_prompt, 
-                    NARRATIVE_SYSTEM_PROMPT,
+                    system_prompt,
                     cls.CHAPTER_MIN_WORDS,
-                    context
+                    context,
+                    on_partial=on_partial
                 )
                 return narrative
             except Exception as e:
@@ -247,11 +374,34 @@ class NarrativeGenerator:
         narrative = cls._generate_template_narrative(chapter_id, context)
         return narrative
     
+    @classmethod
+    async def generate_ai_async(
+        cls,
+        chapter_id: int,
+        context: Dict[str, Any],
+        ai_provider: Any
+    ) -> NarrativeOutput:
+        """
+        Generate a chapter narrative with AI, awaiting the provider (async pipeline path).
+        
+        Unlike generate() there is no template fallback: errors propagate, so
+        the caller can leave the chapter to the regular path.
+        """
+        logger.info(f"NarrativeGenerator: Generating narrative for Chapter {chapter_id} (async)")
+        return await cls._request_with_ai(
+            ai_provider,
+            cls._build_user_prompt(chapter_id, context),
+            cls._build_system_prompt(context),
+            cls.CHAPTER_MIN_WORDS,
+            context
+        )
+    
     @classmethod
     def generate_dashboard(
         cls,
         context: Dict[str, Any],
-        ai_provider: Optional[Any] = None
+        ai_provider: Optional[Any] = None,
+        on_partial: Optional[PartialNarrativeCallback] = None
     ) -> NarrativeOutput:
         """
         Generate narrative for the dashboard (decision memo).
@@ -270,7 +420,8 @@ class NarrativeGenerator:
                     user_prompt,
                     DASHBOARD_SYSTEM_PROMPT,
                     cls.DASHBOARD_MIN_WORDS,
-                    context
+                    context,
+                    on_partial=on_partial
                 )
                 return narrative
             except Exception as e:
@@ -281,16 +432,91 @@ class NarrativeGenerator:
         return cls._generate_dashboard_fallback(context)
     
     @classmethod
-    def _build_user_prompt(cls, chapter_id: int, context: Dict[str, Any]) -> str:
-        """Build the user prompt for AI chapter narrative."""
+    def generate_group(
+        cls,
+        chapter_contexts: Dict[int, Dict[str, Any]],
+        ai_provider: Any
+    ) -> Dict[int, NarrativeOutput]:
+        """
+        Generate narratives for several chapters in ONE JSON-mode call.
         
-        goal = CHAPTER_GOALS.get(chapter_id, f"Chapter {chapter_id} analysis")
+        Every chapter in the response is validated independently; only the
+        chapters that parse and meet the word minimum are returned. Callers
+        generate the missing ones individually with generate().
+        
+        Raises NarrativeGenerationError if the call fails or the response
+        is not a multi-chapter JSON object.
+        """
+        from backend.ai.bridge import safe_execute_async
+        return safe_execute_async(cls.generate_group_async(chapter_contexts, ai_provider))
+    
+    @classmethod
+    async def generate_group_async(
+        cls,
+        chapter_contexts: Dict[int, Dict[str, Any]],
+        ai_provider: Any
+    ) -> Dict[int, NarrativeOutput]:
+        """Async variant of generate_group() for the async pipeline path."""
+        chapter_ids = sorted(chapter_contexts)
+        logger.info(f"NarrativeGenerator: Generating narratives for Chapters {chapter_ids} in one request")
         
-        # Extract preferences
+        # All chapters of a run share the preferences: one cacheable prefix
+        first_context = chapter_contexts[chapter_ids[0]]
+        system_prompt = cls._build_system_prompt(first_context)
+        user_prompt = cls._build_group_prompt(chapter_contexts)
+        min_words = cls.CHAPTER_MIN_WORDS
+        
+        from backend.ai.response_cache import cache_validation
+        
+        def _validate_complete(text: str) -> None:
+            # Only fully valid group responses are cached
+            narratives = cls._parse_group_response(text, chapter_ids, min_words)
+            if len(narratives) != len(chapter_ids):
+                raise NarrativeGenerationError("Incomplete multi-chapter response")
+        
+        try:
+            with cache_validation(_validate_complete):
+                response_text = await ai_provider.generate(
+                    user_prompt,
+                    system=system_prompt,
+                    model=cls._resolve_json_model(ai_provider, first_context),
+                    json_mode=True,
+                    max_tokens=cls.GROUP_MAX_TOKENS_PER_CHAPTER * len(chapter_ids)
+                )
+        except Exception as e:
+            raise NarrativeGenerationError(f"Multi-chapter request failed: {e}") from e
+        
+        if not response_text:
+            raise NarrativeGenerationError("AI returned empty response")
+        
+        return cls._parse_group_response(response_text, chapter_ids, min_words)
+    
+    @classmethod
+    def _build_system_prompt(cls, context: Dict[str, Any]) -> str:
+        """
+        Build the cacheable prefix: system prompt + Marcel & Petra's preferences.
+        
+        Identical for all chapters of a run (keys sorted), so providers with
+        prompt caching only process it once.
+        """
         preferences = context.get('_preferences', {})
         marcel_prefs = preferences.get('marcel', {})
         petra_prefs = preferences.get('petra', {})
         
+        return f"""{NARRATIVE_SYSTEM_PROMPT}
+MARCEL'S PREFERENCES:
+{json.dumps(marcel_prefs, default=str, indent=2, sort_keys=True)}
+
+PETRA'S PREFERENCES:
+{json.dumps(petra_prefs, default=str, indent=2, sort_keys=True)}
+"""
+
+    @classmethod
+    def _build_user_prompt(cls, chapter_id: int, context: Dict[str, Any]) -> str:
+        """Build the chapter-specific part of the prompt (preferences are in the system prompt)."""
+        
+        goal = CHAPTER_GOALS.get(chapter_id, f"Chapter {chapter_id} analysis")
+        
         # Build variables section
         variables = {k: v for k, v in context.items() 
                     if not k.startswith('_') and k not in ['description', 'features', 'media_urls']}
@@ -322,12 +548,6 @@ KPIs:
 UNCERTAINTIES (Missing or Unknown Data):
 {json.dumps(uncertainties, default=str)}
 
-MARCEL'S PREFERENCES:
-{json.dumps(marcel_prefs, default=str, indent=2)}
-
-PETRA'S PREFERENCES:
-{json.dumps(petra_prefs, default=str, indent=2)}
-
 TASK:
 Write a continuous narrative of at least 300 words explaining what these variables 
 and KPIs mean for Marcel & Petra's decision-making. Focus on relationships, 
@@ -337,6 +557,52 @@ include their scores, percentages, or points in the narrative text.
 """
         return prompt
 
+    @classmethod
+    def _build_group_prompt(cls, chapter_contexts: Dict[int, Dict[str, Any]]) -> str:
+        """Per-chapter prompts of a group plus the multi-chapter output format."""
+        chapter_ids = sorted(chapter_contexts)
+        sections = "\n".join(
+            cls._build_user_prompt(chapter_id, chapter_contexts[chapter_id])
+            for chapter_id in chapter_ids
+        )
+        example = {
+            "chapters": {
+                str(chapter_id): {"text": "...", "word_count": 0} for chapter_id in chapter_ids
+            }
+        }
+        return f"""{sections}
+MULTI-CHAPTER OUTPUT FORMAT (replaces the single-chapter format):
+Write one separate narrative per chapter above, each following every rule of
+the contract on its own (at least 300 words each). Return a single JSON object
+with one entry per chapter id:
+{json.dumps(example)}
+"""
+
+    @classmethod
+    def _parse_group_response(
+        cls,
+        response_text: str,
+        chapter_ids: List[int],
+        min_words: int
+    ) -> Dict[int, NarrativeOutput]:
+        """Valid narratives of a multi-chapter response, keyed by chapter id."""
+        result = cls._load_json_response(response_text)
+        entries = result.get('chapters') if isinstance(result, dict) else None
+        if not isinstance(entries, dict):
+            raise NarrativeGenerationError("Multi-chapter response has no 'chapters' object")
+        
+        narratives = {}
+        for chapter_id in chapter_ids:
+            entry = entries.get(str(chapter_id))
+            if entry is None:
+                logger.warning(f"NarrativeGenerator: Chapter {chapter_id} missing from multi-chapter response")
+                continue
+            try:
+                narratives[chapter_id] = cls._narrative_from_result(entry, min_words)
+            except (NarrativeGenerationError, NarrativeWordCountError) as e:
+                logger.warning(f"NarrativeGenerator: Chapter {chapter_id} rejected from multi-chapter response: {e}")
+        return narratives
+
     @classmethod
     def _build_dashboard_prompt(cls, context: Dict[str, Any]) -> str:
         """Build the user prompt for Dashboard narrative."""
@@ -370,12 +636,61 @@ persona alignment, and next steps.
         user_prompt: str,
         system_prompt: str,
         min_words: int,
-        context: Dict[str, Any]
+        context: Dict[str, Any],
+        on_partial: Optional[PartialNarrativeCallback] = None
     ) -> NarrativeOutput:
         """Generate narrative using AI provider."""
-        
         from backend.ai.bridge import safe_execute_async
+        return safe_execute_async(cls._request_with_ai(
+            ai_provider, user_prompt, system_prompt, min_words, context, on_partial=on_partial
+        ))
+    
+    @classmethod
+    async def _request_with_ai(
+        cls,
+        ai_provider: Any,
+        user_prompt: str,
+        system_prompt: str,
+        min_words: int,
+        context: Dict[str, Any],
+        on_partial: Optional[PartialNarrativeCallback] = None
+    ) -> NarrativeOutput:
+        """Await the AI response and parse it into a word-count checked narrative."""
+        model = cls._resolve_json_model(ai_provider, context)
+            
+        # Content-addressed cache (CachingProvider around the run's provider):
+        # identical prompts on a re-run are served without a provider call.
+        # Only responses that parse and meet the word minimum are stored.
+        # Streaming only feeds the live preview; validation below uses the full text.
+        # Duck-typed providers without the AIProvider interface keep plain generate().
+        from backend.ai.provider_interface import AIProvider
+        on_delta = None
+        if on_partial is not None and isinstance(ai_provider, AIProvider) and cls._streaming_enabled():
+            on_delta = NarrativeStreamForwarder(on_partial).feed
+
+        from backend.ai.response_cache import cache_validation
+        with cache_validation(lambda text: cls._parse_narrative_response(text, min_words)):
+            if on_delta is None:
+                response_text = await ai_provider.generate(
+                    user_prompt, system=system_prompt, model=model, json_mode=True
+                )
+            else:
+                parts: List[str] = []
+                async for chunk in ai_provider.generate_stream(
+                    user_prompt, system=system_prompt, model=model, json_mode=True
+                ):
+                    parts.append(chunk)
+                    on_delta(chunk)
+                response_text = "".join(parts)
+        
+        if not response_text:
+            raise NarrativeGenerationError("AI returned empty response")
         
+        return cls._parse_narrative_response(response_text, min_words)
+    
+    @staticmethod
+    def _resolve_json_model(ai_provider: Any, context: Dict[str, Any]) -> str:
+        """The user's model if it supports JSON mode, else a JSON-capable model of the provider."""
         # Models that reliably support JSON mode
         JSON_CAPABLE_MODELS = {
             'openai': 'gpt-4o-mini',
@@ -384,39 +699,41 @@ persona alignment, and next steps.
             'ollama': 'llama3'
         }
         
-        async def _async_generate():
-            # Get the provider name
-            p_name = getattr(ai_provider, 'name', 'openai')
-            
-            # IMPORTANT: Always use a JSON-capable model for narrative generation
-            # User preference for legacy models (gpt-4, gpt-3.5-turbo) doesn't work
-            # for structured JSON output
-            user_model = context.get('_preferences', {}).get('ai_model', '')
-            
-            # Check if user's preferred model supports JSON mode
-            json_capable_patterns = ['gpt-4o', 'gpt-4-turbo', 'gpt-4-1106', 'gemini', 'claude', 'llama']
-            model_supports_json = any(pattern in user_model for pattern in json_capable_patterns) if user_model else False
-            
-            if model_supports_json:
-                model = user_model
-            else:
-                # Force a JSON-capable model
-                model = JSON_CAPABLE_MODELS.get(p_name, 'gpt-4o-mini')
-                logger.info(f"NarrativeGenerator: Overriding model to {model} (user's {user_model} doesn't support JSON)")
-                
-            response = await ai_provider.generate(
-                user_prompt,
-                system=system_prompt,
-                model=model,
-                json_mode=True
-            )
-            return response
+        # Get the provider name
+        p_name = getattr(ai_provider, 'name', 'openai')
         
-        response_text = safe_execute_async(_async_generate())
+        # IMPORTANT: Always use a JSON-capable model for narrative generation
+        # User preference for legacy models (gpt-4, gpt-3.5-turbo) doesn't work
+        # for structured JSON output
+        user_model = context.get('_preferences', {}).get('ai_model', '')
         
-        if not response_text:
-            raise NarrativeGenerationError("AI returned empty response")
+        # Check if user's preferred model supports JSON mode
+        json_capable_patterns = ['gpt-4o', 'gpt-4-turbo', 'gpt-4-1106', 'gemini', 'claude', 'llama']
+        model_supports_json = any(pattern in user_model for pattern in json_capable_patterns) if user_model else False
         
+        if model_supports_json:
+            return user_model
+        # Force a JSON-capable model
+        model = JSON_CAPABLE_MODELS.get(p_name, 'gpt-4o-mini')
+        logger.info(f"NarrativeGenerator: Overriding model to {model} (user's {user_model} doesn't support JSON)")
+        return model
+    
+    @staticmethod
+    def _streaming_enabled() -> bool:
+        try:
+            from backend.config.settings import get_settings
+            return get_settings().ai.stream_narratives
+        except Exception:
+            return False
+    
+    @classmethod
+    def _parse_narrative_response(cls, response_text: str, min_words: int) -> NarrativeOutput:
+        """Parse a JSON narrative response and enforce the minimum word count."""
+        return cls._narrative_from_result(cls._load_json_response(response_text), min_words)
+    
+    @staticmethod
+    def _load_json_response(response_text: str) -> Any:
+        """Decode a JSON response, tolerating markdown fences and control characters."""
         # Parse JSON response with robust error handling
         try:
             # Clean markdown code blocks if present
@@ -430,23 +747,29 @@ persona alignment, and next steps.
             import re
             clean_text = re.sub(r'[\x00-\x1f\x7f-\x9f]', ' ', clean_text.strip())
             
-            result = json.loads(clean_text)
-            
-            text = result.get('text', '')
-            word_count = result.get('word_count', len(text.split()))
-            
-            # Validate minimum word count
-            if word_count < min_words:
-                raise NarrativeWordCountError(
-                    f"Narrative too short: {word_count} words "
-                    f"(minimum {min_words})"
-                )
-            
-            return NarrativeOutput(text=text, word_count=word_count)
+            return json.loads(clean_text)
             
         except json.JSONDecodeError as e:
             raise NarrativeGenerationError(f"Failed to parse AI response as JSON: {e}")
     
+    @staticmethod
+    def _narrative_from_result(result: Any, min_words: int) -> NarrativeOutput:
+        """Build a NarrativeOutput from a decoded {"text", "word_count"} object."""
+        if not isinstance(result, dict):
+            raise NarrativeGenerationError("AI response is not a narrative object")
+        
+        text = result.get('text', '')
+        word_count = result.get('word_count', len(text.split()))
+        
+        # Validate minimum word count
+        if word_count < min_words:
+            raise NarrativeWordCountError(
+                f"Narrative too short: {word_count} words "
+                f"(minimum {min_words})"
+            )
+        
+        return NarrativeOutput(text=text, word_count=word_count)
+    
     @classmethod
     def _generate_template_narrative(
         cls, 
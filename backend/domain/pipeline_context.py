@@ -12,7 +12,7 @@ INVARIANTS:
 """
 
 from dataclasses import dataclass, field
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterable, List, Optional, Set
 from datetime import datetime
 import logging
 
@@ -33,6 +33,16 @@ class PipelineViolation(Exception):
     pass
 
 
+class PipelineCancelled(Exception):
+    """Raised at a pipeline checkpoint when the run was superseded by a newer start."""
+    pass
+
+
+class PipelineRetryable(Exception):
+    """Raised when a pipeline attempt failed transiently and its job should be retried."""
+    pass
+
+
 class ValidationFailure(Exception):
     """Raised when validation gate rejects chapter output."""
     def __init__(self, chapter_id: int, errors: List[str]):
@@ -81,9 +91,24 @@ class PipelineContext:
     # Dashboard output (populated after dashboard generation)
     _dashboard_output: Optional[Dict[str, Any]] = field(default=None, repr=False)
     
+    # Narratives generated ahead of their chapter (multi-chapter requests, fast mode);
+    # consumed once by the chapter generator, which still validates them
+    _prefetched_narratives: Dict[int, Any] = field(default_factory=dict, repr=False)
+    
+    # Chapters whose narrative was already requested ahead (async pipeline path);
+    # the sync multi-chapter prefetch does not request them again
+    _narrative_prefetch_attempted: Set[int] = field(default_factory=set, repr=False)
+    
+    # Hero image results generated ahead of their chapter (async pipeline path)
+    _prefetched_images: Dict[int, Any] = field(default_factory=dict, repr=False)
+    
     # Preferences (user-defined, not from registry)
     preferences: Dict[str, Any] = field(default_factory=dict)
     
+    # AI provider for this run (backend.ai.provider_registry.ProviderHandle),
+    # resolved once at pipeline start; None = the process-wide provider
+    provider_handle: Optional[Any] = field(default=None, repr=False)
+    
     # === MANDATORY BACKBONE CONTRACT ===
     # CoreSummary is built AFTER enrichment, BEFORE chapter generation
     # It is NEVER derived from AI or chapters - only from registry
@@ -246,6 +271,36 @@ class PipelineContext:
         """Get all validated chapter outputs."""
         return self._validated_chapters.copy()
         
+    def store_prefetched_narrative(self, chapter_id: int, narrative: Any) -> None:
+        """Park a narrative generated ahead of its chapter. The registry must be locked."""
+        if not self._registry_locked:
+            raise PipelineViolation("Cannot prefetch narratives before the registry is locked")
+        self._prefetched_narratives[chapter_id] = narrative
+    
+    def has_prefetched_narrative(self, chapter_id: int) -> bool:
+        return chapter_id in self._prefetched_narratives
+    
+    def take_prefetched_narrative(self, chapter_id: int) -> Optional[Any]:
+        """Remove and return the prefetched narrative of a chapter, if any."""
+        return self._prefetched_narratives.pop(chapter_id, None)
+    
+    def mark_narrative_prefetch_attempted(self, chapter_ids: Iterable[int]) -> None:
+        """Record that narratives of these chapters were requested ahead (successful or not)."""
+        self._narrative_prefetch_attempted.update(chapter_ids)
+    
+    def narrative_prefetch_attempted(self, chapter_id: int) -> bool:
+        return chapter_id in self._narrative_prefetch_attempted
+    
+    def store_prefetched_image(self, chapter_id: int, result: Any) -> None:
+        """Park a hero image result generated ahead of its chapter. The registry must be locked."""
+        if not self._registry_locked:
+            raise PipelineViolation("Cannot prefetch images before the registry is locked")
+        self._prefetched_images[chapter_id] = result
+    
+    def take_prefetched_image(self, chapter_id: int) -> Optional[Any]:
+        """Remove and return the prefetched hero image result of a chapter, if any."""
+        return self._prefetched_images.pop(chapter_id, None)
+    
     def store_dashboard(self, output: Dict[str, Any]) -> None:
         """Store validated dashboard output."""
         self._dashboard_output = output
@@ -254,12 +309,21 @@ class PipelineContext:
         """Get dashboard output."""
         return self._dashboard_output.copy() if self._dashboard_output else None
     
+    @property
+    def ai_provider(self) -> Optional[Any]:
+        """The provider bound to this run, if a handle was given."""
+        return self.provider_handle.provider if self.provider_handle is not None else None
+    
     def get_incomplete_entries(self) -> List[str]:
         """Get list of registry entries marked as incomplete or uncertain."""
         return self.registry.validate_completeness()
 
 
-def create_pipeline_context(run_id: str, preferences: Optional[Dict[str, Any]] = None) -> PipelineContext:
+def create_pipeline_context(
+    run_id: str,
+    preferences: Optional[Dict[str, Any]] = None,
+    provider_handle: Optional[Any] = None
+) -> PipelineContext:
     """
     Factory function to create a new pipeline context.
     
@@ -267,7 +331,8 @@ def create_pipeline_context(run_id: str, preferences: Optional[Dict[str, Any]] =
     """
     ctx = PipelineContext(
         run_id=run_id,
-        preferences=preferences or {}
+        preferences=preferences or {},
+        provider_handle=provider_handle
     )
     logger.info(f"Pipeline [{run_id}]: Context created.")
     return ctx
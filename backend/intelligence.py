@@ -118,10 +118,16 @@ class IntelligenceEngine:
         cls._provider = provider
 
     @staticmethod
-    def generate_chapter_narrative(chapter_id: int, ctx: Dict[str, Any]) -> Dict[str, str]:
+    def generate_chapter_narrative(
+        chapter_id: int,
+        ctx: Dict[str, Any],
+        ai_provider: Optional[AIProvider] = None
+    ) -> Dict[str, str]:
         """
         Returns a dictionary with 'title', 'intro', 'main_analysis', and 'conclusion'.
         
+        ai_provider: the run's provider; defaults to the process-wide one.
+        
         STRICT DELEGATION TO NARRATIVE GENERATOR:
         - Calls NarrativeGenerator.generate() which enforces 300-word contract and fail-closed behavior.
         - If AI fails or is missing, this method RAISES an error.
@@ -177,8 +183,10 @@ class IntelligenceEngine:
         # 1. Get Structural Skeleton (Title, Intro)
         structure = get_registry_only_narrative(chapter_id, data)
         
+        provider = ai_provider or IntelligenceEngine._provider
+        
         # 2. FAIL-CLOSED CHECK: Provider must be present
-        if not IntelligenceEngine._provider:
+        if not provider:
             from backend.domain.governance_state import get_governance_state
             from backend.domain.guardrails import PolicyLevel
             
@@ -214,7 +222,7 @@ class IntelligenceEngine:
         narrative_output = NarrativeGenerator.generate(
             chapter_id=chapter_id, 
             context=data, 
-            ai_provider=IntelligenceEngine._provider
+            ai_provider=provider
         )
         
         # 4. Construct Result
@@ -233,8 +241,8 @@ class IntelligenceEngine:
                 "source": "ai_generated"
             },
             "_provenance": {
-                "provider": getattr(IntelligenceEngine._provider, 'name', 'unknown'),
-                "model": getattr(IntelligenceEngine._provider, 'default_model', 'unknown'),
+                "provider": getattr(provider, 'name', 'unknown'),
+                "model": getattr(provider, 'default_model', 'unknown'),
                 "confidence": "high",
                 "timestamp": datetime.now().isoformat(),
                 "request_count": IntelligenceEngine._request_count
@@ -249,7 +257,7 @@ class IntelligenceEngine:
                 # process_visuals is async. We are in a static blocking context? 
                 # generate_chapter_narrative is synchronous staticmethod
                 # NarrativeGenerator used safe_execute_async internaly. We need to do same here for visual audit.
-                vision_audit = safe_execute_async(IntelligenceEngine.process_visuals(data))
+                vision_audit = safe_execute_async(IntelligenceEngine.process_visuals(data, ai_provider=provider))
                 if vision_audit:
                      result["main_analysis"] = vision_audit + "\n\n" + result["main_analysis"]
             except Exception as e:
@@ -259,13 +267,16 @@ class IntelligenceEngine:
         return result
 
     @classmethod
-    async def process_visuals(cls, property_data: Dict[str, Any]) -> str:
+    async def process_visuals(cls, property_data: Dict[str, Any], ai_provider: Optional[Any] = None) -> str:
         """
         Multimodal "Vision" Audit: Analyzes property photos to detect maintenance state,
         quality of finish, and potential risks.
+        
+        ai_provider is the run's provider; without it the process-wide one is used.
         """
+        provider = ai_provider or cls._provider
         media_urls = property_data.get('media_urls', [])
-        if not media_urls or not cls._provider:
+        if not media_urls or not provider:
             return ""
 
         cls._request_count += 1
@@ -284,30 +295,21 @@ class IntelligenceEngine:
 
         user_prompt = "Hier zijn de foto's van de woning. Voer een visuele audit uit. Noem Marcel en Petra herhaaldelijk bij naam."
         
-        # Resolve local paths for files in /uploads/
-        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        resolved_paths = []
-        for url in media_urls[:10]:  # Limit to first 10 for performance
-            if url.startswith('/uploads/'):
-                filename = url.split('/')[-1]
-                path = os.path.join(base_dir, "data", "uploads", filename)
-                if os.path.exists(path):
-                    resolved_paths.append(path)
-                else:
-                    logger.warning(f"Vision Audit: Uploaded file not found at {path}")
-                    resolved_paths.append(url)
-            else:
-                resolved_paths.append(url)
+        # Stored vision-sized variants (downloaded/resized once per photo)
+        from backend.pipeline.media_ingest import get_media_ingestor
+        resolved_paths = await asyncio.to_thread(
+            get_media_ingestor().vision_inputs, media_urls[:10]  # Limit to first 10 for performance
+        )
 
         try:
             # Authority-based model resolution
             model = property_data.get('_preferences', {}).get('ai_model')
             if not model:
                  from backend.ai.ai_authority import get_ai_authority
-                 # Use authority default for current provider
-                 model = get_ai_authority().get_default_model(cls._provider.name)
+                 # The run provider's model, else the authority default for that provider
+                 model = getattr(provider, 'default_model', None) or get_ai_authority().get_default_model(provider.name)
             
-            audit = await cls._provider.generate(user_prompt, system=system_prompt, model=model, images=resolved_paths)
+            audit = await provider.generate(user_prompt, system=system_prompt, model=model, images=resolved_paths)
             return f"<div className='p-4 bg-blue-50/50 border border-blue-100 rounded-xl mb-6'><h4>🔍 Visuele Audit Insights</h4>{audit}</div>"
         except Exception as e:
             logger.error(f"Vision Audit failed: {e}")
@@ -12,7 +12,6 @@ _boot_logger = logging.getLogger("spine.boot")
 
 
 import json
-import sqlite3
 import time
 import uuid
 import re
@@ -22,9 +21,9 @@ import threading
 from datetime import datetime, timedelta
 import gc
 
-from fastapi import FastAPI, HTTPException, UploadFile, File, Response
+from fastapi import FastAPI, HTTPException, UploadFile, File, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse, StreamingResponse
+from fastapi.responses import FileResponse, HTMLResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 import sys
@@ -38,15 +37,42 @@ if str(BACKEND_DIR) not in sys.path:
     sys.path.append(str(BACKEND_DIR))
 
 from backend.__version__ import __version__
-from backend.scraper import Scraper
 from backend.parser import Parser
-from backend.consistency import ConsistencyChecker
 from backend.enrichment import DataEnricher
 from backend.chapters.registry import get_chapter_class
-from backend.intelligence import IntelligenceEngine
 from backend.ai.provider_factory import ProviderFactory
-from backend.ai.dynamic_extractor import DynamicExtractor
+from backend.ai.image_queue import get_image_queue
 from backend.config.settings import get_settings, reset_settings, AppSettings
+from backend.storage import sqlite_pool
+from backend.storage.run_artifacts import chapter_sort_key, chapter_title
+from backend.storage.asset_store import ASSET_CACHE_CONTROL, get_asset_store
+from backend.pipeline.media_ingest import MediaIngestError, close_media_ingestor, get_media_ingestor
+from backend.worker import JobWorker
+# Run storage and pipeline execution (shared with `python -m backend.worker`)
+from backend.pipeline_runner import (
+    PIPELINE_JOB_KIND,
+    STEPS,
+    artifact_store,
+    attach_queued_images,
+    build_pipeline_worker,
+    collect_unused_assets,
+    db,
+    default_steps,
+    get_kv,
+    get_run_row,
+    init_ai_provider,
+    init_db,
+    job_queue,
+    now,
+    pin_text_provider,
+    prefetch_run_media,
+    reload_ai_provider,
+    run_dynamic_extraction,
+    run_pipeline_job,
+    set_kv,
+    simulate_pipeline,
+    update_run,
+)
 from jinja2 import Environment, FileSystemLoader
 try:
     from weasyprint import HTML
@@ -64,95 +90,66 @@ settings = get_settings()
 BACKEND_DIR = Path(__file__).parent
 BASE_DIR = BACKEND_DIR.parent # Project root
 
-# Data paths (stay in project root or as specified by env)
-DEFAULT_DB_PATH = BASE_DIR / "data" / "local_app.db"
-DB_PATH = Path(os.environ.get("APP_DB", str(DEFAULT_DB_PATH)))
 UPLOAD_DIR = BASE_DIR / "data" / "uploads"
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
-# Ensure DB directory exists
-if not DB_PATH.parent.exists():
-    try:
-        DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    except Exception as e:
-        logger.error(f"Failed to create DB directory: {e}")
-
 CHAPTER_TITLES = settings.chapters.titles
 
-STEPS = (
-    "scrape_funda",           # Chapter 0, Chapter 1
-    "dynamic_extraction",      # AI Attribute Discovery
-    "compute_kpis",           # Calculations
-    "generate_chapters",      # Intelligence Engine
-    "render_pdf"              # Template & PDF
-)
+# =============================================================================
+# PIPELINE JOBS (durable queue; runs execute in backend/pipeline_runner.py)
+# =============================================================================
+
+_pipeline_worker: Optional[JobWorker] = None
+_pipeline_worker_lock = threading.Lock()
+
+def ensure_pipeline_worker() -> Optional[JobWorker]:
+    """Start the in-process worker unless runs are executed by an external worker."""
+    global _pipeline_worker
+    if settings.pipeline.worker_mode != "embedded":
+        return None
+    with _pipeline_worker_lock:
+        worker = _pipeline_worker
+        if worker is not None and worker.is_running and worker.queue is job_queue():
+            return worker
+        if worker is not None:
+            worker.stop()
+        _pipeline_worker = build_pipeline_worker(executor=executor)
+        _pipeline_worker.start()
+        return _pipeline_worker
+
+def enqueue_pipeline(run_id: str, supersede: bool = False, fresh: bool = False) -> str:
+    """
+    Schedule a pipeline run on the durable queue (single-flight). Returns the job id.
 
-# --- DATABASE ---
-def db():
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+    A repeated start attaches to the run's queued/running job. With
+    supersede=True (new input data) running work for this run - or for any
+    run of the same listing - is cancelled and a fresh job is queued.
+    With fresh=True a newly queued run does not read the AI response cache.
+    """
+    queue = job_queue()
+    row = get_run_row(run_id)
+    listing_key = normalize_funda_url(row["funda_url"]) if row and row["funda_url"] else None
+    worker = ensure_pipeline_worker()
+    if supersede:
+        stale = queue.request_cancel(PIPELINE_JOB_KIND, run_id=run_id, dedupe_key=listing_key)
+        if worker is not None:
+            worker.cancel(job["id"] for job in stale)
+        for job in stale:
+            if job["status"] == "queued" and job["run_id"] != run_id:
+                update_run(job["run_id"], status="cancelled")
+    # Until the new job starts, status readers (/live-status, /events) must
+    # not report the previous attempt's terminal status for this run
+    from backend.api.run_status import TERMINAL_STATUSES, reset_run_tracking
+    reset_run_tracking(run_id)
+    if row and row["status"] in TERMINAL_STATUSES:
+        update_run(run_id, status="queued")
+    job_id = queue.enqueue(
+        PIPELINE_JOB_KIND, run_id=run_id, dedupe_key=listing_key, payload={"fresh": True} if fresh else None
+    )
+    if worker is not None:
+        worker.notify()
+    return job_id
 
-def init_db():
-    con = db()
-    cur = con.cursor()
-    # Runs table
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS runs (
-            id TEXT PRIMARY KEY,
-            funda_url TEXT,
-            funda_html TEXT,
-            status TEXT, -- queued, running, done, error
-            steps_json TEXT,
-            property_core_json TEXT, -- All relevant raw fields from scraper
-            chapters_json TEXT,      -- Final generated contents
-            kpis_json TEXT,          -- Computed KPIs
-            sources_json TEXT,       -- Info about used external sources
-            unknowns_json TEXT,      -- Missing data fields
-            artifacts_json TEXT,     -- references to PDF path, etc.
-            created_at TEXT,
-            updated_at TEXT
-        )
-    """)
-    # Attribute Discovery (Dynamic Interpretation Pipeline)
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS attribute_discovery (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            run_id TEXT,
-            namespace TEXT, -- e.g., 'financial', 'energy', 'physical'
-            key TEXT,
-            display_name TEXT,
-            value TEXT,
-            confidence REAL,
-            source_snippet TEXT,
-            created_at TEXT,
-            FOREIGN KEY (run_id) REFERENCES runs (id)
-        )
-    """)
-    # Media Table (User-Mediated Browser Context)
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS media (
-            id TEXT PRIMARY KEY,
-            run_id TEXT,
-            url TEXT,
-            caption TEXT,
-            ordering INTEGER,
-            provenance TEXT, -- e.g., 'extension', 'paste'
-            local_path TEXT,
-            created_at TEXT,
-            FOREIGN KEY (run_id) REFERENCES runs (id)
-        )
-    """)
-    # KV Store for preferences and configuration
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS kv_store (
-            key TEXT PRIMARY KEY,
-            value TEXT
-        )
-    """)
-    con.commit()
-    con.close()
-    
 def cleanup_zombie_runs():
     """
     FIX 3: Zombie Run Cleanup
@@ -167,13 +164,16 @@ def cleanup_zombie_runs():
         threshold = datetime.now() - timedelta(minutes=30)
         threshold_str = threshold.strftime("%Y-%m-%d %H:%M:%S")
 
-        # Find zombies
+        # Find zombies (runs with a queued/leased job are resumed by a worker instead)
+        active_jobs = set(job_queue().active_run_ids(PIPELINE_JOB_KIND))
         cur.execute("SELECT id, steps_json, status FROM runs WHERE status = 'running' AND updated_at < ?", (threshold_str,))
         rows = cur.fetchall()
         
         fixed_count = 0
         for row in rows:
             run_id = row['id']
+            if run_id in active_jobs:
+                continue
             raw_steps = row['steps_json']
             steps = json.loads(raw_steps) if raw_steps else default_steps()
             
@@ -206,33 +206,28 @@ def cleanup_zombie_runs():
     finally:
         con.close()
 
-def now():
-    return time.strftime("%Y-%m-%d %H:%M:%S")
-
-def default_steps():
-    return {s: "pending" for s in STEPS}
+# Columns needed by run_to_overview - status polling must not pull html/chapters
+OVERVIEW_COLUMNS = "id, status, steps_json, unknowns_json, artifacts_json, updated_at"
 
-def update_run(run_id, **kwargs):
+def get_run_overview_row(run_id):
     con = db()
     cur = con.cursor()
-    fields = []
-    values = []
-    for k, v in kwargs.items():
-        fields.append(f"{k} = ?")
-        values.append(v)
-    values.append(now())
-    values.append(run_id)
-    cur.execute(f"UPDATE runs SET {', '.join(fields)}, updated_at = ? WHERE id = ?", tuple(values))
-    con.commit()
+    cur.execute(f"SELECT {OVERVIEW_COLUMNS} FROM runs WHERE id=?", (run_id,))
+    row = cur.fetchone()
     con.close()
+    return row
 
-def get_run_row(run_id):
+def load_run_chapters(run_id: str) -> Dict[str, Any]:
+    """Chapters from normalized storage, falling back to legacy runs.chapters_json."""
+    chapters = artifact_store().load_chapters(run_id)
+    if chapters is not None:
+        return chapters
     con = db()
     cur = con.cursor()
-    cur.execute("SELECT * FROM runs WHERE id=?", (run_id,))
+    cur.execute("SELECT chapters_json FROM runs WHERE id=?", (run_id,))
     row = cur.fetchone()
     con.close()
-    return row
+    return json.loads(row["chapters_json"]) if row and row["chapters_json"] else {}
 
 def run_to_overview(row) -> Dict[str, Any]:
     if not row:
@@ -257,29 +252,6 @@ def run_to_overview(row) -> Dict[str, Any]:
         "updated_at": row["updated_at"],
     }
 
-# --- AI INITIALIZATION (via AIAuthority) ---
-def init_ai_provider():
-    """
-    Initialize AI Provider using AIAuthority as single source of truth.
-    
-    AIAuthority handles:
-    - Reading API keys (only place allowed to do so)
-    - Applying provider hierarchy (OpenAI -> Gemini -> Claude -> Ollama)
-    - Determining operational status
-    """
-    from backend.ai.ai_authority import get_ai_authority
-    
-    try:
-        authority = get_ai_authority()
-        provider = authority.create_text_provider()
-        
-        IntelligenceEngine.set_provider(provider)
-        logger.info(f"✓ AI Provider initialized via AIAuthority: {provider.name}")
-        return True
-    except Exception as e:
-        logger.error(f"✗ Failed to initialize AI Provider via AIAuthority: {e}")
-        return False
-
 # --- MODELS ---
 class RunInput(BaseModel):
     funda_url: str
@@ -309,7 +281,7 @@ app.add_middleware(
 )
 init_db()
 
-# Background task executor
+# Background task executor: hosts the embedded job worker's claim loops
 executor = ThreadPoolExecutor(max_workers=settings.pipeline.max_workers) # Higher capacity for always-on service
 
 # Determine static directory
@@ -347,14 +319,24 @@ def _startup():
     init_db()
     init_ai_provider()
     cleanup_zombie_runs()  # Fix 3: Automatic cleanup on boot
+    collect_unused_assets()  # Images of runs deleted since the last start
+    ensure_pipeline_worker()  # Resume jobs queued/leased before the restart
 
 @app.on_event("shutdown")
 async def _shutdown():
-    # Properly close AI Provider shared client (Risk 2 Mitigation)
-    from backend.intelligence import IntelligenceEngine
-    provider = IntelligenceEngine._provider
-    if provider and hasattr(provider, "close"):
-        await provider.close()
+    # Properly close AI Provider shared clients (Risk 2 Mitigation)
+    from backend.ai.bridge import get_async_runtime, shutdown_async_runtime
+    from backend.ai.provider_registry import get_provider_registry
+    # Shared clients are bound to the AsyncRuntime loop - close them there
+    try:
+        await asyncio.wrap_future(get_async_runtime().submit(get_provider_registry().close_all()))
+    except Exception as e:
+        logger.warning(f"Shutdown: Failed to close AI providers: {e}")
+    if _pipeline_worker is not None:
+        _pipeline_worker.stop()
+    close_media_ingestor()
+    shutdown_async_runtime()
+    sqlite_pool.close_all_pools()
 
 # Include configuration routers
 from backend.api import config as config_router
@@ -371,298 +353,6 @@ app.include_router(run_status_router.router)
 app.include_router(ai_runtime_router.router)  # NEW: /api/ai/runtime-status
 app.include_router(governance_router.router) # /api/governance
 
-# --- PIPELINE ---
-def simulate_pipeline(run_id):
-    """
-    Main pipeline execution function.
-    
-    CRITICAL: This function now uses PipelineSpine for chapter generation.
-    All chapters pass through ValidationGate before being stored.
-    
-    TELEMETRY: Real-time status is tracked via run_status_router.
-    """
-    from backend.api.run_status import (
-        start_run_tracking, track_step, track_warning, 
-        track_error, complete_run_tracking
-    )
-    from backend.domain.app_config import build_app_config, validate_config_for_execution, OperatingMode
-    
-    logger.info(f"Pipeline: Starting run {run_id}")
-    
-    # Build configuration and validate
-    config = build_app_config()
-    can_execute, config_error = validate_config_for_execution(config)
-    
-    # Initialize run tracking for real-time UI updates
-    start_run_tracking(
-        run_id=run_id,
-        provider=config.provider,
-        model=config.model,
-        mode=config.mode.value
-    )
-    
-    # FAIL-CLOSED: Check config validity before proceeding
-    if not can_execute:
-        logger.error(f"Pipeline [{run_id}]: Configuration invalid - {config_error}")
-        track_error(run_id, f"Configuration error: {config_error}")
-        complete_run_tracking(run_id, "error")
-        update_run(run_id, status="error")
-        return
-    
-    # Check if mode requires AI
-    if config.mode in (OperatingMode.DEBUG, OperatingMode.OFFLINE):
-        logger.info(f"Pipeline [{run_id}]: Running in {config.mode.value} mode - AI disabled")
-        track_warning(run_id, f"AI disabled by mode: {config.mode.value}")
-    
-    # Refresh AI at start of pipeline & Validate Availability (Patch B)
-    # FAIL-FAST: If no AI provider is operational, we must NOT proceed.
-    if not init_ai_provider():
-        error_msg = "Pipeline Aborted: No AI provider available. Please configure API keys or check Ollama status."
-        logger.error(f"Pipeline [{run_id}]: {error_msg}")
-        track_step(run_id, "scrape_funda", "error", error_msg) # Fail early
-        track_error(run_id, error_msg)
-        complete_run_tracking(run_id, "error")
-        update_run(run_id, status="error")
-        return
-    
-    row = get_run_row(run_id)
-    if not row:
-        complete_run_tracking(run_id, "error")
-        return
-    
-    logger.info(f"Pipeline [{run_id}]: Starting. Status: {row['status']}, Mode: {config.mode.value}")
-    
-    steps = json.loads(row["steps_json"]) if row["steps_json"] else {}
-    core = json.loads(row["property_core_json"]) if row["property_core_json"] else {}
-    funda_url = row["funda_url"]
-    
-    # 1. Scrape / Parse
-    logger.info(f"Pipeline [{run_id}]: Starting Scrape/Parse")
-    track_step(run_id, "scrape_funda", "running")
-    steps["scrape_funda"] = "running"
-    update_run(run_id, steps_json=json.dumps(steps))
-    
-    if funda_url and "manual-paste" not in funda_url:
-        try:
-            scraper = Scraper()
-            scraped = scraper.derive_property_core(funda_url)
-            core.update({k: v for k, v in scraped.items() if v})
-        except Exception as e:
-            logger.error(f"Pipeline [{run_id}]: Scrape failed: {e}")
-            core["scrape_error"] = str(e)
-            
-    if row["funda_html"]:
-        try:
-            p = Parser().parse_html(row["funda_html"])
-            incoming_media = p.get("media_urls", [])
-            # For a truly clean re-scan, we trust the newest data from the parser/extension
-            # rather than indefinitely merging old state.
-            core.update({k: v for k, v in p.items() if v})
-            core["media_urls"] = list(dict.fromkeys(incoming_media))[:50] 
-            
-            # Sync to media table
-            con = db()
-            cur = con.cursor()
-            for idx, m_url in enumerate(core["media_urls"]):
-                cur.execute("SELECT 1 FROM media WHERE run_id = ? AND url = ?", (run_id, m_url))
-                if not cur.fetchone():
-                    cur.execute(
-                        "INSERT INTO media (id, run_id, url, caption, ordering, provenance, created_at) VALUES (?,?,?,?,?,?,?)",
-                        (str(uuid.uuid4()), run_id, m_url, f"Foto {idx+1}", idx, "parser", now())
-                    )
-            con.commit()
-            con.close()
-        except Exception as e:
-            logger.error(f"Pipeline [{run_id}]: Parse failed: {e}")
-            
-
-    steps["scrape_funda"] = "done"
-    track_step(run_id, "scrape_funda", "done")
-    update_run(run_id, steps_json=json.dumps(steps), property_core_json=json.dumps(core))
-    
-    # 1a. Consistency Validation
-    if row["funda_html"] and core:
-        try:
-             checker = ConsistencyChecker()
-             # Extract text for validation scanning
-             from bs4 import BeautifulSoup
-             soup = BeautifulSoup(row["funda_html"], "html.parser")
-             text_body = soup.get_text(separator="\n")
-             
-             issues = checker.check(text_body, core)
-             if issues:
-                 core["_validation_issues"] = [i for i in issues if i['status'] == 'mismatch']
-                 logger.info(f"Pipeline [{run_id}]: Found {len(core.get('_validation_issues', []))} validation mismatches.")
-        except Exception as e:
-            logger.error(f"Validation failed: {e}")
-    
-    # 1b. Dynamic Extraction (if HTML present)
-    if row["funda_html"]:
-        logger.info(f"Pipeline [{run_id}]: Starting Dynamic Extraction")
-        steps["dynamic_extraction"] = "running"
-        track_step(run_id, "dynamic_extraction", "running")
-        update_run(run_id, steps_json=json.dumps(steps))
-        try:
-            # Use safe execution bridge (Risk 1 Mitigation)
-            from backend.ai.bridge import safe_execute_async
-            safe_execute_async(run_dynamic_extraction(run_id, row["funda_html"]))
-            steps["dynamic_extraction"] = "done"
-            track_step(run_id, "dynamic_extraction", "done")
-            update_run(run_id, steps_json=json.dumps(steps))
-        except Exception as e:
-            logger.error(f"Pipeline [{run_id}]: Dynamic Extraction failed: {e}")
-            track_step(run_id, "dynamic_extraction", "error", str(e))
-            track_error(run_id, f"Dynamic extraction failed: {e}")
-            complete_run_tracking(run_id, "error")
-            update_run(run_id, status="error", steps_json=json.dumps(steps))
-            return # Stop pipeline on failure
-
-    # =========================================================================
-    # SPINE-BASED EXECUTION (Gravity Installed)
-    # =========================================================================
-    # From here, we use PipelineSpine which enforces:
-    # - Single canonical registry
-    # - Locked immutable truth
-    # - Mandatory validation for every chapter
-    # =========================================================================
-    
-    logger.info(f"Pipeline [{run_id}]: Starting Spine-Based Execution")
-    track_step(run_id, "plane_generation", "running", "4-Plane Report Generation")
-    steps["compute_kpis"] = "running"
-    update_run(run_id, steps_json=json.dumps(steps))
-    
-    # FIX 2: Guaranteed Terminal State via try/finally
-    try:
-        # Get preferences
-        prefs = get_kv("preferences", {})
-        if 'ai_model' not in prefs or not prefs['ai_model']:
-            prefs['ai_model'] = settings.ai.model
-        if 'ai_provider' not in prefs or not prefs['ai_provider']:
-            prefs['ai_provider'] = settings.ai.provider
-        
-        # FIX 1: Heartbeat Callback
-        def persist_progress(status_msg: str):
-            """
-            Callback passed to spine to persist progress to DB.
-            Called after every chapter generation.
-            """
-            logger.info(f"Pipeline [{run_id}]: Heartbeat - {status_msg}")
-            # Update step status in memory
-            steps["compute_kpis"] = status_msg
-            # Persist to DB immediately
-            update_run(run_id, steps_json=json.dumps(steps), updated_at=now())
-
-        # Execute through the spine - THIS IS THE CRITICAL PATH
-        from backend.pipeline.bridge import execute_report_pipeline
-        chapters, kpis, enriched_core, core_summary = execute_report_pipeline(
-            run_id=run_id,
-            raw_data=core,
-            preferences=prefs,
-            progress_callback=persist_progress  # Pass callback
-        )
-        
-        # Update core with enriched data for database storage
-        core = enriched_core
-        
-        # === BACKBONE CONTRACT: Store CoreSummary ===
-        # CoreSummary is now part of enriched_core for backward compatibility
-        # But we also add it explicitly to kpis for API access
-        kpis["core_summary"] = core_summary
-        
-        steps["compute_kpis"] = "done"
-        track_step(run_id, "plane_generation", "done")
-        track_step(run_id, "validation", "done")
-        update_run(run_id, steps_json=json.dumps(steps), kpis_json=json.dumps(kpis), property_core_json=json.dumps(core))
-        
-    except Exception as e:
-        logger.error(f"Pipeline [{run_id}]: Spine execution failed: {e}")
-        track_step(run_id, "plane_generation", "error", str(e))
-        track_error(run_id, f"Spine execution failed: {e}")
-        complete_run_tracking(run_id, "error")
-        
-        # FAIL-CLOSED: Ensure steps are terminal
-        for k, v in steps.items():
-            if v == "running":
-                steps[k] = "failed"
-            elif v == "pending":
-                steps[k] = "skipped"
-                
-        update_run(run_id, status="error", steps_json=json.dumps(steps))
-        return
-    finally:
-        # Final fail-safe: explicitly check if we are exiting with 'running' status
-        try:
-             # If we are somehow exiting without having cleaned up (e.g. unhandled exit)
-             is_running = any(v == 'running' for v in steps.values())
-             if is_running:
-                 logger.error(f"Pipeline [{run_id}]: Finalizer caught running status - Forcing consistency.")
-                 for k, v in steps.items():
-                     if v == "running": steps[k] = "failed"
-                     elif v == "pending": steps[k] = "skipped"
-                 update_run(run_id, status="error", steps_json=json.dumps(steps))
-        except Exception as ex:
-             logger.error(f"Pipeline [{run_id}]: Finalizer error: {ex}")
-    
-    # 3. Finalize
-    logger.info(f"Pipeline [{run_id}]: Finalizing Chapters")
-    steps["generate_chapters"] = "running"
-    update_run(run_id, steps_json=json.dumps(steps))
-    
-    try:
-        unknowns = build_unknowns(core)
-    except Exception as e:
-        logger.error(f"Pipeline [{run_id}]: Build unknowns failed: {e}")
-        unknowns = []
-    
-    steps["generate_chapters"] = "done"
-    
-    # =========================================================================
-    # LAW D ENFORCEMENT: FAIL-CLOSED PERSISTENCE
-    # =========================================================================
-    # If validation_passed is False, we MUST NOT store chapters_json.
-    # Only diagnostics (steps_json, kpis with errors) are stored.
-    # This prevents invalid reports from reaching users.
-    # =========================================================================
-    
-    validation_passed = kpis.get('validation_passed', False)
-    
-    if validation_passed:
-        # VALID REPORT: Store chapters and mark as done
-        logger.info(f"Pipeline [{run_id}]: ✓ VALIDATION PASSED - Storing chapters")
-        track_step(run_id, "render", "done")
-        complete_run_tracking(run_id, "done")
-        update_run(
-            run_id, 
-            steps_json=json.dumps(steps), 
-            chapters_json=json.dumps(chapters), 
-            unknowns_json=json.dumps(unknowns), 
-            status="done"
-        )
-    else:
-        # INVALID REPORT: Do NOT store chapters, mark as validation_failed
-        logger.error(
-            f"Pipeline [{run_id}]: ✗ VALIDATION FAILED - NOT storing chapters_json. "
-            f"This is LAW D enforcement: invalid reports cannot persist."
-        )
-        # Store only diagnostics for debugging
-        diagnostics = {
-            "validation_failed": True,
-            "kpis": kpis,
-            "chapter_count": len(chapters),
-            "failed_reason": "One or more chapters failed validation. See kpis for details."
-        }
-        update_run(
-            run_id, 
-            steps_json=json.dumps(steps), 
-            # chapters_json is NOT updated - keeps previous value or empty
-            kpis_json=json.dumps(kpis),  # Contains validation details
-            unknowns_json=json.dumps(unknowns),
-            # CRITICAL: status is 'validation_failed', NOT 'done'
-            status="validation_failed"
-        )
-        track_error(run_id, "Validation failed - report not stored")
-        complete_run_tracking(run_id, "validation_failed")
-
 class BypassBlocked(Exception):
     """Raised when deprecated bypass functions are called."""
     pass
@@ -721,10 +411,6 @@ def build_kpis(core: Dict[str, Any]) -> Dict[str, Any]:
         "fit_score": fit_score
     }
 
-def build_unknowns(core: Dict[str, Any]) -> List[str]:
-    fields = ["asking_price_eur", "living_area_m2", "plot_area_m2", "build_year", "energy_label", "rooms", "bedrooms"]
-    return [f for f in fields if not core.get(f)]
-
 # --- API ROUTES ---
 
 
@@ -732,10 +418,18 @@ def build_unknowns(core: Dict[str, Any]) -> List[str]:
 def list_runs():
     con = db()
     cur = con.cursor()
-    cur.execute("SELECT id, funda_url, status, created_at FROM runs ORDER BY created_at DESC")
+    # Metadata only: run_index carries address/chapter count without touching report bodies
+    cur.execute("""
+        SELECT r.id, r.funda_url, r.status, r.created_at, i.address, i.chapter_count
+        FROM runs r LEFT JOIN run_index i ON i.run_id = r.id
+        ORDER BY r.created_at DESC
+    """)
     rows = cur.fetchall()
     con.close()
-    return [{"id": r[0], "funda_url": r[1], "status": r[2], "created_at": r[3]} for r in rows]
+    return [
+        {"id": r[0], "funda_url": r[1], "status": r[2], "created_at": r[3], "address": r[4], "chapter_count": r[5] or 0}
+        for r in rows
+    ]
 
 @app.get("/api/runs/active")
 def get_active_run():
@@ -768,9 +462,11 @@ def create_run(inp: RunInput):
     return {"run_id": run_id, "status": "queued"}
 
 @app.post("/api/runs/{run_id}/start")
-def start_run(run_id: str):
-    executor.submit(simulate_pipeline, run_id)
-    return {"ok": True, "status": "processing"}
+def start_run(run_id: str, fresh: bool = False):
+    # Repeated clicks attach to the queued/running job instead of starting another pipeline.
+    # fresh=true: new AI responses instead of the cached ones of an earlier run
+    job_id = enqueue_pipeline(run_id, fresh=fresh)
+    return {"ok": True, "status": "processing", "job_id": job_id}
 
 @app.post("/api/runs/{run_id}/paste")
 def paste_funda_html(run_id: str, inp: Dict[str, Any]):
@@ -795,18 +491,25 @@ def paste_funda_html(run_id: str, inp: Dict[str, Any]):
 
 @app.get("/api/runs/{run_id}/status")
 def get_run_status(run_id: str):
-    row = get_run_row(run_id)
+    row = get_run_overview_row(run_id)
     if not row: raise HTTPException(404)
     return run_to_overview(row)
 
-@app.get("/api/runs/{run_id}/report")
-def get_run_report(run_id: str):
-    row = get_run_row(run_id)
-    if not row: raise HTTPException(404)
-    
-    # Fetch Discovery Attributes
+def load_report_context(run_id: str) -> Dict[str, Any]:
+    """
+    Everything a report view needs except chapter bodies:
+    property core, KPIs, discovery attributes, media and the CoreSummary.
+    """
+    # Narrow read: funda_html and legacy chapters_json are not needed here
     con = db()
     cur = con.cursor()
+    cur.execute("SELECT id, property_core_json, kpis_json FROM runs WHERE id=?", (run_id,))
+    row = cur.fetchone()
+    if not row:
+        con.close()
+        raise HTTPException(404)
+    
+    # Fetch Discovery Attributes
     cur.execute("SELECT namespace, key, display_name, value, confidence, source_snippet FROM attribute_discovery WHERE run_id = ?", (run_id,))
     discovery = [dict(r) for r in cur.fetchall()]
     
@@ -814,13 +517,18 @@ def get_run_report(run_id: str):
     cur.execute("SELECT url, caption, ordering, provenance FROM media WHERE run_id = ? ORDER BY ordering ASC", (run_id,))
     media = [dict(r) for r in cur.fetchall()]
     con.close()
+    thumbnails = get_media_ingestor().thumbnail_urls([m["url"] for m in media])
+    for m in media:
+        m["thumbnail_url"] = thumbnails.get(m["url"])
 
     # === BACKBONE CONTRACT: Extract CoreSummary ===
     # CoreSummary is MANDATORY - if missing, the report is invalid
     raw_kpis = json.loads(row["kpis_json"]) if row["kpis_json"] else {}
     # Handle legacy format where kpis_json was initialized as "[]" (list) instead of "{}" (dict)
     kpis_data = raw_kpis if isinstance(raw_kpis, dict) else {}
-    core_summary = kpis_data.get("core_summary")
+    # Older runs kept a copy in kpis_json; it is served at the top level only
+    legacy_core_summary = kpis_data.pop("core_summary", None)
+    core_summary = artifact_store().load_core_summary(run_id) or legacy_core_summary
     
     # FAIL-CLOSED: If CoreSummary is missing, log error but return empty structure
     # (The report may have been generated before this contract was enforced)
@@ -832,12 +540,12 @@ def get_run_report(run_id: str):
         core_summary_obj = CoreSummaryBuilder.create_empty()
         core_summary = core_summary_obj.model_dump()
 
+    property_core = json.loads(row["property_core_json"]) if row["property_core_json"] else {}
 
     return {
         "runId": row["id"],
-        "address": (json.loads(row["property_core_json"]) if row["property_core_json"] else {}).get("address", "Onbekend"),
-        "property_core": json.loads(row["property_core_json"]) if row["property_core_json"] else {},
-        "chapters": json.loads(row["chapters_json"]) if row["chapters_json"] else {},
+        "address": property_core.get("address", "Onbekend"),
+        "property_core": property_core,
         "kpis": kpis_data,
         "discovery": discovery,
         "media_from_db": media,
@@ -845,6 +553,72 @@ def get_run_report(run_id: str):
         "core_summary": core_summary
     }
 
+@app.get("/api/runs/{run_id}/report")
+def get_run_report(run_id: str):
+    report = load_report_context(run_id)
+    report["chapters"] = load_run_chapters(run_id)
+    resolve_orphaned_heroes(run_id, report["chapters"])
+    return report
+
+@app.get("/api/runs/{run_id}/report/manifest")
+def get_run_report_manifest(run_id: str):
+    """
+    Lightweight report manifest for the first dashboard render.
+    
+    Same top-level fields as /report, but "chapters" is an ordered list of
+    {id, title, raw_bytes} entries instead of the full chapter bodies. Bodies
+    are fetched on demand via /api/runs/{run_id}/chapters/{chapter_id}.
+    """
+    manifest = load_report_context(run_id)
+    manifest.pop("kpis", None)
+    
+    sizes = artifact_store().list_chapter_sizes(run_id)
+    if sizes:
+        chapters = [{"id": s["chapter_id"], "title": s["title"], "raw_bytes": s["raw_bytes"]} for s in sizes]
+    else:
+        # Legacy run (chapters_json only): derive the listing from the blob once
+        legacy = load_run_chapters(run_id)
+        chapters = [
+            {"id": str(k), "title": chapter_title(v), "raw_bytes": len(json.dumps(v, default=str))}
+            for k, v in sorted(legacy.items(), key=lambda kv: chapter_sort_key(kv[0]))
+        ]
+    manifest["chapters"] = chapters
+    manifest["chapter_ids"] = [c["id"] for c in chapters]
+    # Hero images still generating: the client listens for chapter_updated events
+    manifest["images_pending"] = len(artifact_store().pending_images(run_id))
+    return manifest
+
+@app.get("/api/runs/{run_id}/chapters/{chapter_id}")
+def get_run_chapter(run_id: str, chapter_id: str):
+    """Single chapter body (all planes) - one row read from normalized storage."""
+    chapter = artifact_store().load_chapter(run_id, chapter_id)
+    if chapter is None:
+        # Legacy run fallback
+        chapter = load_run_chapters(run_id).get(chapter_id)
+    if chapter is None:
+        raise HTTPException(404, "chapter not found")
+    resolve_orphaned_heroes(run_id, {chapter_id: chapter})
+    return chapter
+
+@app.get("/api/assets/{asset_id}")
+def get_asset(asset_id: str, request: Request):
+    """
+    Generated media referenced by chapters (e.g. Plane A2 hero images).
+    
+    Assets are content-addressed and never change: the id is the ETag and
+    clients may cache them for a year.
+    """
+    if not re.fullmatch(r"[0-9a-f]{64}", asset_id):
+        raise HTTPException(404, "asset not found")
+    headers = {"ETag": f'"{asset_id}"', "Cache-Control": ASSET_CACHE_CONTROL}
+    if_none_match = [tag.strip() for tag in request.headers.get("if-none-match", "").split(",")]
+    if f'"{asset_id}"' in if_none_match or f'W/"{asset_id}"' in if_none_match:
+        return Response(status_code=304, headers=headers)
+    asset = get_asset_store().get(asset_id)
+    if asset is None:
+        raise HTTPException(404, "asset not found")
+    return FileResponse(asset["path"], media_type=asset["mime_type"], headers=headers)
+
 def normalize_funda_url(url: str) -> str:
     """Extracts the base property ID or URL to ensure consistent matching"""
     if not url: return ""
@@ -909,6 +683,8 @@ def extension_ingest(data: Dict[str, Any]):
             # Wipe related tables completely
             cur.execute("DELETE FROM media WHERE run_id = ?", (run_id,))
             cur.execute("DELETE FROM attribute_discovery WHERE run_id = ?", (run_id,))
+            cur.execute("DELETE FROM run_artifacts WHERE run_id = ?", (run_id,))
+            cur.execute("DELETE FROM run_index WHERE run_id = ?", (run_id,))
             
             # Clear photos from the run object too
             core_data["media_urls"] = []
@@ -936,7 +712,8 @@ def extension_ingest(data: Dict[str, Any]):
             # Important: return early to prevent the global photos loop from adding duplicates
             con.commit()
             con.close()
-            executor.submit(simulate_pipeline, run_id)
+            prefetch_run_media(run_id, core_data.get("media_urls") or [])
+            enqueue_pipeline(run_id, supersede=True)
             return {"run_id": run_id, "status": "processing"}
     else:
         # 3. Create NEW run
@@ -968,42 +745,57 @@ def extension_ingest(data: Dict[str, Any]):
             
     con.commit()
     con.close()
+
+    # Photos download while the job waits for a worker; the media_ingest stage reuses them
+    prefetch_run_media(run_id, core_data.get("media_urls") or [])
     
     # 3. Always trigger/re-trigger pipeline to refresh analysis with new data
-    executor.submit(simulate_pipeline, run_id)
+    #    (supersedes a stale run of this listing that is still in flight)
+    enqueue_pipeline(run_id, supersede=True)
         
     return {"run_id": run_id, "status": "processing"}
 
-async def run_dynamic_extraction(run_id: str, html: str):
+def resolve_orphaned_heroes(run_id: str, chapters: Dict[str, Any]) -> None:
+    """
+    Mark "pending" hero images that no image queue will deliver anymore as failed.
+
+    The run index lists the heroes an image queue (in this or a worker
+    process) is still generating. A pending hero missing from that list is
+    orphaned. A listed one that this process does not track only counts as
+    orphaned once the run's artifacts have not changed for
+    ORPHANED_AFTER_SECONDS: the queue lives in memory and dies with its
+    process. The chapter dicts are updated in place and persisted.
+    """
+    from backend.ai.image_queue import ORPHANED_AFTER_SECONDS
+    from backend.ai.image_provider_interface import ImageGenerationResult, ImageGenerationStatus
+    from backend.pipeline.four_plane_backbone import apply_hero_image_result, hero_image_pending
+
+    queue = get_image_queue()
+    pending = [
+        cid for cid, ch in chapters.items()
+        if hero_image_pending(ch) and not (str(cid).isdigit() and queue.tracks(run_id, int(cid)))
+    ]
+    if not pending:
+        return
+    index = artifact_store().get_index(run_id) or {}
+    listed = index.get("pending_images")
     try:
-        init_ai_provider()
-        provider = IntelligenceEngine._provider
-        if not provider: 
-            logger.warning("No AI Provider for dynamic extraction")
-            return
-            
-        extractor = DynamicExtractor(provider)
-        
-        from bs4 import BeautifulSoup
-        soup = BeautifulSoup(html, "html.parser")
-        main = soup.find('main') or soup.find('article') or soup.body or soup
-        text = main.get_text(separator="\n")
-        
-        # 100% Correct async call
-        attributes = await extractor.extract_attributes(text)
-        
-        con = db()
-        cur = con.cursor()
-        for attr in attributes:
-            cur.execute(
-                "INSERT INTO attribute_discovery (run_id, namespace, key, display_name, value, confidence, source_snippet, created_at) VALUES (?,?,?,?,?,?,?,?)",
-                (run_id, attr["namespace"], attr["key"], attr["display_name"], attr["value"], attr["confidence"], attr["source_snippet"], now())
-            )
-        con.commit()
-        con.close()
-    except Exception as e:
-        logger.error(f"Background dynamic extraction failed: {e}")
-        raise # Propagate to stop pipeline
+        idle = time.time() - time.mktime(time.strptime(index.get("updated_at") or "", "%Y-%m-%d %H:%M:%S"))
+    except ValueError:
+        idle = ORPHANED_AFTER_SECONDS
+    if idle < ORPHANED_AFTER_SECONDS:
+        # Reports stored before the index listed pending images: all may still arrive
+        pending = [cid for cid in pending if listed is not None and str(cid) not in listed]
+    if not pending:
+        return
+    result = ImageGenerationResult(
+        status=ImageGenerationStatus.FAILED,
+        error_message="Image generation was interrupted (server restart)"
+    )
+    for cid in pending:
+        apply_hero_image_result(chapters[cid], result)
+        artifact_store().update_chapter(run_id, cid, lambda ch: apply_hero_image_result(ch, result), resolves_image=True)
+    logger.warning(f"Report {run_id}: Marked {len(pending)} orphaned pending hero images as failed")
 
 @app.get("/api/health")
 def health_check():
@@ -1026,23 +818,17 @@ async def upload_image(file: UploadFile = File(...)):
     filepath = UPLOAD_DIR / filename
     with open(filepath, "wb") as f:
         f.write(content)
-    return {"ok": True, "url": f"/uploads/{filename}", "size": len(content)}
-
-def get_kv(key: str, default: Any = None) -> Any:
-    con = db()
-    cur = con.cursor()
-    cur.execute("SELECT value FROM kv_store WHERE key=?", (key,))
-    row = cur.fetchone()
-    con.close()
-    if row: return json.loads(row[0])
-    return default
-
-def set_kv(key: str, value: Any):
-    con = db()
-    cur = con.cursor()
-    cur.execute("INSERT OR REPLACE INTO kv_store (key, value) VALUES (?, ?)", (key, json.dumps(value)))
-    con.commit()
-    con.close()
+    url = f"/uploads/{filename}"
+    
+    # Vision/thumbnail variants are produced once, at upload time
+    response = {"ok": True, "url": url, "size": len(content)}
+    try:
+        variants = await asyncio.to_thread(get_media_ingestor().ingest_bytes, url, content, file.content_type)
+        response["thumbnail_url"] = variants["thumbnail"]["url"]
+        response["vision_url"] = variants["vision"]["url"]
+    except MediaIngestError as e:
+        logger.warning(f"Upload {filename}: No image variants ({e})")
+    return response
 
 @app.get("/api/preferences")
 def get_preferences():
@@ -1066,7 +852,7 @@ def save_preferences(prefs: Dict[str, Any]):
         from api.config import _persist_section
         _persist_section("ai", s.ai.model_dump())
         reset_settings()
-        init_ai_provider()
+        reload_ai_provider()
         
     return {"ok": True}
 
@@ -1094,7 +880,7 @@ def list_models(provider: Optional[str] = None):
 
 @app.get("/api/ai/status")
 def check_ai_status():
-    success = init_ai_provider()
+    success = init_ai_provider() is not None
     from backend.ai.capability_manager import get_capability_manager
     capabilities = get_capability_manager().get_all_statuses()
     return {
@@ -1137,10 +923,12 @@ async def get_run_pdf(run_id: str):
                 core_summary = json.loads(core_summary_raw)
     except (IndexError, KeyError, json.JSONDecodeError, TypeError) as e:
         logger.debug(f"PDF: core_summary_json not available for run {run_id}: {e}")
+    if core_summary is None:
+        core_summary = artifact_store().load_core_summary(run_id)
     
     # Backend DB stores chapters as JSON dict. Template expects list of objects.
     # The template uses {% for ch in chapters %}, so we yield values.
-    chapters_raw = json.loads(row["chapters_json"]) if row["chapters_json"] else {}
+    chapters_raw = load_run_chapters(run_id)
     # Sort by ID as string int
     sorted_keys = sorted(chapters_raw.keys(), key=lambda x: int(x))
     chapters = [chapters_raw[k] for k in sorted_keys]
@@ -82,6 +82,50 @@ def execute_report_pipeline(
         logger.error(f"Pipeline Bridge: FATAL - Unexpected error - {e}")
         raise  # Re-raise - no swallowing of errors
     
+    return _package_spine_output(spine, output)
+
+
+async def execute_report_pipeline_async(
+    run_id: str,
+    raw_data: Dict[str, Any],
+    preferences: Optional[Dict[str, Any]] = None,
+    progress_callback: Optional[Any] = None
+) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any], Dict[str, Any]]:
+    """
+    Async variant of execute_report_pipeline() (PipelineSpine.execute_full_pipeline_async).
+    
+    Same FAIL-CLOSED behaviour and return value; the run's chapter
+    narratives and hero images are prefetched concurrently on the caller's
+    event loop.
+    """
+    logger.info(f"Pipeline Bridge: Starting async execution for run {run_id}")
+    
+    try:
+        spine, output = await PipelineSpine.execute_full_pipeline_async(
+            run_id=run_id,
+            raw_data=raw_data,
+            preferences=preferences,
+            strict_validation=is_production_mode(),
+            progress_callback=progress_callback
+        )
+    except PipelineViolation as e:
+        logger.error(f"Pipeline Bridge: FATAL - Validation failure - {e}")
+        raise
+    except RegistryConflict as e:
+        logger.error(f"Pipeline Bridge: FATAL - Registry conflict - {e}")
+        raise
+    except Exception as e:
+        logger.error(f"Pipeline Bridge: FATAL - Unexpected error - {e}")
+        raise
+    
+    return _package_spine_output(spine, output)
+
+
+def _package_spine_output(
+    spine: PipelineSpine,
+    output: Dict[str, Any]
+) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any], Dict[str, Any]]:
+    """Turn the spine's renderable output into (chapters, kpis, enriched_core, core_summary)."""
     # Convert chapters output to expected format
     chapters = output.get("chapters", {})
     
@@ -22,8 +22,11 @@ KEY PRINCIPLES:
 4. Validation is NOT the concern of this module - that's done at the spine level
 """
 
+import asyncio
+import contextvars
 import logging
-from typing import Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, List, Optional
 
 from backend.domain.pipeline_context import PipelineContext, PipelineViolation
 from backend.domain.ownership import OwnershipMap
@@ -46,6 +49,14 @@ NARRATIVE_REQUIRED_CHAPTERS = set(range(13))  # 0-12
 NARRATIVE_MINIMUM_WORDS = 300
 
 
+def resolve_run_provider(ctx: PipelineContext) -> Optional[Any]:
+    """The provider bound to the run (PipelineContext handle), else the process-wide one."""
+    if ctx.ai_provider is not None:
+        return ctx.ai_provider
+    from backend.intelligence import IntelligenceEngine
+    return IntelligenceEngine._provider
+
+
 def generate_chapter_with_validation(ctx: PipelineContext, chapter_id: int) -> Dict[str, Any]:
     """
     Generate a single chapter using the 4-PLANE BACKBONE (for 0-12) or legacy (for 13).
@@ -189,7 +200,9 @@ def _generate_legacy_chapter(
     """
     from backend.intelligence import IntelligenceEngine
     
-    output = IntelligenceEngine.generate_chapter_narrative(chapter_id, scoped_data)
+    output = IntelligenceEngine.generate_chapter_narrative(
+        chapter_id, scoped_data, ai_provider=resolve_run_provider(ctx)
+    )
     output = _structure_chapter_output(chapter_id, output, ctx)
     output["segment"] = _get_segment_name(chapter_id)
     
@@ -219,15 +232,26 @@ def _generate_and_validate_narrative(
         PipelineViolation: If narrative generation fails or word count < 300
     """
     # Get AI provider if available
-    from backend.intelligence import IntelligenceEngine
-    ai_provider = IntelligenceEngine._provider
+    ai_provider = resolve_run_provider(ctx)
+    
+    def _forward_partial(text: str, word_count: int) -> None:
+        from backend.api.run_status import track_narrative
+        track_narrative(ctx.run_id, str(chapter_id), text, word_count)
     
     try:
-        narrative_output = NarrativeGenerator.generate(
-            chapter_id=chapter_id,
-            context=scoped_data,
-            ai_provider=ai_provider
-        )
+        # Generated earlier: multi-chapter request (fast mode) or async prefetch
+        narrative_output = ctx.take_prefetched_narrative(chapter_id)
+        if narrative_output is not None:
+            logger.info(f"Chapter {chapter_id}: Using prefetched narrative")
+            if ctx.run_id:
+                _forward_partial(narrative_output.text, narrative_output.word_count)
+        else:
+            narrative_output = NarrativeGenerator.generate(
+                chapter_id=chapter_id,
+                context=scoped_data,
+                ai_provider=ai_provider,
+                on_partial=_forward_partial if ctx.run_id else None
+            )
         
         # Validate word count
         if narrative_output.word_count < NARRATIVE_MINIMUM_WORDS:
@@ -261,6 +285,161 @@ def _generate_and_validate_narrative(
         raise PipelineViolation(f"Chapter {chapter_id} narrative generation error: {e}")
 
 
+def prefetch_narratives(
+    ctx: PipelineContext,
+    chapter_ids: List[int],
+    group_size: int,
+    max_concurrency: int = 1
+) -> int:
+    """
+    Generate narratives for groups of chapters in single AI requests (fast mode).
+    
+    Groups are requested at most max_concurrency at a time. Valid narratives
+    are parked on the context and picked up by generate_chapter_with_validation,
+    which validates them like any other. Chapters missing from a response - or
+    from a failed request - are simply generated individually later. Returns
+    the number of prefetched narratives.
+    """
+    ai_provider = resolve_run_provider(ctx)
+    if ai_provider is None or group_size < 2:
+        return 0
+    
+    # Chapters the async path already requested (successful or not) are not requested again
+    eligible = [
+        c for c in chapter_ids
+        if c in NARRATIVE_REQUIRED_CHAPTERS
+        and not ctx.has_prefetched_narrative(c)
+        and not ctx.narrative_prefetch_attempted(c)
+    ]
+    groups = [eligible[start:start + group_size] for start in range(0, len(eligible), group_size)]
+    if not groups:
+        return 0
+    
+    def _request(group: List[int]) -> Dict[int, Any]:
+        contexts = {}
+        for chapter_id in group:
+            scoped_data = _build_scoped_context(ctx, chapter_id)
+            scoped_data['_preferences'] = ctx.preferences
+            contexts[chapter_id] = scoped_data
+        return NarrativeGenerator.generate_group(contexts, ai_provider)
+    
+    prefetched = 0
+    workers = max(1, min(max_concurrency, len(groups)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"Narratives-{ctx.run_id[:8]}") as pool:
+        # Each request runs in a copy of the caller's context (run-scoped retry budget)
+        futures = {
+            pool.submit(contextvars.copy_context().run, _request, group): group
+            for group in groups
+        }
+        for future in as_completed(futures):
+            group = futures[future]
+            try:
+                narratives = future.result()
+            except Exception as e:
+                logger.warning(f"Chapters {group}: Multi-chapter request failed, generating individually: {e}")
+                continue
+            for chapter_id, narrative in narratives.items():
+                ctx.store_prefetched_narrative(chapter_id, narrative)
+            prefetched += len(narratives)
+            missing = sorted(set(group) - set(narratives))
+            if missing:
+                logger.info(f"Chapters {missing}: Not valid in multi-chapter response, re-requesting individually")
+    return prefetched
+
+
+async def prefetch_chapter_io_async(
+    ctx: PipelineContext,
+    chapter_ids: List[int],
+    group_size: int = 1,
+    max_concurrency: int = 4
+) -> Dict[str, int]:
+    """
+    Await all provider work of the chapters concurrently (async pipeline path).
+    
+    Narratives (in groups in fast mode, then individually for the rest) and
+    hero images are requested on the running event loop, at most
+    max_concurrency at a time, and parked on the context. Hero images are
+    left to the background image queue when it is enabled.
+    generate_chapter_with_validation then only builds and validates the
+    chapters; anything that failed here is generated by its regular path.
+    
+    Returns the number of prefetched narratives and images.
+    """
+    ai_provider = resolve_run_provider(ctx)
+    eligible = [c for c in chapter_ids if c in NARRATIVE_REQUIRED_CHAPTERS]
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    narrated: set = set()
+    imaged: set = set()
+    
+    def _contexts(group: List[int]) -> Dict[int, Dict[str, Any]]:
+        contexts = {}
+        for chapter_id in group:
+            scoped_data = _build_scoped_context(ctx, chapter_id)
+            scoped_data['_preferences'] = ctx.preferences
+            contexts[chapter_id] = scoped_data
+        return contexts
+    
+    async def _group(group: List[int]) -> None:
+        async with semaphore:
+            try:
+                narratives = await NarrativeGenerator.generate_group_async(_contexts(group), ai_provider)
+            except Exception as e:
+                logger.warning(f"Chapters {group}: Multi-chapter request failed, generating individually: {e}")
+                return
+        for chapter_id, narrative in narratives.items():
+            ctx.store_prefetched_narrative(chapter_id, narrative)
+            narrated.add(chapter_id)
+    
+    async def _single(chapter_id: int) -> None:
+        async with semaphore:
+            try:
+                narrative = await NarrativeGenerator.generate_ai_async(
+                    chapter_id, _contexts([chapter_id])[chapter_id], ai_provider
+                )
+            except Exception as e:
+                logger.warning(f"Chapter {chapter_id}: Async narrative failed, using regular path: {e}")
+                return
+        ctx.store_prefetched_narrative(chapter_id, narrative)
+        narrated.add(chapter_id)
+    
+    async def _image(chapter_id: int, image_provider: Any, request: Any) -> None:
+        async with semaphore:
+            try:
+                result = await image_provider.generate_image(request)
+            except Exception as e:
+                logger.warning(f"Chapter {chapter_id}: Async image generation failed, using regular path: {e}")
+                return
+        ctx.store_prefetched_image(chapter_id, result)
+        imaged.add(chapter_id)
+    
+    image_tasks = []
+    from backend.ai.image_provider_factory import get_image_provider
+    from backend.ai.image_queue import image_queue_concurrency
+    from backend.pipeline.four_plane_backbone import FourPlaneBackbone
+    image_provider = get_image_provider()
+    if image_provider.is_configured() and image_queue_concurrency() == 0:
+        backbone = FourPlaneBackbone(ctx)
+        for chapter_id in eligible:
+            request = backbone.build_hero_request(chapter_id)
+            if request is not None:
+                image_tasks.append(_image(chapter_id, image_provider, request))
+    
+    narrative_tasks = []
+    if ai_provider is not None:
+        if group_size > 1:
+            groups = [eligible[i:i + group_size] for i in range(0, len(eligible), group_size)]
+            await asyncio.gather(*(_group(g) for g in groups), *image_tasks)
+            image_tasks = []
+        # Chapters not covered by a multi-chapter response, or all in normal mode
+        narrative_tasks = [_single(c) for c in eligible if c not in narrated]
+    await asyncio.gather(*narrative_tasks, *image_tasks)
+    if ai_provider is not None:
+        # Failures here go straight to the regular per-chapter path
+        ctx.mark_narrative_prefetch_attempted(eligible)
+    
+    return {"narratives": len(narrated), "images": len(imaged)}
+
+
 def _build_scoped_context(ctx: PipelineContext, chapter_id: int) -> Dict[str, Any]:
     """
     Build a scoped data context for a chapter from the registry.
@@ -49,8 +49,8 @@ def generate_dashboard_with_validation(ctx: PipelineContext) -> DashboardOutput:
     structure = _derive_dashboard_structure(ctx)
     
     # 3. Generate Narrative (MANDATORY)
-    from backend.intelligence import IntelligenceEngine
-    ai_provider = IntelligenceEngine._provider
+    from backend.pipeline.chapter_generator import resolve_run_provider
+    ai_provider = resolve_run_provider(ctx)
     
     try:
         narrative_out = NarrativeGenerator.generate_dashboard(
@@ -32,6 +32,8 @@ FAIL-CLOSED PRINCIPLES:
 4. No fallback paths, no silent degradation
 """
 
+import base64
+import dataclasses
 import logging
 from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass
@@ -71,6 +73,8 @@ from backend.ai.image_provider_interface import (
     ImageGenerationStatus,
 )
 from backend.ai.image_provider_factory import get_image_provider, is_image_generation_available
+from backend.ai.image_queue import get_image_queue, image_queue_concurrency
+from backend.storage.asset_store import get_asset_store
 
 logger = logging.getLogger(__name__)
 
@@ -329,6 +333,8 @@ class FourPlaneBackbone:
         - Plane A2 ALWAYS exists (never None)
         - If image generation fails → not_applicable=True with reason
         - If no provider → not_applicable=True with reason
+        - If queued (settings.ai.image_queue_concurrency) → hero is "pending"
+          until the image queue attaches it to the stored report
         - Concepts are ALWAYS generated from registry data
         
         Args:
@@ -375,9 +381,23 @@ class FourPlaneBackbone:
         # [A2][IMAGE_GENERATION][GEMINI_3] invoked - Runtime marker
         logger.info(f"[A2][IMAGE_GENERATION][GEMINI_3] invoked for chapter {chapter_id}")
         
+        # Async pipeline path: generated earlier, concurrently with the narratives
+        result = self.ctx.take_prefetched_image(chapter_id)
+        
+        if result is None and self.ctx.run_id and image_queue_concurrency() > 0:
+            # Background queue: the chapter continues, the image is attached to the stored report
+            if get_image_queue().submit(self.ctx.run_id, chapter_id, hero_request):
+                result = ImageGenerationResult(
+                    status=ImageGenerationStatus.PENDING,
+                    provider_name=image_provider.provider_name,
+                    model_name=image_provider.model_name,
+                    prompt=hero_request.prompt
+                )
+        
         from backend.ai.bridge import safe_execute_async
         try:
-            result = safe_execute_async(image_provider.generate_image(hero_request))
+            if result is None:
+                result = safe_execute_async(image_provider.generate_image(hero_request))
         except Exception as e:
             logger.error(f"Plane A2: Image generation failed: {e}")
             result = ImageGenerationResult(
@@ -388,6 +408,9 @@ class FourPlaneBackbone:
                 error_message=str(e)
             )
         
+        # Inline image bytes go to the asset store; the chapter keeps the URL
+        result = _store_image_asset(result)
+        
         # Build HeroInfographic from result
         hero_infographic = HeroInfographic(
             title=hero_request.title,
@@ -402,30 +425,14 @@ class FourPlaneBackbone:
             generation_error=result.error_message
         )
         
-        # Determine not_applicable based on result
-        not_applicable = result.status != ImageGenerationStatus.GENERATED
-        not_applicable_reason = None
-        
-        if not_applicable:
-            # Check global capability status for intelligent messaging
-            from backend.ai.capability_manager import get_capability_manager, CapabilityState
-            cap_status = get_capability_manager().get_status("image_generation")
-            
-            if cap_status.state == CapabilityState.QUOTA_EXCEEDED:
-                 not_applicable_reason = (
-                     "Image generation is temporarily unavailable due to quota limits. "
-                     "The system is correctly configured and will resume automatically."
-                 )
-            elif result.error_message:
-                not_applicable_reason = f"Image generatie mislukt: {result.error_message}"
-            else:
-                not_applicable_reason = f"Image generatie status: {result.status.value}"
+        # Determine not_applicable based on result (a queued image is still coming)
+        not_applicable_reason = _a2_not_applicable_reason(result)
         
         return PlaneA2SynthVisualModel(
             hero_infographic=hero_infographic,
             concepts=concepts,
             data_source_ids=data_source_ids,
-            not_applicable=not_applicable,
+            not_applicable=not_applicable_reason is not None,
             not_applicable_reason=not_applicable_reason
         )
     
@@ -580,6 +587,10 @@ class FourPlaneBackbone:
         
         return concepts
     
+    def build_hero_request(self, chapter_id: int) -> Optional[ImageGenerationRequest]:
+        """The hero infographic request Plane A2 would send for a chapter (None = no image)."""
+        return self._build_hero_infographic_request(chapter_id, self._build_a2_concepts(chapter_id))
+    
     def _build_hero_infographic_request(
         self,
         chapter_id: int,
@@ -1219,6 +1230,83 @@ def _serialize_plane_a2(plane_a2: Optional[PlaneA2SynthVisualModel]) -> Dict[str
     }
 
 
+def _a2_not_applicable_reason(result: ImageGenerationResult) -> Optional[str]:
+    """Why Plane A2 has no hero image, or None if it was generated or is still queued."""
+    if result.status in (ImageGenerationStatus.GENERATED, ImageGenerationStatus.PENDING):
+        return None
+    
+    # Check global capability status for intelligent messaging
+    from backend.ai.capability_manager import get_capability_manager, CapabilityState
+    cap_status = get_capability_manager().get_status("image_generation")
+    
+    if cap_status.state == CapabilityState.QUOTA_EXCEEDED:
+        return (
+            "Image generation is temporarily unavailable due to quota limits. "
+            "The system is correctly configured and will resume automatically."
+        )
+    if result.error_message:
+        return f"Image generatie mislukt: {result.error_message}"
+    return f"Image generatie status: {result.status.value}"
+
+
+def _store_image_asset(result: ImageGenerationResult) -> ImageGenerationResult:
+    """
+    Move an inline (base64) image into the asset store.
+    
+    Stored chapters and /report responses then carry an /api/assets URL
+    instead of megabytes of base64. If the store fails, the image stays inline.
+    """
+    if not result.image_base64:
+        return result
+    mime_type = (result.generation_metadata or {}).get("mime_type") or "image/png"
+    try:
+        asset = get_asset_store().put(base64.b64decode(result.image_base64), mime_type, source="plane_a2")
+    except Exception as e:
+        logger.warning(f"Plane A2: Storing image asset failed, keeping it inline: {e}")
+        return result
+    return dataclasses.replace(result, image_uri=asset["url"], image_base64=None)
+
+
+def apply_hero_image_result(chapter: Dict[str, Any], result: ImageGenerationResult) -> bool:
+    """
+    Attach a hero image that arrived from the image queue to a serialized chapter.
+    
+    Updates plane_a2 and the A2 diagnostics status in place. Returns False
+    if the chapter has no pending hero infographic to complete.
+    """
+    plane_a2 = chapter.get("plane_a2") or {}
+    hero = plane_a2.get("hero_infographic")
+    if not hero or hero.get("generation_status") != ImageGenerationStatus.PENDING.value:
+        return False
+    
+    result = _store_image_asset(result)
+    hero.update({
+        "image_uri": result.image_uri,
+        "image_base64": result.image_base64,
+        "generation_status": result.status.value,
+        "generation_error": result.error_message,
+    })
+    reason = _a2_not_applicable_reason(result)
+    plane_a2["not_applicable"] = reason is not None
+    plane_a2["not_applicable_reason"] = reason
+    
+    plane_status = (chapter.get("diagnostics") or {}).get("plane_status")
+    if isinstance(plane_status, dict):
+        if reason is not None:
+            plane_status["A2"] = "not_applicable"
+        elif result.status == ImageGenerationStatus.GENERATED:
+            plane_status["A2"] = "ok"
+    return True
+
+
+def hero_image_pending(chapter: Any) -> bool:
+    """Whether a serialized chapter's hero infographic is still waiting for the image queue."""
+    if not isinstance(chapter, dict):
+        return False
+    hero = (chapter.get("plane_a2") or {}).get("hero_infographic") or {}
+    return hero.get("generation_status") == ImageGenerationStatus.PENDING.value
+
+
 def _get_a2_status(plane_a2: Optional[PlaneA2SynthVisualModel]) -> str:
     """Get status string for Plane A2 diagnostics."""
     if plane_a2 is None:
@@ -1227,6 +1315,8 @@ def _get_a2_status(plane_a2: Optional[PlaneA2SynthVisualModel]) -> str:
         return "not_applicable"
     if plane_a2.hero_infographic and plane_a2.hero_infographic.generation_status == "generated":
         return "ok"
+    if plane_a2.hero_infographic and plane_a2.hero_infographic.generation_status == "pending":
+        return "image_pending"
     if plane_a2.concepts:
         return "concepts_only"
     return "empty"
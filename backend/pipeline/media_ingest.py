@@ -0,0 +1,397 @@
+"""
+Media Ingestion - Listing photos stored once, in the sizes they are used at
+
+The vision audit read full-resolution photos (Funda URLs are even rewritten
+to width=1440) and every provider call base64-encoded them again. Photos are
+now ingested once per source URL:
+
+    source (http(s) URL, /uploads/<file>, /api/assets/<id>)
+        └─> original   content-hashed asset (AssetStore)
+        └─> vision     longest side ≤ PIPELINE_VISION_IMAGE_MAX_PX, JPEG
+        └─> thumbnail  longest side ≤ PIPELINE_THUMBNAIL_MAX_PX, JPEG
+
+The media_variants table maps source URLs to their asset ids, so later runs,
+re-runs and the vision audit reuse the stored variants. Concurrent requests
+for the same URL share one download.
+
+Remote photos are downloaded through one pooled HTTP client, at most
+PIPELINE_MEDIA_DOWNLOAD_CONCURRENCY at a time and PIPELINE_IMAGE_MAX_SIZE_MB
+each. extension_ingest starts prefetch() for a run's photos, so they are
+usually local before the pipeline's vision audit asks for them.
+
+Resizing needs Pillow; without it the variants are the original image.
+"""
+
+import logging
+import mimetypes
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from io import BytesIO
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple, Union
+
+import httpx
+
+from backend.storage import sqlite_pool
+from backend.storage.asset_store import ASSET_URL_PREFIX, AssetStore, asset_url, get_asset_store
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Optional: ingestion still stores originals
+    Image = None
+    ImageOps = None
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_DIR = Path(__file__).resolve().parent.parent.parent / "data" / "uploads"
+UPLOAD_URL_PREFIX = "/uploads/"
+
+VARIANT_MIME_TYPE = "image/jpeg"
+JPEG_QUALITY = 85
+
+# (path, file identity) of databases whose tables exist: a deleted or replaced
+# file at the same path gets its tables created again
+_initialized_files: Set[Tuple[str, Optional[tuple]]] = set()
+_init_lock = threading.Lock()
+
+
+class MediaIngestError(RuntimeError):
+    """A photo could not be loaded or decoded."""
+
+
+def resize_image(data: bytes, max_px: int) -> Optional[bytes]:
+    """
+    JPEG re-encoding with the longest side at most max_px (EXIF rotation applied).
+
+    Returns None when Pillow is not installed.
+    """
+    if Image is None:
+        return None
+    try:
+        with Image.open(BytesIO(data)) as img:
+            img = ImageOps.exif_transpose(img)
+            if img.mode not in ("RGB", "L"):
+                img = img.convert("RGB")
+            img.thumbnail((max_px, max_px))
+            out = BytesIO()
+            img.save(out, format="JPEG", quality=JPEG_QUALITY, optimize=True)
+    except Exception as e:
+        raise MediaIngestError(f"Image could not be decoded: {e}") from e
+    return out.getvalue()
+
+
+class MediaIngestor:
+    """Downloads, stores and resizes listing photos (one ingestion per source URL)."""
+
+    def __init__(
+        self,
+        db_path: Union[str, Path],
+        store: Optional[AssetStore] = None,
+        vision_max_px: int = 768,
+        thumbnail_max_px: int = 320,
+        upload_dir: Union[str, Path] = UPLOAD_DIR,
+        fetch: Optional[Callable[[str], Tuple[bytes, str]]] = None,
+        download_concurrency: int = 8,
+        max_download_bytes: int = 10 * 1024 * 1024
+    ):
+        self.db_path = str(db_path)
+        self.store = store or AssetStore(db_path)
+        self.vision_max_px = vision_max_px
+        self.thumbnail_max_px = thumbnail_max_px
+        self.upload_dir = Path(upload_dir)
+        self.download_concurrency = max(1, download_concurrency)
+        self.max_download_bytes = max_download_bytes
+        self._fetch = fetch or self._http_fetch
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+        self._client: Optional[httpx.Client] = None
+        self._prefetch_pool: Optional[ThreadPoolExecutor] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite_pool.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        if self._init_key() not in _initialized_files or self.db_path == ":memory:":
+            self._create_tables(conn)
+        return conn
+
+    def _init_key(self) -> Tuple[str, Optional[tuple]]:
+        return (self.db_path, sqlite_pool.file_identity(self.db_path))
+
+    def init_schema(self) -> None:
+        """Create the media_variants table (idempotent). Called from init_db()."""
+        conn = sqlite_pool.connect(self.db_path)
+        try:
+            self._create_tables(conn)
+        finally:
+            conn.close()
+        if self.store.db_path == self.db_path:
+            # thumbnail_urls() joins the assets table
+            self.store.init_schema()
+
+    def _create_tables(self, conn: sqlite3.Connection) -> None:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS media_variants (
+                source_url TEXT PRIMARY KEY,
+                original_id TEXT,   -- asset ids (AssetStore)
+                vision_id TEXT,
+                thumbnail_id TEXT,
+                created_at TEXT
+            )
+        """)
+        conn.commit()
+        with _init_lock:
+            _initialized_files.add(self._init_key())
+
+    # =========================================================================
+    # LOOKUP
+    # =========================================================================
+
+    def lookup(self, source_url: str) -> Optional[Dict[str, Any]]:
+        """Stored variants of a source URL, or None if not ingested (or an asset is gone)."""
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT * FROM media_variants WHERE source_url = ?", (source_url,)).fetchone()
+        finally:
+            conn.close()
+        if not row:
+            return None
+        entry = {"source_url": source_url}
+        for variant in ("original", "vision", "thumbnail"):
+            asset = self.store.get(row[f"{variant}_id"])
+            if asset is None:
+                return None
+            entry[variant] = asset
+        return entry
+
+    def thumbnail_urls(self, source_urls: Sequence[str]) -> Dict[str, str]:
+        """
+        Thumbnail URL per ingested source URL (report views, one query per 500 URLs).
+
+        Unlike lookup() this neither loads every variant nor checks the files.
+        """
+        urls = list(dict.fromkeys(u for u in source_urls if u))
+        if not urls or self.store.db_path != self.db_path:
+            return {u: e["thumbnail"]["url"] for u in urls for e in [self.lookup(u)] if e}
+        found: Dict[str, str] = {}
+        conn = self._connect()
+        try:
+            for start in range(0, len(urls), 500):
+                chunk = urls[start:start + 500]
+                rows = conn.execute(
+                    "SELECT v.source_url, v.thumbnail_id FROM media_variants v "
+                    "JOIN assets a ON a.asset_id = v.thumbnail_id "
+                    f"WHERE v.source_url IN ({','.join('?' * len(chunk))})",
+                    chunk
+                ).fetchall()
+                found.update((r["source_url"], asset_url(r["thumbnail_id"])) for r in rows)
+        except sqlite3.OperationalError:
+            return {}  # nothing ingested into this database yet (no assets table)
+        finally:
+            conn.close()
+        return found
+
+    # =========================================================================
+    # INGEST
+    # =========================================================================
+
+    def ingest_bytes(self, source_url: str, data: bytes, mime_type: str = "image/jpeg") -> Dict[str, Any]:
+        """Store an image and its variants under source_url."""
+        original = self.store.put(data, mime_type, source="media")
+        variants = {}
+        for variant, max_px in (("vision", self.vision_max_px), ("thumbnail", self.thumbnail_max_px)):
+            resized = resize_image(data, max_px)
+            # Never store a "variant" that is bigger than the original
+            if resized is None or len(resized) >= len(data):
+                variants[variant] = original
+            else:
+                variants[variant] = self.store.put(resized, VARIANT_MIME_TYPE, source=f"media_{variant}")
+
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO media_variants "
+                    "(source_url, original_id, vision_id, thumbnail_id, created_at) VALUES (?,?,?,?,?)",
+                    (source_url, original["asset_id"], variants["vision"]["asset_id"],
+                     variants["thumbnail"]["asset_id"], time.strftime("%Y-%m-%d %H:%M:%S"))
+                )
+        finally:
+            conn.close()
+        logger.info(
+            f"MediaIngestor: Ingested {source_url} ({original['size_bytes']} -> "
+            f"{variants['vision']['size_bytes']} bytes for vision)"
+        )
+        return {"source_url": source_url, "original": original, **variants}
+
+    def ingest_url(self, source_url: str) -> Dict[str, Any]:
+        """Variants of source_url, ingesting it first if needed (one download per URL)."""
+        entry = self.lookup(source_url)
+        if entry is not None:
+            return entry
+        with self._lock:
+            future = self._inflight.get(source_url)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[source_url] = future
+        if not owner:
+            return future.result()
+        try:
+            data, mime_type = self._load(source_url)
+            entry = self.ingest_bytes(source_url, data, mime_type)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(entry)
+            return entry
+        finally:
+            with self._lock:
+                self._inflight.pop(source_url, None)
+
+    def ingest_many(self, source_urls: Sequence[str], max_workers: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+        """Ingest several URLs concurrently; failures are logged and left out."""
+        max_workers = max_workers or self.download_concurrency
+        urls = list(dict.fromkeys(u for u in source_urls if u))
+        if not urls:
+            return {}
+
+        def _one(url: str) -> Optional[Dict[str, Any]]:
+            try:
+                return self.ingest_url(url)
+            except Exception as e:
+                logger.warning(f"MediaIngestor: Ingesting {url} failed: {e}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="MediaIngest") as pool:
+            results = list(pool.map(_one, urls))
+        return {url: entry for url, entry in zip(urls, results) if entry is not None}
+
+    def prefetch(self, source_urls: Sequence[str]) -> Future:
+        """Start ingest_many in the background; the future resolves to its result."""
+        with self._lock:
+            if self._prefetch_pool is None:
+                self._prefetch_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="MediaPrefetch")
+            pool = self._prefetch_pool
+        return pool.submit(self.ingest_many, list(source_urls))
+
+    def vision_inputs(self, source_urls: Sequence[str]) -> List[str]:
+        """
+        Local paths of the vision-sized variants, for provider image arguments.
+
+        A photo that cannot be ingested is passed on as before (URL or path).
+        """
+        ingested = self.ingest_many(source_urls)
+        inputs = []
+        for url in source_urls:
+            entry = ingested.get(url)
+            inputs.append(str(entry["vision"]["path"]) if entry else self._legacy_input(url))
+        return inputs
+
+    def _legacy_input(self, source_url: str) -> str:
+        if source_url.startswith(UPLOAD_URL_PREFIX):
+            path = self.upload_dir / source_url.split("/")[-1]
+            if path.exists():
+                return str(path)
+        return source_url
+
+    def _load(self, source_url: str) -> Tuple[bytes, str]:
+        if source_url.startswith(UPLOAD_URL_PREFIX):
+            path = self.upload_dir / Path(source_url).name
+            if not path.exists():
+                raise MediaIngestError(f"Uploaded file not found at {path}")
+            return path.read_bytes(), mimetypes.guess_type(path.name)[0] or "image/jpeg"
+        if source_url.startswith(ASSET_URL_PREFIX):
+            asset = self.store.get(source_url[len(ASSET_URL_PREFIX):])
+            if asset is None:
+                raise MediaIngestError(f"Asset not found: {source_url}")
+            return asset["path"].read_bytes(), asset["mime_type"]
+        if source_url.startswith(("http://", "https://")):
+            return self._fetch(source_url)
+        raise MediaIngestError(f"Unsupported media URL: {source_url}")
+
+    def _http_client(self) -> httpx.Client:
+        with self._lock:
+            if self._client is None:
+                # Keep-alive connections are reused across photos and runs (same CDN host)
+                self._client = httpx.Client(
+                    timeout=15.0,
+                    follow_redirects=True,
+                    limits=httpx.Limits(
+                        max_connections=self.download_concurrency,
+                        max_keepalive_connections=self.download_concurrency,
+                    ),
+                )
+            return self._client
+
+    def _http_fetch(self, url: str) -> Tuple[bytes, str]:
+        """Download a photo, refusing anything larger than max_download_bytes."""
+        with self._http_client().stream("GET", url) as resp:
+            resp.raise_for_status()
+            declared = int(resp.headers.get("content-length") or 0)
+            if declared > self.max_download_bytes:
+                raise MediaIngestError(f"{url} is {declared} bytes (limit {self.max_download_bytes})")
+            chunks, total = [], 0
+            for chunk in resp.iter_bytes():
+                total += len(chunk)
+                if total > self.max_download_bytes:
+                    raise MediaIngestError(f"{url} exceeds {self.max_download_bytes} bytes")
+                chunks.append(chunk)
+            mime_type = (resp.headers.get("content-type") or "").split(";")[0].strip()
+        if mime_type and not mime_type.startswith("image/"):
+            raise MediaIngestError(f"{url} is not an image ({mime_type})")
+        return b"".join(chunks), mime_type or mimetypes.guess_type(url)[0] or "image/jpeg"
+
+    def close(self) -> None:
+        """Release the HTTP connection pool and prefetch threads (shutdown)."""
+        with self._lock:
+            client, self._client = self._client, None
+            pool, self._prefetch_pool = self._prefetch_pool, None
+        if pool is not None:
+            pool.shutdown(wait=False)
+        if client is not None:
+            client.close()
+
+
+# =============================================================================
+# MODULE-LEVEL HELPER
+# =============================================================================
+
+_ingestor_instance: Optional[MediaIngestor] = None
+_ingestor_lock = threading.Lock()
+
+
+def get_media_ingestor() -> MediaIngestor:
+    """Ingestor for the configured database (rebuilt if settings.database_url or the asset directory changes)."""
+    global _ingestor_instance
+    from backend.config.settings import get_settings
+    settings = get_settings()
+    with _ingestor_lock:
+        store = get_asset_store()
+        if (
+            _ingestor_instance is None
+            or _ingestor_instance.db_path != str(settings.database_url)
+            or _ingestor_instance.store.directory != store.directory
+        ):
+            if _ingestor_instance is not None:
+                _ingestor_instance.close()
+            _ingestor_instance = MediaIngestor(
+                settings.database_url,
+                store=store,
+                vision_max_px=settings.pipeline.vision_image_max_px,
+                thumbnail_max_px=settings.pipeline.thumbnail_max_px,
+                download_concurrency=settings.pipeline.media_download_concurrency,
+                max_download_bytes=settings.pipeline.image_max_size_mb * 1024 * 1024,
+            )
+        return _ingestor_instance
+
+
+def close_media_ingestor() -> None:
+    """Close and drop the global instance (shutdown, tests)."""
+    global _ingestor_instance
+    with _ingestor_lock:
+        if _ingestor_instance is not None:
+            _ingestor_instance.close()
+        _ingestor_instance = None
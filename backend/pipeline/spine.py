@@ -20,20 +20,25 @@ If any of these invariants are violated, the system is incorrect.
 """
 
 import os
+import asyncio
+import contextvars
 import logging
 from typing import Dict, Any, List, Optional, Tuple, Callable
 import gc
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 
 from backend.domain.pipeline_context import (
     PipelineContext, 
     create_pipeline_context, 
     PipelineViolation,
+    PipelineCancelled,
     ValidationFailure
 )
 from backend.domain.registry import RegistryType, RegistryConflict, RegistryLocked
 from backend.domain.ownership import OwnershipMap
 from backend.validation.gate import ValidationGate
+from backend.ai.provider_registry import current_provider_handle
 from backend.domain.guardrails import PolicyLevel
 
 logger = logging.getLogger(__name__)
@@ -111,14 +116,23 @@ class PipelineSpine:
     FAIL-CLOSED: Any invalid state causes immediate failure.
     """
     
-    def __init__(self, run_id: str, preferences: Optional[Dict[str, Any]] = None):
+    def __init__(
+        self,
+        run_id: str,
+        preferences: Optional[Dict[str, Any]] = None,
+        provider_handle: Optional[Any] = None
+    ):
         """
         Initialize the pipeline spine.
         
         This creates the PipelineContext which holds the canonical registry
-        for the entire lifecycle of this report generation.
+        for the entire lifecycle of this report generation. provider_handle
+        (ProviderHandle) binds the AI provider for the whole run; if None,
+        the handle of the enclosing provider_scope() is used.
         """
-        self.ctx = create_pipeline_context(run_id, preferences)
+        if provider_handle is None:
+            provider_handle = current_provider_handle()
+        self.ctx = create_pipeline_context(run_id, preferences, provider_handle)
         self._phase = "initialized"
         self._validation_failed = False
         self._failed_chapters: List[int] = []
@@ -180,7 +194,11 @@ class PipelineSpine:
     # PHASE 3: CHAPTER GENERATION WITH MANDATORY VALIDATION
     # =========================================================================
     
-    def generate_all_chapters(self, progress_callback: Optional[Callable[[str], None]] = None) -> Dict[int, Dict[str, Any]]:
+    def generate_all_chapters(
+        self,
+        progress_callback: Optional[Callable[[str], None]] = None,
+        max_concurrency: Optional[int] = None
+    ) -> Dict[int, Dict[str, Any]]:
         """
         Generate all chapters with MANDATORY validation.
         
@@ -191,8 +209,16 @@ class PipelineSpine:
         - Failed chapters are tracked
         - In production, validation failure means pipeline failure
         
+        CONCURRENT MODE:
+        With max_concurrency > 1, chapters are generated in parallel against the
+        locked (read-only) registry. Validation and storage still happen on this
+        thread, strictly in chapter order, so the outcome is identical to the
+        sequential path.
+        
         Args:
             progress_callback: Optional function to report progress (e.g. for DB heartbeats)
+            max_concurrency: Chapters generated in parallel. Defaults to
+                             settings.pipeline.chapter_concurrency (1 = sequential).
         
         Returns:
             Dict mapping chapter_id to chapter output (may include failed chapters)
@@ -202,25 +228,33 @@ class PipelineSpine:
         
         self.ctx.begin_chapter_generation()
         
-        # Import chapter generator
-        from backend.pipeline.chapter_generator import generate_chapter_with_validation
+        chapter_ids = list(range(1, 14))  # Skip 0, it is generated as Dashboard
+        concurrency = self._resolve_chapter_concurrency(max_concurrency)
+        
+        # FAST MODE: narratives for groups of chapters in one request each;
+        # chapters without a valid narrative from it are requested individually
+        group_size = self._resolve_narrative_group_size()
+        if group_size > 1:
+            from backend.pipeline.chapter_generator import prefetch_narratives
+            self._report_progress(progress_callback, "running (narratives, multi-chapter)")
+            prefetched = prefetch_narratives(self.ctx, chapter_ids, group_size, concurrency)
+            logger.info(
+                f"PipelineSpine [{self.ctx.run_id}]: {prefetched} narratives from "
+                f"multi-chapter requests (group size {group_size})"
+            )
+        
+        if concurrency > 1:
+            outputs = self._generate_chapters_concurrently(chapter_ids, concurrency, progress_callback)
+        else:
+            outputs = self._generate_chapters_sequentially(chapter_ids, progress_callback)
         
         all_chapters = {}
         
-        for chapter_id in range(1, 14): # Skip 0, it is generated as Dashboard
-            # Heartbeat update via callback
-            if progress_callback:
-                try:
-                    progress_callback(f"running (Chapter {chapter_id}/13)")
-                except Exception as e:
-                    logger.warning(f"PipelineSpine: Progress callback failed: {e}")
-
-            logger.info(f"PipelineSpine [{self.ctx.run_id}]: Generating chapter {chapter_id}")
+        # MANDATORY VALIDATION - in chapter order, on the spine thread
+        for chapter_id in chapter_ids:
+            output = outputs[chapter_id]
             
-            # Generate chapter (may use AI or fallback - doesn't matter)
-            output = generate_chapter_with_validation(self.ctx, chapter_id)
-            
-            # MANDATORY VALIDATION - No exceptions, no bypasses
+            # No exceptions, no bypasses
             errors = ValidationGate.validate_chapter_output(
                 chapter_id, 
                 output, 
@@ -242,10 +276,6 @@ class PipelineSpine:
                 self.ctx.store_validated_chapter(chapter_id, output)
             
             all_chapters[chapter_id] = output
-            
-            # MEMORY RELIEF (Fix 4)
-            # Explicitly collect garbage after each heavy chapter generation to reduce OOM risk
-            gc.collect()
         
         self._phase = "chapters_generated"
         
@@ -260,6 +290,159 @@ class PipelineSpine:
         
         return all_chapters
     
+    async def generate_all_chapters_async(
+        self,
+        progress_callback: Optional[Callable[[str], None]] = None,
+        max_concurrency: Optional[int] = None
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Async variant of generate_all_chapters().
+        
+        All provider work of the chapters (narratives, hero images) is first
+        awaited concurrently on the running event loop, at most
+        max_concurrency requests at a time. generate_all_chapters() then
+        builds and validates the chapters from those results in a worker
+        thread, exactly as in the sync path; its multi-chapter prefetch skips
+        the chapters requested here.
+        """
+        if self._phase != "enriched_and_locked":
+            raise PipelineViolation(f"Cannot generate chapters in phase '{self._phase}'")
+        
+        chapter_ids = list(range(1, 14))  # Skip 0, it is generated as Dashboard
+        concurrency = self._resolve_chapter_concurrency(max_concurrency)
+        
+        from backend.pipeline.chapter_generator import prefetch_chapter_io_async
+        self._report_progress(progress_callback, "running (narratives and images, async)")
+        prefetched = await prefetch_chapter_io_async(
+            self.ctx, chapter_ids, self._resolve_narrative_group_size(), concurrency
+        )
+        logger.info(
+            f"PipelineSpine [{self.ctx.run_id}]: Prefetched {prefetched['narratives']} narratives "
+            f"and {prefetched['images']} images (concurrency {concurrency})"
+        )
+        
+        return await asyncio.to_thread(self.generate_all_chapters, progress_callback, concurrency)
+    
+    def _generate_chapters_sequentially(
+        self,
+        chapter_ids: List[int],
+        progress_callback: Optional[Callable[[str], None]]
+    ) -> Dict[int, Dict[str, Any]]:
+        """Generate chapters one after another (default mode)."""
+        from backend.pipeline.chapter_generator import generate_chapter_with_validation
+        
+        outputs: Dict[int, Dict[str, Any]] = {}
+        total = len(chapter_ids)
+        
+        for chapter_id in chapter_ids:
+            # Heartbeat update via callback
+            self._report_progress(progress_callback, f"running (Chapter {chapter_id}/{total})")
+            
+            logger.info(f"PipelineSpine [{self.ctx.run_id}]: Generating chapter {chapter_id}")
+            
+            # Generate chapter (may use AI or fallback - doesn't matter)
+            outputs[chapter_id] = generate_chapter_with_validation(self.ctx, chapter_id)
+            
+            # MEMORY RELIEF (Fix 4)
+            # Explicitly collect garbage after each heavy chapter generation to reduce OOM risk
+            gc.collect()
+        
+        return outputs
+    
+    def _generate_chapters_concurrently(
+        self,
+        chapter_ids: List[int],
+        concurrency: int,
+        progress_callback: Optional[Callable[[str], None]]
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Generate chapters on a bounded worker pool.
+        
+        FAIL-CLOSED: The first generation error cancels all chapters that have
+        not started yet and is re-raised, exactly like the sequential path.
+        """
+        from backend.pipeline.chapter_generator import generate_chapter_with_validation
+        
+        outputs: Dict[int, Dict[str, Any]] = {}
+        total = len(chapter_ids)
+        
+        logger.info(
+            f"PipelineSpine [{self.ctx.run_id}]: Generating {total} chapters "
+            f"with concurrency={concurrency}"
+        )
+        self._report_progress(progress_callback, f"running (0/{total} chapters, parallel)")
+        
+        pool = ThreadPoolExecutor(
+            max_workers=concurrency,
+            thread_name_prefix=f"Spine-{self.ctx.run_id[:8]}"
+        )
+        try:
+            # Each chapter runs in a copy of the caller's context (run-scoped retry budget)
+            futures = {
+                pool.submit(contextvars.copy_context().run, generate_chapter_with_validation, self.ctx, chapter_id): chapter_id
+                for chapter_id in chapter_ids
+            }
+            for future in as_completed(futures):
+                chapter_id = futures[future]
+                # Re-raises the chapter's exception (PipelineViolation etc.)
+                outputs[chapter_id] = future.result()
+                logger.info(f"PipelineSpine [{self.ctx.run_id}]: Chapter {chapter_id} generated")
+                self._report_progress(
+                    progress_callback,
+                    f"running ({len(outputs)}/{total} chapters, parallel)"
+                )
+        except BaseException:
+            pool.shutdown(wait=True, cancel_futures=True)
+            raise
+        else:
+            pool.shutdown(wait=True)
+        
+        # MEMORY RELIEF (Fix 4)
+        gc.collect()
+        
+        return outputs
+    
+    @staticmethod
+    def _resolve_chapter_concurrency(max_concurrency: Optional[int]) -> int:
+        """Resolve the degree of chapter parallelism (explicit arg > settings > 1)."""
+        if max_concurrency is None:
+            try:
+                from backend.config.settings import get_settings
+                max_concurrency = get_settings().pipeline.chapter_concurrency
+            except Exception as e:
+                logger.warning(f"PipelineSpine: Could not read chapter_concurrency setting: {e}")
+                max_concurrency = 1
+        return max(1, int(max_concurrency))
+    
+    @staticmethod
+    def _resolve_narrative_group_size() -> int:
+        """Chapters per narrative request: settings.ai.narrative_group_size in fast mode, else 1."""
+        try:
+            from backend.config.settings import get_settings
+            ai = get_settings().ai
+        except Exception as e:
+            logger.warning(f"PipelineSpine: Could not read AI mode setting: {e}")
+            return 1
+        if ai.mode != "fast":
+            return 1
+        return max(1, int(ai.narrative_group_size))
+    
+    def _report_progress(self, progress_callback: Optional[Callable[[str], None]], message: str) -> None:
+        """
+        Invoke the progress callback; callback failures never break generation.
+        
+        PipelineCancelled is the exception: it is how a superseded run stops
+        before the next chapter (the concurrent path cancels pending chapters).
+        """
+        if not progress_callback:
+            return
+        try:
+            progress_callback(message)
+        except PipelineCancelled:
+            raise
+        except Exception as e:
+            logger.warning(f"PipelineSpine: Progress callback failed: {e}")
+    
     def generate_single_chapter(self, chapter_id: int) -> Dict[str, Any]:
         """
         Generate a single chapter with mandatory validation.
@@ -409,7 +592,9 @@ class PipelineSpine:
         raw_data: Dict[str, Any],
         preferences: Optional[Dict[str, Any]] = None,
         strict_validation: Optional[bool] = None,
-        progress_callback: Optional[Callable[[str], None]] = None
+        progress_callback: Optional[Callable[[str], None]] = None,
+        chapter_concurrency: Optional[int] = None,
+        provider_handle: Optional[Any] = None
     ) -> Tuple["PipelineSpine", Dict[str, Any]]:
         """
         Execute the complete pipeline from raw data to renderable output.
@@ -422,6 +607,11 @@ class PipelineSpine:
             preferences: User preferences (Marcel & Petra)
             strict_validation: If None, uses production mode detection.
                                Only tests should set this to False.
+            chapter_concurrency: Chapters generated in parallel. If None, uses
+                                 settings.pipeline.chapter_concurrency.
+            provider_handle: AI provider for this run. If None, the handle of
+                             the enclosing provider_scope(), else the
+                             process-wide IntelligenceEngine provider.
         
         Returns:
             Tuple of (PipelineSpine instance, renderable output)
@@ -436,7 +626,7 @@ class PipelineSpine:
         if strict_validation is None:
             strict_validation = is_production_mode()
         
-        spine = cls(run_id, preferences)
+        spine = cls(run_id, preferences, provider_handle)
         
         # Phase 1: Ingest
         spine.ingest_raw_data(raw_data)
@@ -445,7 +635,10 @@ class PipelineSpine:
         spine.enrich_and_populate_registry()
         
         # Phase 3: Generate with Validation
-        spine.generate_all_chapters(progress_callback=progress_callback)
+        spine.generate_all_chapters(
+            progress_callback=progress_callback,
+            max_concurrency=chapter_concurrency
+        )
         
         # Phase 3.5: Dashboard
         spine.generate_dashboard()
@@ -456,6 +649,56 @@ class PipelineSpine:
         logger.info(f"PipelineSpine.execute_full_pipeline: Completed run {run_id}")
         
         return spine, output
+    
+    @classmethod
+    async def execute_full_pipeline_async(
+        cls,
+        run_id: str,
+        raw_data: Dict[str, Any],
+        preferences: Optional[Dict[str, Any]] = None,
+        strict_validation: Optional[bool] = None,
+        progress_callback: Optional[Callable[[str], None]] = None,
+        chapter_concurrency: Optional[int] = None,
+        provider_handle: Optional[Any] = None
+    ) -> Tuple["PipelineSpine", Dict[str, Any]]:
+        """
+        Async variant of execute_full_pipeline() with the same phases and checks.
+        
+        Only the chapter narratives and hero images are awaited concurrently
+        on the caller's event loop (see generate_all_chapters_async).
+        Enrichment, chapter building and the dashboard run in worker threads,
+        so the loop stays free for other runs' prefetches. The progress
+        callback is called from those worker threads.
+        """
+        logger.info(f"PipelineSpine.execute_full_pipeline_async: Starting run {run_id}")
+        
+        # FAIL-CLOSED: Default to strict in production
+        if strict_validation is None:
+            strict_validation = is_production_mode()
+        
+        spine = cls(run_id, preferences, provider_handle)
+        
+        # Phase 1: Ingest
+        spine.ingest_raw_data(raw_data)
+        
+        # Phase 2: Enrich & Lock (may raise RegistryConflict)
+        await asyncio.to_thread(spine.enrich_and_populate_registry)
+        
+        # Phase 3: Generate with Validation
+        await spine.generate_all_chapters_async(
+            progress_callback=progress_callback,
+            max_concurrency=chapter_concurrency
+        )
+        
+        # Phase 3.5: Dashboard
+        await asyncio.to_thread(spine.generate_dashboard)
+        
+        # Phase 4: Get Renderable Output (may raise PipelineViolation if strict)
+        output = spine.get_renderable_output(strict=strict_validation)
+        
+        logger.info(f"PipelineSpine.execute_full_pipeline_async: Completed run {run_id}")
+        
+        return spine, output
 
 
 # =============================================================================
@@ -0,0 +1,131 @@
+"""
+Stage Scheduler - Runs independent pipeline stages concurrently
+
+simulate_pipeline used to run the consistency check, dynamic extraction
+(one LLM round-trip) and the spine strictly one after another, although
+neither side stage feeds the registry. Stages are now declared with their
+dependencies and start as soon as those have finished:
+
+    scheduler = StageScheduler("Pipeline [run]")
+    scheduler.add("consistency", check)
+    scheduler.add("dynamic_extraction", extract)
+    scheduler.add("summary", summarize, depends_on=["consistency"])
+    scheduler.start()
+    ...                                   # caller runs the spine meanwhile
+    issues = scheduler.result("consistency")
+
+A stage whose dependency failed is not run; its result() raises
+StageSkipped. Every stage runs in a copy of the caller's context (retry
+budget, provider scope).
+"""
+
+import contextvars
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+class StageSkipped(RuntimeError):
+    """A stage was not run because one of its dependencies failed."""
+
+    def __init__(self, stage: str, dependency: str):
+        self.stage = stage
+        self.dependency = dependency
+        super().__init__(f"Stage '{stage}' skipped: dependency '{dependency}' failed")
+
+
+@dataclass
+class Stage:
+    name: str
+    fn: Callable[[], Any]
+    depends_on: List[str] = field(default_factory=list)
+
+
+class StageScheduler:
+    """Dependency-ordered, concurrent execution of pipeline stages."""
+
+    def __init__(self, label: str = "StageScheduler", max_workers: int = 4):
+        self.label = label
+        self.max_workers = max(1, max_workers)
+        self._stages: Dict[str, Stage] = {}
+        self._futures: Dict[str, Future] = {}
+        self._scheduled: set = set()
+        self._lock = threading.Lock()
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    def add(self, name: str, fn: Callable[[], Any], depends_on: Sequence[str] = ()) -> None:
+        """Declare a stage. Dependencies must have been added before."""
+        if self._pool is not None:
+            raise RuntimeError(f"{self.label}: Cannot add stage '{name}' after start()")
+        if name in self._stages:
+            raise ValueError(f"{self.label}: Duplicate stage '{name}'")
+        unknown = [d for d in depends_on if d not in self._stages]
+        if unknown:
+            raise ValueError(f"{self.label}: Stage '{name}' depends on unknown stages {unknown}")
+        self._stages[name] = Stage(name, fn, list(depends_on))
+        self._futures[name] = Future()
+
+    def start(self) -> None:
+        """Start every stage whose dependencies are met; the rest follow as they finish."""
+        if self._pool is not None:
+            return
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="Stage")
+        for stage in self._stages.values():
+            if not stage.depends_on:
+                self._schedule(stage)
+            for dependency in stage.depends_on:
+                self._futures[dependency].add_done_callback(lambda _f, stage=stage: self._schedule(stage))
+
+    def _schedule(self, stage: Stage) -> None:
+        dependencies = [self._futures[d] for d in stage.depends_on]
+        with self._lock:
+            # The last finishing dependency schedules the stage (exactly once)
+            if stage.name in self._scheduled or not all(f.done() for f in dependencies):
+                return
+            self._scheduled.add(stage.name)
+        future = self._futures[stage.name]
+        future.set_running_or_notify_cancel()
+        for dependency, dependency_future in zip(stage.depends_on, dependencies):
+            if dependency_future.exception() is not None:
+                logger.warning(f"{self.label}: Skipping stage '{stage.name}' ({dependency} failed)")
+                future.set_exception(StageSkipped(stage.name, dependency))
+                return
+        self._pool.submit(contextvars.copy_context().run, self._run, stage)
+
+    def _run(self, stage: Stage) -> None:
+        future = self._futures[stage.name]
+        logger.info(f"{self.label}: Stage '{stage.name}' started")
+        try:
+            result = stage.fn()
+        except BaseException as e:
+            logger.error(f"{self.label}: Stage '{stage.name}' failed: {e}")
+            future.set_exception(e)
+        else:
+            logger.info(f"{self.label}: Stage '{stage.name}' done")
+            future.set_result(result)
+
+    def result(self, name: str, timeout: Optional[float] = None) -> Any:
+        """Wait for a stage and return its result; re-raises its exception (or StageSkipped)."""
+        return self._futures[name].result(timeout=timeout)
+
+    def exception(self, name: str, timeout: Optional[float] = None) -> Optional[BaseException]:
+        """Wait for a stage and return its exception, or None if it succeeded."""
+        return self._futures[name].exception(timeout=timeout)
+
+    def wait_all(self) -> None:
+        """Wait for every stage (failures are left to result()) and release the threads."""
+        if self._pool is None:
+            return
+        for future in self._futures.values():
+            try:
+                future.exception()
+            except Exception:
+                pass
+        self._pool.shutdown(wait=True)
+
+    def has(self, name: str) -> bool:
+        return name in self._stages
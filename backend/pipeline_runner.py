@@ -0,0 +1,840 @@
+"""
+PIPELINE RUNNER - Run storage and pipeline execution, without the web app
+
+Everything a pipeline run needs outside of HTTP lives here, so a process that
+only executes runs does not build the FastAPI app:
+
+    backend.main    API: creates/queues runs, serves reports (imports this module)
+    backend.worker  `python -m backend.worker`: executes queued runs (imports this module)
+
+A job attempt that fails transiently (spine or dynamic extraction error)
+raises PipelineRetryable while attempts are left; JobWorker then hands it to
+JobQueue.fail, which re-queues it with exponential backoff. The last attempt
+records the failure on the run instead.
+"""
+
+import os
+from dotenv import load_dotenv
+load_dotenv()
+
+import json
+import logging
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Legacy modules import siblings as top-level packages (e.g. `from config.settings import ...`)
+BACKEND_DIR = Path(__file__).parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.append(str(BACKEND_DIR))
+
+from backend.scraper import Scraper
+from backend.parser import Parser
+from backend.consistency import ConsistencyChecker
+from backend.intelligence import IntelligenceEngine
+from backend.ai.provider_interface import AIProvider
+from backend.ai.provider_registry import ProviderHandle
+from backend.ai.dynamic_extractor import DynamicExtractor
+from backend.ai.image_queue import get_image_queue
+from backend.config.settings import get_settings
+from backend.storage import sqlite_pool
+from backend.storage.run_artifacts import RunArtifactStore
+from backend.storage.asset_store import get_asset_store
+from backend.pipeline.media_ingest import get_media_ingestor
+from backend.storage.job_queue import Job, JobQueue
+from backend.domain.pipeline_context import PipelineCancelled, PipelineRetryable
+from backend.worker import JobWorker
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+# --- CONFIGURATION ---
+BASE_DIR = BACKEND_DIR.parent # Project root
+
+# Data paths (stay in project root or as specified by env)
+DEFAULT_DB_PATH = BASE_DIR / "data" / "local_app.db"
+DB_PATH = Path(os.environ.get("APP_DB", str(DEFAULT_DB_PATH)))
+
+# Ensure DB directory exists
+if not DB_PATH.parent.exists():
+    try:
+        DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+    except Exception as e:
+        logger.error(f"Failed to create DB directory: {e}")
+
+STEPS = (
+    "scrape_funda",           # Chapter 0, Chapter 1
+    "dynamic_extraction",      # AI Attribute Discovery
+    "compute_kpis",           # Calculations
+    "generate_chapters",      # Intelligence Engine
+    "render_pdf"              # Template & PDF
+)
+
+# --- DATABASE ---
+def db():
+    # Pooled (WAL, busy_timeout); con.close() returns the connection to the pool
+    conn = sqlite_pool.connect(DB_PATH)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+def artifact_store() -> RunArtifactStore:
+    """Normalized chapter/core-summary storage (run_artifacts + run_index tables)."""
+    return RunArtifactStore(DB_PATH)
+
+# =============================================================================
+# PIPELINE JOBS (durable queue; see backend/storage/job_queue.py)
+# =============================================================================
+
+PIPELINE_JOB_KIND = "pipeline.run"
+
+_job_queue: Optional[JobQueue] = None
+
+def job_queue() -> JobQueue:
+    """Queue bound to the current DB_PATH (rebuilt if the path changes)."""
+    global _job_queue
+    if _job_queue is None or _job_queue.db_path != str(DB_PATH):
+        _job_queue = JobQueue(
+            DB_PATH,
+            lease_seconds=settings.pipeline.job_lease_seconds,
+            max_attempts=settings.pipeline.job_max_attempts,
+            retry_base_seconds=settings.pipeline.job_retry_base_seconds,
+        )
+    return _job_queue
+
+def _raise_if_cancelled(run_id: str, cancel_event: Optional[threading.Event]) -> None:
+    if cancel_event is not None and cancel_event.is_set():
+        raise PipelineCancelled(run_id)
+
+def run_pipeline_job(job: Job) -> None:
+    # Ollama keeps its model loaded for the whole run; unloaded when the last run ends
+    from backend.ai.ollama_guard import get_ollama_guard
+    from backend.ai.resilience import retry_budget_scope
+    from backend.ai.response_cache import response_cache_bypass
+    guard = get_ollama_guard()
+    guard.begin_run(job.run_id)
+    try:
+        # Retries/hedges of every provider call in this run share one budget;
+        # a fresh run does not read the response cache
+        with retry_budget_scope(job.run_id), response_cache_bypass(bool(job.payload.get("fresh"))):
+            # Attempts left: a failed attempt raises PipelineRetryable and the
+            # worker re-queues the job with backoff (JobQueue.fail)
+            simulate_pipeline(
+                job.run_id,
+                cancel_event=job.cancel_event,
+                retry_on_failure=job.attempts < job.max_attempts,
+            )
+    except PipelineCancelled:
+        logger.info(f"Pipeline [{job.run_id}]: Superseded - stopped at checkpoint")
+        # Same run re-queued: the new job takes over status and tracking
+        if not job_queue().has_queued(PIPELINE_JOB_KIND, job.run_id):
+            from backend.api.run_status import complete_run_tracking
+            complete_run_tracking(job.run_id, "cancelled")
+            update_run(job.run_id, status="cancelled")
+    finally:
+        unloaded = guard.end_run(job.run_id)
+        if unloaded:
+            logger.info(f"Pipeline [{job.run_id}]: Unloaded resident Ollama models {unloaded}")
+
+def _on_pipeline_job_dead(job: Job, error: str) -> None:
+    row = get_run_row(job.run_id)
+    if row and row["status"] not in ("done", "error", "failed", "validation_failed"):
+        update_run(job.run_id, status="error")
+    logger.error(f"Pipeline job for {job.run_id} gave up after {job.attempts} attempts: {error}")
+
+def build_pipeline_worker(concurrency: Optional[int] = None, executor: Optional[Executor] = None) -> JobWorker:
+    """JobWorker that executes pipeline runs (embedded or `python -m backend.worker`)."""
+    return JobWorker(
+        job_queue(),
+        {PIPELINE_JOB_KIND: run_pipeline_job},
+        concurrency=concurrency or settings.pipeline.max_workers,
+        poll_interval=settings.pipeline.job_poll_interval_ms / 1000,
+        on_dead=_on_pipeline_job_dead,
+        executor=executor,
+    )
+
+def init_db():
+    con = db()
+    cur = con.cursor()
+    # Runs table
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS runs (
+            id TEXT PRIMARY KEY,
+            funda_url TEXT,
+            funda_html TEXT,
+            status TEXT, -- queued, running, done, error
+            steps_json TEXT,
+            property_core_json TEXT, -- All relevant raw fields from scraper
+            chapters_json TEXT,      -- Final generated contents
+            kpis_json TEXT,          -- Computed KPIs
+            sources_json TEXT,       -- Info about used external sources
+            unknowns_json TEXT,      -- Missing data fields
+            artifacts_json TEXT,     -- references to PDF path, etc.
+            created_at TEXT,
+            updated_at TEXT
+        )
+    """)
+    # Attribute Discovery (Dynamic Interpretation Pipeline)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS attribute_discovery (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            run_id TEXT,
+            namespace TEXT, -- e.g., 'financial', 'energy', 'physical'
+            key TEXT,
+            display_name TEXT,
+            value TEXT,
+            confidence REAL,
+            source_snippet TEXT,
+            created_at TEXT,
+            FOREIGN KEY (run_id) REFERENCES runs (id)
+        )
+    """)
+    # Media Table (User-Mediated Browser Context)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS media (
+            id TEXT PRIMARY KEY,
+            run_id TEXT,
+            url TEXT,
+            caption TEXT,
+            ordering INTEGER,
+            provenance TEXT, -- e.g., 'extension', 'paste'
+            local_path TEXT,
+            created_at TEXT,
+            FOREIGN KEY (run_id) REFERENCES runs (id)
+        )
+    """)
+    # KV Store for preferences and configuration
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS kv_store (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        )
+    """)
+    con.commit()
+    con.close()
+    # Normalized report artifacts (per-chapter compressed blobs + metadata index)
+    artifact_store().init_schema()
+    # Durable pipeline job queue
+    job_queue().init_schema()
+    # Generated media referenced by chapters (/api/assets)
+    get_asset_store().init_schema()
+    get_media_ingestor().init_schema()
+
+def collect_unused_assets() -> None:
+    """Keep generated media within PIPELINE_ASSET_MAX_MB (never fails the caller)."""
+    try:
+        get_asset_store().collect_garbage(get_settings().pipeline.asset_max_mb * 1024 * 1024)
+    except Exception as e:
+        logger.warning(f"Asset garbage collection failed: {e}")
+
+def now():
+    return time.strftime("%Y-%m-%d %H:%M:%S")
+
+def default_steps():
+    return {s: "pending" for s in STEPS}
+
+def update_run(run_id, **kwargs):
+    con = db()
+    cur = con.cursor()
+    fields = []
+    values = []
+    for k, v in kwargs.items():
+        fields.append(f"{k} = ?")
+        values.append(v)
+    values.append(now())
+    values.append(run_id)
+    cur.execute(f"UPDATE runs SET {', '.join(fields)}, updated_at = ? WHERE id = ?", tuple(values))
+    con.commit()
+    con.close()
+
+def get_run_row(run_id):
+    con = db()
+    cur = con.cursor()
+    cur.execute("SELECT * FROM runs WHERE id=?", (run_id,))
+    row = cur.fetchone()
+    con.close()
+    return row
+
+def get_kv(key: str, default: Any = None) -> Any:
+    con = db()
+    cur = con.cursor()
+    cur.execute("SELECT value FROM kv_store WHERE key=?", (key,))
+    row = cur.fetchone()
+    con.close()
+    if row: return json.loads(row[0])
+    return default
+
+def set_kv(key: str, value: Any):
+    con = db()
+    cur = con.cursor()
+    cur.execute("INSERT OR REPLACE INTO kv_store (key, value) VALUES (?, ?)", (key, json.dumps(value)))
+    con.commit()
+    con.close()
+
+# --- AI INITIALIZATION (via AIAuthority) ---
+# Set by offline tools (backend/batch_regenerate.py) to run pipelines against
+# a specific provider instead of the one AIAuthority selects
+_pinned_text_provider: Optional[AIProvider] = None
+
+def pin_text_provider(provider: Optional[AIProvider]) -> None:
+    """Use `provider` for every pipeline in this process (None restores AIAuthority)."""
+    global _pinned_text_provider
+    _pinned_text_provider = provider
+
+def resolve_ai_provider_handle() -> Optional[ProviderHandle]:
+    """
+    Provider for a new run: the pinned one, else AIAuthority's registered
+    instance for the current provider/model/key (reused across runs).
+    Returns None if no provider is available.
+    """
+    from backend.ai.ai_authority import get_ai_authority
+    
+    if _pinned_text_provider is not None:
+        return ProviderHandle.wrap(_pinned_text_provider)
+
+    try:
+        return get_ai_authority().resolve_text_provider()
+    except Exception as e:
+        logger.error(f"✗ Failed to initialize AI Provider via AIAuthority: {e}")
+        return None
+
+def init_ai_provider() -> Optional[ProviderHandle]:
+    """
+    Initialize AI Provider using AIAuthority as single source of truth.
+    
+    AIAuthority handles:
+    - Reading API keys (only place allowed to do so)
+    - Applying provider hierarchy (OpenAI -> Gemini -> Claude -> Ollama)
+    - Determining operational status
+    
+    Sets the process-wide provider (status endpoints, legacy callers) and
+    returns its handle, or None if no provider is available. Pipeline runs
+    keep that handle for their whole duration.
+    """
+    handle = resolve_ai_provider_handle()
+    if handle is None:
+        return None
+    IntelligenceEngine.set_provider(handle.provider)
+    logger.info(f"✓ AI Provider initialized via AIAuthority: {handle.provider_name}/{handle.model}")
+    return handle
+
+def reload_ai_provider() -> Optional[ProviderHandle]:
+    """
+    Re-resolve the provider after AI settings or keys were saved.
+
+    Registry entries built from the previous settings are evicted; runs
+    that still hold one keep using it until they finish.
+    """
+    from backend.ai.provider_registry import get_provider_registry
+    handle = init_ai_provider()
+    evicted = get_provider_registry().evict(keep=handle)
+    if evicted:
+        logger.info(f"Evicted {evicted} superseded AI provider instance(s)")
+    return handle
+
+# --- PIPELINE ---
+def simulate_pipeline(run_id, cancel_event: Optional[threading.Event] = None, retry_on_failure: bool = False):
+    """
+    Main pipeline execution function.
+    
+    CRITICAL: This function now uses PipelineSpine for chapter generation.
+    All chapters pass through ValidationGate before being stored.
+    
+    TELEMETRY: Real-time status is tracked via run_status_router.
+    
+    CANCELLATION: When cancel_event is set (run superseded by a newer start),
+    PipelineCancelled is raised at the next checkpoint - never after results
+    of the stale run could overwrite the new one.
+    
+    RETRIES: With retry_on_failure, a spine or dynamic extraction failure
+    re-queues the run and raises PipelineRetryable for the job queue instead
+    of marking the run as error.
+    """
+    from backend.api.run_status import (
+        start_run_tracking, track_step, track_warning, 
+        track_error, complete_run_tracking
+    )
+    from backend.domain.app_config import build_app_config, validate_config_for_execution, OperatingMode
+    
+    logger.info(f"Pipeline: Starting run {run_id}")
+    
+    # Build configuration and validate
+    config = build_app_config()
+    can_execute, config_error = validate_config_for_execution(config)
+    
+    # Initialize run tracking for real-time UI updates
+    start_run_tracking(
+        run_id=run_id,
+        provider=config.provider,
+        model=config.model,
+        mode=config.mode.value
+    )
+    
+    # FAIL-CLOSED: Check config validity before proceeding
+    if not can_execute:
+        logger.error(f"Pipeline [{run_id}]: Configuration invalid - {config_error}")
+        track_error(run_id, f"Configuration error: {config_error}")
+        complete_run_tracking(run_id, "error")
+        update_run(run_id, status="error")
+        return
+    
+    # Check if mode requires AI
+    if config.mode in (OperatingMode.DEBUG, OperatingMode.OFFLINE):
+        logger.info(f"Pipeline [{run_id}]: Running in {config.mode.value} mode - AI disabled")
+        track_warning(run_id, f"AI disabled by mode: {config.mode.value}")
+    
+    # Resolve AI at start of pipeline & Validate Availability (Patch B)
+    # FAIL-FAST: If no AI provider is operational, we must NOT proceed.
+    # The handle is bound to this run: later provider changes (settings,
+    # other runs) do not affect it.
+    provider_handle = init_ai_provider()
+    if not provider_handle:
+        error_msg = "Pipeline Aborted: No AI provider available. Please configure API keys or check Ollama status."
+        logger.error(f"Pipeline [{run_id}]: {error_msg}")
+        track_step(run_id, "scrape_funda", "error", error_msg) # Fail early
+        track_error(run_id, error_msg)
+        complete_run_tracking(run_id, "error")
+        update_run(run_id, status="error")
+        return
+    
+    row = get_run_row(run_id)
+    if not row:
+        complete_run_tracking(run_id, "error")
+        return
+    
+    logger.info(f"Pipeline [{run_id}]: Starting. Status: {row['status']}, Mode: {config.mode.value}")
+    
+    steps = json.loads(row["steps_json"]) if row["steps_json"] else {}
+    core = json.loads(row["property_core_json"]) if row["property_core_json"] else {}
+    funda_url = row["funda_url"]
+    
+    # 1. Scrape / Parse
+    _raise_if_cancelled(run_id, cancel_event)
+    logger.info(f"Pipeline [{run_id}]: Starting Scrape/Parse")
+    track_step(run_id, "scrape_funda", "running")
+    steps["scrape_funda"] = "running"
+    update_run(run_id, steps_json=json.dumps(steps))
+    
+    if funda_url and "manual-paste" not in funda_url:
+        try:
+            scraper = Scraper()
+            scraped = scraper.derive_property_core(funda_url)
+            core.update({k: v for k, v in scraped.items() if v})
+        except Exception as e:
+            logger.error(f"Pipeline [{run_id}]: Scrape failed: {e}")
+            core["scrape_error"] = str(e)
+            
+    if row["funda_html"]:
+        try:
+            p = Parser().parse_html(row["funda_html"])
+            incoming_media = p.get("media_urls", [])
+            # For a truly clean re-scan, we trust the newest data from the parser/extension
+            # rather than indefinitely merging old state.
+            core.update({k: v for k, v in p.items() if v})
+            core["media_urls"] = list(dict.fromkeys(incoming_media))[:50] 
+            
+            # Sync to media table
+            con = db()
+            cur = con.cursor()
+            for idx, m_url in enumerate(core["media_urls"]):
+                cur.execute("SELECT 1 FROM media WHERE run_id = ? AND url = ?", (run_id, m_url))
+                if not cur.fetchone():
+                    cur.execute(
+                        "INSERT INTO media (id, run_id, url, caption, ordering, provenance, created_at) VALUES (?,?,?,?,?,?,?)",
+                        (str(uuid.uuid4()), run_id, m_url, f"Foto {idx+1}", idx, "parser", now())
+                    )
+            con.commit()
+            con.close()
+        except Exception as e:
+            logger.error(f"Pipeline [{run_id}]: Parse failed: {e}")
+            
+
+    steps["scrape_funda"] = "done"
+    track_step(run_id, "scrape_funda", "done")
+    update_run(run_id, steps_json=json.dumps(steps), property_core_json=json.dumps(core))
+    
+    # 1a/1b. Consistency Validation and Dynamic Extraction (if HTML present)
+    # Neither feeds the registry: both run as stages next to the spine and
+    # are joined before anything is persisted.
+    _raise_if_cancelled(run_id, cancel_event)
+    from backend.pipeline.stage_scheduler import StageScheduler
+    side_stages = StageScheduler(f"Pipeline [{run_id}]")
+    # Set as soon as extraction fails: the spine stops at its next checkpoint
+    # instead of generating a report that would be thrown away
+    extraction_failed = threading.Event()
+    if row["funda_html"] and core:
+        parsed_core = dict(core)  # the spine gets `core` itself
+        side_stages.add("consistency", lambda: check_consistency(row["funda_html"], parsed_core))
+    if row["funda_html"]:
+        logger.info(f"Pipeline [{run_id}]: Starting Dynamic Extraction")
+        steps["dynamic_extraction"] = "running"
+        track_step(run_id, "dynamic_extraction", "running")
+        update_run(run_id, steps_json=json.dumps(steps))
+        # Use safe execution bridge (Risk 1 Mitigation)
+        from backend.ai.bridge import safe_execute_async
+
+        def extract():
+            try:
+                return safe_execute_async(run_dynamic_extraction(run_id, row["funda_html"], provider_handle.provider))
+            except BaseException:
+                extraction_failed.set()
+                raise
+
+        side_stages.add("dynamic_extraction", extract)
+    if core.get("media_urls"):
+        # Photos stored once with vision-sized variants (used by the chapter 0 vision audit)
+        media_urls = list(core["media_urls"])
+        side_stages.add("media_ingest", lambda: ingest_run_media(run_id, media_urls))
+
+    # =========================================================================
+    # SPINE-BASED EXECUTION (Gravity Installed)
+    # =========================================================================
+    # From here, we use PipelineSpine which enforces:
+    # - Single canonical registry
+    # - Locked immutable truth
+    # - Mandatory validation for every chapter
+    # =========================================================================
+    
+    _raise_if_cancelled(run_id, cancel_event)
+    logger.info(f"Pipeline [{run_id}]: Starting Spine-Based Execution")
+    track_step(run_id, "plane_generation", "running", "4-Plane Report Generation")
+    steps["compute_kpis"] = "running"
+    update_run(run_id, steps_json=json.dumps(steps))
+    
+    retry_scheduled = False
+
+    def retry_later(error: BaseException) -> None:
+        """Hand the failed attempt back to the job queue; the next attempt starts over."""
+        nonlocal retry_scheduled
+        retry_scheduled = True
+        get_image_queue().discard(run_id)
+        track_warning(run_id, f"Attempt failed, retrying: {error}")
+        update_run(run_id, status="queued", steps_json=json.dumps(default_steps()))
+        raise PipelineRetryable(f"Pipeline [{run_id}]: {error}") from error
+
+    def fail_extraction() -> None:
+        """FAIL-CLOSED: a failed extraction stops the pipeline; nothing is stored."""
+        extraction_error = side_stages.exception("dynamic_extraction")
+        logger.error(f"Pipeline [{run_id}]: Dynamic Extraction failed: {extraction_error}")
+        if retry_on_failure:
+            retry_later(extraction_error)
+        track_step(run_id, "dynamic_extraction", "error", str(extraction_error))
+        track_step(run_id, "plane_generation", "skipped", "Stopped: dynamic extraction failed")
+        track_error(run_id, f"Dynamic extraction failed: {extraction_error}")
+        complete_run_tracking(run_id, "error")
+        steps["dynamic_extraction"] = "failed"
+        steps["compute_kpis"] = "skipped"
+        update_run(run_id, status="error", steps_json=json.dumps(steps))
+        get_image_queue().discard(run_id)
+
+    # Side stages run while the spine executes (joined in the try/finally below)
+    side_stages.start()
+    # Hero images still queued from an earlier (superseded) attempt of this run
+    get_image_queue().discard(run_id)
+    
+    # FIX 2: Guaranteed Terminal State via try/finally
+    try:
+        # Get preferences
+        prefs = get_kv("preferences", {})
+        if 'ai_model' not in prefs or not prefs['ai_model']:
+            prefs['ai_model'] = settings.ai.model
+        if 'ai_provider' not in prefs or not prefs['ai_provider']:
+            prefs['ai_provider'] = settings.ai.provider
+        
+        # FIX 1: Heartbeat Callback
+        def persist_progress(status_msg: str):
+            """
+            Callback passed to spine to persist progress to DB.
+            Called after every chapter generation.
+            """
+            _raise_if_cancelled(run_id, cancel_event)
+            if extraction_failed.is_set():
+                # PipelineCancelled is the one exception the spine lets through its checkpoints
+                raise PipelineCancelled(run_id)
+            logger.info(f"Pipeline [{run_id}]: Heartbeat - {status_msg}")
+            # Update step status in memory
+            steps["compute_kpis"] = status_msg
+            # Persist to DB immediately
+            update_run(run_id, steps_json=json.dumps(steps), updated_at=now())
+
+        # Execute through the spine - THIS IS THE CRITICAL PATH
+        from backend.pipeline.bridge import execute_report_pipeline, execute_report_pipeline_async
+        from backend.ai.provider_registry import provider_scope
+        with provider_scope(provider_handle):
+            if settings.pipeline.async_spine:
+                # Narratives and hero images are prefetched concurrently on the
+                # shared AsyncRuntime loop; this job-worker thread stays
+                # blocked until the run is done
+                from backend.ai.bridge import get_async_runtime
+                chapters, kpis, enriched_core, core_summary = get_async_runtime().run(
+                    execute_report_pipeline_async(
+                        run_id=run_id,
+                        raw_data=core,
+                        preferences=prefs,
+                        progress_callback=persist_progress
+                    )
+                )
+            else:
+                chapters, kpis, enriched_core, core_summary = execute_report_pipeline(
+                    run_id=run_id,
+                    raw_data=core,
+                    preferences=prefs,
+                    progress_callback=persist_progress  # Pass callback
+                )
+        
+        # Update core with enriched data for database storage
+        core = enriched_core
+        
+        # Join the side stages (FAIL-CLOSED: a failed extraction stops the pipeline)
+        if side_stages.has("dynamic_extraction"):
+            if side_stages.exception("dynamic_extraction") is not None:
+                # Failed after the spine's last checkpoint
+                fail_extraction()
+                return # Stop pipeline on failure
+            steps["dynamic_extraction"] = "done"
+            track_step(run_id, "dynamic_extraction", "done")
+        if side_stages.has("consistency"):
+            issues = side_stages.result("consistency")
+            if issues:
+                core["_validation_issues"] = issues
+        
+        steps["compute_kpis"] = "done"
+        track_step(run_id, "plane_generation", "done")
+        track_step(run_id, "validation", "done")
+        update_run(run_id, steps_json=json.dumps(steps), kpis_json=json.dumps(kpis), property_core_json=json.dumps(core))
+        
+    except PipelineCancelled:
+        superseded = cancel_event is not None and cancel_event.is_set()
+        if extraction_failed.is_set() and not superseded:
+            fail_extraction()
+            return # Spine stopped early: extraction failed
+        raise
+    except PipelineRetryable:
+        raise
+    except Exception as e:
+        logger.error(f"Pipeline [{run_id}]: Spine execution failed: {e}")
+        if retry_on_failure:
+            retry_later(e)
+        get_image_queue().discard(run_id)
+        track_step(run_id, "plane_generation", "error", str(e))
+        track_error(run_id, f"Spine execution failed: {e}")
+        complete_run_tracking(run_id, "error")
+        
+        # FAIL-CLOSED: Ensure steps are terminal
+        for k, v in steps.items():
+            if v == "running":
+                steps[k] = "failed"
+            elif v == "pending":
+                steps[k] = "skipped"
+                
+        update_run(run_id, status="error", steps_json=json.dumps(steps))
+        return
+    finally:
+        # Side stages never outlive the run
+        side_stages.wait_all()
+        # Final fail-safe: explicitly check if we are exiting with 'running' status
+        try:
+             # If we are somehow exiting without having cleaned up (e.g. unhandled exit)
+             is_running = any(v == 'running' for v in steps.values())
+             superseded = cancel_event is not None and cancel_event.is_set()
+             if is_running and not superseded and not retry_scheduled:
+                 logger.error(f"Pipeline [{run_id}]: Finalizer caught running status - Forcing consistency.")
+                 for k, v in steps.items():
+                     if v == "running": steps[k] = "failed"
+                     elif v == "pending": steps[k] = "skipped"
+                 update_run(run_id, status="error", steps_json=json.dumps(steps))
+        except Exception as ex:
+             logger.error(f"Pipeline [{run_id}]: Finalizer error: {ex}")
+    
+    # 3. Finalize
+    _raise_if_cancelled(run_id, cancel_event)
+    logger.info(f"Pipeline [{run_id}]: Finalizing Chapters")
+    steps["generate_chapters"] = "running"
+    update_run(run_id, steps_json=json.dumps(steps))
+    
+    try:
+        unknowns = build_unknowns(core)
+    except Exception as e:
+        logger.error(f"Pipeline [{run_id}]: Build unknowns failed: {e}")
+        unknowns = []
+    
+    steps["generate_chapters"] = "done"
+    
+    # =========================================================================
+    # LAW D ENFORCEMENT: FAIL-CLOSED PERSISTENCE
+    # =========================================================================
+    # If validation_passed is False, we MUST NOT store chapters_json.
+    # Only diagnostics (steps_json, kpis with errors) are stored.
+    # This prevents invalid reports from reaching users.
+    # =========================================================================
+    
+    validation_passed = kpis.get('validation_passed', False)
+    
+    if validation_passed:
+        # VALID REPORT: Store chapters and mark as done
+        logger.info(f"Pipeline [{run_id}]: ✓ VALIDATION PASSED - Storing chapters")
+        # Chapters go to normalized storage (one compressed row per chapter);
+        # chapters_json is cleared so the runs row stays narrow.
+        # Heroes still generating are listed in the run index, so readers in
+        # any process (API with an external worker) know what is pending
+        from backend.pipeline.four_plane_backbone import hero_image_pending
+        artifact_store().save_report(
+            run_id,
+            chapters,
+            core_summary=core_summary,  # BACKBONE CONTRACT: stored once, as its own artifact
+            address=core.get("address"),
+            pending_images=[cid for cid, ch in chapters.items() if hero_image_pending(ch)]
+        )
+        track_step(run_id, "render", "done")
+        update_run(
+            run_id, 
+            steps_json=json.dumps(steps), 
+            chapters_json="{}", 
+            unknowns_json=json.dumps(unknowns), 
+            status="done"
+        )
+        # Hero images from the background queue are attached to the stored chapters
+        # (finished ones before 'complete', so the first report fetch includes them)
+        pending_images = attach_queued_images(run_id)
+        if pending_images:
+            logger.info(f"Pipeline [{run_id}]: {pending_images} hero images still generating")
+        # After the DB write: SSE subscribers fetch the report on 'complete'
+        complete_run_tracking(run_id, "done")
+        collect_unused_assets()
+    else:
+        # INVALID REPORT: Do NOT store chapters, mark as validation_failed
+        logger.error(
+            f"Pipeline [{run_id}]: ✗ VALIDATION FAILED - NOT storing chapters_json. "
+            f"This is LAW D enforcement: invalid reports cannot persist."
+        )
+        # Store only diagnostics for debugging
+        diagnostics = {
+            "validation_failed": True,
+            "kpis": kpis,
+            "chapter_count": len(chapters),
+            "failed_reason": "One or more chapters failed validation. See kpis for details."
+        }
+        update_run(
+            run_id, 
+            steps_json=json.dumps(steps), 
+            # chapters_json is NOT updated - keeps previous value or empty
+            kpis_json=json.dumps(kpis),  # Contains validation details
+            unknowns_json=json.dumps(unknowns),
+            # CRITICAL: status is 'validation_failed', NOT 'done'
+            status="validation_failed"
+        )
+        track_error(run_id, "Validation failed - report not stored")
+        complete_run_tracking(run_id, "validation_failed")
+        get_image_queue().discard(run_id)
+
+def build_unknowns(core: Dict[str, Any]) -> List[str]:
+    fields = ["asking_price_eur", "living_area_m2", "plot_area_m2", "build_year", "energy_label", "rooms", "bedrooms"]
+    return [f for f in fields if not core.get(f)]
+
+def _record_media_paths(run_id: str, ingested: Dict[str, Dict[str, Any]]) -> None:
+    if not ingested:
+        return
+    con = db()
+    try:
+        con.executemany(
+            "UPDATE media SET local_path = ? WHERE run_id = ? AND url = ?",
+            [(str(v["vision"]["path"]), run_id, url) for url, v in ingested.items()]
+        )
+        con.commit()
+    finally:
+        con.close()
+
+def ingest_run_media(run_id: str, media_urls: List[str]) -> int:
+    """Ingest a run's photos and record the vision variant on its media rows; returns the number ingested."""
+    ingested = get_media_ingestor().ingest_many(media_urls)
+    _record_media_paths(run_id, ingested)
+    logger.info(f"Pipeline [{run_id}]: Ingested {len(ingested)}/{len(media_urls)} photos")
+    return len(ingested)
+
+def prefetch_run_media(run_id: str, media_urls: List[str]) -> None:
+    """Start downloading a run's photos in the background (the pipeline's media_ingest stage joins them)."""
+    if not media_urls:
+        return
+
+    def _done(future):
+        try:
+            ingested = future.result()
+            _record_media_paths(run_id, ingested)
+            logger.info(f"Ingest [{run_id}]: Prefetched {len(ingested)}/{len(media_urls)} photos")
+        except Exception as e:
+            logger.warning(f"Ingest [{run_id}]: Photo prefetch failed: {e}")
+
+    get_media_ingestor().prefetch(media_urls).add_done_callback(_done)
+
+def check_consistency(html: str, core: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Mismatches between the listing text and the parsed core data (errors are logged, not raised)."""
+    try:
+        checker = ConsistencyChecker()
+        # Extract text for validation scanning
+        from bs4 import BeautifulSoup
+        soup = BeautifulSoup(html, "html.parser")
+        text_body = soup.get_text(separator="\n")
+        
+        issues = [i for i in checker.check(text_body, core) if i['status'] == 'mismatch']
+        logger.info(f"Consistency: Found {len(issues)} validation mismatches.")
+        return issues
+    except Exception as e:
+        logger.error(f"Validation failed: {e}")
+        return []
+
+def attach_queued_images(run_id: str) -> int:
+    """
+    Route the run's queued hero images into its stored chapters; returns how many are still pending.
+
+    Each attached image leaves the run index's pending images and is
+    announced as a chapter_updated SSE event, so open reports re-fetch the
+    chapter.
+    """
+    from backend.api.run_status import run_status_store
+    from backend.pipeline.four_plane_backbone import apply_hero_image_result
+
+    def _attach(chapter_id, result):
+        store = artifact_store()
+        if store.update_chapter(run_id, chapter_id, lambda ch: apply_hero_image_result(ch, result), resolves_image=True):
+            logger.info(f"Pipeline [{run_id}]: Hero image of chapter {chapter_id} attached ({result.status.value})")
+            run_status_store.publish_chapter_updated(run_id, str(chapter_id), len(store.pending_images(run_id)))
+
+    return get_image_queue().deliver(run_id, _attach)
+
+async def run_dynamic_extraction(run_id: str, html: str, provider: Optional[AIProvider] = None):
+    try:
+        # Pipeline runs pass their own provider; standalone calls use the process-wide one
+        if provider is None:
+            init_ai_provider()
+            provider = IntelligenceEngine._provider
+        if not provider: 
+            logger.warning("No AI Provider for dynamic extraction")
+            return
+            
+        extractor = DynamicExtractor(provider)
+        
+        from bs4 import BeautifulSoup
+        soup = BeautifulSoup(html, "html.parser")
+        main = soup.find('main') or soup.find('article') or soup.body or soup
+        text = main.get_text(separator="\n")
+        
+        # 100% Correct async call
+        attributes = await extractor.extract_attributes(text)
+        
+        con = db()
+        cur = con.cursor()
+        for attr in attributes:
+            cur.execute(
+                "INSERT INTO attribute_discovery (run_id, namespace, key, display_name, value, confidence, source_snippet, created_at) VALUES (?,?,?,?,?,?,?,?)",
+                (run_id, attr["namespace"], attr["key"], attr["display_name"], attr["value"], attr["confidence"], attr["source_snippet"], now())
+            )
+        con.commit()
+        con.close()
+    except Exception as e:
+        logger.error(f"Background dynamic extraction failed: {e}")
+        raise # Propagate to stop pipeline
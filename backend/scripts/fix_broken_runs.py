@@ -2,6 +2,10 @@
 import sqlite3
 import json
 import os
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from backend.storage import sqlite_pool
 
 DB_PATH = "data/local_app.db"
 
@@ -12,7 +16,8 @@ def fix_runs():
         return
 
     try:
-        con = sqlite3.connect(DB_PATH)
+        # Same WAL mode and busy timeout as the app, so a running server is not blocked
+        con = sqlite_pool.connect(DB_PATH)
         con.row_factory = sqlite3.Row
         cur = con.cursor()
         
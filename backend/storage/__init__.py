@@ -0,0 +1,18 @@
+"""
+Storage package - shared SQLite access for the application.
+
+Public API:
+    connect(db_path) -> sqlite3.Connection: Pooled connection; close() returns it to the pool
+    get_pool(db_path) -> SQLitePool: The pool for a database path
+    close_all_pools(): Close every pooled connection (shutdown / tests)
+    RunArtifactStore: Normalized per-chapter report storage
+    JobQueue: Durable job queue with leases, heartbeats and retry backoff
+    AssetStore: Content-hashed files for generated media (served via /api/assets)
+"""
+
+from .sqlite_pool import SQLitePool, connect, get_pool, close_all_pools
+from .run_artifacts import RunArtifactStore
+from .job_queue import Job, JobQueue
+from .asset_store import AssetStore, get_asset_store
+
+__all__ = ["SQLitePool", "connect", "get_pool", "close_all_pools", "RunArtifactStore", "Job", "JobQueue", "AssetStore", "get_asset_store"]
@@ -0,0 +1,295 @@
+"""
+ASSET STORE - Content-hashed blobs for generated media
+
+Generated images used to travel inline: a provider without save_to_disk
+returned image_base64, FourPlaneBackbone copied it into the hero
+infographic, and every stored chapter and /report response carried
+megabytes of base64. Binary assets now live outside the report:
+
+    <db dir>/assets/<aa>/<sha256>.<ext> the bytes, written once (content-addressed)
+    assets table                        asset_id, mime type, size, timestamps
+
+Files live next to the database they are registered in (data/assets for the
+default data/local_app.db), so a store on another database never writes
+into the repository tree.
+
+Chapters keep only the asset URL (/api/assets/<asset_id>). Since the id is
+the content hash, an asset never changes: the endpoint serves it with the
+id as ETag and an immutable, year-long Cache-Control.
+
+Assets are permanent while something references them. collect_garbage()
+keeps the store within a byte budget by deleting, oldest first, assets that
+no stored report (run_artifacts, legacy runs rows) and no ingested photo
+(media, media_variants) points to - e.g. images of deleted runs, or image
+cache hits that were never used by a report.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
+
+from backend.storage import sqlite_pool
+from backend.storage.run_artifacts import ENCODING_ZLIB_JSON
+
+logger = logging.getLogger(__name__)
+
+# Override for the global store's directory (None: "assets" next to the database)
+ASSET_DIR: Optional[Path] = None
+ASSET_URL_PREFIX = "/api/assets/"
+ASSET_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+_EXTENSIONS = {"image/png": "png", "image/jpeg": "jpg", "image/webp": "webp", "image/gif": "gif"}
+_ASSET_URL_PATTERN = re.compile(re.escape(ASSET_URL_PREFIX).encode("ascii") + rb"([0-9a-f]{64})")
+
+# Garbage collection: assets younger than this are kept even if unreferenced (a
+# running pipeline stores its hero images before the report that uses them),
+# and a collection deletes down to this share of the budget, so the next few
+# stored assets do not trigger another scan right away
+GC_MIN_AGE_SECONDS = 24 * 3600
+GC_TARGET_RATIO = 0.9
+# Text columns that may hold asset URLs: (table, column)
+_URL_COLUMNS = (
+    ("runs", "chapters_json"),
+    ("runs", "property_core_json"),
+    ("media", "url"),
+    ("media_variants", "source_url"),
+)
+
+# (path, file identity) of databases whose tables exist: a deleted or replaced
+# file at the same path gets its tables created again
+_initialized_files: Set[Tuple[str, Optional[tuple]]] = set()
+_init_lock = threading.Lock()
+
+
+def asset_url(asset_id: str) -> str:
+    return f"{ASSET_URL_PREFIX}{asset_id}"
+
+
+def default_asset_dir(db_path: Union[str, Path]) -> Path:
+    """"assets" next to the database file; a per-process temp dir for in-memory databases."""
+    db_path = str(db_path)
+    if db_path == ":memory:" or db_path.startswith("file::memory:"):
+        return Path(tempfile.gettempdir()) / f"assets-{os.getpid()}"
+    return Path(db_path).resolve().parent / "assets"
+
+
+class AssetStore:
+    """Content-addressed files plus metadata rows in the app database."""
+
+    def __init__(self, db_path: Union[str, Path], directory: Optional[Union[str, Path]] = None):
+        self.db_path = str(db_path)
+        self.directory = Path(directory) if directory is not None else default_asset_dir(self.db_path)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite_pool.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        if self._init_key() not in _initialized_files or self.db_path == ":memory:":
+            self._create_tables(conn)
+        return conn
+
+    def _init_key(self) -> Tuple[str, Optional[tuple]]:
+        return (self.db_path, sqlite_pool.file_identity(self.db_path))
+
+    def init_schema(self) -> None:
+        """Create the assets table (idempotent). Called from init_db()."""
+        conn = sqlite_pool.connect(self.db_path)
+        try:
+            self._create_tables(conn)
+        finally:
+            conn.close()
+
+    def _create_tables(self, conn: sqlite3.Connection) -> None:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS assets (
+                asset_id TEXT PRIMARY KEY,  -- sha256 of the bytes
+                mime_type TEXT,
+                size_bytes INTEGER,
+                source TEXT,                -- producer, e.g. 'plane_a2'
+                created_at TEXT
+            )
+        """)
+        conn.commit()
+        with _init_lock:
+            _initialized_files.add(self._init_key())
+
+    def _path(self, asset_id: str, mime_type: str) -> Path:
+        ext = _EXTENSIONS.get(mime_type, "bin")
+        return self.directory / asset_id[:2] / f"{asset_id}.{ext}"
+
+    # =========================================================================
+    # WRITE
+    # =========================================================================
+
+    def put(self, data: bytes, mime_type: str = "image/png", source: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Store bytes (a no-op if identical content is already stored).
+
+        Returns the asset entry including its "path" and "url".
+        """
+        asset_id = hashlib.sha256(data).hexdigest()
+        path = self._path(asset_id, mime_type)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Atomic: a concurrent reader never sees a partial file
+            tmp_path = path.with_name(f".{asset_id}.{uuid.uuid4().hex[:8]}.tmp")
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+
+        entry = {
+            "asset_id": asset_id,
+            "mime_type": mime_type,
+            "size_bytes": len(data),
+            "source": source,
+            "created_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        conn = self._connect()
+        try:
+            with conn:
+                # Storing known content again counts as new for collect_garbage()
+                conn.execute(
+                    "INSERT INTO assets (asset_id, mime_type, size_bytes, source, created_at) "
+                    "VALUES (:asset_id, :mime_type, :size_bytes, :source, :created_at) "
+                    "ON CONFLICT(asset_id) DO UPDATE SET created_at = excluded.created_at",
+                    entry
+                )
+        finally:
+            conn.close()
+        return {**entry, "path": path, "url": asset_url(asset_id)}
+
+    # =========================================================================
+    # READ
+    # =========================================================================
+
+    def get(self, asset_id: str) -> Optional[Dict[str, Any]]:
+        """Asset metadata plus "path" and "url", or None if unknown or its file is gone."""
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT * FROM assets WHERE asset_id = ?", (asset_id,)).fetchone()
+        finally:
+            conn.close()
+        if not row:
+            return None
+        entry = dict(row)
+        path = self._path(asset_id, entry["mime_type"])
+        if not path.exists():
+            logger.warning(f"AssetStore: File of asset {asset_id} is missing")
+            return None
+        entry["path"] = path
+        entry["url"] = asset_url(asset_id)
+        return entry
+
+    # =========================================================================
+    # GARBAGE COLLECTION
+    # =========================================================================
+
+    def touch(self, asset_id: str) -> None:
+        """Mark an asset as new for collect_garbage(), e.g. when a run reuses it from a cache."""
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(
+                    "UPDATE assets SET created_at = ? WHERE asset_id = ?",
+                    (time.strftime("%Y-%m-%d %H:%M:%S"), asset_id)
+                )
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _referenced_ids(conn: sqlite3.Connection) -> Set[str]:
+        """Ids of assets used by a stored report or an ingested photo (tables of this database)."""
+        found: Set[str] = set()
+
+        def scan(text: Any) -> None:
+            if isinstance(text, str):
+                text = text.encode("utf-8")
+            if text:
+                found.update(m.decode("ascii") for m in _ASSET_URL_PATTERN.findall(text))
+
+        try:
+            for row in conn.execute("SELECT encoding, body FROM run_artifacts"):
+                encoding, body = row[0], row[1]
+                scan(zlib.decompress(body) if encoding == ENCODING_ZLIB_JSON else body)
+        except sqlite3.OperationalError:
+            pass  # no reports stored in this database
+        try:
+            for row in conn.execute("SELECT original_id, vision_id, thumbnail_id FROM media_variants"):
+                found.update(v for v in row if v)
+        except sqlite3.OperationalError:
+            pass
+        for table, column in _URL_COLUMNS:
+            try:
+                rows = conn.execute(
+                    f"SELECT {column} FROM {table} WHERE {column} LIKE ?", (f"%{ASSET_URL_PREFIX}%",)
+                ).fetchall()
+            except sqlite3.OperationalError:
+                continue
+            for row in rows:
+                scan(row[0])
+        return found
+
+    def collect_garbage(self, max_bytes: int, min_age_seconds: float = GC_MIN_AGE_SECONDS) -> Dict[str, int]:
+        """
+        Delete unreferenced assets, oldest first, while the store is above max_bytes.
+
+        Referenced assets and those younger than min_age_seconds are never
+        deleted, so the store can stay above the budget. Below the budget
+        nothing is scanned. Returns the number of deleted assets, the bytes
+        freed and the bytes still stored.
+        """
+        deleted: List[sqlite3.Row] = []
+        conn = self._connect()
+        try:
+            total = conn.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM assets").fetchone()[0]
+            if max_bytes <= 0 or total <= max_bytes:
+                return {"deleted": 0, "freed_bytes": 0, "stored_bytes": total}
+            referenced = self._referenced_ids(conn)
+            cutoff = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(time.time() - min_age_seconds))
+            candidates = conn.execute(
+                "SELECT asset_id, mime_type, size_bytes FROM assets WHERE created_at <= ? ORDER BY created_at",
+                (cutoff,)
+            ).fetchall()
+            target = max_bytes * GC_TARGET_RATIO
+            with conn:
+                for row in candidates:
+                    if total <= target:
+                        break
+                    if row["asset_id"] in referenced:
+                        continue
+                    # Re-checks the age: put() of the same content in the meantime keeps it
+                    cursor = conn.execute(
+                        "DELETE FROM assets WHERE asset_id = ? AND created_at <= ?", (row["asset_id"], cutoff)
+                    )
+                    if cursor.rowcount:
+                        deleted.append(row)
+                        total -= row["size_bytes"] or 0
+        finally:
+            conn.close()
+
+        freed = 0
+        for row in deleted:
+            self._path(row["asset_id"], row["mime_type"]).unlink(missing_ok=True)
+            freed += row["size_bytes"] or 0
+        if deleted:
+            logger.info(
+                f"AssetStore: Deleted {len(deleted)} unreferenced assets ({freed} bytes), {total} bytes stored"
+            )
+        return {"deleted": len(deleted), "freed_bytes": freed, "stored_bytes": total}
+
+
+# =============================================================================
+# MODULE-LEVEL HELPER
+# =============================================================================
+
+def get_asset_store() -> AssetStore:
+    """Store for the configured application database (settings.database_url)."""
+    from backend.config.settings import get_settings
+    return AssetStore(get_settings().database_url, ASSET_DIR)
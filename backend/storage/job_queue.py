@@ -0,0 +1,465 @@
+"""
+JOB QUEUE - Durable, SQLite-backed work queue with leases
+
+Pipeline runs used to be handed straight to an in-memory ThreadPoolExecutor:
+a restart lost every queued run and cleanup_zombie_runs could only mark the
+half-finished ones failed 30 minutes later. Jobs now live in the `jobs` table
+of the app database, so any process (the API or a separate worker) can pick
+them up:
+
+    queued ──claim()──> leased ──complete()──> done
+       ^                  │
+       └──── fail() ──────┤  (attempts left: re-queued with exponential backoff)
+                          └──> dead  (max_attempts reached)
+
+LEASES:
+- claim() atomically moves one due job to 'leased' for lease_seconds
+- the holder calls heartbeat() to extend the lease while it is still working
+- a lease that expires (worker crashed / process killed) makes the job
+  claimable again; that counts as an attempt
+
+SINGLE-FLIGHT (per run_id, and per dedupe_key - the normalized listing):
+- enqueue() attaches to a queued or running job of the same run instead of
+  scheduling a duplicate; a queued job reads the latest run data when it starts
+- request_cancel() supersedes stale work: running jobs get cancel_requested
+  (the worker stops them at the next checkpoint), queued jobs of other runs
+  for the same listing are cancelled outright
+- claim() never starts a job while another job of the same run holds a live
+  lease, so a superseding job waits for the stale one to wind down
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from backend.storage import sqlite_pool
+
+logger = logging.getLogger(__name__)
+
+STATUS_QUEUED = "queued"
+STATUS_LEASED = "leased"
+STATUS_DONE = "done"
+STATUS_DEAD = "dead"
+STATUS_CANCELLED = "cancelled"
+ACTIVE_STATUSES = (STATUS_QUEUED, STATUS_LEASED)
+
+DEFAULT_LEASE_SECONDS = 120
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_RETRY_BASE_SECONDS = 10.0
+MAX_RETRY_DELAY_SECONDS = 600.0
+
+
+@dataclass
+class Job:
+    """A claimed job as handed to a worker."""
+
+    id: str
+    kind: str
+    run_id: Optional[str]
+    payload: Dict[str, Any] = field(default_factory=dict)
+    attempts: int = 0
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS
+    lease_owner: Optional[str] = None
+    lease_expires_at: float = 0.0
+    dedupe_key: Optional[str] = None
+    # Set by the worker when the job was superseded; handlers check it cooperatively
+    cancel_event: threading.Event = field(default_factory=threading.Event, repr=False, compare=False)
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+
+def retry_delay(attempts: int, base_seconds: float = DEFAULT_RETRY_BASE_SECONDS) -> float:
+    """Exponential backoff after the given number of failed attempts (capped)."""
+    return min(base_seconds * (2 ** max(attempts - 1, 0)), MAX_RETRY_DELAY_SECONDS)
+
+
+class JobQueue:
+    """
+    Queue operations for one database.
+
+    File databases use the shared connection pool; ':memory:' databases (tests)
+    keep one private connection so the table survives between calls.
+    """
+
+    def __init__(
+        self,
+        db_path: Union[str, Path],
+        lease_seconds: int = DEFAULT_LEASE_SECONDS,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        retry_base_seconds: float = DEFAULT_RETRY_BASE_SECONDS
+    ):
+        self.db_path = str(db_path)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        if self.db_path == ":memory:":
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        self.init_schema()
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """Yield an autocommit connection with Row factory (explicit BEGIN for writes)."""
+        if self._conn is not None:
+            with self._lock:
+                self._conn.row_factory = sqlite3.Row
+                yield self._conn
+            return
+        conn = sqlite_pool.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        previous_isolation = conn.isolation_level
+        conn.isolation_level = None
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            conn.isolation_level = previous_isolation
+            conn.close()
+
+    def init_schema(self) -> None:
+        """Create the jobs table (idempotent). Called from init_db()."""
+        with self._connection() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    kind TEXT,
+                    run_id TEXT,
+                    dedupe_key TEXT,        -- e.g. normalized listing id (single-flight)
+                    payload_json TEXT,
+                    status TEXT,            -- queued, leased, done, dead, cancelled
+                    cancel_requested INTEGER DEFAULT 0,
+                    attempts INTEGER DEFAULT 0,
+                    max_attempts INTEGER,
+                    available_at REAL,      -- not claimable before this time
+                    lease_owner TEXT,
+                    lease_expires_at REAL,
+                    heartbeat_at REAL,
+                    last_error TEXT,
+                    created_at REAL,
+                    updated_at REAL
+                )
+            """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_jobs_claim ON jobs (status, available_at)"
+            )
+            existing = {r["name"] for r in conn.execute("PRAGMA table_info(jobs)").fetchall()}
+            for column, ddl in (("dedupe_key", "TEXT"), ("cancel_requested", "INTEGER DEFAULT 0")):
+                if column not in existing:
+                    conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {ddl}")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_run ON jobs (run_id, status)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_dedupe ON jobs (dedupe_key, status)")
+
+    # =========================================================================
+    # PRODUCER
+    # =========================================================================
+
+    def enqueue(
+        self,
+        kind: str,
+        run_id: Optional[str] = None,
+        payload: Optional[Dict[str, Any]] = None,
+        delay_seconds: float = 0.0,
+        max_attempts: Optional[int] = None,
+        dedupe_key: Optional[str] = None
+    ) -> str:
+        """
+        Schedule a job. Returns its id.
+
+        If the run already has a queued job, or a running job that was not
+        asked to cancel, that job's id is returned and nothing new is scheduled.
+        """
+        now = time.time()
+        with self._connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            if run_id is not None:
+                row = conn.execute(
+                    "SELECT id, status FROM jobs WHERE run_id = ? AND kind = ? "
+                    "AND (status = ? OR (status = ? AND cancel_requested = 0 AND lease_expires_at >= ?)) "
+                    "ORDER BY status = ? DESC LIMIT 1",
+                    (run_id, kind, STATUS_QUEUED, STATUS_LEASED, now, STATUS_QUEUED)
+                ).fetchone()
+                if row:
+                    conn.execute("COMMIT")
+                    logger.info(f"JobQueue: {kind} for {run_id} attached to {row['status']} job {row['id']}")
+                    return row["id"]
+            job_id = str(uuid.uuid4())
+            conn.execute(
+                "INSERT INTO jobs (id, kind, run_id, dedupe_key, payload_json, status, attempts, max_attempts, "
+                "available_at, created_at, updated_at) VALUES (?,?,?,?,?,?,0,?,?,?,?)",
+                (job_id, kind, run_id, dedupe_key, json.dumps(payload or {}), STATUS_QUEUED,
+                 max_attempts or self.max_attempts, now + delay_seconds, now, now)
+            )
+            conn.execute("COMMIT")
+        logger.info(f"JobQueue: Enqueued {kind} {job_id} (run {run_id})")
+        return job_id
+
+    def request_cancel(
+        self,
+        kind: str,
+        run_id: Optional[str] = None,
+        dedupe_key: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Supersede active jobs of a run and/or of every run sharing dedupe_key.
+
+        Running jobs are flagged cancel_requested; queued jobs of OTHER runs
+        are cancelled immediately (a queued job of run_id itself is kept - it
+        will pick up the new data). Returns the affected jobs as
+        {id, run_id, status} with the status they had.
+        """
+        clauses, params = [], []
+        if run_id is not None:
+            clauses.append("run_id = ?")
+            params.append(run_id)
+        if dedupe_key:
+            clauses.append("dedupe_key = ?")
+            params.append(dedupe_key)
+        if not clauses:
+            return []
+        now = time.time()
+        with self._connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            rows = conn.execute(
+                f"SELECT id, run_id, status FROM jobs WHERE kind = ? AND status IN (?, ?) "
+                f"AND cancel_requested = 0 AND ({' OR '.join(clauses)})",
+                (kind, *ACTIVE_STATUSES, *params)
+            ).fetchall()
+            affected = []
+            for row in rows:
+                if row["status"] == STATUS_QUEUED:
+                    if row["run_id"] == run_id:
+                        continue
+                    conn.execute(
+                        "UPDATE jobs SET status = ?, cancel_requested = 1, updated_at = ? WHERE id = ?",
+                        (STATUS_CANCELLED, now, row["id"])
+                    )
+                else:
+                    conn.execute(
+                        "UPDATE jobs SET cancel_requested = 1, updated_at = ? WHERE id = ?",
+                        (now, row["id"])
+                    )
+                affected.append(dict(row))
+            conn.execute("COMMIT")
+        for job in affected:
+            logger.info(f"JobQueue: Superseding {job['status']} {kind} {job['id']} (run {job['run_id']})")
+        return affected
+
+    # =========================================================================
+    # CONSUMER
+    # =========================================================================
+
+    def claim(self, worker_id: str, kinds: Optional[List[str]] = None) -> Optional[Job]:
+        """
+        Lease the oldest due job (or one whose lease expired). None if idle.
+
+        Expired leases that already used all attempts are moved to 'dead'
+        instead of being handed out again.
+        """
+        now = time.time()
+        kind_filter = ""
+        params: List[Any] = [STATUS_QUEUED, now, STATUS_LEASED, now, STATUS_LEASED, now]
+        if kinds:
+            kind_filter = f" AND kind IN ({','.join('?' for _ in kinds)})"
+            params.extend(kinds)
+
+        # Single-flight: a queued job waits while its run has a live lease
+        candidate_query = (
+            "SELECT * FROM jobs WHERE ((status = ? AND available_at <= ? AND NOT EXISTS ("
+            "SELECT 1 FROM jobs AS running WHERE running.run_id = jobs.run_id "
+            "AND running.status = ? AND running.lease_expires_at >= ?)) "
+            "OR (status = ? AND lease_expires_at < ?))" + kind_filter +
+            " ORDER BY available_at, created_at LIMIT 1"
+        )
+        with self._connection() as conn:
+            # Idle polls stay read-only; the write lock is only taken when there is work
+            if conn.execute(candidate_query, params).fetchone() is None:
+                return None
+            conn.execute("BEGIN IMMEDIATE")
+            while True:
+                row = conn.execute(candidate_query, params).fetchone()
+                if row is None:
+                    conn.execute("COMMIT")
+                    return None
+                if row["status"] == STATUS_LEASED and row["cancel_requested"]:
+                    conn.execute(
+                        "UPDATE jobs SET status = ?, lease_owner = NULL, updated_at = ? WHERE id = ?",
+                        (STATUS_CANCELLED, now, row["id"])
+                    )
+                    continue
+                if row["status"] == STATUS_LEASED and row["attempts"] >= row["max_attempts"]:
+                    conn.execute(
+                        "UPDATE jobs SET status = ?, lease_owner = NULL, last_error = ?, updated_at = ? WHERE id = ?",
+                        (STATUS_DEAD, f"Lease of {row['lease_owner']} expired on final attempt", now, row["id"])
+                    )
+                    logger.warning(f"JobQueue: {row['kind']} {row['id']} dead after expired lease")
+                    continue
+                if row["status"] == STATUS_LEASED:
+                    logger.warning(
+                        f"JobQueue: Reclaiming {row['kind']} {row['id']} from {row['lease_owner']} (lease expired)"
+                    )
+                expires = now + self.lease_seconds
+                conn.execute(
+                    "UPDATE jobs SET status = ?, attempts = attempts + 1, lease_owner = ?, "
+                    "lease_expires_at = ?, heartbeat_at = ?, updated_at = ? WHERE id = ?",
+                    (STATUS_LEASED, worker_id, expires, now, now, row["id"])
+                )
+                conn.execute("COMMIT")
+                return Job(
+                    id=row["id"],
+                    kind=row["kind"],
+                    run_id=row["run_id"],
+                    payload=json.loads(row["payload_json"] or "{}"),
+                    attempts=row["attempts"] + 1,
+                    max_attempts=row["max_attempts"],
+                    lease_owner=worker_id,
+                    lease_expires_at=expires,
+                    dedupe_key=row["dedupe_key"],
+                )
+
+    def heartbeat(self, job_id: str, worker_id: str) -> bool:
+        """
+        Extend a lease. False if the job should stop: the lease was lost or a
+        cancel was requested (the lease is still extended so the job can wind
+        down without being reclaimed).
+        """
+        now = time.time()
+        with self._connection() as conn:
+            cur = conn.execute(
+                "UPDATE jobs SET lease_expires_at = ?, heartbeat_at = ?, updated_at = ? "
+                "WHERE id = ? AND status = ? AND lease_owner = ?",
+                (now + self.lease_seconds, now, now, job_id, STATUS_LEASED, worker_id)
+            )
+            if not cur.rowcount:
+                return False
+            row = conn.execute("SELECT cancel_requested FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            return not row["cancel_requested"]
+
+    def complete(self, job_id: str, worker_id: str) -> bool:
+        """Mark a leased job done (or cancelled if superseded). False if the lease was lost."""
+        now = time.time()
+        with self._connection() as conn:
+            cur = conn.execute(
+                "UPDATE jobs SET status = CASE WHEN cancel_requested THEN ? ELSE ? END, "
+                "lease_owner = NULL, updated_at = ? WHERE id = ? AND status = ? AND lease_owner = ?",
+                (STATUS_CANCELLED, STATUS_DONE, now, job_id, STATUS_LEASED, worker_id)
+            )
+            return (cur.rowcount or 0) > 0
+
+    def fail(self, job_id: str, worker_id: str, error: str) -> Optional[str]:
+        """
+        Record a failed attempt.
+
+        Returns the new status ('queued' for a scheduled retry, 'dead' when
+        attempts are exhausted, 'cancelled' when superseded) or None if the
+        lease was lost.
+        """
+        now = time.time()
+        with self._connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT attempts, max_attempts, cancel_requested FROM jobs "
+                "WHERE id = ? AND status = ? AND lease_owner = ?",
+                (job_id, STATUS_LEASED, worker_id)
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            if row["cancel_requested"]:
+                status, available_at = STATUS_CANCELLED, now
+            elif row["attempts"] >= row["max_attempts"]:
+                status, available_at = STATUS_DEAD, now
+            else:
+                status = STATUS_QUEUED
+                available_at = now + retry_delay(row["attempts"], self.retry_base_seconds)
+            conn.execute(
+                "UPDATE jobs SET status = ?, available_at = ?, lease_owner = NULL, "
+                "last_error = ?, updated_at = ? WHERE id = ?",
+                (status, available_at, (error or "")[:2000], now, job_id)
+            )
+            conn.execute("COMMIT")
+        if status == STATUS_CANCELLED:
+            logger.info(f"JobQueue: {job_id} cancelled: {error}")
+        elif status == STATUS_DEAD:
+            logger.error(f"JobQueue: {job_id} dead after {row['attempts']} attempts: {error}")
+        else:
+            logger.warning(
+                f"JobQueue: {job_id} attempt {row['attempts']} failed, retry in "
+                f"{available_at - now:.0f}s: {error}"
+            )
+        return status
+
+    # =========================================================================
+    # INSPECTION
+    # =========================================================================
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._connection() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return dict(row) if row else None
+
+    def has_queued(self, kind: str, run_id: str) -> bool:
+        """True if the run has a job waiting to start (e.g. a superseding one)."""
+        with self._connection() as conn:
+            row = conn.execute(
+                "SELECT 1 FROM jobs WHERE kind = ? AND run_id = ? AND status = ? LIMIT 1",
+                (kind, run_id, STATUS_QUEUED)
+            ).fetchone()
+        return row is not None
+
+    def active_run_ids(self, kind: Optional[str] = None) -> List[str]:
+        """Runs that still have a queued or leased job."""
+        query = "SELECT DISTINCT run_id FROM jobs WHERE status IN (?, ?) AND run_id IS NOT NULL"
+        params: List[Any] = list(ACTIVE_STATUSES)
+        if kind:
+            query += " AND kind = ?"
+            params.append(kind)
+        with self._connection() as conn:
+            return [r["run_id"] for r in conn.execute(query, params).fetchall()]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Job counts per status plus the age of the oldest due job."""
+        now = time.time()
+        with self._connection() as conn:
+            counts = conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+            oldest = conn.execute(
+                "SELECT MIN(available_at) FROM jobs WHERE status = ? AND available_at <= ?",
+                (STATUS_QUEUED, now)
+            ).fetchone()[0]
+        by_status = {r["status"]: r["n"] for r in counts}
+        return {
+            "by_status": by_status,
+            "queued": by_status.get(STATUS_QUEUED, 0),
+            "leased": by_status.get(STATUS_LEASED, 0),
+            "dead": by_status.get(STATUS_DEAD, 0),
+            "cancelled": by_status.get(STATUS_CANCELLED, 0),
+            "oldest_due_seconds": round(now - oldest, 1) if oldest else 0.0,
+            "lease_seconds": self.lease_seconds,
+            "max_attempts": self.max_attempts,
+        }
+
+    def purge_finished(self, older_than_seconds: float = 7 * 24 * 3600) -> int:
+        """Delete finished (done/dead/cancelled) jobs older than the given age. Returns count removed."""
+        cutoff = time.time() - older_than_seconds
+        with self._connection() as conn:
+            cur = conn.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?, ?) AND updated_at < ?",
+                (STATUS_DONE, STATUS_DEAD, STATUS_CANCELLED, cutoff)
+            )
+            return cur.rowcount or 0
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,355 @@
+"""
+RUN ARTIFACTS - Normalized storage for generated report output
+
+The runs table used to hold every chapter (with all four planes) in one
+chapters_json text column, so every status poll, overview and report read
+pulled and parsed the whole report. Artifacts now live in their own tables:
+
+    run_artifacts   one row per (run_id, kind, key), zlib-compressed JSON
+                    kind='chapter'      key=<chapter id>  (planes included)
+                    kind='core_summary' key=''
+    run_index       metadata only: address, chapter ids, sizes, timestamps,
+                    chapters whose hero image is still generating
+
+Single-chapter reads decompress one row; listings touch only run_index.
+Legacy rows (chapters_json populated, no artifacts) are still readable by the
+caller's fallback - this store never rewrites the runs table.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
+
+from backend.storage import sqlite_pool
+
+logger = logging.getLogger(__name__)
+
+ENCODING_ZLIB_JSON = "zlib+json"
+COMPRESSION_LEVEL = 6
+
+KIND_CHAPTER = "chapter"
+KIND_CORE_SUMMARY = "core_summary"
+
+# (path, file identity) of databases whose tables exist: a deleted or replaced
+# file at the same path gets its tables created again
+_initialized_files: Set[Tuple[str, Optional[tuple]]] = set()
+_init_lock = threading.Lock()
+
+
+def _encode(payload: Any) -> Tuple[bytes, int]:
+    """Compressed body and uncompressed size."""
+    raw = json.dumps(payload, default=str).encode("utf-8")
+    return zlib.compress(raw, COMPRESSION_LEVEL), len(raw)
+
+
+def _decode(body: bytes, encoding: str) -> Any:
+    if encoding == ENCODING_ZLIB_JSON:
+        return json.loads(zlib.decompress(body).decode("utf-8"))
+    return json.loads(body)
+
+
+def chapter_title(chapter: Any) -> Optional[str]:
+    """Title of a stored chapter (top level, chapter_data or legacy chapter_title)."""
+    if not isinstance(chapter, dict):
+        return None
+    data = chapter.get("chapter_data")
+    nested = data.get("title") if isinstance(data, dict) else None
+    return chapter.get("title") or nested or chapter.get("chapter_title")
+
+
+def chapter_sort_key(chapter_id: str):
+    """Numeric chapter ids in order, then any other keys."""
+    try:
+        return (0, int(chapter_id))
+    except (TypeError, ValueError):
+        return (1, str(chapter_id))
+
+
+class RunArtifactStore:
+    """Read/write access to normalized run artifacts for one database."""
+
+    def __init__(self, db_path: Union[str, Path]):
+        self.db_path = str(db_path)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite_pool.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        if self._init_key() not in _initialized_files or self.db_path == ":memory:":
+            self._create_tables(conn)
+        return conn
+
+    def _init_key(self) -> Tuple[str, Optional[tuple]]:
+        return (self.db_path, sqlite_pool.file_identity(self.db_path))
+
+    def init_schema(self) -> None:
+        """Create artifact tables (idempotent). Called from init_db()."""
+        conn = sqlite_pool.connect(self.db_path)
+        try:
+            self._create_tables(conn)
+        finally:
+            conn.close()
+
+    def _create_tables(self, conn: sqlite3.Connection) -> None:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS run_artifacts (
+                run_id TEXT,
+                kind TEXT,          -- 'chapter', 'core_summary'
+                key TEXT,           -- chapter id ('' for singletons)
+                title TEXT,         -- chapter title (manifest without decompressing)
+                encoding TEXT,
+                body BLOB,
+                size_bytes INTEGER, -- uncompressed JSON size
+                updated_at TEXT,
+                PRIMARY KEY (run_id, kind, key)
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS run_index (
+                run_id TEXT PRIMARY KEY,
+                address TEXT,
+                chapter_ids_json TEXT,
+                chapter_count INTEGER,
+                stored_bytes INTEGER,   -- compressed
+                raw_bytes INTEGER,      -- uncompressed
+                has_core_summary INTEGER,
+                pending_images_json TEXT, -- chapter ids with a hero image still generating
+                updated_at TEXT
+            )
+        """)
+        existing = {r[1] for r in conn.execute("PRAGMA table_info(run_artifacts)").fetchall()}
+        if "title" not in existing:
+            # Databases created before titles were stored: add and backfill once
+            conn.execute("ALTER TABLE run_artifacts ADD COLUMN title TEXT")
+            rows = conn.execute(
+                "SELECT run_id, key, encoding, body FROM run_artifacts WHERE kind = ?", (KIND_CHAPTER,)
+            ).fetchall()
+            conn.executemany(
+                "UPDATE run_artifacts SET title = ? WHERE run_id = ? AND kind = ? AND key = ?",
+                [(chapter_title(_decode(r[3], r[2])), r[0], KIND_CHAPTER, r[1]) for r in rows]
+            )
+        index_columns = {r[1] for r in conn.execute("PRAGMA table_info(run_index)").fetchall()}
+        if "pending_images_json" not in index_columns:
+            # NULL for reports stored before: pending state unknown
+            conn.execute("ALTER TABLE run_index ADD COLUMN pending_images_json TEXT")
+        conn.commit()
+        with _init_lock:
+            _initialized_files.add(self._init_key())
+
+    # =========================================================================
+    # WRITE
+    # =========================================================================
+
+    def save_report(
+        self,
+        run_id: str,
+        chapters: Dict[str, Any],
+        core_summary: Optional[Dict[str, Any]] = None,
+        address: Optional[str] = None,
+        pending_images: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Replace all artifacts of a run with a freshly validated report.
+
+        pending_images lists the chapters whose hero image is still being
+        generated; update_chapter(..., resolves_image=True) removes them.
+        Returns the run_index entry that was written.
+        """
+        ts = time.strftime("%Y-%m-%d %H:%M:%S")
+        rows = []
+        raw_total = 0
+        for chapter_id, chapter in chapters.items():
+            body, raw_len = _encode(chapter)
+            raw_total += raw_len
+            rows.append((run_id, KIND_CHAPTER, str(chapter_id), chapter_title(chapter),
+                         ENCODING_ZLIB_JSON, body, raw_len, ts))
+        if core_summary:
+            body, raw_len = _encode(core_summary)
+            rows.append((run_id, KIND_CORE_SUMMARY, "", None, ENCODING_ZLIB_JSON, body, raw_len, ts))
+
+        chapter_ids = sorted((str(k) for k in chapters.keys()), key=chapter_sort_key)
+        pending = sorted((str(k) for k in pending_images or []), key=chapter_sort_key)
+        stored_total = sum(len(r[5]) for r in rows)
+
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("DELETE FROM run_artifacts WHERE run_id = ?", (run_id,))
+                conn.executemany(
+                    "INSERT INTO run_artifacts (run_id, kind, key, title, encoding, body, size_bytes, updated_at) "
+                    "VALUES (?,?,?,?,?,?,?,?)",
+                    rows
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO run_index "
+                    "(run_id, address, chapter_ids_json, chapter_count, stored_bytes, raw_bytes, has_core_summary, "
+                    "pending_images_json, updated_at) VALUES (?,?,?,?,?,?,?,?,?)",
+                    (run_id, address, json.dumps(chapter_ids), len(chapter_ids),
+                     stored_total, raw_total, 1 if core_summary else 0, json.dumps(pending), ts)
+                )
+        finally:
+            conn.close()
+
+        logger.info(
+            f"RunArtifactStore: Stored {len(chapter_ids)} chapters for {run_id} "
+            f"({raw_total} -> {stored_total} bytes)"
+        )
+        return self.get_index(run_id) or {}
+
+    def update_chapter(
+        self,
+        run_id: str,
+        chapter_id: Union[str, int],
+        mutate: Callable[[Dict[str, Any]], bool],
+        resolves_image: bool = False
+    ) -> bool:
+        """
+        Rewrite one stored chapter in place (e.g. a hero image that arrived later).
+
+        `mutate` changes the decoded chapter and returns whether anything
+        changed. With resolves_image the chapter also leaves the run's pending
+        images, changed or not. Returns False if the chapter is not stored or
+        unchanged.
+        """
+        ts = time.strftime("%Y-%m-%d %H:%M:%S")
+        chapter_key = str(chapter_id)
+        conn = self._connect()
+        try:
+            with conn:
+                row = conn.execute(
+                    "SELECT encoding, body FROM run_artifacts WHERE run_id = ? AND kind = ? AND key = ?",
+                    (run_id, KIND_CHAPTER, chapter_key)
+                ).fetchone()
+                changed = False
+                if row:
+                    chapter = _decode(row["body"], row["encoding"])
+                    changed = mutate(chapter)
+                if changed:
+                    body, raw_len = _encode(chapter)
+                    conn.execute(
+                        "UPDATE run_artifacts SET title = ?, encoding = ?, body = ?, size_bytes = ?, updated_at = ? "
+                        "WHERE run_id = ? AND kind = ? AND key = ?",
+                        (chapter_title(chapter), ENCODING_ZLIB_JSON, body, raw_len, ts,
+                         run_id, KIND_CHAPTER, chapter_key)
+                    )
+                    conn.execute(
+                        "UPDATE run_index SET "
+                        "stored_bytes = (SELECT COALESCE(SUM(LENGTH(body)), 0) FROM run_artifacts WHERE run_id = ?), "
+                        "raw_bytes = (SELECT COALESCE(SUM(size_bytes), 0) FROM run_artifacts WHERE run_id = ? AND kind = ?), "
+                        "updated_at = ? WHERE run_id = ?",
+                        (run_id, run_id, KIND_CHAPTER, ts, run_id)
+                    )
+                if resolves_image:
+                    index = conn.execute(
+                        "SELECT pending_images_json FROM run_index WHERE run_id = ?", (run_id,)
+                    ).fetchone()
+                    pending = json.loads(index[0]) if index and index[0] else []
+                    if chapter_key in pending:
+                        pending.remove(chapter_key)
+                        conn.execute(
+                            "UPDATE run_index SET pending_images_json = ?, updated_at = ? WHERE run_id = ?",
+                            (json.dumps(pending), ts, run_id)
+                        )
+        finally:
+            conn.close()
+        return changed
+
+    def delete_run(self, run_id: str) -> None:
+        """Drop all artifacts of a run (e.g. when it is re-queued)."""
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("DELETE FROM run_artifacts WHERE run_id = ?", (run_id,))
+                conn.execute("DELETE FROM run_index WHERE run_id = ?", (run_id,))
+        finally:
+            conn.close()
+
+    # =========================================================================
+    # READ
+    # =========================================================================
+
+    def load_chapters(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """All chapters keyed by id, or None if the run has no normalized artifacts."""
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT key, encoding, body FROM run_artifacts WHERE run_id = ? AND kind = ?",
+                (run_id, KIND_CHAPTER)
+            ).fetchall()
+        finally:
+            conn.close()
+        if not rows:
+            return None
+        ordered = sorted(rows, key=lambda r: chapter_sort_key(r["key"]))
+        return {r["key"]: _decode(r["body"], r["encoding"]) for r in ordered}
+
+    def load_chapter(self, run_id: str, chapter_id: Union[str, int]) -> Optional[Dict[str, Any]]:
+        """A single chapter, or None if not stored."""
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT encoding, body FROM run_artifacts WHERE run_id = ? AND kind = ? AND key = ?",
+                (run_id, KIND_CHAPTER, str(chapter_id))
+            ).fetchone()
+        finally:
+            conn.close()
+        return _decode(row["body"], row["encoding"]) if row else None
+
+    def load_core_summary(self, run_id: str) -> Optional[Dict[str, Any]]:
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT encoding, body FROM run_artifacts WHERE run_id = ? AND kind = ? AND key = ''",
+                (run_id, KIND_CORE_SUMMARY)
+            ).fetchone()
+        finally:
+            conn.close()
+        return _decode(row["body"], row["encoding"]) if row else None
+
+    def get_index(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """Metadata-only view of a run's artifacts (no chapter bodies)."""
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT * FROM run_index WHERE run_id = ?", (run_id,)).fetchone()
+        finally:
+            conn.close()
+        if not row:
+            return None
+        entry = dict(row)
+        entry["chapter_ids"] = json.loads(entry.pop("chapter_ids_json") or "[]")
+        entry["has_core_summary"] = bool(entry["has_core_summary"])
+        pending = entry.pop("pending_images_json", None)
+        entry["pending_images"] = json.loads(pending) if pending is not None else None
+        return entry
+
+    def pending_images(self, run_id: str) -> List[str]:
+        """Chapters whose hero image is still generating (in any process); [] if none or unknown."""
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT pending_images_json FROM run_index WHERE run_id = ?", (run_id,)
+            ).fetchone()
+        finally:
+            conn.close()
+        return json.loads(row[0]) if row and row[0] else []
+
+    def list_chapter_sizes(self, run_id: str) -> List[Dict[str, Any]]:
+        """Per-chapter metadata (id, title, sizes, timestamp) without decompressing bodies."""
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT key, title, size_bytes, LENGTH(body) AS stored_bytes, updated_at "
+                "FROM run_artifacts WHERE run_id = ? AND kind = ?",
+                (run_id, KIND_CHAPTER)
+            ).fetchall()
+        finally:
+            conn.close()
+        return [
+            {"chapter_id": r["key"], "title": r["title"], "raw_bytes": r["size_bytes"],
+             "stored_bytes": r["stored_bytes"], "updated_at": r["updated_at"]}
+            for r in sorted(rows, key=lambda r: chapter_sort_key(r["key"]))
+        ]
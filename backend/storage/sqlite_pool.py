@@ -0,0 +1,221 @@
+"""
+SQLITE POOL - Shared, thread-safe connection pool with WAL journaling
+
+Every persistence helper used to open a fresh sqlite3 connection per statement.
+With parallel pipeline workers plus frequent UI polling this caused lock
+contention ("database is locked") and threw away the per-connection statement
+cache on every call.
+
+This module keeps idle connections per database path and hands them out
+exclusively. Callers keep the familiar pattern:
+
+    conn = connect(db_path)
+    ...
+    conn.close()        # returns the connection to the pool
+
+CONNECTION SETUP (once per physical connection):
+- journal_mode=WAL: readers no longer block the writer
+- synchronous=NORMAL: safe with WAL, avoids an fsync per commit
+- busy_timeout: writers wait for the lock instead of failing immediately
+- cached_statements: larger prepared-statement cache, reused across checkouts
+
+':memory:' databases are never pooled - each connect() is a fresh database,
+exactly like sqlite3.connect().
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_IDLE = 8
+DEFAULT_BUSY_TIMEOUT_MS = 5000
+DEFAULT_CACHED_STATEMENTS = 256
+
+
+def _is_memory_path(db_path: str) -> bool:
+    return db_path == ":memory:" or db_path.startswith("file::memory:")
+
+
+def file_identity(db_path: Union[str, Path]) -> Optional[tuple]:
+    """
+    (device, inode) of a database file, or None if it does not exist.
+
+    Changes when the file is deleted and re-created or replaced (restore from
+    backup), so per-file state such as "schema created" can be keyed on it.
+    """
+    try:
+        st = os.stat(str(db_path))
+        return (st.st_dev, st.st_ino)
+    except OSError:
+        return None
+
+
+class PooledConnection(sqlite3.Connection):
+    """sqlite3.Connection whose close() hands the connection back to its pool."""
+
+    _pool: Optional["SQLitePool"] = None
+    _file_id: Optional[tuple] = None
+
+    def close(self) -> None:
+        pool = self._pool
+        if pool is not None:
+            pool.release(self)
+        # Already released: a repeated close() must not touch the pooled handle
+
+    def _close_physical(self) -> None:
+        self._pool = None
+        super().close()
+
+
+class SQLitePool:
+    """
+    Pool of connections to ONE SQLite database file.
+
+    There is no hard cap on open connections (nested helpers must never
+    deadlock waiting for each other); at most max_idle connections are kept
+    around after release.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        max_idle: int = DEFAULT_MAX_IDLE,
+        busy_timeout_ms: int = DEFAULT_BUSY_TIMEOUT_MS
+    ):
+        self.db_path = db_path
+        self.max_idle = max_idle
+        self.busy_timeout_ms = busy_timeout_ms
+        self._idle: List[PooledConnection] = []
+        self._lock = threading.Lock()
+        self._file_id: Optional[tuple] = None
+        self._created = 0
+        self._reused = 0
+
+    def _current_file_id(self) -> Optional[tuple]:
+        return file_identity(self.db_path)
+
+    def _new_connection(self) -> PooledConnection:
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.busy_timeout_ms / 1000,
+            check_same_thread=False,  # Checkouts are exclusive; threads may differ
+            cached_statements=DEFAULT_CACHED_STATEMENTS,
+            factory=PooledConnection,
+        )
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+        except sqlite3.DatabaseError as e:
+            logger.warning(f"SQLitePool: Could not apply pragmas to {self.db_path}: {e}")
+        conn._pool = self
+        conn._file_id = self._current_file_id()
+        self._created += 1
+        return conn
+
+    def acquire(self) -> PooledConnection:
+        """Check out a connection (reusing an idle one when possible)."""
+        with self._lock:
+            # A deleted/replaced database file must not be served from stale handles
+            file_id = self._current_file_id()
+            if file_id != self._file_id:
+                self._drain_locked()
+                self._file_id = file_id
+            while self._idle:
+                conn = self._idle.pop()
+                conn._pool = self
+                self._reused += 1
+                return conn
+        conn = self._new_connection()
+        with self._lock:
+            if self._file_id is None:
+                self._file_id = self._current_file_id()
+        return conn
+
+    def release(self, conn: PooledConnection) -> None:
+        """Return a connection; uncommitted work is rolled back."""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            conn.row_factory = None
+        except sqlite3.Error:
+            conn._close_physical()
+            return
+        # Detach so a repeated close() by the previous holder is a no-op
+        conn._pool = None
+        with self._lock:
+            if conn._file_id == self._file_id and len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                return
+        conn._close_physical()
+
+    def _drain_locked(self) -> None:
+        for conn in self._idle:
+            try:
+                conn._close_physical()
+            except sqlite3.Error:
+                pass
+        self._idle.clear()
+
+    def close_all(self) -> None:
+        """Close idle connections (checked-out ones close on release)."""
+        with self._lock:
+            self._drain_locked()
+            self._file_id = None
+
+    def get_stats(self) -> Dict[str, Union[str, int]]:
+        with self._lock:
+            return {
+                "db_path": self.db_path,
+                "idle": len(self._idle),
+                "created": self._created,
+                "reused": self._reused,
+            }
+
+
+# =============================================================================
+# MODULE-LEVEL HELPER
+# =============================================================================
+
+_pools: Dict[str, SQLitePool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path: Union[str, Path]) -> SQLitePool:
+    """Get (or create) the pool for a database path."""
+    key = str(db_path)
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                pool = SQLitePool(key)
+                _pools[key] = pool
+    return pool
+
+
+def connect(db_path: Union[str, Path]) -> sqlite3.Connection:
+    """
+    Drop-in replacement for sqlite3.connect(db_path).
+
+    File databases return a pooled connection whose close() releases it.
+    ':memory:' returns a plain, unpooled connection.
+    """
+    path = str(db_path)
+    if _is_memory_path(path):
+        return sqlite3.connect(path)
+    return get_pool(path).acquire()
+
+
+def close_all_pools() -> None:
+    """Close every idle pooled connection (app shutdown / tests)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close_all()
@@ -20,6 +20,54 @@ def reset_governance_singleton():
     # No cleanup needed for session scope
 
 
+@pytest.fixture(autouse=True)
+def reset_provider_rate_limits():
+    """
+    Provider budgets are process-wide; give every test fresh buckets so calls
+    made by earlier tests (mocked providers) don't queue later ones.
+    """
+    from backend.ai.rate_limiter import reset_rate_limiter
+    reset_rate_limiter()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def reset_provider_instances():
+    """Registered provider instances are process-wide; tests patch provider classes and keys."""
+    from backend.ai.provider_registry import reset_provider_registry
+    reset_provider_registry()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def reset_image_queue_instance():
+    """The hero image queue holds per-run results; tests must not see another test's images."""
+    from backend.ai.image_queue import reset_image_queue
+    reset_image_queue()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def isolated_image_cache(tmp_path, monkeypatch):
+    """Generated images must not be served from (or written to) the real static cache."""
+    from backend.ai import image_cache
+    monkeypatch.setattr(image_cache, "IMAGE_CACHE_DIR", tmp_path / "image_cache")
+    image_cache.reset_image_cache()
+    yield
+    image_cache.reset_image_cache()
+
+
+@pytest.fixture(autouse=True)
+def isolated_asset_store(tmp_path, monkeypatch):
+    """Generated images and ingested photos must not be written into the repository's data/assets."""
+    from backend.pipeline.media_ingest import close_media_ingestor
+    from backend.storage import asset_store
+    monkeypatch.setattr(asset_store, "ASSET_DIR", tmp_path / "assets")
+    close_media_ingestor()
+    yield
+    close_media_ingestor()
+
+
 @pytest.fixture
 def structural_policy():
     """
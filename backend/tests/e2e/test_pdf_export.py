@@ -38,8 +38,8 @@ import main
 class TestPDFExport(unittest.TestCase):
     def setUp(self):
         self.test_db_path = f"test_{uuid.uuid4()}.db"
-        # Patch the DB_PATH in main module
-        self.db_patcher = patch("main.DB_PATH", self.test_db_path)
+        # Patch the DB_PATH the run storage helpers use
+        self.db_patcher = patch("backend.pipeline_runner.DB_PATH", self.test_db_path)
         self.db_patcher.start()
         
         # Initialize the DB
@@ -54,6 +54,8 @@ class TestPDFExport(unittest.TestCase):
 
     def tearDown(self):
         self.db_patcher.stop()
+        # Release pooled connections so SQLite removes its -wal/-shm files
+        main.sqlite_pool.close_all_pools()
         if os.path.exists(self.test_db_path):
             os.remove(self.test_db_path)
 
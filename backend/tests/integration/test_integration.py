@@ -37,11 +37,11 @@ class TestIntegration(unittest.TestCase):
         
         init_db()
         # Prevent init_ai_provider from running in the background thread and resetting our configuration
-        self.patcher = patch('main.init_ai_provider')
+        self.patcher = patch('backend.pipeline_runner.init_ai_provider')
         self.mock_init = self.patcher.start()
         
         # Patch Scraper to avoid network calls and timeouts
-        self.patcher_scraper = patch('main.Scraper')
+        self.patcher_scraper = patch('backend.pipeline_runner.Scraper')
         self.mock_scraper = self.patcher_scraper.start()
         self.mock_scraper.return_value.derive_property_core.return_value = {}
 
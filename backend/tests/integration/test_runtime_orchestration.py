@@ -73,8 +73,8 @@ def test_cleanup_zombie_runs(clean_db):
     s_done = get_run_status("done_run")
     assert s_done['status'] == "done"
 
-@patch("backend.main.init_ai_provider", return_value=True)
-@patch("backend.main.Scraper")
+@patch("backend.pipeline_runner.init_ai_provider", return_value=True)
+@patch("backend.pipeline_runner.Scraper")
 @patch("backend.pipeline.bridge.execute_report_pipeline")
 def test_heartbeat_updates_db(mock_pipeline, mock_scraper_cls, mock_init_ai, clean_db):
     """Verify that progress callback from spine updates the DB."""
@@ -106,8 +106,8 @@ def test_heartbeat_updates_db(mock_pipeline, mock_scraper_cls, mock_init_ai, cle
     # We don't care about the final status here, as we verified the heartbeat implementation in the side_effect
 
 
-@patch("backend.main.init_ai_provider", return_value=True)
-@patch("backend.main.Scraper")
+@patch("backend.pipeline_runner.init_ai_provider", return_value=True)
+@patch("backend.pipeline_runner.Scraper")
 @patch("backend.pipeline.bridge.execute_report_pipeline")
 def test_pipeline_failure_sets_error_status(mock_pipeline, mock_scraper_cls, mock_init_ai, clean_db):
     """Verify that unhandled exceptions result in 'error' status in DB."""
@@ -127,3 +127,60 @@ def test_pipeline_failure_sets_error_status(mock_pipeline, mock_scraper_cls, moc
     # Check DB
     row = get_run_status(run_id)
     assert row['status'] == "error"
+
+
+@patch("backend.domain.app_config.validate_config_for_execution", return_value=(True, None))
+@patch("backend.pipeline_runner.init_ai_provider")
+@patch("backend.pipeline_runner.Scraper")
+@patch("backend.pipeline_runner.run_dynamic_extraction")
+@patch("backend.pipeline.bridge.execute_report_pipeline")
+def test_failed_extraction_stops_the_spine_early(mock_pipeline, mock_extraction, mock_scraper_cls, mock_init_ai, mock_config, clean_db):
+    """A dynamic extraction failure stops chapter generation at the next checkpoint."""
+    run_id = "extraction_failure_test"
+    create_dummy_run(run_id, "queued", 0)
+    update_run(run_id, funda_html="<html><body>Teststraat 1</body></html>")
+    mock_scraper_cls.return_value.derive_property_core.return_value = {"address": "Teststraat 1"}
+
+    async def failing_extraction(*args, **kwargs):
+        raise RuntimeError("extraction offline")
+    mock_extraction.side_effect = failing_extraction
+
+    generated = []
+
+    def side_effect(run_id, raw_data, preferences=None, progress_callback=None):
+        for chapter in range(1, 14):
+            # Give the side stage time to fail before the first checkpoints
+            time.sleep(0.05)
+            progress_callback(f"running (Chapter {chapter}/13)")
+            generated.append(chapter)
+        return {}, {"validation_passed": True}, {"address": "Teststraat 1"}, {}
+
+    mock_pipeline.side_effect = side_effect
+
+    simulate_pipeline(run_id)
+
+    row = get_run_status(run_id)
+    steps = json.loads(row["steps_json"])
+    assert row["status"] == "error"
+    assert steps["dynamic_extraction"] == "failed"
+    assert len(generated) < 13
+
+
+@patch("backend.domain.app_config.validate_config_for_execution", return_value=(True, None))
+@patch("backend.pipeline_runner.init_ai_provider", return_value=True)
+@patch("backend.pipeline_runner.Scraper")
+@patch("backend.pipeline.bridge.execute_report_pipeline")
+def test_failed_attempt_with_retries_left_is_requeued(mock_pipeline, mock_scraper_cls, mock_init_ai, mock_config, clean_db):
+    """With attempts left, a spine failure hands the run back to the job queue instead of ending it."""
+    from backend.domain.pipeline_context import PipelineRetryable
+    run_id = "retry_test"
+    create_dummy_run(run_id, "queued", 0)
+    mock_scraper_cls.return_value.derive_property_core.return_value = {"address": "Teststraat 1"}
+    mock_pipeline.side_effect = Exception("provider timeout")
+
+    with pytest.raises(PipelineRetryable):
+        simulate_pipeline(run_id, retry_on_failure=True)
+
+    row = get_run_status(run_id)
+    assert row["status"] == "queued"
+    assert set(json.loads(row["steps_json"]).values()) == {"pending"}
@@ -29,6 +29,7 @@ from tests.unit.test_api_endpoints import TestApiEndpoints
 from scraper import Scraper
 from parser import Parser
 import main
+from backend import pipeline_runner
 from main import app, build_kpis, init_db
 
 # --- 2. CONFIGURATION ---
@@ -65,9 +66,9 @@ time.sleep(1) # Warmup
 class TestMasterSuite(unittest.TestCase):
     def setUp(self):
         # STRICT DB ISOLATION
-        main.DB_PATH = TEST_DB_PATH
-        if os.path.exists(main.DB_PATH):
-            os.remove(main.DB_PATH)
+        pipeline_runner.DB_PATH = TEST_DB_PATH
+        if os.path.exists(pipeline_runner.DB_PATH):
+            os.remove(pipeline_runner.DB_PATH)
         init_db()
     
     # --- TIER 1: UNIT TESTS (Parser & Logic) ---
@@ -229,7 +229,7 @@ class TestPlaneA2Diagnostics:
         assert "A2" in diagnostics["plane_status"], "A2 status must be in diagnostics"
         
         # A2 status must be one of the valid values
-        valid_statuses = ["ok", "concepts_only", "not_applicable", "empty", "missing"]
+        valid_statuses = ["ok", "image_pending", "concepts_only", "not_applicable", "empty", "missing"]
         assert diagnostics["plane_status"]["A2"] in valid_statuses
 
 
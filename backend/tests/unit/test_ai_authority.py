@@ -195,20 +195,79 @@ class TestRuntimeStatusEndpoint:
 
 
 class TestOllamaKeepAlive:
-    """Test Ollama keep_alive=0 enforcement."""
+    """Test Ollama keep_alive residency (zombie protection stays in place)."""
     
-    def test_keep_alive_in_payload(self):
-        """Verify Ollama provider sets keep_alive=0."""
-        import re
-        from pathlib import Path
+    async def test_keep_alive_in_payload(self):
+        """Ollama provider takes keep_alive from the residency manager."""
+        from unittest.mock import patch
+        from backend.ai.ollama_guard import OllamaGuard
+        from backend.ai.providers.ollama_provider import OllamaProvider
         
-        backend_dir = Path(__file__).parent.parent.parent
-        ollama_file = backend_dir / "ai" / "providers" / "ollama_provider.py"
-        content = ollama_file.read_text()
+        provider = OllamaProvider(base_url="http://localhost:11434", model="llama3")
+        with patch("backend.ai.ollama_guard.get_ollama_guard", return_value=OllamaGuard(keep_alive_seconds=300)):
+            payload = await provider._build_payload("p", None, "", 0.7, 10, False, None, stream=False)
+        
+        assert payload["keep_alive"] == 300
+    
+    def test_keep_alive_zero_when_disabled_or_memory_low(self):
+        """Without residency or under memory pressure, models unload after each request."""
+        from unittest.mock import patch
+        from backend.ai.ollama_guard import OllamaGuard
+        
+        assert OllamaGuard(keep_alive_seconds=0).keep_alive_for("llama3") == 0
         
-        # Must contain keep_alive = 0
-        assert 'keep_alive' in content.lower(), "Ollama provider must set keep_alive"
-        assert re.search(r'"keep_alive"\s*:\s*0', content), "keep_alive must be 0"
+        guard = OllamaGuard(keep_alive_seconds=300, min_free_memory_mb=4096)
+        with patch("backend.ai.ollama_guard._available_memory_mb", return_value=512):
+            assert guard.keep_alive_for("llama3") == 0
+        assert guard.get_residency()["models"] == []
+    
+    def test_memory_check_is_local_and_spares_resident_models(self):
+        """Host memory says nothing about a remote server or the model already using it."""
+        from unittest.mock import patch
+        from backend.ai.ollama_guard import OllamaGuard
+        
+        remote = OllamaGuard(base_url="http://ollama:11434", keep_alive_seconds=300, min_free_memory_mb=4096)
+        local = OllamaGuard(keep_alive_seconds=300, min_free_memory_mb=4096)
+        assert local.keep_alive_for("llama3") == 300  # resident before memory ran low
+        with patch("backend.ai.ollama_guard._available_memory_mb", return_value=512):
+            assert remote.keep_alive_for("llama3") == 300
+            assert local.keep_alive_for("llama3") == 300
+            assert local.keep_alive_for("mistral") == 0
+    
+    def test_memory_pressure_unloads_idle_resident_models(self):
+        """A new model under memory pressure first makes room by unloading idle models."""
+        from unittest.mock import AsyncMock, patch
+        from backend.ai.ollama_guard import OllamaGuard
+        
+        guard = OllamaGuard(keep_alive_seconds=300, min_free_memory_mb=4096)
+        assert guard.keep_alive_for("llama3") == 300
+        with patch("backend.ai.ollama_guard._available_memory_mb", return_value=512):
+            with patch.object(guard, "unload_model", AsyncMock(return_value=True)) as unload:
+                # llama3 was just used: not idle, so mistral cannot become resident
+                assert guard.keep_alive_for("mistral") == 0
+                unload.assert_not_awaited()
+                
+                guard._resident["llama3"].last_used -= guard.IDLE_UNLOAD_SECONDS
+                assert guard.keep_alive_for("mistral") == 300
+        
+        unload.assert_awaited_once_with("llama3", base_url="http://localhost:11434")
+    
+    def test_models_unloaded_when_last_run_ends(self):
+        """Resident models stay loaded until the last active run finishes."""
+        from unittest.mock import AsyncMock, patch
+        from backend.ai.ollama_guard import OllamaGuard
+        
+        guard = OllamaGuard(keep_alive_seconds=300)
+        guard.begin_run("run-1")
+        guard.begin_run("run-2")
+        assert guard.keep_alive_for("llama3") == 300
+        
+        with patch.object(guard, "unload_model", AsyncMock(return_value=True)) as unload:
+            assert guard.end_run("run-1") == []
+            assert guard.end_run("run-2") == ["llama3"]
+        
+        unload.assert_awaited_once_with("llama3", base_url="http://localhost:11434")
+        assert guard.get_residency()["models"] == []
 
 
 class TestOllamaCleanup:
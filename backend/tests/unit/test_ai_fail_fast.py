@@ -51,8 +51,8 @@ def test_pipeline_fails_fast_on_init_failure():
     run_id = "test-fail-fast-run"
     
     # Mock dependencies
-    with patch('backend.main.init_ai_provider', return_value=False) as mock_init:
-        with patch('backend.main.update_run') as mock_update:
+    with patch('backend.pipeline_runner.init_ai_provider', return_value=False) as mock_init:
+        with patch('backend.pipeline_runner.update_run') as mock_update:
             with patch('backend.api.run_status.track_error') as mock_track:
                 with patch('backend.domain.app_config.build_app_config') as mock_config:
                     # Mock valid config so we pass the first check
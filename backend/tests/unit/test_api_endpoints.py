@@ -71,6 +71,25 @@ class TestApiEndpoints(unittest.TestCase):
         self.assertEqual(report_resp.status_code, 200)
         # We assume pipeline runs synchronously in local mode
 
+    def test_repeated_start_attaches_to_queued_job(self):
+        """Double-clicking start must not queue a second pipeline for the same run"""
+        import main
+        from unittest.mock import patch
+
+        run_id = self.client.post("/api/runs", json={"funda_url": "http://example.com"}).json()["run_id"]
+        # External worker mode: nothing consumes the job while we inspect the queue
+        with patch.object(main.settings.pipeline, "worker_mode", "external"):
+            first = self.client.post(f"/api/runs/{run_id}/start").json()
+            second = self.client.post(f"/api/runs/{run_id}/start").json()
+        try:
+            self.assertEqual(first["job_id"], second["job_id"])
+            self.assertEqual(main.job_queue().get_job(first["job_id"])["status"], "queued")
+        finally:
+            con = main.db()
+            con.execute("DELETE FROM jobs WHERE run_id = ?", (run_id,))
+            con.commit()
+            con.close()
+
     def test_preferences_api(self):
         """Test getting and setting preferences"""
         # Set
@@ -91,5 +110,51 @@ class TestApiEndpoints(unittest.TestCase):
         self.assertEqual(data["backend"], "ok")
         self.assertEqual(data["db"], "ok")
 
+    def test_report_manifest_and_single_chapter(self):
+        """Manifest lists chapters without bodies; chapters are served one at a time"""
+        from main import artifact_store
+        run_id = self.client.post("/api/runs", json={"funda_url": "http://example.com"}).json()["run_id"]
+        artifact_store().save_report(
+            run_id,
+            {"0": {"id": "0", "title": "Executive Dashboard"}, "1": {"id": "1", "title": "Algemene Woningkenmerken", "plane_structure": True}},
+            core_summary={"completeness_score": 0.5},
+        )
+
+        manifest = self.client.get(f"/api/runs/{run_id}/report/manifest").json()
+        self.assertEqual([c["id"] for c in manifest["chapters"]], ["0", "1"])
+        self.assertEqual(manifest["chapters"][1]["title"], "Algemene Woningkenmerken")
+        self.assertNotIn("plane_structure", json.dumps(manifest["chapters"]))
+        self.assertEqual(manifest["core_summary"], {"completeness_score": 0.5})
+
+        chapter = self.client.get(f"/api/runs/{run_id}/chapters/1").json()
+        self.assertTrue(chapter["plane_structure"])
+        self.assertEqual(self.client.get(f"/api/runs/{run_id}/chapters/7").status_code, 404)
+
+    def test_report_reads_core_summary_from_artifacts_not_kpis(self):
+        """CoreSummary is stored once, as an artifact; a legacy copy in kpis_json is only a fallback"""
+        from main import artifact_store, update_run
+        run_id = self.client.post("/api/runs", json={"funda_url": "http://example.com"}).json()["run_id"]
+        update_run(run_id, kpis_json=json.dumps({"fit_score": 0.8, "core_summary": {"completeness_score": 0.1}}))
+
+        legacy = self.client.get(f"/api/runs/{run_id}/report").json()
+        self.assertEqual(legacy["core_summary"], {"completeness_score": 0.1})
+        self.assertEqual(legacy["kpis"], {"fit_score": 0.8})
+
+        artifact_store().save_report(run_id, {"0": {"id": "0"}}, core_summary={"completeness_score": 0.9})
+        manifest = self.client.get(f"/api/runs/{run_id}/report/manifest").json()
+        self.assertEqual(manifest["core_summary"], {"completeness_score": 0.9})
+
+    def test_legacy_report_manifest_tolerates_odd_chapter_keys(self):
+        """Manifest of a chapters_json-only run: non-numeric keys sort last, non-dict bodies have no title"""
+        from main import update_run
+        run_id = self.client.post("/api/runs", json={"funda_url": "http://example.com"}).json()["run_id"]
+        update_run(run_id, chapters_json=json.dumps({"10": {"title": "Tien"}, "appendix": None, "2": {"title": "Twee"}}))
+
+        response = self.client.get(f"/api/runs/{run_id}/report/manifest")
+        self.assertEqual(response.status_code, 200)
+        chapters = response.json()["chapters"]
+        self.assertEqual([c["id"] for c in chapters], ["2", "10", "appendix"])
+        self.assertEqual([c["title"] for c in chapters], ["Twee", "Tien", None])
+
 if __name__ == "__main__":
     unittest.main()
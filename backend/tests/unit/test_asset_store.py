@@ -0,0 +1,119 @@
+"""
+Tests for generated media storage (backend/storage/asset_store.py).
+"""
+import base64
+from io import BytesIO
+
+import pytest
+from fastapi.testclient import TestClient
+from PIL import Image
+
+from backend.ai.image_provider_interface import ImageGenerationResult, ImageGenerationStatus
+from backend.pipeline import four_plane_backbone
+from backend.pipeline.media_ingest import MediaIngestor
+from backend.storage import close_all_pools
+from backend.storage.asset_store import ASSET_CACHE_CONTROL, AssetStore
+from backend.storage.run_artifacts import RunArtifactStore
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    s = AssetStore(tmp_path / "app.db", tmp_path / "assets")
+    s.init_schema()
+    monkeypatch.setattr(four_plane_backbone, "get_asset_store", lambda: s)
+    yield s
+    close_all_pools()
+
+
+def test_identical_content_is_stored_once(store):
+    first = store.put(b"\x89PNG one", "image/png", source="plane_a2")
+    again = store.put(b"\x89PNG one", "image/png")
+    other = store.put(b"\xff\xd8 two", "image/jpeg")
+
+    assert first["asset_id"] == again["asset_id"] != other["asset_id"]
+    assert first["url"] == f"/api/assets/{first['asset_id']}"
+    assert first["path"].read_bytes() == b"\x89PNG one"
+    assert other["path"].suffix == ".jpg"
+    assert len(list(store.directory.rglob("*.*"))) == 2
+    assert store.get("0" * 64) is None
+
+
+def test_queued_base64_image_is_stored_as_reference(store):
+    chapter = {"plane_a2": {"hero_infographic": {"generation_status": "pending"}}}
+    result = ImageGenerationResult(
+        status=ImageGenerationStatus.GENERATED,
+        image_base64=base64.b64encode(b"\x89PNG hero").decode("ascii"),
+        generation_metadata={"mime_type": "image/png"},
+    )
+
+    assert four_plane_backbone.apply_hero_image_result(chapter, result)
+
+    hero = chapter["plane_a2"]["hero_infographic"]
+    assert hero["image_base64"] is None
+    asset_id = hero["image_uri"].rsplit("/", 1)[1]
+    assert store.get(asset_id)["path"].read_bytes() == b"\x89PNG hero"
+
+
+def test_endpoint_serves_assets_with_etag(store, monkeypatch):
+    from backend import main
+    monkeypatch.setattr(main, "get_asset_store", lambda: store)
+    asset = store.put(b"\x89PNG served", "image/png")
+    client = TestClient(main.app)
+
+    response = client.get(asset["url"])
+    assert response.status_code == 200
+    assert response.content == b"\x89PNG served"
+    assert response.headers["content-type"] == "image/png"
+    assert response.headers["etag"] == f'"{asset["asset_id"]}"'
+    assert response.headers["cache-control"] == ASSET_CACHE_CONTROL
+
+    revalidated = client.get(asset["url"], headers={"If-None-Match": response.headers["etag"]})
+    assert revalidated.status_code == 304
+    assert client.get("/api/assets/" + "a" * 64).status_code == 404
+    assert client.get("/api/assets/not-a-hash").status_code == 404
+
+
+def test_default_asset_directory_follows_the_database(tmp_path):
+    assert AssetStore(tmp_path / "db" / "app.db").directory == (tmp_path / "db" / "assets").resolve()
+
+
+def test_garbage_collection_keeps_referenced_and_recent_assets(store):
+    in_report = store.put(b"\x89PNG hero of a stored report" * 10, "image/png")
+    jpeg = BytesIO()
+    Image.new("RGB", (1600, 1200), (120, 160, 200)).save(jpeg, format="JPEG")
+    photo = MediaIngestor(store.db_path, store).ingest_bytes("https://example.com/1.jpg", jpeg.getvalue())
+    orphans = [store.put(b"\x89PNG deleted run %d" % i * 10, "image/png") for i in range(3)]
+    RunArtifactStore(store.db_path).save_report(
+        "run-1", {"1": {"plane_a2": {"hero_infographic": {"image_uri": in_report["url"]}}}}
+    )
+    orphan_bytes = sum(o["size_bytes"] for o in orphans)
+    photo_assets = {photo[v]["asset_id"]: photo[v]["size_bytes"] for v in ("original", "vision", "thumbnail")}
+    used_bytes = in_report["size_bytes"] + sum(photo_assets.values())
+
+    # Within the budget nothing is scanned or deleted
+    assert store.collect_garbage(10 ** 9)["deleted"] == 0
+    # Unreferenced but recent: a running pipeline may not have stored its report yet
+    assert store.collect_garbage(used_bytes)["deleted"] == 0
+
+    result = store.collect_garbage(used_bytes, min_age_seconds=0)
+
+    assert result == {"deleted": 3, "freed_bytes": orphan_bytes, "stored_bytes": used_bytes}
+    assert all(store.get(o["asset_id"]) is None for o in orphans)
+    assert not any(o["path"].exists() for o in orphans)
+    assert store.get(in_report["asset_id"]) is not None
+    assert all(store.get(asset_id) is not None for asset_id in photo_assets)
+
+
+def test_garbage_collection_deletes_oldest_unreferenced_assets_first(store):
+    old = store.put(b"\x89PNG old" * 100, "image/png")
+    new = store.put(b"\x89PNG new" * 100, "image/png")
+    conn = store._connect()
+    with conn:
+        conn.execute("UPDATE assets SET created_at = '2020-01-01 00:00:00' WHERE asset_id = ?", (old["asset_id"],))
+    conn.close()
+
+    result = store.collect_garbage(old["size_bytes"] * 3 // 2, min_age_seconds=0)
+
+    assert result["deleted"] == 1
+    assert store.get(old["asset_id"]) is None
+    assert store.get(new["asset_id"]) is not None
@@ -0,0 +1,89 @@
+"""
+Tests for the persistent async-to-sync bridge (backend/ai/bridge.py).
+
+The bridge must run every coroutine on ONE long-lived event loop so shared
+provider clients keep their connections between calls.
+"""
+import asyncio
+import threading
+
+import pytest
+
+from backend.ai.bridge import (
+    safe_execute_async,
+    get_async_runtime,
+    shutdown_async_runtime,
+)
+
+
+async def _current_loop_and_thread():
+    return asyncio.get_running_loop(), threading.current_thread().name
+
+
+def test_calls_share_one_persistent_loop():
+    """Consecutive calls run on the same loop and thread."""
+    loop_1, thread_1 = safe_execute_async(_current_loop_and_thread())
+    loop_2, thread_2 = safe_execute_async(_current_loop_and_thread())
+
+    assert loop_1 is loop_2
+    assert not loop_1.is_closed()
+    assert thread_1 == thread_2 == "AsyncBridge"
+
+
+def test_shared_loop_across_worker_threads():
+    """Calls from different OS threads (e.g. parallel chapters) share the loop."""
+    loops = []
+
+    def worker():
+        loop, _ = safe_execute_async(_current_loop_and_thread())
+        loops.append(loop)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(loops) == 4
+    assert all(loop is loops[0] for loop in loops)
+
+
+def test_exceptions_propagate():
+    """Errors raised inside the coroutine reach the sync caller."""
+    async def boom():
+        raise RuntimeError("provider failed")
+
+    with pytest.raises(RuntimeError, match="provider failed"):
+        safe_execute_async(boom())
+
+
+async def test_works_from_running_event_loop():
+    """Sync code called from within an event loop (e.g. FastAPI) still works."""
+    loop, _ = safe_execute_async(_current_loop_and_thread())
+
+    assert loop is not asyncio.get_running_loop()
+    assert loop is get_async_runtime().loop
+
+
+def test_reentrant_call_from_runtime_thread_does_not_deadlock():
+    """Sync code invoked inside a runtime coroutine falls back to a temporary loop."""
+    async def inner():
+        return "inner"
+
+    async def outer():
+        # e.g. run_dynamic_extraction -> init_ai_provider -> safe_execute_async
+        return safe_execute_async(inner())
+
+    assert safe_execute_async(outer()) == "inner"
+
+
+def test_shutdown_restarts_lazily():
+    """After shutdown, the next call starts a fresh runtime."""
+    old_loop, _ = safe_execute_async(_current_loop_and_thread())
+    shutdown_async_runtime()
+
+    assert old_loop.is_closed()
+
+    new_loop, _ = safe_execute_async(_current_loop_and_thread())
+    assert new_loop is not old_loop
+    assert not new_loop.is_closed()
@@ -0,0 +1,165 @@
+"""
+Tests for batch mode (backend/ai/batch.py) against the local batch backend.
+"""
+import asyncio
+import json
+
+import pytest
+
+from backend.ai.batch import (
+    BatchingProvider,
+    BatchRequest,
+    LocalBatchBackend,
+    OpenAIBatchBackend,
+    make_batch_backend,
+)
+
+
+def _provider(responder, **kwargs) -> BatchingProvider:
+    kwargs.setdefault("collect_window_seconds", 0.05)
+    kwargs.setdefault("poll_interval_seconds", 0.01)
+    return BatchingProvider(LocalBatchBackend(responder), default_model="local-1", **kwargs)
+
+
+async def test_concurrent_calls_are_submitted_as_one_batch():
+    provider = _provider(lambda r: f"answer to {r.prompt}")
+    try:
+        answers = await asyncio.gather(*(provider.generate(f"chapter {i}", json_mode=True) for i in range(5)))
+    finally:
+        provider.stop()
+
+    assert answers == [f"answer to chapter {i}" for i in range(5)]
+    submitted = provider.backend.submitted
+    assert len(submitted) == 1 and len(submitted[0]) == 5
+    assert all(r.model == "local-1" and r.json_mode for r in submitted[0])
+    assert provider.stats == {"batches": 1, "requests": 5, "failed_requests": 0}
+
+
+async def test_max_batch_size_splits_batches():
+    provider = _provider(lambda r: "ok", max_batch_size=2)
+    try:
+        await asyncio.gather(*(provider.generate(str(i)) for i in range(5)))
+    finally:
+        provider.stop()
+
+    assert sorted(len(b) for b in provider.backend.submitted) == [1, 2, 2]
+
+
+async def test_next_batch_is_submitted_while_earlier_one_is_polled():
+    class _SlowFirstBackend(LocalBatchBackend):
+        """The first batch only completes once a second batch was submitted."""
+
+        async def status(self, batch_id):
+            if len(self.submitted) < 2 and batch_id == self.first_id:
+                return "in_progress"
+            return await super().status(batch_id)
+
+        async def submit(self, requests):
+            batch_id = await super().submit(requests)
+            self.first_id = getattr(self, "first_id", batch_id)
+            return batch_id
+
+    provider = BatchingProvider(
+        _SlowFirstBackend(lambda r: r.prompt), collect_window_seconds=0.05, poll_interval_seconds=0.01
+    )
+    try:
+        first = asyncio.ensure_future(provider.generate("first"))
+        await asyncio.sleep(0.2)
+        second = await asyncio.wait_for(provider.generate("second"), timeout=5)
+        assert await asyncio.wait_for(first, timeout=5) == "first"
+    finally:
+        provider.stop()
+
+    assert second == "second"
+    assert provider.stats["batches"] == 2
+
+
+async def test_failed_request_raises_only_for_its_caller():
+    def responder(request: BatchRequest) -> str:
+        if request.prompt == "bad":
+            raise ValueError("content filtered")
+        return "fine"
+
+    provider = _provider(responder)
+    try:
+        good, bad = await asyncio.gather(
+            provider.generate("good"), provider.generate("bad"), return_exceptions=True
+        )
+    finally:
+        provider.stop()
+
+    assert good == "fine"
+    assert isinstance(bad, RuntimeError) and "content filtered" in str(bad)
+    assert provider.stats["failed_requests"] == 1
+
+
+async def test_multimodal_calls_bypass_the_batch():
+    class _Fallback:
+        async def generate(self, prompt, **kwargs):
+            return f"direct with {len(kwargs['images'])} images"
+
+    provider = _provider(lambda r: "batched")
+    provider.fallback = _Fallback()
+    try:
+        assert await provider.generate("describe", images=["a.jpg"]) == "direct with 1 images"
+    finally:
+        provider.stop()
+    assert provider.backend.submitted == []
+
+
+async def test_stopped_provider_rejects_calls():
+    provider = _provider(lambda r: "x")
+    provider.stop()
+
+    with pytest.raises(RuntimeError, match="closed"):
+        await provider.generate("late")
+
+
+async def test_openai_backend_builds_batch_jsonl_and_reads_output():
+    class _Files:
+        uploaded = None
+
+        async def create(self, file, purpose):
+            self.uploaded = (file[1].decode(), purpose)
+            return type("F", (), {"id": "file-in"})()
+
+        async def content(self, file_id):
+            lines = [
+                {"custom_id": "a", "response": {"status_code": 200,
+                                                "body": {"choices": [{"message": {"content": "{\"ok\": 1}"}}]}}},
+                {"custom_id": "b", "response": {"status_code": 400, "body": {"error": {"message": "bad"}}}},
+            ]
+            return type("C", (), {"text": "\n".join(json.dumps(l) for l in lines)})()
+
+    class _Batches:
+        async def create(self, input_file_id, endpoint, completion_window):
+            return type("B", (), {"id": "batch-1"})()
+
+        async def retrieve(self, batch_id):
+            return type("B", (), {"status": "completed", "output_file_id": "file-out", "error_file_id": None})()
+
+    class _Client:
+        files = _Files()
+        batches = _Batches()
+
+    class _OpenAI:
+        client = _Client()
+
+        def _build_params(self, prompt, model, system, temperature, max_tokens, json_mode, images):
+            return {"model": model, "messages": [{"role": "user", "content": prompt}]}
+
+    backend = OpenAIBatchBackend(_OpenAI())
+    batch_id = await backend.submit([BatchRequest("a", "p1", model="gpt-4o"), BatchRequest("b", "p2")])
+    line = json.loads(_Client.files.uploaded[0].splitlines()[0])
+    results = await backend.results(batch_id)
+
+    assert _Client.files.uploaded[1] == "batch"
+    assert line["custom_id"] == "a" and line["url"] == "/v1/chat/completions"
+    assert await backend.status(batch_id) == "completed"
+    assert results["a"].text == "{\"ok\": 1}"
+    assert results["b"].error and results["b"].text is None
+
+
+def test_batch_backend_for_unsupported_provider():
+    with pytest.raises(ValueError):
+        make_batch_backend("ollama")
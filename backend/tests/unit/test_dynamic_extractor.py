@@ -0,0 +1,109 @@
+"""
+Tests for chunked dynamic attribute extraction (backend/ai/dynamic_extractor.py).
+"""
+import asyncio
+import json
+import re
+import uuid
+from typing import List
+
+from backend.ai.dynamic_extractor import DynamicExtractor
+from backend.ai.provider_interface import AIProvider
+
+
+class _SegmentProvider(AIProvider):
+    """Returns one attribute per 'kenmerk_N: value' line of the segment; tracks concurrency."""
+
+    def __init__(self, confidences=None):
+        self.confidences = confidences or {}
+        self.prompts = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    @property
+    def name(self) -> str:
+        return "segment-test"
+
+    async def generate(self, prompt, **kwargs) -> str:
+        self.prompts.append(prompt)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        items = [
+            {"key": key, "value": value, "namespace": "physical",
+             "confidence": self.confidences.get((key, value), 0.8)}
+            for key, value in re.findall(r"(kenmerk_\d+): (\S+)", prompt)
+        ]
+        return json.dumps(items)
+
+    async def check_health(self) -> bool:
+        return True
+
+    def list_models(self) -> List[str]:
+        return []
+
+    async def close(self):
+        pass
+
+
+def _listing(lines: int) -> str:
+    # Unique filler keeps the shared response cache out of the way
+    filler = uuid.uuid4().hex
+    return "\n".join(f"kenmerk_{i}: waarde{i} {filler} {'x' * 60}" for i in range(lines))
+
+
+async def test_long_listing_is_extracted_in_parallel_segments():
+    provider = _SegmentProvider()
+    extractor = DynamicExtractor(provider, chunk_chars=1000, chunk_overlap=200, max_parallel_chunks=3)
+
+    attributes = await extractor.extract_attributes(_listing(100))
+
+    assert len(provider.prompts) > 3
+    assert 1 < provider.max_in_flight <= 3
+    assert "segment 1 of" in provider.prompts[0]
+    # Every line is covered once, including the end of the listing
+    assert [a["key"] for a in attributes] == [f"kenmerk_{i}" for i in range(100)]
+
+
+async def test_short_listing_is_a_single_prompt():
+    provider = _SegmentProvider()
+
+    attributes = await DynamicExtractor(provider).extract_attributes(_listing(3))
+
+    assert len(provider.prompts) == 1 and "segment" not in provider.prompts[0]
+    assert len(attributes) == 3
+
+
+def test_merge_prefers_value_with_most_confidence_support():
+    def attr(value, confidence):
+        return {"key": "bouwjaar", "value": value, "namespace": "physical", "confidence": confidence}
+
+    merged = DynamicExtractor._merge_attributes([
+        [attr("1990", 0.6)],
+        [attr("1990 ", 0.5), attr("1909", 0.9)],
+    ])
+
+    assert len(merged) == 1
+    assert merged[0]["value"] == "1990" and merged[0]["confidence"] == 0.6
+
+
+def test_merge_keeps_same_key_in_different_namespaces_apart():
+    merged = DynamicExtractor._merge_attributes([
+        [{"key": "oppervlakte", "value": "120 m2", "namespace": "physical", "confidence": 0.9}],
+        [{"key": "oppervlakte", "value": "250 m2", "namespace": "legal", "confidence": 0.8}],
+    ])
+
+    assert [(a["namespace"], a["value"]) for a in merged] == [("physical", "120 m2"), ("legal", "250 m2")]
+
+
+def test_segments_overlap_and_cover_the_text():
+    extractor = DynamicExtractor(None, chunk_chars=100, chunk_overlap=20)
+    text = " ".join(f"w{i}" for i in range(200))
+
+    chunks = extractor._split_text(text)
+
+    assert all(len(c) <= 100 for c in chunks)
+    assert chunks[0].split()[0] == "w0" and chunks[-1].split()[-1] == "w199"
+    for previous, following in zip(chunks, chunks[1:]):
+        assert following.split()[0] in previous  # overlapping boundary
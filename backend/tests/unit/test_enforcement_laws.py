@@ -283,9 +283,9 @@ class TestLawD_FailClosedPersistence:
         assert 'status="validation_failed"' in source, \
             "Pipeline must use 'validation_failed' status for failed validation"
     
-    @patch('backend.main.update_run')
-    @patch('backend.main.get_run_row')
-    @patch('backend.main.get_kv')
+    @patch('backend.pipeline_runner.update_run')
+    @patch('backend.pipeline_runner.get_run_row')
+    @patch('backend.pipeline_runner.get_kv')
     def test_chapters_not_written_when_validation_fails(
         self, mock_get_kv, mock_get_row, mock_update
     ):
@@ -0,0 +1,109 @@
+"""
+Tests for the generated image cache (backend/ai/image_cache.py).
+"""
+import os
+from types import SimpleNamespace
+
+from backend.ai.image_cache import ImageCache, build_image_cache_key, get_image_cache
+from backend.ai.image_provider_interface import ImageGenerationRequest, ImageGenerationStatus
+from backend.ai.providers.gemini_image_provider import GeminiImageProvider
+from backend.storage import close_all_pools
+from backend.storage.asset_store import AssetStore
+
+
+def test_key_ignores_whitespace_and_field_order():
+    a = build_image_cache_key("gemini", "Hero  infographic\nprijs", "infographic", ["price", "area"])
+    b = build_image_cache_key("gemini", "Hero infographic prijs ", "infographic", ["area", "price"])
+
+    assert a == b
+    assert a != build_image_cache_key("imagen", "Hero infographic prijs", "infographic", ["area", "price"])
+    assert a != build_image_cache_key("gemini", "Hero infographic huur", "infographic", ["area", "price"])
+
+
+def test_lru_eviction_by_entry_count(tmp_path):
+    cache = ImageCache(tmp_path, max_entries=2)
+    keys = [build_image_cache_key("m", f"prompt {i}") for i in range(3)]
+    cache.put(keys[0], "a" * 64, size_bytes=100)
+    cache.put(keys[1], "b" * 64, "image/jpeg", 100)
+    assert cache.get(keys[0]) is not None  # keys[1] is now least recently used
+
+    cache.put(keys[2], "c" * 64)
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]).asset_id == "a" * 64
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(f"{k}.json" for k in (keys[0], keys[2]))
+    assert cache.get_stats()["evictions"] == 1
+
+
+def test_index_is_rebuilt_from_disk(tmp_path):
+    key = build_image_cache_key("m", "prompt")
+    legacy_key = build_image_cache_key("m", "old prompt")
+    ImageCache(tmp_path).put(key, "a" * 64, "image/jpeg", 3)
+    (tmp_path / "notes.txt").write_text("not an image")
+    (tmp_path / f"{legacy_key}.png").write_bytes(b"image bytes from the old cache format")
+
+    reopened = ImageCache(tmp_path)
+
+    cached = reopened.get(key)
+    assert cached.mime_type == "image/jpeg" and cached.size_bytes == 3
+    assert reopened.get_stats()["entries"] == 1
+    assert not (tmp_path / f"{legacy_key}.png").exists()
+    os.remove(tmp_path / f"{key}.json")
+    assert reopened.get(key) is None
+
+
+async def test_provider_serves_repeated_prompt_from_cache(tmp_path, monkeypatch):
+    from backend.ai.providers import gemini_image_provider
+    store = AssetStore(tmp_path / "app.db", tmp_path / "assets")
+    monkeypatch.setattr(gemini_image_provider, "get_asset_store", lambda: store)
+    calls = []
+    image = SimpleNamespace(inline_data=SimpleNamespace(data=b"\x89PNG fake", mime_type="image/png"))
+
+    async def generate_content(**kwargs):
+        calls.append(kwargs)
+        return SimpleNamespace(candidates=[SimpleNamespace(content=SimpleNamespace(parts=[image]))])
+
+    provider = GeminiImageProvider(api_key="test-key")
+    fake_client = SimpleNamespace(aio=SimpleNamespace(models=SimpleNamespace(generate_content=generate_content)))
+    provider._client_for_running_loop = lambda: fake_client
+    request = ImageGenerationRequest(prompt="Hero: prijs per m2", visual_type="infographic", data_used=["price"])
+
+    first = await provider.generate_image(request)
+    second = await provider.generate_image(request)
+
+    assert len(calls) == 1
+    assert first.status == second.status == ImageGenerationStatus.GENERATED
+    assert first.image_uri == second.image_uri
+    # Served from the permanent asset; the cache only holds its id
+    assert first.image_uri.startswith("/api/assets/")
+    assert [p.suffix for p in get_image_cache().directory.iterdir()] == [".json"]
+    get_image_cache().purge()
+    assert store.get(first.image_uri.rsplit("/", 1)[1]) is not None
+    assert second.generation_metadata["cache"] == "hit"
+    assert get_image_cache().get_stats()["hits"] == 1
+    close_all_pools()
+
+
+async def test_cache_write_failure_keeps_the_generated_image(tmp_path, monkeypatch):
+    from backend.ai.providers import gemini_image_provider
+    store = AssetStore(tmp_path / "app.db", tmp_path / "assets")
+    monkeypatch.setattr(gemini_image_provider, "get_asset_store", lambda: store)
+
+    def broken_put(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(get_image_cache(), "put", broken_put)
+    image = SimpleNamespace(inline_data=SimpleNamespace(data=b"\x89PNG fake", mime_type="image/png"))
+
+    async def generate_content(**kwargs):
+        return SimpleNamespace(candidates=[SimpleNamespace(content=SimpleNamespace(parts=[image]))])
+
+    provider = GeminiImageProvider(api_key="test-key")
+    fake_client = SimpleNamespace(aio=SimpleNamespace(models=SimpleNamespace(generate_content=generate_content)))
+    provider._client_for_running_loop = lambda: fake_client
+
+    result = await provider.generate_image(ImageGenerationRequest(prompt="Hero", visual_type="infographic", data_used=["price"]))
+
+    assert result.status == ImageGenerationStatus.GENERATED
+    assert result.image_uri.startswith("/api/assets/")
+    close_all_pools()
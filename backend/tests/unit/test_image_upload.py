@@ -16,6 +16,13 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
 from main import app, UPLOAD_DIR
 
 
+@pytest.fixture(autouse=True)
+def isolated_media_db(tmp_path, monkeypatch):
+    """Uploads are ingested (variants + media_variants rows) into a throwaway database"""
+    from backend.config.settings import get_settings
+    monkeypatch.setattr(get_settings(), "database_url", str(tmp_path / "app.db"))
+
+
 @pytest.fixture
 def client():
     """Create test client"""
@@ -66,6 +73,8 @@ class TestImageUpload:
         assert data["url"].endswith(".png")
         assert "size" in data
         assert data["size"] > 0
+        # Variants are stored next to the test database, not in the repository
+        assert data["thumbnail_url"].startswith("/api/assets/")
 
     def test_upload_jpg_image(self, client):
         """Test uploading a JPG image"""
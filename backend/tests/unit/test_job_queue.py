@@ -0,0 +1,223 @@
+"""
+Tests for the durable job queue (backend/storage/job_queue.py) and JobWorker.
+"""
+import threading
+import time
+
+import pytest
+
+from backend.storage import close_all_pools
+from backend.storage.job_queue import JobQueue, retry_delay
+from backend.worker import JobWorker
+
+
+@pytest.fixture
+def queue(tmp_path):
+    q = JobQueue(tmp_path / "jobs.db", lease_seconds=60, max_attempts=2, retry_base_seconds=5)
+    yield q
+    close_all_pools()
+
+
+def test_claim_leases_oldest_job_once(queue):
+    first = queue.enqueue("pipeline.run", run_id="run-1")
+    queue.enqueue("pipeline.run", run_id="run-2")
+
+    job = queue.claim("worker-a")
+
+    assert job.id == first
+    assert job.run_id == "run-1"
+    assert job.attempts == 1
+    assert queue.claim("worker-b").run_id == "run-2"
+    assert queue.claim("worker-c") is None
+
+
+def test_duplicate_starts_attach_to_the_same_job(queue):
+    job_id = queue.enqueue("pipeline.run", run_id="run-1")
+
+    assert queue.enqueue("pipeline.run", run_id="run-1") == job_id
+
+    queue.claim("worker-a")
+    # Still running: a repeated start attaches instead of starting a second pipeline
+    assert queue.enqueue("pipeline.run", run_id="run-1") == job_id
+
+
+def test_supersede_cancels_running_job_and_queues_after_it(queue):
+    stale_id = queue.enqueue("pipeline.run", run_id="run-1", dedupe_key="funda-id-1")
+    queue.claim("worker-a")
+
+    affected = queue.request_cancel("pipeline.run", run_id="run-1", dedupe_key="funda-id-1")
+    fresh_id = queue.enqueue("pipeline.run", run_id="run-1", dedupe_key="funda-id-1")
+
+    assert [job["id"] for job in affected] == [stale_id]
+    assert fresh_id != stale_id
+    assert queue.heartbeat(stale_id, "worker-a") is False
+    # Single-flight: the fresh job waits until the stale one has wound down
+    assert queue.claim("worker-b") is None
+    assert queue.complete(stale_id, "worker-a") is True
+    assert queue.get_job(stale_id)["status"] == "cancelled"
+    assert queue.claim("worker-b").id == fresh_id
+
+
+def test_supersede_by_listing_cancels_queued_jobs_of_other_runs(queue):
+    other_id = queue.enqueue("pipeline.run", run_id="run-old", dedupe_key="funda-id-1")
+    unrelated_id = queue.enqueue("pipeline.run", run_id="run-x", dedupe_key="funda-id-2")
+
+    affected = queue.request_cancel("pipeline.run", run_id="run-new", dedupe_key="funda-id-1")
+
+    assert affected == [{"id": other_id, "run_id": "run-old", "status": "queued"}]
+    assert queue.get_job(other_id)["status"] == "cancelled"
+    assert queue.get_job(unrelated_id)["status"] == "queued"
+
+
+def test_jobs_survive_a_new_queue_instance(tmp_path):
+    JobQueue(tmp_path / "jobs.db").enqueue("pipeline.run", run_id="run-1")
+
+    job = JobQueue(tmp_path / "jobs.db").claim("worker-after-restart")
+
+    assert job is not None and job.run_id == "run-1"
+    close_all_pools()
+
+
+def test_failure_is_retried_with_backoff_then_dead(queue):
+    job_id = queue.enqueue("pipeline.run", run_id="run-1")
+    job = queue.claim("worker-a")
+
+    assert queue.fail(job.id, "worker-a", "boom") == "queued"
+    assert queue.claim("worker-a") is None  # backoff not elapsed
+    assert queue.get_job(job_id)["available_at"] >= time.time() + 4
+
+    with queue._connection() as conn:
+        conn.execute("UPDATE jobs SET available_at = 0 WHERE id = ?", (job_id,))
+    job = queue.claim("worker-a")
+    assert job.attempts == 2
+    assert queue.fail(job.id, "worker-a", "boom again") == "dead"
+    assert queue.get_job(job_id)["last_error"] == "boom again"
+
+
+def test_expired_lease_is_reclaimed(queue):
+    job_id = queue.enqueue("pipeline.run", run_id="run-1")
+    queue.claim("crashed-worker")
+    with queue._connection() as conn:
+        conn.execute("UPDATE jobs SET lease_expires_at = 0 WHERE id = ?", (job_id,))
+
+    job = queue.claim("worker-b")
+
+    assert job.id == job_id
+    assert job.lease_owner == "worker-b"
+    # The old holder can no longer touch the job
+    assert queue.heartbeat(job_id, "crashed-worker") is False
+    assert queue.complete(job_id, "crashed-worker") is False
+    assert queue.complete(job_id, "worker-b") is True
+
+
+def test_retry_delay_is_exponential_and_capped():
+    assert retry_delay(1, 10) == 10
+    assert retry_delay(3, 10) == 40
+    assert retry_delay(20, 10) == 600
+
+
+def test_worker_runs_handler_and_completes(queue):
+    done = threading.Event()
+    seen = []
+
+    def handler(job):
+        seen.append(job.run_id)
+        done.set()
+
+    worker = JobWorker(queue, {"pipeline.run": handler}, poll_interval=0.05)
+    worker.start()
+    job_id = queue.enqueue("pipeline.run", run_id="run-1")
+    worker.notify()
+
+    assert done.wait(5)
+    worker.stop(wait=True)
+    assert seen == ["run-1"]
+    assert queue.get_job(job_id)["status"] == "done"
+
+
+def test_worker_cancel_signals_running_job(queue):
+    started, finished = threading.Event(), threading.Event()
+    observed = []
+
+    def handler(job):
+        started.set()
+        observed.append(job.cancel_event.wait(5))
+        finished.set()
+
+    worker = JobWorker(queue, {"pipeline.run": handler}, poll_interval=0.05)
+    worker.start()
+    job_id = queue.enqueue("pipeline.run", run_id="run-1")
+    worker.notify()
+    assert started.wait(5)
+
+    assert worker.cancel([job_id]) == 1
+    assert finished.wait(5)
+    worker.stop(wait=True)
+    assert observed == [True]
+
+
+def test_worker_reports_dead_jobs(queue):
+    dead = []
+
+    def handler(job):
+        raise RuntimeError("pipeline crashed")
+
+    worker = JobWorker(queue, {"pipeline.run": handler}, on_dead=lambda job, err: dead.append(err))
+    job_id = queue.enqueue("pipeline.run", run_id="run-1", max_attempts=1)
+
+    assert worker.run_once() is True
+    assert queue.get_job(job_id)["status"] == "dead"
+    assert dead == ["pipeline crashed"]
+
+
+def test_failed_pipeline_attempts_are_retried_until_the_last_one(queue, monkeypatch):
+    from backend import pipeline_runner
+    from backend.domain.pipeline_context import PipelineRetryable
+    attempts = []
+
+    def simulate_pipeline(run_id, cancel_event=None, retry_on_failure=False):
+        attempts.append(retry_on_failure)
+        if retry_on_failure:
+            raise PipelineRetryable("provider timeout")
+        # Last attempt: the failure is recorded on the run, the job completes
+
+    monkeypatch.setattr(pipeline_runner, "simulate_pipeline", simulate_pipeline)
+    worker = JobWorker(queue, {"pipeline.run": pipeline_runner.run_pipeline_job})
+    job_id = queue.enqueue("pipeline.run", run_id="run-1")
+
+    assert worker.run_once() is True
+    assert queue.get_job(job_id)["status"] == "queued"
+    assert "PipelineRetryable" in queue.get_job(job_id)["last_error"]
+
+    with queue._connection() as conn:
+        conn.execute("UPDATE jobs SET available_at = 0 WHERE id = ?", (job_id,))
+    assert worker.run_once() is True
+    assert queue.get_job(job_id)["status"] == "done"
+    assert attempts == [True, False]
+
+
+def test_fresh_pipeline_job_bypasses_the_response_cache(queue, monkeypatch):
+    from backend import pipeline_runner
+    from backend.ai import response_cache
+    bypassed = []
+
+    def simulate_pipeline(run_id, cancel_event=None, retry_on_failure=False):
+        bypassed.append(response_cache._bypass.get())
+
+    monkeypatch.setattr(pipeline_runner, "simulate_pipeline", simulate_pipeline)
+    worker = JobWorker(queue, {"pipeline.run": pipeline_runner.run_pipeline_job})
+    queue.enqueue("pipeline.run", run_id="run-1", payload={"fresh": True})
+    queue.enqueue("pipeline.run", run_id="run-2")
+
+    assert worker.run_once() and worker.run_once()
+    assert bypassed == [True, False]
+
+
+def test_worker_entrypoint_does_not_build_the_api_app():
+    import subprocess
+    import sys
+    code = (
+        "import sys, backend.worker, backend.pipeline_runner; "
+        "assert 'backend.main' not in sys.modules and 'main' not in sys.modules"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
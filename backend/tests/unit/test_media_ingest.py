@@ -0,0 +1,120 @@
+"""
+Tests for listing photo ingestion (backend/pipeline/media_ingest.py).
+"""
+import threading
+from io import BytesIO
+
+import httpx
+import pytest
+from PIL import Image
+
+from backend.storage import close_all_pools
+from backend.storage.asset_store import AssetStore
+from backend.pipeline.media_ingest import MediaIngestError, MediaIngestor
+
+
+def _photo(width=2000, height=1500) -> bytes:
+    out = BytesIO()
+    Image.new("RGB", (width, height), (120, 160, 200)).save(out, format="JPEG", quality=95)
+    return out.getvalue()
+
+
+class _Fetcher:
+    def __init__(self, data):
+        self.data = data
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, url):
+        with self._lock:
+            self.calls.append(url)
+        if "missing" in url:
+            raise IOError("404")
+        return self.data, "image/jpeg"
+
+
+@pytest.fixture
+def ingestor(tmp_path):
+    fetcher = _Fetcher(_photo())
+    store = AssetStore(tmp_path / "app.db", tmp_path / "assets")
+    ing = MediaIngestor(tmp_path / "app.db", store, upload_dir=tmp_path / "uploads", fetch=fetcher)
+    ing.fetcher = fetcher
+    yield ing
+    close_all_pools()
+
+
+def test_variants_are_resized_jpegs(ingestor):
+    entry = ingestor.ingest_url("https://cloud.funda.nl/foto1.jpg?options=width=1440")
+
+    with Image.open(entry["vision"]["path"]) as vision:
+        assert max(vision.size) == 768 and vision.format == "JPEG"
+    with Image.open(entry["thumbnail"]["path"]) as thumb:
+        assert max(thumb.size) == 320
+    assert entry["vision"]["size_bytes"] < entry["original"]["size_bytes"]
+    assert entry["thumbnail"]["url"].startswith("/api/assets/")
+
+
+def test_each_url_is_downloaded_once(ingestor):
+    urls = ["https://cloud.funda.nl/a.jpg", "https://cloud.funda.nl/b.jpg"] * 3
+
+    first = ingestor.ingest_many(urls)
+    ingestor.ingest_many(urls)
+
+    assert sorted(ingestor.fetcher.calls) == sorted(set(urls))
+    assert set(first) == set(urls)
+    assert ingestor.lookup(urls[0])["vision"]["asset_id"] == first[urls[0]]["vision"]["asset_id"]
+
+
+def test_vision_inputs_fall_back_to_the_original_reference(ingestor, tmp_path):
+    (tmp_path / "uploads").mkdir()
+    (tmp_path / "uploads" / "upload.jpg").write_bytes(_photo(400, 300))
+
+    inputs = ingestor.vision_inputs([
+        "/uploads/upload.jpg",
+        "https://cloud.funda.nl/missing.jpg",
+    ])
+
+    # Already small: the stored original is the vision variant
+    assert inputs[0].endswith(".jpg") and "assets" in inputs[0]
+    assert inputs[1] == "https://cloud.funda.nl/missing.jpg"
+
+
+def test_prefetch_downloads_in_the_background_once(ingestor):
+    urls = ["https://cloud.funda.nl/c.jpg", "https://cloud.funda.nl/d.jpg", "https://cloud.funda.nl/missing.jpg"]
+
+    prefetched = ingestor.prefetch(urls).result(timeout=10)
+    # The pipeline's own ingest finds the prefetched variants
+    again = ingestor.ingest_many(urls[:2])
+
+    assert set(prefetched) == set(urls[:2])
+    assert sorted(ingestor.fetcher.calls) == sorted(urls)
+    assert again[urls[0]]["original"]["asset_id"] == prefetched[urls[0]]["original"]["asset_id"]
+    ingestor.close()
+
+
+def test_http_download_enforces_the_size_limit(tmp_path):
+    photo = _photo(200, 150)
+
+    def handler(request):
+        if "huge" in request.url.path:
+            return httpx.Response(200, content=b"x" * 2048, headers={"content-type": "image/jpeg"})
+        return httpx.Response(200, content=photo, headers={"content-type": "image/jpeg"})
+
+    store = AssetStore(tmp_path / "app.db", tmp_path / "assets")
+    ing = MediaIngestor(tmp_path / "app.db", store, max_download_bytes=len(photo))
+    ing._client = httpx.Client(transport=httpx.MockTransport(handler))
+    try:
+        assert ing.ingest_url("https://cloud.funda.nl/small.jpg")["original"]["size_bytes"] == len(photo)
+        with pytest.raises(MediaIngestError):
+            ing.ingest_url("https://cloud.funda.nl/huge.jpg")
+    finally:
+        ing.close()
+        close_all_pools()
+
+
+def test_thumbnail_urls_in_one_lookup(ingestor):
+    entry = ingestor.ingest_url("https://cloud.funda.nl/e.jpg")
+
+    urls = ingestor.thumbnail_urls(["https://cloud.funda.nl/e.jpg", "https://cloud.funda.nl/never.jpg", None])
+
+    assert urls == {"https://cloud.funda.nl/e.jpg": entry["thumbnail"]["url"]}
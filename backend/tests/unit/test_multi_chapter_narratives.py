@@ -0,0 +1,134 @@
+"""
+Tests for multi-chapter narrative requests (fast mode).
+"""
+import json
+import uuid
+from typing import List
+
+import pytest
+
+from backend.ai.provider_interface import AIProvider
+from backend.domain.narrative_generator import NarrativeGenerationError, NarrativeGenerator
+from backend.domain.pipeline_context import create_pipeline_context
+from backend.intelligence import IntelligenceEngine
+from backend.pipeline.chapter_generator import prefetch_narratives
+
+
+def _words(n: int) -> str:
+    return " ".join(["woord"] * n)
+
+
+class _GroupProvider(AIProvider):
+    """Answers multi-chapter prompts with the scripted chapters; records calls."""
+
+    def __init__(self, chapters=None, fail=False):
+        self.chapters = chapters or {}
+        self.fail = fail
+        self.calls = []
+
+    @property
+    def name(self) -> str:
+        return "group-test"
+
+    async def generate(self, prompt, **kwargs) -> str:
+        self.calls.append({"prompt": prompt, **kwargs})
+        if self.fail:
+            raise RuntimeError("503 overloaded")
+        return json.dumps({"chapters": self.chapters})
+
+    async def check_health(self) -> bool:
+        return True
+
+    def list_models(self) -> List[str]:
+        return []
+
+    async def close(self):
+        pass
+
+
+def _context(chapter_id: int):
+    # Unique values keep the shared response cache out of the way
+    return {"_preferences": {"marcel": {}, "petra": {}}, "topic": f"{chapter_id}-{uuid.uuid4().hex}"}
+
+
+def test_group_response_is_validated_per_chapter():
+    provider = _GroupProvider({
+        "1": {"text": _words(320), "word_count": 320},
+        "2": {"text": _words(40), "word_count": 40},
+    })
+
+    narratives = NarrativeGenerator.generate_group({1: _context(1), 2: _context(2), 3: _context(3)}, provider)
+
+    assert list(narratives) == [1]
+    assert narratives[1].word_count == 320
+    call = provider.calls[0]
+    assert len(provider.calls) == 1
+    assert call["json_mode"] is True and call["max_tokens"] == 3 * NarrativeGenerator.GROUP_MAX_TOKENS_PER_CHAPTER
+    assert "PAGE CONTEXT FOR CHAPTER 1" in call["prompt"] and "PAGE CONTEXT FOR CHAPTER 3" in call["prompt"]
+
+
+def test_malformed_group_response_raises():
+    class _SingleObject(_GroupProvider):
+        async def generate(self, prompt, **kwargs) -> str:
+            return json.dumps({"text": _words(400), "word_count": 400})
+
+    with pytest.raises(NarrativeGenerationError):
+        NarrativeGenerator.generate_group({1: _context(1), 2: _context(2)}, _SingleObject())
+
+
+@pytest.fixture
+def locked_ctx():
+    ctx = create_pipeline_context(f"run-{uuid.uuid4().hex[:8]}", {"marcel": {}, "petra": {}})
+    ctx.complete_enrichment()
+    ctx.lock_registry()
+    ctx.begin_chapter_generation()
+    previous = IntelligenceEngine._provider
+    yield ctx
+    IntelligenceEngine._provider = previous
+
+
+def test_prefetch_groups_chapters_and_leaves_failures_to_single_requests(locked_ctx):
+    provider = _GroupProvider({str(c): {"text": _words(310), "word_count": 310} for c in (1, 2, 3, 5)})
+    IntelligenceEngine.set_provider(provider)
+
+    # Each request shares the run's preferences prefix; chapter 13 has no narrative step
+    prefetched = prefetch_narratives(locked_ctx, list(range(1, 14)), group_size=4)
+
+    assert len(provider.calls) == 3
+    assert prefetched == 4
+    assert locked_ctx.take_prefetched_narrative(2).word_count == 310
+    assert locked_ctx.take_prefetched_narrative(2) is None  # consumed once
+    assert locked_ctx.take_prefetched_narrative(4) is None
+
+
+def test_failed_group_request_prefetches_nothing(locked_ctx):
+    IntelligenceEngine.set_provider(_GroupProvider(fail=True))
+
+    assert prefetch_narratives(locked_ctx, [1, 2, 3], group_size=4) == 0
+    assert locked_ctx.take_prefetched_narrative(1) is None
+
+
+def test_prefetch_requests_groups_concurrently_within_the_bound(locked_ctx):
+    import asyncio
+
+    class _SlowProvider(_GroupProvider):
+        def __init__(self):
+            super().__init__({})
+            self.in_flight = 0
+            self.peak = 0
+
+        async def generate(self, prompt, **kwargs) -> str:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            await asyncio.sleep(0.05)
+            self.in_flight -= 1
+            return await super().generate(prompt, **kwargs)
+
+    provider = _SlowProvider()
+    IntelligenceEngine.set_provider(provider)
+
+    # Twelve narrative chapters in groups of two: six requests, two at a time
+    prefetch_narratives(locked_ctx, list(range(1, 14)), group_size=2, max_concurrency=2)
+
+    assert len(provider.calls) == 6
+    assert provider.peak == 2
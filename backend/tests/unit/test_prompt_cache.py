@@ -0,0 +1,82 @@
+"""
+Tests for the cacheable prompt prefix (backend/ai/prompt_cache.py).
+"""
+from types import SimpleNamespace
+
+import pytest
+
+from backend.ai import prompt_cache
+from backend.ai.providers.anthropic_provider import AnthropicProvider
+from backend.ai.providers.openai_provider import OpenAIProvider
+from backend.domain.narrative_generator import NARRATIVE_SYSTEM_PROMPT, NarrativeGenerator
+
+
+@pytest.fixture(autouse=True)
+def _clean_stats():
+    prompt_cache.reset_prompt_cache_stats()
+    yield
+    prompt_cache.reset_prompt_cache_stats()
+
+
+def _context(**extra):
+    context = {
+        "_preferences": {"marcel": {"garage": True, "budget": 500000}, "petra": {"garden": "south"}},
+        "asking_price": 450000,
+    }
+    context.update(extra)
+    return context
+
+
+def test_preferences_form_a_shared_prefix_and_chapters_only_differ_in_suffix():
+    first = _context(living_area=120)
+    second = _context(energy_label="B")
+    # Same preferences in a different insertion order
+    second["_preferences"] = {"petra": {"garden": "south"}, "marcel": {"budget": 500000, "garage": True}}
+
+    system = NarrativeGenerator._build_system_prompt(first)
+
+    assert system.startswith(NARRATIVE_SYSTEM_PROMPT)
+    assert "MARCEL'S PREFERENCES" in system and '"garage": true' in system
+    assert NarrativeGenerator._build_system_prompt(second) == system
+    user = NarrativeGenerator._build_user_prompt(3, first)
+    assert "PREFERENCES" not in user and "living_area" in user
+
+
+def test_anthropic_marks_system_prefix_for_caching():
+    provider = AnthropicProvider(api_key="test-key")
+
+    params = provider._build_params("chapter", None, "shared prefix", 0.7, 100, True, None)
+
+    assert params["system"] == [{
+        "type": "text",
+        "text": "shared prefix\nReturn only valid JSON.",
+        "cache_control": {"type": "ephemeral"},
+    }]
+
+
+def test_openai_routes_same_prefix_to_same_cache_key():
+    provider = OpenAIProvider(api_key="test-key")
+
+    first = provider._build_params("chapter 1", "gpt-4o", "shared prefix", 0.7, 100, False, None)
+    second = provider._build_params("chapter 2", "gpt-4o", "shared prefix", 0.7, 100, False, None)
+    other = provider._build_params("chapter 1", "gpt-4o", "other prefix", 0.7, 100, False, None)
+
+    assert first["prompt_cache_key"] == second["prompt_cache_key"] != other["prompt_cache_key"]
+    assert "prompt_cache_key" not in provider._build_params("p", "gpt-4o", "", 0.7, 100, False, None)
+
+
+def test_usage_is_reported_per_provider():
+    prompt_cache.anthropic_usage(SimpleNamespace(
+        input_tokens=200, cache_read_input_tokens=1800, cache_creation_input_tokens=0
+    ))
+    prompt_cache.openai_usage(SimpleNamespace(
+        prompt_tokens=2000, prompt_tokens_details=SimpleNamespace(cached_tokens=0)
+    ))
+
+    providers = prompt_cache.get_prompt_cache_stats()["providers"]
+    assert providers["anthropic"]["cache_hits"] == 1
+    assert providers["anthropic"]["cached_ratio"] == 0.9
+    assert providers["openai"] == {
+        "requests": 1, "input_tokens": 2000, "cached_tokens": 0, "cache_write_tokens": 0,
+        "cache_hits": 0, "cached_ratio": 0.0,
+    }
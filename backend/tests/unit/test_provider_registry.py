@@ -0,0 +1,121 @@
+"""
+Tests for provider instance reuse (backend/ai/provider_registry.py).
+"""
+import uuid
+
+from backend.ai.provider_registry import (
+    ProviderHandle,
+    current_provider_handle,
+    get_provider_registry,
+    provider_scope,
+)
+from backend.domain.pipeline_context import create_pipeline_context
+from backend.intelligence import IntelligenceEngine
+from backend.pipeline.chapter_generator import resolve_run_provider
+from backend.pipeline.spine import PipelineSpine
+
+
+class _Provider:
+    name = "fake"
+
+    def __init__(self, model="m1"):
+        self.default_model = model
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+def test_same_configuration_reuses_one_instance():
+    registry = get_provider_registry()
+    built = []
+
+    def factory():
+        built.append(_Provider())
+        return built[-1]
+
+    first = registry.get("openai", "gpt-4o", "sk-secret", factory)
+    second = registry.get("openai", "gpt-4o", "sk-secret", factory)
+
+    assert first is second and len(built) == 1
+    assert registry.get_stats()["hits"] == 1
+
+
+def test_changed_model_or_key_builds_a_new_instance():
+    registry = get_provider_registry()
+
+    base = registry.get("openai", "gpt-4o", "sk-one", _Provider)
+    other_model = registry.get("openai", "gpt-4o-mini", "sk-one", _Provider)
+    other_key = registry.get("openai", "gpt-4o", "sk-two", _Provider)
+
+    assert len({id(h.provider) for h in (base, other_model, other_key)}) == 3
+    assert "sk-one" not in str(registry.get_stats())
+    # A handle held by a run stays valid after eviction
+    assert registry.evict("openai") == 3
+    assert base.provider.default_model == "m1"
+
+
+def test_evict_keeps_the_current_handle():
+    registry = get_provider_registry()
+    stale = registry.get("gemini", "old-model", "key", _Provider)
+    current = registry.get("gemini", "new-model", "key", _Provider)
+
+    assert registry.evict(keep=current) >= 1
+    assert registry.get("gemini", "new-model", "key", _Provider) is current
+    assert registry.get("gemini", "old-model", "key", _Provider) is not stale
+
+
+async def test_close_all_closes_clients_and_empties_registry():
+    registry = get_provider_registry()
+    handle = registry.get("anthropic", "claude", "key", _Provider)
+
+    await registry.close_all()
+
+    assert handle.provider.closed
+    assert registry.get_stats()["entries"] == []
+
+
+def test_run_context_provider_takes_precedence_over_process_wide_one():
+    process_wide, bound = _Provider(), _Provider("m2")
+    previous = IntelligenceEngine._provider
+    IntelligenceEngine.set_provider(process_wide)
+    try:
+        ctx = create_pipeline_context(f"run-{uuid.uuid4().hex[:8]}", {}, ProviderHandle.wrap(bound))
+        assert resolve_run_provider(ctx) is bound
+        assert resolve_run_provider(create_pipeline_context("run-plain", {})) is process_wide
+    finally:
+        IntelligenceEngine._provider = previous
+
+
+def test_spine_picks_up_the_scoped_handle():
+    handle = ProviderHandle.wrap(_Provider())
+
+    with provider_scope(handle):
+        spine = PipelineSpine(f"run-{uuid.uuid4().hex[:8]}", {})
+
+    assert spine.ctx.provider_handle is handle
+    assert current_provider_handle() is None
+
+
+async def test_vision_audit_uses_the_run_provider(monkeypatch):
+    from types import SimpleNamespace
+    from backend.pipeline import media_ingest
+
+    class _VisionProvider(_Provider):
+        def __init__(self, model):
+            super().__init__(model)
+            self.calls = []
+
+        async def generate(self, prompt, **kwargs):
+            self.calls.append(kwargs)
+            return "audit"
+
+    process_wide, bound = _VisionProvider("m1"), _VisionProvider("m2")
+    monkeypatch.setattr(media_ingest, "get_media_ingestor", lambda: SimpleNamespace(vision_inputs=lambda urls: list(urls)))
+    monkeypatch.setattr(IntelligenceEngine, "_provider", process_wide)
+
+    audit = await IntelligenceEngine.process_visuals({"media_urls": ["a.jpg"]}, ai_provider=bound)
+
+    assert "audit" in audit
+    assert process_wide.calls == []
+    assert bound.calls[0]["model"] == "m2" and bound.calls[0]["images"] == ["a.jpg"]
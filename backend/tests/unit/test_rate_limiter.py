@@ -0,0 +1,86 @@
+"""
+Tests for provider admission control (backend/ai/rate_limiter.py).
+"""
+import asyncio
+
+import pytest
+
+from backend.ai.rate_limiter import (
+    ProviderLimits,
+    RateLimiter,
+    RateLimitTimeout,
+    estimate_tokens,
+)
+
+
+async def test_concurrency_limit_queues_instead_of_failing():
+    limiter = RateLimiter({"openai": ProviderLimits(max_concurrent=2)})
+    active, peak = 0, 0
+
+    async def call():
+        nonlocal active, peak
+        async with limiter.admit("openai", "gpt-4o"):
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.05)
+            active -= 1
+
+    await asyncio.gather(*(call() for _ in range(6)))
+
+    stats = limiter.get_stats()["limiters"][0]
+    assert peak == 2
+    assert stats["admitted"] == 6
+    assert stats["throttled"] >= 1
+    assert stats["in_flight"] == 0 and stats["queued"] == 0
+
+
+async def test_limits_are_per_model_with_specific_override():
+    limiter = RateLimiter({
+        "openai": ProviderLimits(max_concurrent=1),
+        "openai/gpt-4o-mini": ProviderLimits(max_concurrent=5),
+    })
+
+    assert limiter.limits_for("openai", "gpt-4o").max_concurrent == 1
+    assert limiter.limits_for("openai", "gpt-4o-mini").max_concurrent == 5
+    assert limiter.limits_for("unknown", "x") == ProviderLimits()
+
+    # A busy gpt-4o slot does not block gpt-4o-mini
+    async with limiter.admit("openai", "gpt-4o"):
+        async with limiter.admit("openai", "gpt-4o-mini") as ticket:
+            assert ticket.waited_seconds == 0
+
+
+async def test_request_budget_exhaustion_times_out_after_max_wait():
+    limiter = RateLimiter({"gemini": ProviderLimits(requests_per_minute=1)}, max_wait_seconds=0.1)
+
+    async with limiter.admit("gemini", "flash"):
+        pass
+    with pytest.raises(RateLimitTimeout):
+        async with limiter.admit("gemini", "flash"):
+            pass
+
+    assert limiter.get_stats()["limiters"][0]["timeouts"] == 1
+
+
+async def test_token_budget_charges_prompt_and_response():
+    limiter = RateLimiter({"anthropic": ProviderLimits(tokens_per_minute=1000)})
+
+    async with limiter.admit("anthropic", "claude", tokens=100) as ticket:
+        ticket.record_output("x" * 2000)  # ~500 tokens
+
+    stats = limiter.get_stats()["limiters"][0]
+    assert 390 <= stats["tokens_available"] <= 410
+
+
+async def test_disabled_limiter_admits_without_tracking():
+    limiter = RateLimiter({"openai": ProviderLimits(max_concurrent=1)}, enabled=False)
+
+    async with limiter.admit("openai", "gpt-4o"):
+        async with limiter.admit("openai", "gpt-4o"):
+            pass
+
+    assert limiter.get_stats()["limiters"] == []
+
+
+def test_estimate_tokens():
+    assert estimate_tokens("a" * 40, None, "b" * 8) == 12
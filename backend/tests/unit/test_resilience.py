@@ -0,0 +1,170 @@
+"""
+Tests for retries, backoff and hedging of AI calls (backend/ai/resilience.py).
+"""
+import asyncio
+from typing import List
+
+import httpx
+import pytest
+
+from backend.ai.provider_interface import AIProvider
+from backend.ai.rate_limiter import RateLimitTimeout
+from backend.ai.resilience import (
+    ResilientProvider,
+    RetryPolicy,
+    backoff_delay,
+    current_retry_budget,
+    is_retryable,
+    retry_budget_scope,
+)
+
+FAST = RetryPolicy(max_attempts=3, base_delay_seconds=0.001, max_delay_seconds=0.002)
+
+
+class _ScriptedProvider(AIProvider):
+    """Returns/raises the scripted outcomes in order."""
+
+    def __init__(self, outcomes, delays=None):
+        self.outcomes = list(outcomes)
+        self.delays = list(delays or [])
+        self.calls = 0
+        self.default_model = "scripted-1"
+
+    @property
+    def name(self) -> str:
+        return "scripted"
+
+    async def generate(self, prompt, **kwargs) -> str:
+        self.calls += 1
+        outcome = self.outcomes.pop(0)
+        if self.delays:
+            await asyncio.sleep(self.delays.pop(0))
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    async def check_health(self) -> bool:
+        return True
+
+    def list_models(self) -> List[str]:
+        return []
+
+    async def close(self):
+        pass
+
+
+def _wrapped(error: Exception) -> RuntimeError:
+    """What providers raise: RuntimeError chained to the SDK error."""
+    try:
+        raise RuntimeError(f"OpenAI failed: {error}") from error
+    except RuntimeError as e:
+        return e
+
+
+def test_classifies_transient_and_permanent_errors():
+    request = httpx.Request("POST", "https://api.test")
+    throttled = httpx.HTTPStatusError("429", request=request, response=httpx.Response(429, request=request))
+    unauthorized = httpx.HTTPStatusError("401", request=request, response=httpx.Response(401, request=request))
+
+    assert is_retryable(_wrapped(throttled))
+    assert is_retryable(_wrapped(httpx.ConnectTimeout("slow")))
+    assert is_retryable(RuntimeError("Gemini failed: 503 UNAVAILABLE"))
+    assert not is_retryable(_wrapped(unauthorized))
+    assert not is_retryable(ValueError("invalid JSON schema"))
+    assert not is_retryable(RateLimitTimeout("no capacity"))
+
+
+def test_backoff_is_exponential_jittered_and_capped():
+    for attempt, ceiling in ((1, 1.0), (3, 4.0), (10, 20.0)):
+        delay = backoff_delay(attempt, 1.0, 20.0)
+        assert ceiling / 2 <= delay <= ceiling
+
+
+async def test_transient_error_is_retried():
+    inner = _ScriptedProvider([_wrapped(TimeoutError("read timeout")), "ok"])
+    provider = ResilientProvider(inner, FAST)
+
+    assert await provider.generate("p") == "ok"
+    assert inner.calls == 2
+    # Attributes of the wrapped provider stay reachable
+    assert provider.name == "scripted" and provider.default_model == "scripted-1"
+
+
+async def test_permanent_error_is_not_retried():
+    inner = _ScriptedProvider([RuntimeError("OpenAI failed: invalid api key"), "ok"])
+
+    with pytest.raises(RuntimeError, match="invalid api key"):
+        await ResilientProvider(inner, FAST).generate("p")
+    assert inner.calls == 1
+
+
+async def test_run_budget_limits_retries_across_calls():
+    inner = _ScriptedProvider([RuntimeError("503")] * 6)
+    provider = ResilientProvider(inner, FAST)
+
+    with retry_budget_scope("run-1", limit=1) as budget:
+        with pytest.raises(RuntimeError):
+            await provider.generate("a")
+        with pytest.raises(RuntimeError):
+            await provider.generate("b")
+
+    assert budget.used == 1
+    assert inner.calls == 3  # 2 for the first call, no retry left for the second
+    assert current_retry_budget() is None
+
+
+async def test_slow_request_is_hedged_and_first_success_wins():
+    inner = _ScriptedProvider(["slow", "fast"], delays=[1.0, 0.0])
+    provider = ResilientProvider(inner, RetryPolicy(max_attempts=1, hedge_after_seconds=0.05))
+
+    assert await provider.generate("p") == "fast"
+    assert inner.calls == 2
+
+
+async def test_cancelled_caller_cancels_and_awaits_hedged_requests():
+    finished = []
+
+    class _Hanging(_ScriptedProvider):
+        async def generate(self, prompt, **kwargs):
+            self.calls += 1
+            try:
+                await asyncio.sleep(10)
+            finally:
+                finished.append(self.calls)
+
+    inner = _Hanging([])
+    provider = ResilientProvider(inner, RetryPolicy(max_attempts=1, hedge_after_seconds=0.05))
+
+    # Cancelled while waiting for the primary request, before the hedge is sent
+    call = asyncio.ensure_future(provider.generate("p"))
+    await asyncio.sleep(0.01)
+    call.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await call
+    assert finished == [1]
+
+    # Cancelled while the primary and the hedge are both running
+    call = asyncio.ensure_future(provider.generate("p"))
+    await asyncio.sleep(0.1)
+    assert inner.calls == 3
+    call.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await call
+    assert sorted(finished) == [1, 3, 3]
+
+
+async def test_stream_is_not_retried_after_first_chunk():
+    class _BrokenStream(_ScriptedProvider):
+        async def generate_stream(self, prompt, **kwargs):
+            self.calls += 1
+            yield "partial"
+            raise RuntimeError("503")
+
+    inner = _BrokenStream([])
+    chunks = []
+    with pytest.raises(RuntimeError):
+        async for chunk in ResilientProvider(inner, FAST).generate_stream("p"):
+            chunks.append(chunk)
+
+    assert chunks == ["partial"]
+    assert inner.calls == 1
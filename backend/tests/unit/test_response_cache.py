@@ -0,0 +1,188 @@
+"""
+Tests for the content-addressed AI response cache (backend/ai/response_cache.py).
+"""
+import json
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from backend.ai.response_cache import (
+    CachingProvider,
+    ResponseCache,
+    build_cache_key,
+    cache_validation,
+    make_cached,
+    response_cache_bypass,
+)
+
+
+def _provider(response="ok", name="openai", default_model="gpt-4o-mini"):
+    provider = MagicMock()
+    provider.name = name
+    provider.default_model = default_model
+    provider.generate = AsyncMock(return_value=response)
+    return provider
+
+
+@pytest.fixture
+def cache():
+    c = ResponseCache(":memory:")
+    yield c
+    c.close()
+
+
+def test_key_covers_every_input():
+    base = build_cache_key("openai", "gpt-4o-mini", "sys", "prompt", 0.7, True)
+
+    assert base == build_cache_key("openai", "gpt-4o-mini", "sys", "prompt", 0.7, True)
+    assert base != build_cache_key("ollama", "gpt-4o-mini", "sys", "prompt", 0.7, True)
+    assert base != build_cache_key("openai", "gpt-4o", "sys", "prompt", 0.7, True)
+    assert base != build_cache_key("openai", "gpt-4o-mini", "other", "prompt", 0.7, True)
+    assert base != build_cache_key("openai", "gpt-4o-mini", "sys", "prompt!", 0.7, True)
+    assert base != build_cache_key("openai", "gpt-4o-mini", "sys", "prompt", 0.2, True)
+    assert base != build_cache_key("openai", "gpt-4o-mini", "sys", "prompt", 0.7, False)
+    assert base != build_cache_key("openai", "gpt-4o-mini", "sys", "prompt", 0.7, True, {"max_tokens": 256})
+
+
+async def test_different_max_tokens_is_not_served_from_cache(cache):
+    provider = _provider('{"text": "hello"}')
+    cached = CachingProvider(provider, cache)
+
+    await cached.generate("prompt", json_mode=True, max_tokens=256)
+    await cached.generate("prompt", json_mode=True, max_tokens=4096)
+    await cached.generate("prompt", json_mode=True, max_tokens=4096)
+
+    assert provider.generate.await_count == 2
+
+
+async def test_identical_call_is_served_from_cache(cache):
+    provider = _provider('{"text": "hello"}')
+    cached = CachingProvider(provider, cache)
+
+    first = await cached.generate("prompt", system="sys", json_mode=True)
+    second = await cached.generate("prompt", system="sys", json_mode=True)
+
+    assert first == second == '{"text": "hello"}'
+    assert provider.generate.await_count == 1
+    stats = cache.get_stats()
+    assert stats["hits"] == 1
+    assert stats["entries"] == 1
+
+
+async def test_arguments_are_passed_through(cache):
+    provider = _provider()
+
+    await CachingProvider(provider, cache).generate(
+        "prompt", system="sys", model="m", temperature=0.2, json_mode=True, max_tokens=10
+    )
+
+    provider.generate.assert_awaited_once_with(
+        "prompt", system="sys", model="m", temperature=0.2, json_mode=True, max_tokens=10
+    )
+
+
+async def test_failed_validation_is_not_stored(cache):
+    provider = _provider("not json")
+    cached = CachingProvider(provider, cache)
+
+    with cache_validation(json.loads):
+        response = await cached.generate("prompt")
+        await cached.generate("prompt")
+
+    assert response == "not json"
+    assert provider.generate.await_count == 2
+    assert cache.get_stats()["entries"] == 0
+
+
+async def test_image_calls_bypass_cache(cache):
+    provider = _provider()
+    cached = CachingProvider(provider, cache)
+
+    await cached.generate("describe", images=["abc"])
+    await cached.generate("describe", images=["abc"])
+
+    assert provider.generate.await_count == 2
+    assert cache.get_stats()["entries"] == 0
+
+
+async def test_calls_above_the_temperature_threshold_are_not_cached():
+    cache = ResponseCache(":memory:", max_temperature=0.5)
+    provider = _provider()
+    cached = CachingProvider(provider, cache)
+
+    await cached.generate("prompt")  # default temperature 0.7
+    await cached.generate("prompt")
+    await cached.generate("prompt", temperature=0.2)
+    await cached.generate("prompt", temperature=0.2)
+
+    assert provider.generate.await_count == 3
+    assert cache.get_stats()["entries"] == 1
+    cache.close()
+
+
+async def test_bypassed_run_gets_and_stores_fresh_responses(cache):
+    provider = _provider("old")
+    cached = CachingProvider(provider, cache)
+    await cached.generate("prompt")
+
+    provider.generate.return_value = "new"
+    with response_cache_bypass():
+        assert await cached.generate("prompt") == "new"
+    assert await cached.generate("prompt") == "new"
+    assert provider.generate.await_count == 2
+
+
+async def test_disabled_cache_always_calls_provider():
+    cache = ResponseCache(":memory:", enabled=False)
+    provider = _provider()
+    cached = CachingProvider(provider, cache)
+
+    await cached.generate("prompt")
+    await cached.generate("prompt")
+
+    assert provider.generate.await_count == 2
+    cache.close()
+
+
+def test_make_cached_wraps_once():
+    provider = _provider()
+    wrapped = make_cached(provider)
+
+    assert isinstance(wrapped, CachingProvider)
+    assert make_cached(wrapped) is wrapped
+    assert wrapped.name == "openai"
+    assert wrapped.default_model == "gpt-4o-mini"
+
+
+def test_expired_entries_are_not_served():
+    cache = ResponseCache(":memory:", ttl_seconds=60)
+    cache.put("k", "value")
+    cache._conn.execute("UPDATE ai_response_cache SET created_at = ?", (time.time() - 120,))
+
+    assert cache.get("k") is None
+    assert cache.get_stats()["entries"] == 0
+    cache.close()
+
+
+def test_lru_eviction_respects_size_bound():
+    cache = ResponseCache(":memory:", max_bytes=25)
+    cache.put("a", "x" * 10)
+    cache.put("b", "y" * 10)
+    cache._conn.execute("UPDATE ai_response_cache SET last_access = 0 WHERE key = 'a'")
+    cache.put("c", "z" * 10)
+
+    assert cache.get("a") is None
+    assert cache.get("b") == "y" * 10
+    assert cache.get("c") == "z" * 10
+    assert cache.get_stats()["size_bytes"] <= 25
+    cache.close()
+
+
+def test_purge_by_provider(cache):
+    cache.put("a", "1", provider="openai")
+    cache.put("b", "2", provider="ollama")
+
+    assert cache.purge(provider="openai") == 1
+    assert cache.get("b") == "2"
+    assert cache.purge() == 1
@@ -0,0 +1,154 @@
+"""
+Tests for normalized run artifact storage (backend/storage/run_artifacts.py).
+"""
+import pytest
+
+from backend.storage import close_all_pools
+from backend.storage.run_artifacts import RunArtifactStore
+
+
+def _chapter(chapter_id):
+    return {
+        "id": str(chapter_id),
+        "title": f"Chapter {chapter_id}",
+        "plane_structure": True,
+        "plane_b": {"narrative_text": "tekst " * 400},
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = RunArtifactStore(tmp_path / "artifacts.db")
+    s.init_schema()
+    yield s
+    close_all_pools()
+
+
+def test_roundtrip_preserves_chapters_in_order(store):
+    chapters = {str(i): _chapter(i) for i in (10, 2, 0, 1)}
+
+    store.save_report("run-1", chapters, core_summary={"asking_price": {"value": "€ 500.000"}})
+
+    loaded = store.load_chapters("run-1")
+    assert list(loaded.keys()) == ["0", "1", "2", "10"]
+    assert loaded["2"] == chapters["2"]
+    assert store.load_core_summary("run-1") == {"asking_price": {"value": "€ 500.000"}}
+
+
+def test_single_chapter_read(store):
+    store.save_report("run-1", {"0": _chapter(0), "5": _chapter(5)})
+
+    assert store.load_chapter("run-1", 5) == _chapter(5)
+    assert store.load_chapter("run-1", 7) is None
+
+
+def test_index_is_metadata_only_and_compressed(store):
+    index = store.save_report("run-1", {str(i): _chapter(i) for i in range(3)}, address="Teststraat 1")
+
+    assert index["address"] == "Teststraat 1"
+    assert index["chapter_ids"] == ["0", "1", "2"]
+    assert index["chapter_count"] == 3
+    assert index["has_core_summary"] is False
+    assert index["stored_bytes"] < index["raw_bytes"]
+
+    sizes = store.list_chapter_sizes("run-1")
+    assert [s["chapter_id"] for s in sizes] == ["0", "1", "2"]
+    assert all(s["stored_bytes"] < s["raw_bytes"] for s in sizes)
+
+
+def test_save_replaces_previous_report(store):
+    store.save_report("run-1", {"0": _chapter(0), "1": _chapter(1)})
+    store.save_report("run-1", {"0": _chapter(0)})
+
+    assert list(store.load_chapters("run-1").keys()) == ["0"]
+    assert store.get_index("run-1")["chapter_count"] == 1
+
+
+def test_unknown_and_deleted_runs_return_none(store):
+    assert store.load_chapters("missing") is None
+    assert store.get_index("missing") is None
+
+    store.save_report("run-1", {"0": _chapter(0)})
+    store.delete_run("run-1")
+
+    assert store.load_chapters("run-1") is None
+    assert store.get_index("run-1") is None
+
+
+def test_update_chapter_rewrites_one_row_and_index_sizes(store):
+    store.save_report("run-1", {"0": _chapter(0), "1": _chapter(1)})
+    before = store.get_index("run-1")
+
+    def add_image(chapter):
+        chapter["plane_a2"] = {"hero_infographic": {"image_base64": "x" * 5000}}
+        return True
+
+    assert store.update_chapter("run-1", 1, add_image) is True
+    assert store.update_chapter("run-1", 1, lambda chapter: False) is False
+    assert store.update_chapter("run-1", 7, add_image) is False
+
+    assert store.load_chapter("run-1", 1)["plane_a2"]["hero_infographic"]["image_base64"] == "x" * 5000
+    assert store.load_chapter("run-1", 0) == _chapter(0)
+    after = store.get_index("run-1")
+    assert after["raw_bytes"] > before["raw_bytes"] + 5000
+    assert after["chapter_ids"] == ["0", "1"]
+
+
+def test_pending_images_are_listed_until_resolved(store):
+    store.save_report("run-1", {"0": _chapter(0), "1": _chapter(1), "2": _chapter(2)}, pending_images=["2", "1"])
+    assert store.pending_images("run-1") == ["1", "2"]
+
+    assert store.update_chapter("run-1", 2, lambda chapter: True, resolves_image=True) is True
+    # Resolved even when the chapter itself did not change
+    assert store.update_chapter("run-1", 1, lambda chapter: False, resolves_image=True) is False
+
+    assert store.pending_images("run-1") == []
+    assert store.get_index("run-1")["pending_images"] == []
+    assert store.pending_images("unknown-run") == []
+
+
+def test_init_schema_adds_and_backfills_title_on_old_databases(tmp_path):
+    import sqlite3
+
+    from backend.storage.run_artifacts import ENCODING_ZLIB_JSON, _encode
+
+    db_path = tmp_path / "old.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "CREATE TABLE run_artifacts (run_id TEXT, kind TEXT, key TEXT, encoding TEXT, body BLOB, "
+        "size_bytes INTEGER, updated_at TEXT, PRIMARY KEY (run_id, kind, key))"
+    )
+    body, raw_len = _encode(_chapter(3))
+    conn.execute(
+        "INSERT INTO run_artifacts VALUES (?, ?, ?, ?, ?, ?, ?)",
+        ("run-1", "chapter", "3", ENCODING_ZLIB_JSON, body, raw_len, "2024-01-01T00:00:00")
+    )
+    conn.commit()
+    conn.close()
+
+    store = RunArtifactStore(db_path)
+    store.init_schema()
+    try:
+        sizes = store.list_chapter_sizes("run-1")
+        assert [(s["chapter_id"], s["title"]) for s in sizes] == [("3", "Chapter 3")]
+
+        store.save_report("run-2", {"0": _chapter(0)})
+        assert store.list_chapter_sizes("run-2")[0]["title"] == "Chapter 0"
+    finally:
+        close_all_pools()
+
+
+def test_tables_are_recreated_for_a_replaced_database_file(store, tmp_path):
+    import os
+    import sqlite3
+
+    store.save_report("run-1", {"0": _chapter(0)})
+    # Restore of a backup without the artifact tables, at the same path
+    empty = tmp_path / "backup.db"
+    sqlite3.connect(empty).close()
+    os.replace(empty, store.db_path)
+
+    store.save_report("run-2", {"1": _chapter(1)})
+
+    assert list(store.load_chapters("run-2")) == ["1"]
+    assert store.load_chapters("run-1") is None
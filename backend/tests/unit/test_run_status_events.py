@@ -0,0 +1,173 @@
+"""
+Tests for the push channel of run status (RunEventBroker + /events SSE stream).
+"""
+import asyncio
+import json
+import threading
+import time
+import uuid
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.api.run_status import (
+    router,
+    run_status_store,
+    start_run_tracking,
+    track_step,
+    track_plane,
+    complete_run_tracking,
+    reset_run_tracking,
+)
+
+
+def _client():
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app)
+
+
+def _read_events(response):
+    """Parse an SSE body into (event, data) tuples."""
+    events, event = [], None
+    for line in response.iter_lines():
+        if line.startswith("event: "):
+            event = line[len("event: "):]
+        elif line.startswith("data: "):
+            events.append((event, json.loads(line[len("data: "):])))
+    return events
+
+
+async def test_broker_delivers_events_from_worker_threads():
+    run_id = str(uuid.uuid4())
+    queue = run_status_store.events.subscribe(run_id)
+    start_run_tracking(run_id, "ollama", "llama3", "fast")
+
+    worker = threading.Thread(target=track_step, args=(run_id, "scrape_funda", "running"))
+    worker.start()
+    worker.join()
+
+    first = await asyncio.wait_for(queue.get(), timeout=1)
+    second = await asyncio.wait_for(queue.get(), timeout=1)
+    run_status_store.events.unsubscribe(run_id, queue)
+
+    assert first[0] == "snapshot"
+    assert second[0] == "step"
+    assert second[1]["key"] == "scrape_funda"
+    assert second[1]["step"]["status"] == "running"
+    assert run_status_store.events.subscriber_count(run_id) == 0
+
+
+def test_stream_pushes_step_plane_and_complete_events():
+    run_id = str(uuid.uuid4())
+    start_run_tracking(run_id, "ollama", "llama3", "fast")
+
+    def pipeline():
+        # Wait until the SSE handler has subscribed
+        deadline = time.time() + 5
+        while run_status_store.events.subscriber_count(run_id) == 0 and time.time() < deadline:
+            time.sleep(0.01)
+        track_step(run_id, "plane_generation", "running")
+        track_plane(run_id, "B", "3", "done", word_count=420)
+        complete_run_tracking(run_id, "done")
+
+    threading.Thread(target=pipeline).start()
+
+    with _client().stream("GET", f"/api/runs/{run_id}/events") as response:
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = _read_events(response)
+
+    assert [e for e, _ in events] == ["snapshot", "step", "plane", "complete"]
+    assert events[0][1]["source"] == "realtime"
+    assert events[2][1]["plane"]["word_count"] == 420
+    assert events[3][1]["status"] == "done"
+
+
+def test_stream_for_finished_run_closes_immediately():
+    run_id = str(uuid.uuid4())
+    start_run_tracking(run_id, "ollama", "llama3", "fast")
+    complete_run_tracking(run_id, "validation_failed")
+
+    with _client().stream("GET", f"/api/runs/{run_id}/events") as response:
+        events = _read_events(response)
+
+    assert [e for e, _ in events] == ["snapshot", "complete"]
+    assert events[1][1]["status"] == "validation_failed"
+
+
+def test_reset_run_tracking_only_drops_finished_runs():
+    running, finished = str(uuid.uuid4()), str(uuid.uuid4())
+    start_run_tracking(running, "ollama", "llama3", "fast")
+    start_run_tracking(finished, "ollama", "llama3", "fast")
+    complete_run_tracking(finished, "done")
+
+    assert reset_run_tracking(running) is False
+    assert reset_run_tracking(finished) is True
+    assert run_status_store.get(running) is not None
+    assert run_status_store.get(finished) is None
+
+
+def test_stream_stays_open_until_pending_hero_images_arrive(monkeypatch):
+    from backend.api import run_status
+    pending = {"chapters": ["3"]}
+    monkeypatch.setattr(run_status, "_pending_images", lambda run_id: pending["chapters"])
+    run_id = str(uuid.uuid4())
+    start_run_tracking(run_id, "ollama", "llama3", "fast")
+    complete_run_tracking(run_id, "done")
+
+    def image_queue():
+        deadline = time.time() + 5
+        while run_status_store.events.subscriber_count(run_id) == 0 and time.time() < deadline:
+            time.sleep(0.01)
+        pending["chapters"] = []
+        run_status_store.publish_chapter_updated(run_id, "3", 0)
+
+    threading.Thread(target=image_queue).start()
+
+    with _client().stream("GET", f"/api/runs/{run_id}/events") as response:
+        events = _read_events(response)
+
+    assert [e for e, _ in events] == ["snapshot", "complete", "chapter_updated"]
+    assert events[1][1]["images_pending"] == 1
+    assert events[2][1] == {"chapter_id": "3", "images_pending": 0}
+
+
+def test_stream_follows_the_database_for_runs_tracked_elsewhere(monkeypatch):
+    # worker_mode="external": the pipeline publishes its events in another process
+    from backend.api import run_status
+    run_id = str(uuid.uuid4())
+    states = iter([
+        {"status": "running", "progress_percent": 0, "steps": {}},
+        {"status": "running", "progress_percent": 0, "steps": {}},
+        {"status": "running", "progress_percent": 40, "steps": {"scrape_funda": {"status": "done"}}},
+        {"status": "done", "progress_percent": 100, "steps": {"scrape_funda": {"status": "done"}}},
+    ])
+    monkeypatch.setattr(run_status, "build_live_status", lambda rid: next(states))
+    monkeypatch.setattr(run_status, "_pending_images", lambda rid: [])
+    monkeypatch.setattr(run_status, "SSE_DB_POLL_SECONDS", 0.01)
+
+    with _client().stream("GET", f"/api/runs/{run_id}/events") as response:
+        events = _read_events(response)
+
+    assert [e for e, _ in events] == ["snapshot", "snapshot", "snapshot", "complete"]
+    assert events[1][1]["progress_percent"] == 40
+    assert events[3][1] == {"status": "done", "progress_percent": 100, "images_pending": 0}
+
+
+def test_stream_announces_hero_images_attached_by_another_process(monkeypatch):
+    # worker_mode="external": the image queue and its chapter_updated events live in the worker
+    from backend.api import run_status
+    run_id = str(uuid.uuid4())
+    start_run_tracking(run_id, "ollama", "llama3", "fast")
+    complete_run_tracking(run_id, "done")
+    stored = iter([["3", "5"], ["3"], ["3"], []])
+    monkeypatch.setattr(run_status, "_pending_images", lambda rid: next(stored))
+    monkeypatch.setattr(run_status, "SSE_DB_POLL_SECONDS", 0.01)
+
+    with _client().stream("GET", f"/api/runs/{run_id}/events") as response:
+        events = _read_events(response)
+
+    assert [e for e, _ in events] == ["snapshot", "complete", "chapter_updated", "chapter_updated"]
+    assert events[1][1]["images_pending"] == 2
+    assert events[2][1] == {"chapter_id": "5", "images_pending": 1}
+    assert events[3][1] == {"chapter_id": "3", "images_pending": 0}
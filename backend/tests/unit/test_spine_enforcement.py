@@ -364,6 +364,150 @@ class TestFullPipelineExecution:
         assert spine.ctx.is_registry_locked()
 
 
+class TestConcurrentChapterGeneration:
+    """Test that concurrent chapter generation keeps the spine invariants."""
+    
+    def test_concurrent_matches_sequential(self, sample_raw_data, sample_preferences, structural_policy):
+        """Parallel generation validates and returns every chapter in chapter order."""
+        sequential, _ = PipelineSpine.execute_full_pipeline(
+            run_id="test-conc-seq",
+            raw_data=sample_raw_data,
+            preferences=sample_preferences,
+            strict_validation=False,
+            chapter_concurrency=1
+        )
+        concurrent, output = PipelineSpine.execute_full_pipeline(
+            run_id="test-conc-par",
+            raw_data=sample_raw_data,
+            preferences=sample_preferences,
+            strict_validation=False,
+            chapter_concurrency=4
+        )
+        
+        assert list(concurrent.ctx._validation_results.keys()) == list(range(1, 14))
+        assert concurrent.ctx._validation_results == sequential.ctx._validation_results
+        assert set(output["chapters"].keys()) == {str(i) for i in range(14)}
+    
+    def test_concurrent_failure_propagates(self, sample_raw_data, structural_policy):
+        """A failing chapter aborts concurrent generation (fail-closed)."""
+        from unittest.mock import patch
+        from backend.pipeline import chapter_generator
+        
+        original = chapter_generator.generate_chapter_with_validation
+        
+        def failing_generator(ctx, chapter_id):
+            if chapter_id == 5:
+                raise PipelineViolation("Narrative generation failed for chapter 5")
+            return original(ctx, chapter_id)
+        
+        spine = PipelineSpine("test-conc-fail")
+        spine.ingest_raw_data(sample_raw_data)
+        spine.enrich_and_populate_registry()
+        
+        with patch.object(chapter_generator, "generate_chapter_with_validation", failing_generator):
+            with pytest.raises(PipelineViolation, match="chapter 5"):
+                spine.generate_all_chapters(max_concurrency=4)
+        
+        assert spine.ctx.get_validated_chapters() == {}
+    
+    def test_concurrent_progress_callback(self, sample_raw_data, structural_policy):
+        """Progress is reported once up-front and once per completed chapter."""
+        messages = []
+        spine = PipelineSpine("test-conc-progress")
+        spine.ingest_raw_data(sample_raw_data)
+        spine.enrich_and_populate_registry()
+        spine.generate_all_chapters(progress_callback=messages.append, max_concurrency=3)
+        
+        assert len(messages) == 14
+        assert messages[-1] == "running (13/13 chapters, parallel)"
+
+
+
+class TestAsyncExecution:
+    """Test the async spine path (execute_full_pipeline_async)."""
+    
+    async def test_async_matches_sync(self, sample_raw_data, sample_preferences, structural_policy):
+        """The async path runs the same phases and validation as the sync path."""
+        sync_spine, _ = PipelineSpine.execute_full_pipeline(
+            run_id="test-async-sync",
+            raw_data=sample_raw_data,
+            preferences=sample_preferences,
+            strict_validation=False
+        )
+        async_spine, output = await PipelineSpine.execute_full_pipeline_async(
+            run_id="test-async",
+            raw_data=sample_raw_data,
+            preferences=sample_preferences,
+            strict_validation=False
+        )
+        
+        assert async_spine.ctx._validation_results == sync_spine.ctx._validation_results
+        assert set(output["chapters"].keys()) == {str(i) for i in range(14)}
+    
+    async def test_async_awaits_narratives_concurrently(self, sample_raw_data, structural_policy):
+        """Chapter narratives are requested concurrently and used by the chapters."""
+        import asyncio
+        import json
+        import uuid
+        from backend.ai.provider_registry import ProviderHandle
+        
+        class _SlowProvider:
+            name = "async-test"
+            
+            def __init__(self):
+                self.in_flight = 0
+                self.max_in_flight = 0
+                self.calls = 0
+            
+            async def generate(self, prompt, **kwargs):
+                self.calls += 1
+                self.in_flight += 1
+                self.max_in_flight = max(self.max_in_flight, self.in_flight)
+                await asyncio.sleep(0.02)
+                self.in_flight -= 1
+                return json.dumps({"text": " ".join(["woord"] * 320), "word_count": 320})
+        
+        provider = _SlowProvider()
+        # Unique preferences keep the shared response cache out of the way
+        preferences = {"marcel": {"priorities": [uuid.uuid4().hex]}, "petra": {}}
+        spine = PipelineSpine("test-async-io", preferences, ProviderHandle.wrap(provider))
+        spine.ingest_raw_data(sample_raw_data)
+        spine.enrich_and_populate_registry()
+        
+        await spine.generate_all_chapters_async(max_concurrency=4)
+        
+        assert provider.calls == 13  # 12 prefetched; chapter 13 (legacy) asks on its own
+        assert 1 < provider.max_in_flight <= 4
+        assert spine.ctx.take_prefetched_narrative(3) is None  # consumed by the chapter
+    
+    async def test_failed_async_prefetch_is_not_repeated_by_sync_prefetch(self, sample_raw_data, structural_policy):
+        """Chapters the async path already requested are skipped by the multi-chapter prefetch."""
+        import uuid
+        from backend.ai.provider_registry import ProviderHandle
+        from backend.pipeline.chapter_generator import prefetch_chapter_io_async, prefetch_narratives
+        
+        class _DownProvider:
+            name = "async-down"
+            calls = 0
+            
+            async def generate(self, prompt, **kwargs):
+                self.calls += 1
+                raise RuntimeError("provider unavailable")
+        
+        provider = _DownProvider()
+        preferences = {"marcel": {"priorities": [uuid.uuid4().hex]}, "petra": {}}
+        spine = PipelineSpine("test-async-down", preferences, ProviderHandle.wrap(provider))
+        spine.ingest_raw_data(sample_raw_data)
+        spine.enrich_and_populate_registry()
+        chapter_ids = list(range(1, 14))
+        
+        result = await prefetch_chapter_io_async(spine.ctx, chapter_ids, group_size=4, max_concurrency=4)
+        calls = provider.calls
+        
+        assert result["narratives"] == 0 and calls > 0
+        assert prefetch_narratives(spine.ctx, chapter_ids, group_size=4, max_concurrency=4) == 0
+        assert provider.calls == calls
+
 # =============================================================================
 # VALIDATION GATE TESTS
 # =============================================================================
@@ -0,0 +1,122 @@
+"""
+Tests for the shared SQLite connection pool (backend/storage/sqlite_pool.py).
+"""
+import sqlite3
+import threading
+
+import pytest
+
+from backend.storage.sqlite_pool import SQLitePool, connect, close_all_pools
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "pool.db"
+    yield str(path)
+    close_all_pools()
+
+
+def test_connections_are_reused(db_path):
+    pool = SQLitePool(db_path)
+
+    first = pool.acquire()
+    first.close()
+    second = pool.acquire()
+
+    assert second is first
+    assert pool.get_stats()["created"] == 1
+    assert pool.get_stats()["reused"] == 1
+    second.close()
+    pool.close_all()
+
+
+def test_wal_and_pragmas_are_applied(db_path):
+    conn = connect(db_path)
+
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+    assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+    conn.close()
+
+
+def test_release_rolls_back_and_resets_row_factory(db_path):
+    conn = connect(db_path)
+    conn.execute("CREATE TABLE t (x INTEGER)")
+    conn.commit()
+    conn.row_factory = sqlite3.Row
+    conn.execute("INSERT INTO t VALUES (1)")
+    conn.close()  # uncommitted insert must not leak into the next checkout
+
+    again = connect(db_path)
+    assert again.row_factory is None
+    assert again.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+    again.close()
+
+
+def test_repeated_close_does_not_close_pooled_handle(db_path):
+    conn = connect(db_path)
+    conn.close()
+    conn.close()
+
+    again = connect(db_path)
+    assert again.execute("SELECT 1").fetchone()[0] == 1
+    again.close()
+
+
+def test_memory_databases_are_not_pooled():
+    a = connect(":memory:")
+    a.execute("CREATE TABLE t (x INTEGER)")
+    b = connect(":memory:")
+
+    assert b is not a
+    assert b.execute("SELECT name FROM sqlite_master WHERE name='t'").fetchone() is None
+    a.close()
+    b.close()
+
+
+def test_replaced_database_file_is_not_served_from_stale_handles(tmp_path):
+    path = tmp_path / "replaced.db"
+    conn = connect(path)
+    conn.execute("CREATE TABLE old (x INTEGER)")
+    conn.commit()
+    conn.close()
+
+    close_all_pools()
+    for suffix in ("", "-wal", "-shm"):
+        p = tmp_path / f"replaced.db{suffix}"
+        if p.exists():
+            p.unlink()
+
+    fresh = connect(path)
+    assert fresh.execute("SELECT name FROM sqlite_master WHERE name='old'").fetchone() is None
+    fresh.close()
+    close_all_pools()
+
+
+def test_concurrent_writers_do_not_fail(db_path):
+    setup = connect(db_path)
+    setup.execute("CREATE TABLE counter (n INTEGER)")
+    setup.commit()
+    setup.close()
+    errors = []
+
+    def writer():
+        try:
+            for _ in range(25):
+                conn = connect(db_path)
+                conn.execute("INSERT INTO counter VALUES (1)")
+                conn.commit()
+                conn.close()
+        except Exception as e:  # pragma: no cover - failure path
+            errors.append(e)
+
+    threads = [threading.Thread(target=writer) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    conn = connect(db_path)
+    assert not errors
+    assert conn.execute("SELECT COUNT(*) FROM counter").fetchone()[0] == 200
+    conn.close()
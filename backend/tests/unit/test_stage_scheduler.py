@@ -0,0 +1,59 @@
+"""
+Tests for the pipeline stage scheduler (backend/pipeline/stage_scheduler.py).
+"""
+import threading
+
+import pytest
+
+from backend.pipeline.stage_scheduler import StageScheduler, StageSkipped
+
+
+def test_independent_stages_run_concurrently():
+    # Both stages must be inside fn at the same time to pass the barrier
+    barrier = threading.Barrier(2, timeout=5)
+    scheduler = StageScheduler()
+    scheduler.add("consistency", lambda: barrier.wait() is not None)
+    scheduler.add("dynamic_extraction", lambda: barrier.wait() is not None)
+
+    scheduler.start()
+    scheduler.wait_all()
+
+    assert scheduler.result("consistency") and scheduler.result("dynamic_extraction")
+
+
+def test_dependent_stage_waits_for_its_dependencies():
+    order = []
+    scheduler = StageScheduler()
+    scheduler.add("a", lambda: order.append("a"))
+    scheduler.add("b", lambda: order.append("b"))
+    scheduler.add("summary", lambda: order.append("summary") or len(order), depends_on=["a", "b"])
+
+    scheduler.start()
+
+    assert scheduler.result("summary") == 3
+    assert order[-1] == "summary"
+    scheduler.wait_all()
+
+
+def test_failed_stage_skips_dependents_and_reraises():
+    def fail():
+        raise ValueError("LLM timeout")
+
+    scheduler = StageScheduler()
+    scheduler.add("extract", fail)
+    scheduler.add("store", lambda: "stored", depends_on=["extract"])
+    scheduler.add("other", lambda: "ok")
+
+    scheduler.start()
+    scheduler.wait_all()
+
+    with pytest.raises(ValueError, match="LLM timeout"):
+        scheduler.result("extract")
+    assert isinstance(scheduler.exception("store"), StageSkipped)
+    assert scheduler.result("other") == "ok"
+
+
+def test_dependencies_must_be_declared_first():
+    scheduler = StageScheduler()
+    with pytest.raises(ValueError):
+        scheduler.add("summary", lambda: None, depends_on=["missing"])
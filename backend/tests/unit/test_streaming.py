@@ -0,0 +1,143 @@
+"""
+Tests for streaming generation: AIProvider.generate_stream, CachingProvider
+streams and the live narrative preview forwarded by NarrativeGenerator.
+"""
+import asyncio
+import json
+import uuid
+from typing import List
+
+import httpx
+
+from backend.ai.provider_interface import AIProvider
+from backend.ai.providers.ollama_provider import OllamaProvider
+from backend.ai.response_cache import CachingProvider, ResponseCache
+from backend.api.run_status import run_status_store, start_run_tracking, track_narrative
+from backend.domain.narrative_generator import NarrativeStreamForwarder, extract_partial_text
+
+
+class _StaticProvider(AIProvider):
+    """Provider without native streaming (uses the interface default)."""
+
+    def __init__(self, response: str):
+        self.response = response
+        self.calls = 0
+
+    @property
+    def name(self) -> str:
+        return "static"
+
+    async def generate(self, prompt, **kwargs) -> str:
+        self.calls += 1
+        return self.response
+
+    async def check_health(self) -> bool:
+        return True
+
+    def list_models(self) -> List[str]:
+        return ["static"]
+
+    async def close(self):
+        pass
+
+
+class _ChunkedProvider(_StaticProvider):
+    def __init__(self, chunks: List[str]):
+        super().__init__("".join(chunks))
+        self.chunks = chunks
+
+    async def generate_stream(self, prompt, **kwargs):
+        self.calls += 1
+        for chunk in self.chunks:
+            yield chunk
+
+
+async def test_default_generate_stream_yields_full_response():
+    provider = _StaticProvider("hello world")
+
+    chunks = [c async for c in provider.generate_stream("prompt")]
+
+    assert chunks == ["hello world"]
+
+
+async def test_ollama_streams_ndjson_chunks():
+    lines = [
+        {"response": '{"text": "Een ', "done": False},
+        {"response": 'mooi huis"}', "done": False},
+        {"response": "", "done": True},
+    ]
+    seen = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen["payload"] = json.loads(request.content)
+        body = "\n".join(json.dumps(line) for line in lines) + "\n"
+        return httpx.Response(200, text=body)
+
+    provider = OllamaProvider(base_url="http://ollama.test", model="llama3")
+    provider._async_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    chunks = [c async for c in provider.generate_stream("prompt", json_mode=True)]
+    await provider.close()
+
+    assert "".join(chunks) == '{"text": "Een mooi huis"}'
+    assert seen["payload"]["stream"] is True
+    assert seen["payload"]["format"] == "json"
+
+
+async def test_cache_streams_miss_and_replays_hit_as_one_chunk():
+    cache = ResponseCache(":memory:")
+    provider = _ChunkedProvider(['{"text": ', '"abc"}'])
+    wrapped = CachingProvider(provider, cache)
+    first = [chunk async for chunk in wrapped.generate_stream("p")]
+    second = [chunk async for chunk in wrapped.generate_stream("p")]
+    cache.close()
+
+    assert first == ['{"text": ', '"abc"}']
+    assert second == ['{"text": "abc"}']
+    assert provider.calls == 1
+
+
+def test_extract_partial_text_decodes_unterminated_string():
+    assert extract_partial_text('{"title": "x", "te') is None
+    assert extract_partial_text('{"text": "Regel 1\\nRegel \\"2\\"') == 'Regel 1\nRegel "2"'
+    # Incomplete escapes wait for the next chunk
+    assert extract_partial_text('{"text": "caf\\u00') == "caf"
+    assert extract_partial_text('{"text": "caf\\u00e9", "word_count": 1}') == "café"
+
+
+def test_forwarder_throttles_and_survives_callback_errors():
+    received = []
+
+    def on_partial(text, word_count):
+        received.append((text, word_count))
+        raise RuntimeError("listener gone")
+
+    forwarder = NarrativeStreamForwarder(on_partial, min_chars=10)
+    forwarder.feed('{"text": "one two')
+    forwarder.feed(' three four')
+    forwarder.feed(' five')
+
+    assert received == [("one two three four", 4)]
+
+
+async def test_track_narrative_publishes_preview_event():
+    run_id = str(uuid.uuid4())
+    start_run_tracking(run_id, "ollama", "llama3", "fast")
+    queue = run_status_store.events.subscribe(run_id)
+
+    track_narrative(run_id, "3", "Een mooi huis", 3)
+
+    event, data = await asyncio.wait_for(queue.get(), timeout=1)
+    run_status_store.events.unsubscribe(run_id, queue)
+    assert event == "narrative"
+    assert data == {"chapter_id": "3", "text": "Een mooi huis", "word_count": 3}
+
+
+def test_forwarder_decodes_escapes_split_across_chunks():
+    received = []
+    forwarder = NarrativeStreamForwarder(lambda text, words: received.append(text), min_chars=1)
+
+    for chunk in ('{"te', 'xt": "caf\\u0', '0e9 \\', 'n', 'klaar", "word_count": 2}', ' "text": "x"'):
+        forwarder.feed(chunk)
+
+    assert received == ["caf", "café ", "café \n", "café \nklaar"]
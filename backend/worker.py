@@ -0,0 +1,241 @@
+"""
+PIPELINE WORKER - Executes jobs from the durable job queue
+
+JobWorker runs a dispatcher and a heartbeat thread against a JobQueue:
+
+    dispatch:  free slot -> claim() -> executor: handler(job) -> complete()
+                                                   | exception -> fail()
+    heartbeat: extend the lease of every job this worker is running
+
+The API process starts an embedded worker by default (PIPELINE_WORKER_MODE=
+embedded). To keep pipeline CPU/IO out of the API process, set
+PIPELINE_WORKER_MODE=external and run one or more workers separately:
+
+    python -m backend.worker [--concurrency N]
+
+Queued and interrupted jobs survive restarts of either process: a job whose
+worker died is claimed again once its lease expires.
+"""
+
+import argparse
+import logging
+import os
+import signal
+import socket
+import threading
+import uuid
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional
+
+from backend.storage.job_queue import Job, JobQueue, STATUS_DEAD
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[Job], None]
+DeadJobHandler = Callable[[Job, str], None]
+
+
+class JobWorker:
+    """
+    Claims and executes jobs of the registered kinds.
+
+    A daemon dispatcher thread claims jobs while a slot is free and submits
+    them to the executor; the executor threads only ever run job handlers, so
+    shutting the executor down waits for running jobs instead of idle loops.
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        handlers: Dict[str, JobHandler],
+        concurrency: int = 1,
+        poll_interval: float = 1.0,
+        worker_id: Optional[str] = None,
+        on_dead: Optional[DeadJobHandler] = None,
+        executor: Optional[Executor] = None
+    ):
+        self.queue = queue
+        self.handlers = dict(handlers)
+        self.concurrency = max(1, concurrency)
+        self.poll_interval = poll_interval
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.on_dead = on_dead
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._slots = threading.BoundedSemaphore(self.concurrency)
+        self._stop = threading.Event()
+        self._wakeup = threading.Event()
+        self._active: Dict[str, Job] = {}
+        self._active_lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+        self._running = False
+
+    @property
+    def is_running(self) -> bool:
+        return self._running and not self._stop.is_set()
+
+    def start(self) -> None:
+        """Start the dispatcher and heartbeat threads."""
+        if self._running:
+            return
+        self._running = True
+        self._stop.clear()
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="JobWorker")
+        for target, name in ((self._dispatch_loop, "JobWorker-dispatch"), (self._heartbeat_loop, "JobWorker-heartbeat")):
+            t = threading.Thread(target=target, name=name, daemon=True)
+            t.start()
+            self._threads.append(t)
+        logger.info(
+            f"JobWorker: {self.worker_id} started ({self.concurrency} slots, kinds={sorted(self.handlers)})"
+        )
+
+    def stop(self, wait: bool = False) -> None:
+        """Stop claiming. Running jobs finish; unfinished leases expire and are reclaimed."""
+        self._stop.set()
+        self._wakeup.set()
+        if wait:
+            if self._owns_executor and self._executor is not None:
+                self._executor.shutdown(wait=True)
+            for t in self._threads:
+                t.join()
+        self._running = False
+
+    def notify(self) -> None:
+        """Wake the dispatcher (a job was just enqueued in this process)."""
+        self._wakeup.set()
+
+    def cancel(self, job_ids: Iterable[str]) -> int:
+        """
+        Signal running jobs of this worker to stop (cooperative; handlers check
+        job.cancelled). Jobs of other processes notice on their next heartbeat.
+        """
+        signalled = 0
+        with self._active_lock:
+            for job_id in job_ids:
+                job = self._active.get(job_id)
+                if job is not None:
+                    job.cancel_event.set()
+                    signalled += 1
+        return signalled
+
+    # =========================================================================
+    # EXECUTION
+    # =========================================================================
+
+    def run_once(self) -> bool:
+        """Claim and execute at most one job in the calling thread. Returns True if a job was run."""
+        job = self.queue.claim(self.worker_id, kinds=list(self.handlers))
+        if job is None:
+            return False
+        self._execute(job)
+        return True
+
+    def _execute(self, job: Job) -> None:
+        with self._active_lock:
+            self._active[job.id] = job
+        logger.info(f"JobWorker: Running {job.kind} {job.id} (run {job.run_id}, attempt {job.attempts})")
+        try:
+            self.handlers[job.kind](job)
+        except Exception as e:
+            logger.exception(f"JobWorker: {job.kind} {job.id} raised")
+            status = self.queue.fail(job.id, self.worker_id, f"{type(e).__name__}: {e}")
+            if status == STATUS_DEAD and self.on_dead is not None:
+                try:
+                    self.on_dead(job, str(e))
+                except Exception:
+                    logger.exception(f"JobWorker: on_dead handler failed for {job.id}")
+        else:
+            if not self.queue.complete(job.id, self.worker_id):
+                logger.warning(f"JobWorker: Lease on {job.id} was lost before completion")
+        finally:
+            with self._active_lock:
+                self._active.pop(job.id, None)
+
+    def _run_slot(self, job: Job) -> None:
+        try:
+            self._execute(job)
+        finally:
+            self._slots.release()
+            # A slot freed up - more work may be waiting
+            self._wakeup.set()
+
+    def _dispatch_loop(self) -> None:
+        while not self._stop.is_set():
+            if not self._slots.acquire(timeout=self.poll_interval):
+                continue
+            self._wakeup.clear()
+            job = None
+            try:
+                job = self.queue.claim(self.worker_id, kinds=list(self.handlers))
+            except Exception:
+                # Queue/DB hiccup: back off instead of spinning
+                logger.exception("JobWorker: Claim failed")
+            if job is None:
+                self._slots.release()
+                self._wakeup.wait(self.poll_interval)
+                continue
+            try:
+                self._executor.submit(self._run_slot, job)
+            except RuntimeError:
+                # Executor shut down (interpreter exit): leave the lease to expire
+                self._slots.release()
+                logger.warning(f"JobWorker: Executor closed, {job.id} will be reclaimed after its lease")
+                return
+
+    def _heartbeat_loop(self) -> None:
+        interval = max(self.queue.lease_seconds / 3, 1.0)
+        while True:
+            stopping = self._stop.wait(interval)
+            with self._active_lock:
+                active = list(self._active.values())
+            # Keep beating after stop() until the running jobs have finished
+            if stopping and not active:
+                break
+            for job in active:
+                try:
+                    if not self.queue.heartbeat(job.id, self.worker_id) and not job.cancelled:
+                        logger.warning(f"JobWorker: {job.id} superseded or lease lost - cancelling")
+                        job.cancel_event.set()
+                except Exception as e:
+                    logger.warning(f"JobWorker: Heartbeat for {job.id} failed: {e}")
+
+
+# =============================================================================
+# STANDALONE ENTRYPOINT
+# =============================================================================
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run pipeline jobs from the durable job queue")
+    parser.add_argument("--concurrency", type=int, default=None,
+                        help="Parallel pipeline runs (default: PIPELINE_MAX_WORKERS)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    # Only the pipeline runner: the worker does not build the FastAPI app
+    from backend import pipeline_runner
+
+    pipeline_runner.init_db()
+    pipeline_runner.init_ai_provider()
+    worker = pipeline_runner.build_pipeline_worker(concurrency=args.concurrency)
+
+    stopped = threading.Event()
+
+    def _handle_signal(signum, _frame):
+        logger.info(f"JobWorker: Signal {signum} received, finishing running jobs")
+        worker.stop()
+        stopped.set()
+
+    signal.signal(signal.SIGINT, _handle_signal)
+    signal.signal(signal.SIGTERM, _handle_signal)
+
+    worker.start()
+    while not stopped.wait(1.0):
+        pass
+    worker.stop(wait=True)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,4 +1,4 @@
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef } from 'react';
 import { BentoGrid, BentoCard } from './components/layout/BentoLayout';
 import { MagazineChapter } from './components/MagazineChapter';
 import { OrientationChapter } from './components/OrientationChapter';
@@ -16,7 +16,14 @@ import { GlobalCapabilityBanner } from './components/common/GlobalCapabilityBann
 import { GovernanceView } from './components/GovernanceView';
 
 
-import type { ReportData } from './types';
+import type { ReportData, ChapterData, ReportManifestChapter } from './types';
+
+// Chapter bodies are loaded on demand from the per-chapter endpoint
+const fetchChapter = async (runId: string, chapterId: string): Promise<ChapterData | null> => {
+  const res = await fetch(`/api/runs/${runId}/chapters/${chapterId}`);
+  if (!res.ok) return null;
+  return res.json();
+};
 
 function App() {
   const [activeChapterId, setActiveChapterId] = useState("0");
@@ -58,6 +65,74 @@ function App() {
     init();
   }, []);
 
+  // Lazy-load the active chapter if only its manifest stub is present
+  const activeIsStub = !!report?.chapters[activeChapterId]?._stub;
+  const [chapterLoadError, setChapterLoadError] = useState<string | null>(null);
+  const [chapterRetry, setChapterRetry] = useState(0);
+  useEffect(() => {
+    setChapterLoadError(null);
+    if (!report || !activeIsStub) return;
+    const runId = report.runId;
+    const chapterId = activeChapterId;
+    let cancelled = false;
+    fetchChapter(runId, chapterId)
+      .then(body => {
+        if (cancelled) return;
+        if (!body) {
+          setChapterLoadError(chapterId);
+          return;
+        }
+        setReport(prev => prev && prev.runId === runId
+          ? { ...prev, chapters: { ...prev.chapters, [chapterId]: body } }
+          : prev);
+      })
+      .catch(err => {
+        console.error("Failed to load chapter", chapterId, err);
+        if (!cancelled) setChapterLoadError(chapterId);
+      });
+    return () => { cancelled = true; };
+  }, [report?.runId, activeChapterId, activeIsStub, chapterRetry]);
+
+  // Hero images that finish after the run is done: re-fetch the chapters they land in
+  const reportRef = useRef(report);
+  reportRef.current = report;
+  const imagesPending = (report?.images_pending ?? 0) > 0;
+  useEffect(() => {
+    if (!report || !imagesPending || typeof EventSource === 'undefined') return;
+    const runId = report.runId;
+    const refresh = (chapterId: string) => {
+      // Stubs load fresh on demand anyway
+      const loaded = reportRef.current?.chapters[chapterId];
+      if (!loaded || loaded._stub) return;
+      fetchChapter(runId, chapterId).then(body => {
+        if (!body) return;
+        setReport(prev => prev && prev.runId === runId
+          ? { ...prev, chapters: { ...prev.chapters, [chapterId]: body } }
+          : prev);
+      }).catch(() => { /* keeps the pending placeholder; a reload retries */ });
+    };
+    const source = new EventSource(`/api/runs/${runId}/events`);
+    const finish = () => {
+      source.close();
+      setReport(prev => prev && prev.runId === runId ? { ...prev, images_pending: 0 } : prev);
+    };
+    source.addEventListener('chapter_updated', (e) => {
+      const { chapter_id, images_pending } = JSON.parse((e as MessageEvent).data);
+      refresh(String(chapter_id));
+      if (!images_pending) finish();
+    });
+    source.addEventListener('complete', (e) => {
+      const { images_pending } = JSON.parse((e as MessageEvent).data);
+      if (!images_pending) {
+        // Everything arrived before we subscribed: catch up once
+        Object.keys(reportRef.current?.chapters || {}).forEach(refresh);
+        finish();
+      }
+    });
+    source.onerror = () => source.close();
+    return () => source.close();
+  }, [report?.runId, imagesPending]);
+
   const pollStatus = async (runId: string) => {
     try {
       const statusRes = await fetch(`/api/runs/${runId}/status`);
@@ -65,7 +140,8 @@ function App() {
 
       const data = await statusRes.json();
       if (data.status === 'done') {
-        const reportRes = await fetch(`/api/runs/${runId}/report`);
+        // Manifest first (no chapter bodies), then chapter 0 - the rest loads on demand
+        const reportRes = await fetch(`/api/runs/${runId}/report/manifest`);
         if (!reportRes.ok) throw new Error('Rapport ophalen mislukt');
         const reportData = await reportRes.json();
 
@@ -77,14 +153,22 @@ function App() {
           return;
         }
 
+        const chapters: Record<string, ChapterData> = {};
+        for (const entry of (reportData.chapters || []) as ReportManifestChapter[]) {
+          chapters[entry.id] = { id: entry.id, title: entry.title || `Hoofdstuk ${entry.id}`, _stub: true };
+        }
+        const firstChapter = await fetchChapter(runId, "0");
+        if (firstChapter) chapters["0"] = firstChapter;
+
         setReport({
           runId: runId,
           address: reportData.property_core?.address || reportData.address || "Onbekend Adres",
-          chapters: reportData.chapters || {},
+          chapters,
           property_core: reportData.property_core,
           discovery: reportData.discovery || [],
           media_from_db: reportData.media_from_db || [],
           consistency: reportData.consistency,
+          images_pending: reportData.images_pending || 0,
           // === BACKBONE CONTRACT: CoreSummary is MANDATORY ===
           core_summary: reportData.core_summary
         });
@@ -93,8 +177,11 @@ function App() {
       } else if (data.status === 'error') {
         setError(`Analyse mislukt: ${data.steps ? JSON.stringify(data.steps) : 'onbekende fout'}`);
         setLoading(false);
+      } else if (data.status === 'cancelled') {
+        setError('Analyse afgebroken: een nieuwere analyse van deze woning is gestart.');
+        setLoading(false);
       } else {
-        setTimeout(() => pollStatus(runId), 2000);
+        waitForCompletion(runId);
       }
     } catch (err) {
       setError(err instanceof Error ? err.message : String(err));
@@ -102,6 +189,29 @@ function App() {
     }
   };
 
+  // Wait for the run to finish: pushed 'complete' event (SSE), or 2 s polling as fallback
+  const waitForCompletion = (runId: string) => {
+    if (typeof EventSource === 'undefined') {
+      setTimeout(() => pollStatus(runId), 2000);
+      return;
+    }
+    const source = new EventSource(`/api/runs/${runId}/events`);
+    source.addEventListener('complete', (e) => {
+      source.close();
+      const { status } = JSON.parse((e as MessageEvent).data);
+      if (status === 'done') {
+        pollStatus(runId);
+      } else {
+        setError(`Analyse mislukt: ${status}`);
+        setLoading(false);
+      }
+    });
+    source.onerror = () => {
+      source.close();
+      setTimeout(() => pollStatus(runId), 2000);
+    };
+  };
+
   const handleStartAnalysis = async (type: 'url' | 'paste', content: string, mediaUrls?: string[], extraFacts?: string) => {
     setLoading(true);
     setError(null);
@@ -365,6 +475,21 @@ function App() {
                     </div>
                   )}
                 </div>
+              ) : currentChapter?._stub && chapterLoadError === activeChapterId ? (
+                <div className="flex flex-col items-center justify-center gap-4 py-24 text-slate-500">
+                  <span className="font-medium">Hoofdstuk kon niet worden geladen.</span>
+                  <button
+                    onClick={() => setChapterRetry(n => n + 1)}
+                    className="bg-slate-100 hover:bg-slate-200 text-slate-700 font-medium py-2 px-4 rounded-lg transition-colors"
+                  >
+                    Opnieuw proberen
+                  </button>
+                </div>
+              ) : currentChapter?._stub ? (
+                <div className="flex items-center justify-center gap-3 py-24 text-slate-500">
+                  <Loader2 className="w-6 h-6 animate-spin text-blue-600" />
+                  <span className="font-medium">Hoofdstuk laden...</span>
+                </div>
               ) : content ? (
                 <div className="animate-in fade-in duration-700">
                   {activeChapterId === "0" ? (
@@ -29,6 +29,12 @@ interface RunLiveStatus {
     source: 'realtime' | 'database';
 }
 
+interface NarrativePreview {
+    chapter_id: string;
+    text: string;
+    word_count: number;
+}
+
 interface Props {
     runId: string;
     onComplete?: () => void;
@@ -56,6 +62,7 @@ const stepLabels: Record<string, string> = {
 export function RunStatusPanel({ runId, onComplete, compact = false }: Props) {
     const [status, setStatus] = useState<RunLiveStatus | null>(null);
     const [loading, setLoading] = useState(true);
+    const [preview, setPreview] = useState<NarrativePreview | null>(null);
 
     const fetchStatus = useCallback(async () => {
         try {
@@ -77,12 +84,67 @@ export function RunStatusPanel({ runId, onComplete, compact = false }: Props) {
     }, [runId, onComplete]);
 
     useEffect(() => {
-        fetchStatus();
+        let interval: ReturnType<typeof setInterval> | undefined;
+        const startPolling = () => {
+            if (interval) return;
+            fetchStatus();
+            // Poll every 750ms for smooth updates
+            interval = setInterval(fetchStatus, 750);
+        };
+
+        // Push channel (SSE) - polling is only the fallback
+        if (typeof EventSource === 'undefined') {
+            startPolling();
+            return () => clearInterval(interval);
+        }
+
+        const source = new EventSource(`/api/runs/${runId}/events`);
+        const on = (event: string, handler: (data: any) => void) =>
+            source.addEventListener(event, (e) => handler(JSON.parse((e as MessageEvent).data)));
+        const apply = (update: (prev: RunLiveStatus) => RunLiveStatus) =>
+            setStatus(prev => (prev ? update(prev) : prev));
+
+        on('snapshot', (data) => {
+            setStatus(data);
+            setLoading(false);
+        });
+        on('step', (d) => apply(prev => ({
+            ...prev,
+            steps: { ...prev.steps, [d.key]: d.step },
+            current_step: d.current_step,
+            progress_percent: d.progress_percent,
+        })));
+        on('plane', (d) => apply(prev => ({
+            ...prev,
+            planes: { ...prev.planes, [d.key]: d.plane },
+            current_plane: d.current_plane,
+            current_chapter: d.current_chapter,
+        })));
+        on('narrative', (d) => setPreview(d));
+        on('warning', (d) => apply(prev => ({ ...prev, warnings: [...prev.warnings, d.message] })));
+        on('run_error', (d) => apply(prev => ({ ...prev, errors: [...prev.errors, d.message] })));
+        on('complete', (d) => {
+            apply(prev => ({
+                ...prev,
+                status: d.status,
+                progress_percent: d.progress_percent,
+                total_elapsed_ms: d.total_elapsed_ms ?? prev.total_elapsed_ms,
+            }));
+            setPreview(null);
+            source.close();
+            if (onComplete) onComplete();
+        });
+        source.onerror = () => {
+            // Stream unavailable (proxy, old backend): fall back to polling
+            source.close();
+            startPolling();
+        };
 
-        // Poll every 750ms for smooth updates
-        const interval = setInterval(fetchStatus, 750);
-        return () => clearInterval(interval);
-    }, [fetchStatus]);
+        return () => {
+            source.close();
+            if (interval) clearInterval(interval);
+        };
+    }, [runId, fetchStatus, onComplete]);
 
     if (loading && !status) {
         return (
@@ -313,6 +375,21 @@ export function RunStatusPanel({ runId, onComplete, compact = false }: Props) {
                 </div>
             )}
 
+            {/* Streaming narrative preview */}
+            {preview && status.status === 'running' && (
+                <div className="px-6 pb-4">
+                    <div className="p-4 bg-slate-800/50 border border-slate-700 rounded-xl">
+                        <div className="flex items-center justify-between text-xs text-slate-400 mb-2">
+                            <span>Hoofdstuk {preview.chapter_id} - concept</span>
+                            <span className="font-mono">{preview.word_count} woorden</span>
+                        </div>
+                        <p className="text-sm text-slate-300 whitespace-pre-line line-clamp-6">
+                            {preview.text.slice(-1200)}
+                        </p>
+                    </div>
+                </div>
+            )}
+
             {/* Warnings */}
             {status.warnings.length > 0 && (
                 <div className="px-6 pb-4">
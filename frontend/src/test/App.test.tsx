@@ -91,7 +91,7 @@ describe('App Component', () => {
           ok: true,
           json: async () => ({
             property_core: { address: 'Test Address' },
-            chapters: { '0': { title: 'Executive Summary' } }
+            chapters: [{ id: '0', title: 'Executive Summary', raw_bytes: 120 }]
           })
         };
       }
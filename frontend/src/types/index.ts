@@ -72,6 +72,8 @@ export interface ChapterData {
         factual_variables?: string[];
     };
     missing_critical_data?: string[];
+    // Manifest placeholder: body not fetched yet (GET /api/runs/{id}/chapters/{chapter_id})
+    _stub?: boolean;
     // MANDATORY NARRATIVE FIELD (chapters 0-12)
     narrative?: NarrativeContract;
 
@@ -154,6 +156,13 @@ export interface MediaItem {
     provenance: string;
 }
 
+// Entry of GET /api/runs/{id}/report/manifest -> chapters
+export interface ReportManifestChapter {
+    id: string;
+    title: string | null;
+    raw_bytes: number;
+}
+
 export interface ReportData {
     runId: string;
     address: string;
@@ -162,6 +171,8 @@ export interface ReportData {
     property_core?: PropertyCore;
     discovery?: DiscoveryAttribute[];
     media_from_db?: MediaItem[];
+    // Hero images still generating after the run finished (chapter_updated SSE events follow)
+    images_pending?: number;
     // === BACKBONE CONTRACT: CoreSummary is MANDATORY ===
     core_summary: CoreSummary;
 }